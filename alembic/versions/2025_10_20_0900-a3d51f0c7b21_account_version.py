@@ -0,0 +1,31 @@
+"""account_version
+
+Revision ID: a3d51f0c7b21
+Revises: 157c3a1e76ae
+Create Date: 2025-10-20 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d51f0c7b21'
+down_revision: Union[str, Sequence[str], None] = '157c3a1e76ae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'accounts',
+        sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('accounts', 'version')
@@ -0,0 +1,40 @@
+"""account_default
+
+Revision ID: 5e0c2b7d9a14
+Revises: a3d51f0c7b21
+Create Date: 2025-10-27 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0c2b7d9a14'
+down_revision: Union[str, Sequence[str], None] = 'a3d51f0c7b21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'accounts',
+        sa.Column('is_default', sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    op.create_index(
+        'uq_accounts_user_default',
+        'accounts',
+        ['user_id'],
+        unique=True,
+        postgresql_where=sa.text('is_default'),
+        sqlite_where=sa.text('is_default'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_accounts_user_default', table_name='accounts')
+    op.drop_column('accounts', 'is_default')
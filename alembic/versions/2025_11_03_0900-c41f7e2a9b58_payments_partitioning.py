@@ -0,0 +1,194 @@
+"""payments_partitioning
+
+Revision ID: c41f7e2a9b58
+Revises: 5e0c2b7d9a14
+Create Date: 2025-11-03 09:00:00.000000
+
+PostgreSQL: таблица `payments` пересоздаётся как секционированная по
+`created_at` (RANGE, по секции на месяц UTC). Первичный ключ становится
+`(id, created_at)`, а глобальная уникальность `transaction_id`, которую
+секционированная таблица обеспечить не может, переносится в таблицу ключей
+`payment_transaction_ids`, заполняемую триггерами. Секции создаются от месяца
+самого старого платежа до трёх месяцев вперёд; дальше их ведёт
+`scripts/manage_partitions.py`. Секция по умолчанию `payments_default`
+принимает платежи вне созданных секций, чтобы вставка не падала; при создании
+секции месяца её платежи переносятся из секции по умолчанию.
+
+SQLite: добавляется только индекс `(user_id, created_at)`.
+
+Откат собирает обычную таблицу из присоединённых секций; отсоединённые
+секции остаются отдельными таблицами.
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.db.types import SafeMoney
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f7e2a9b58'
+down_revision: Union[str, Sequence[str], None] = '5e0c2b7d9a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+COLUMNS = 'id, transaction_id, user_id, account_id, amount, created_at'
+
+
+def _payment_columns() -> list[sa.Column]:
+    return [
+        sa.Column(
+            'id',
+            sa.Integer(),
+            server_default=sa.text("nextval('payments_id_seq')"),
+            autoincrement=False,
+            nullable=False,
+        ),
+        sa.Column('transaction_id', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('amount', SafeMoney(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    ]
+
+
+def _create_indexes(*, unique_transaction: bool) -> None:
+    op.create_index(op.f('ix_payments_account_id'), 'payments', ['account_id'], unique=False)
+    op.create_index(op.f('ix_payments_id'), 'payments', ['id'], unique=False)
+    op.create_index(
+        op.f('ix_payments_transaction_id'),
+        'payments',
+        ['transaction_id'],
+        unique=unique_transaction,
+    )
+    op.create_index(op.f('ix_payments_user_id'), 'payments', ['user_id'], unique=False)
+
+
+def _drop_indexes() -> None:
+    for name in (
+        'ix_payments_account_id',
+        'ix_payments_id',
+        'ix_payments_transaction_id',
+        'ix_payments_user_id',
+        'ix_payments_user_created',
+    ):
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def _month_starts(first: datetime, count_ahead: int) -> list[datetime]:
+    now = datetime.now(timezone.utc)
+    index = first.year * 12 + first.month - 1
+    last = now.year * 12 + now.month - 1 + count_ahead
+    return [
+        datetime(i // 12, i % 12 + 1, 1, tzinfo=timezone.utc) for i in range(index, last + 1)
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        op.create_index('ix_payments_user_created', 'payments', ['user_id', 'created_at'])
+        return
+
+    oldest = bind.execute(sa.text('SELECT min(created_at) FROM payments')).scalar()
+    first = (oldest or datetime.now(timezone.utc)).astimezone(timezone.utc)
+
+    op.execute('ALTER TABLE payments RENAME TO payments_legacy')
+    op.execute('ALTER INDEX payments_pkey RENAME TO payments_legacy_pkey')
+    _drop_indexes()
+    op.execute('ALTER SEQUENCE payments_id_seq OWNED BY NONE')
+
+    op.create_table(
+        'payments',
+        *_payment_columns(),
+        sa.PrimaryKeyConstraint('id', 'created_at', name='payments_pkey'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    starts = _month_starts(first, MONTHS_AHEAD)
+    for start in starts:
+        index = start.year * 12 + start.month
+        end = datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc)
+        op.execute(
+            f'CREATE TABLE payments_p{start.year:04d}_{start.month:02d} '
+            f"PARTITION OF payments FOR VALUES FROM ('{start.isoformat()}') "
+            f"TO ('{end.isoformat()}')"
+        )
+    op.execute('CREATE TABLE payments_default PARTITION OF payments DEFAULT')
+    _create_indexes(unique_transaction=False)
+    op.create_index('ix_payments_user_created', 'payments', ['user_id', 'created_at'])
+
+    op.create_table(
+        'payment_transaction_ids',
+        sa.Column('transaction_id', sa.String(length=64), nullable=False),
+        sa.PrimaryKeyConstraint('transaction_id'),
+    )
+    op.execute(
+        'INSERT INTO payment_transaction_ids (transaction_id) '
+        'SELECT transaction_id FROM payments_legacy'
+    )
+    op.execute(f'INSERT INTO payments ({COLUMNS}) SELECT {COLUMNS} FROM payments_legacy')
+
+    # Нарушение первичного ключа таблицы ключей — та же IntegrityError, что и прежде
+    op.execute(
+        """
+        CREATE FUNCTION payments_claim_transaction_id() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO payment_transaction_ids (transaction_id) VALUES (NEW.transaction_id);
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION payments_release_transaction_id() RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM payment_transaction_ids WHERE transaction_id = OLD.transaction_id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        'CREATE TRIGGER payments_claim_transaction_id AFTER INSERT ON payments '
+        'FOR EACH ROW EXECUTE FUNCTION payments_claim_transaction_id()'
+    )
+    op.execute(
+        'CREATE TRIGGER payments_release_transaction_id AFTER DELETE ON payments '
+        'FOR EACH ROW EXECUTE FUNCTION payments_release_transaction_id()'
+    )
+
+    op.drop_table('payments_legacy')
+    op.execute('ALTER SEQUENCE payments_id_seq OWNED BY payments.id')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        op.drop_index('ix_payments_user_created', table_name='payments')
+        return
+
+    op.execute('ALTER TABLE payments RENAME TO payments_partitioned')
+    op.execute('ALTER INDEX payments_pkey RENAME TO payments_partitioned_pkey')
+    _drop_indexes()
+    op.execute('ALTER SEQUENCE payments_id_seq OWNED BY NONE')
+
+    op.create_table(
+        'payments',
+        *_payment_columns(),
+        sa.PrimaryKeyConstraint('id', name='payments_pkey'),
+    )
+    op.execute(f'INSERT INTO payments ({COLUMNS}) SELECT {COLUMNS} FROM payments_partitioned')
+    _create_indexes(unique_transaction=True)
+
+    op.drop_table('payments_partitioned')
+    op.execute('DROP FUNCTION payments_claim_transaction_id()')
+    op.execute('DROP FUNCTION payments_release_transaction_id()')
+    op.drop_table('payment_transaction_ids')
+    op.execute('ALTER SEQUENCE payments_id_seq OWNED BY payments.id')
@@ -0,0 +1,43 @@
+"""payments_checkpointed
+
+Revision ID: 8d2f6a41c3e7
+Revises: c41f7e2a9b58
+Create Date: 2025-11-10 09:00:00.000000
+
+Флаг `checkpointed` отмечает платежи, уже учтённые в `accounts.balance`.
+Существующие платежи учтены (режим `row`), поэтому получают `true`. Частичный
+индекс по неучтённым платежам держит чтение балансов в режиме `ledger` и
+проход контрольных точек дешёвыми.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f6a41c3e7'
+down_revision: Union[str, Sequence[str], None] = 'c41f7e2a9b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'payments',
+        sa.Column('checkpointed', sa.Boolean(), server_default=sa.true(), nullable=False),
+    )
+    op.create_index(
+        'ix_payments_pending',
+        'payments',
+        ['account_id'],
+        postgresql_where=sa.text('NOT checkpointed'),
+        sqlite_where=sa.text('NOT checkpointed'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_payments_pending', table_name='payments')
+    op.drop_column('payments', 'checkpointed')
@@ -0,0 +1,50 @@
+"""debits
+
+Revision ID: e7b19c04d2a6
+Revises: 8d2f6a41c3e7
+Create Date: 2025-11-17 09:00:00.000000
+
+Таблица списаний: каждое списание уменьшает `accounts.balance` в той же
+транзакции, а уникальный `transaction_id` делает повтор идемпотентным.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from app.db.types import SafeMoney
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b19c04d2a6'
+down_revision: Union[str, Sequence[str], None] = '8d2f6a41c3e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'debits',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('transaction_id', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.Column('amount', SafeMoney(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_debits_account_id'), 'debits', ['account_id'], unique=False)
+    op.create_index(op.f('ix_debits_id'), 'debits', ['id'], unique=False)
+    op.create_index(op.f('ix_debits_transaction_id'), 'debits', ['transaction_id'], unique=True)
+    op.create_index(op.f('ix_debits_user_id'), 'debits', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_debits_user_id'), table_name='debits')
+    op.drop_index(op.f('ix_debits_transaction_id'), table_name='debits')
+    op.drop_index(op.f('ix_debits_id'), table_name='debits')
+    op.drop_index(op.f('ix_debits_account_id'), table_name='debits')
+    op.drop_table('debits')
@@ -11,6 +11,7 @@ from app.api.v1.accounts import router as accounts_v1_router
 from app.api.v1.auth import router as auth_v1_router
 from app.api.v1.health import router as health_v1_router
 from app.api.v1.payments import router as payments_v1_router
+from app.api.v1.profiling import router as profiling_v1_router
 from app.api.v1.users import router as users_v1_router
 from app.api.v1.webhook import router as webhook_v1_router
 
@@ -30,5 +31,6 @@ def create_api_router() -> APIRouter:
     api_router.include_router(accounts_v1_router)
     api_router.include_router(payments_v1_router)
     api_router.include_router(webhook_v1_router)
+    api_router.include_router(profiling_v1_router)
 
     return api_router
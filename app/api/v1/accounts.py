@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.constants import (
@@ -13,11 +14,31 @@ from app.core.constants import (
     ApiSummary,
     PaginationParamDescriptions,
     PaginationParams,
+    QueryBudgets,
+    ServerSentEvents,
 )
-from app.core.deps import get_account_service, get_current_admin, require_self_or_admin_user
+from app.core.deps import (
+    get_account_events,
+    get_account_service,
+    get_current_admin,
+    get_current_user,
+    get_reconciliation_service,
+    get_transfer_service,
+    require_self_or_admin_user,
+)
+from app.core.query_budget import query_budget
 from app.db.session import get_db_session
-from app.schemas import AccountPublic
-from app.services import AccountService
+from app.events import AccountEventHub
+from app.models import User
+from app.schemas import (
+    AccountPublic,
+    DebitCreate,
+    DebitPublic,
+    ReconciliationJobPublic,
+    TransferCreate,
+    TransferPublic,
+)
+from app.services import AccountService, BalanceReconciliationService, TransferService
 from app.validators import AccountValidator
 
 
@@ -28,6 +49,7 @@ router = APIRouter(prefix=AccountsPaths.PREFIX, tags=[AccountsPaths.TAG])
     AccountsPaths.USERS_ACCOUNTS,
     response_model=list[AccountPublic],
     summary=ApiSummary.ACCOUNTS_LIST_ABAC,
+    openapi_extra=query_budget(QueryBudgets.ACCOUNTS_LIST_ABAC),
     description=ApiDescription.ACCOUNTS_LIST_ABAC,
     status_code=status.HTTP_200_OK,
     responses={
@@ -43,6 +65,7 @@ async def list_user_accounts_abac(
     db: AsyncSession = Depends(get_db_session),
     account_service: AccountService = Depends(get_account_service),
     _abac: None = Depends(require_self_or_admin_user),
+    current_user: User = Depends(get_current_user),
     limit: int = Query(
         PaginationParams.DEFAULT_LIMIT,
         ge=PaginationParams.MIN_LIMIT,
@@ -74,6 +97,7 @@ async def list_user_accounts_abac(
         db (AsyncSession): Сессия БД.
         account_service (AccountService): Сервис для работы со счетами.
         _abac (None): Зависимость для проверки ABAC.
+        current_user (User): Текущий пользователь (уже загружен зависимостью ABAC).
         limit (int): Максимум записей.
         offset (int): Смещение.
 
@@ -89,15 +113,58 @@ async def list_user_accounts_abac(
     AccountValidator.validate_user_id(user_id)
     AccountValidator.validate_pagination_params(limit, offset)
 
-    accounts = await account_service.get_user_accounts(db, user_id, limit, offset)
+    accounts = await account_service.get_user_accounts(
+        db, user_id, limit, offset, user_exists=current_user.id == user_id
+    )
     return [AccountPublic.model_validate(a) for a in accounts]
 
 
+@router.get(
+    AccountsPaths.ME_ACCOUNT_EVENTS,
+    response_class=StreamingResponse,
+    summary=ApiSummary.ME_ACCOUNT_EVENTS,
+    openapi_extra=query_budget(QueryBudgets.ME_ACCOUNT_EVENTS),
+    description=ApiDescription.ME_ACCOUNT_EVENTS,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: ApiSuccessResponses.ME_ACCOUNT_EVENTS_200,
+        401: ApiErrorResponses.NOT_AUTHENTICATED,
+    },
+)
+async def stream_my_account_events(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+    events: AccountEventHub = Depends(get_account_events),
+) -> StreamingResponse:
+    """Открывает поток событий счетов текущего пользователя (SSE).
+
+    Args:
+        current_user (User): Текущий пользователь.
+        db (AsyncSession): Сессия БД (только для аутентификации).
+        events (AccountEventHub): Хаб событий счетов.
+
+    Returns:
+        StreamingResponse: Поток `text/event-stream`.
+
+    Raises:
+        HTTPException: 401 если неавторизован.
+    """
+    user_id = current_user.id
+    # Поток живёт долго: соединение пула возвращается сразу после аутентификации
+    await db.close()
+    return StreamingResponse(
+        events.stream(user_id),
+        media_type=ServerSentEvents.MEDIA_TYPE,
+        headers=ServerSentEvents.HEADERS,
+    )
+
+
 @router.post(
     AccountsPaths.ADMIN_USERS_ACCOUNTS,
     response_model=AccountPublic,
     dependencies=[Depends(get_current_admin)],
     summary=ApiSummary.ADMIN_CREATE_ACCOUNT,
+    openapi_extra=query_budget(QueryBudgets.ADMIN_CREATE_ACCOUNT),
     description=ApiDescription.ADMIN_CREATE_ACCOUNT,
     status_code=status.HTTP_201_CREATED,
     responses={
@@ -133,3 +200,197 @@ async def admin_create_account(
 
     account = await account_service.create_account_for_user(db, user_id)
     return AccountPublic.model_validate(account)
+
+
+@router.post(
+    AccountsPaths.USERS_ACCOUNT_DEBITS,
+    response_model=DebitPublic,
+    summary=ApiSummary.ACCOUNT_DEBIT,
+    openapi_extra=query_budget(QueryBudgets.ACCOUNT_DEBIT),
+    description=ApiDescription.ACCOUNT_DEBIT,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        201: ApiSuccessResponses.DEBIT_201,
+        400: ApiErrorResponses.INVALID_PARAMS,
+        401: ApiErrorResponses.NOT_AUTHENTICATED,
+        403: ApiErrorResponses.ACCESS_DENIED,
+        404: ApiErrorResponses.ACCOUNT_NOT_FOUND,
+        409: ApiErrorResponses.DEBIT_CONFLICT,
+    },
+)
+async def debit_account(
+    user_id: int,
+    account_id: int,
+    payload: DebitCreate,
+    db: AsyncSession = Depends(get_db_session),
+    account_service: AccountService = Depends(get_account_service),
+    _abac: None = Depends(require_self_or_admin_user),
+) -> DebitPublic:
+    """Списывает сумму со счёта пользователя (сам владелец или админ).
+
+    Args:
+        user_id (int): Идентификатор владельца счёта.
+        account_id (int): Идентификатор счёта.
+        payload (DebitCreate): Идентификатор операции и сумма.
+        db (AsyncSession): Сессия БД.
+        account_service (AccountService): Сервис для работы со счетами.
+        _abac (None): Зависимость для проверки ABAC.
+
+    Returns:
+        DebitPublic: Списание и баланс счёта после него.
+
+    Raises:
+        HTTPException: 400 при некорректных параметрах.
+        HTTPException: 401 если неавторизован.
+        HTTPException: 403 если доступ запрещён (не владелец и не админ).
+        HTTPException: 404 если у пользователя нет такого счёта.
+        HTTPException: 409 при нехватке средств или повторе транзакции.
+    """
+    AccountValidator.validate_user_id(user_id)
+
+    debit, balance = await account_service.debit(
+        db,
+        user_id,
+        account_id,
+        transaction_id=payload.transaction_id,
+        amount=payload.amount,
+    )
+    return DebitPublic(
+        id=debit.id,
+        transaction_id=debit.transaction_id,
+        user_id=debit.user_id,
+        account_id=debit.account_id,
+        amount=debit.amount,
+        balance=balance,
+    )
+
+
+@router.post(
+    AccountsPaths.USERS_TRANSFERS,
+    response_model=TransferPublic,
+    summary=ApiSummary.ACCOUNT_TRANSFER,
+    openapi_extra=query_budget(QueryBudgets.ACCOUNT_TRANSFER),
+    description=ApiDescription.ACCOUNT_TRANSFER,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        201: ApiSuccessResponses.TRANSFER_201,
+        400: ApiErrorResponses.TRANSFER_SAME_ACCOUNT,
+        401: ApiErrorResponses.NOT_AUTHENTICATED,
+        403: ApiErrorResponses.ACCESS_DENIED,
+        404: ApiErrorResponses.ACCOUNT_NOT_FOUND,
+        409: ApiErrorResponses.DEBIT_CONFLICT,
+    },
+)
+async def transfer_between_accounts(
+    user_id: int,
+    payload: TransferCreate,
+    db: AsyncSession = Depends(get_db_session),
+    transfer_service: TransferService = Depends(get_transfer_service),
+    _abac: None = Depends(require_self_or_admin_user),
+) -> TransferPublic:
+    """Переводит сумму со счёта пользователя на другой счёт (сам владелец или админ).
+
+    Args:
+        user_id (int): Идентификатор владельца счёта-источника.
+        payload (TransferCreate): Идентификатор операции, счета и сумма.
+        db (AsyncSession): Сессия БД.
+        transfer_service (TransferService): Сервис переводов.
+        _abac (None): Зависимость для проверки ABAC.
+
+    Returns:
+        TransferPublic: Перевод и баланс счёта-источника после него.
+
+    Raises:
+        HTTPException: 400 если счета совпадают или параметры некорректны.
+        HTTPException: 401 если неавторизован.
+        HTTPException: 403 если доступ запрещён (не владелец и не админ).
+        HTTPException: 404 если нет счёта-источника у пользователя или счёта-получателя.
+        HTTPException: 409 при нехватке средств или повторе транзакции.
+    """
+    AccountValidator.validate_user_id(user_id)
+
+    debit, balance = await transfer_service.transfer(
+        db,
+        user_id,
+        transaction_id=payload.transaction_id,
+        from_account_id=payload.from_account_id,
+        to_account_id=payload.to_account_id,
+        amount=payload.amount,
+    )
+    return TransferPublic(
+        id=debit.id,
+        transaction_id=debit.transaction_id,
+        from_account_id=payload.from_account_id,
+        to_account_id=payload.to_account_id,
+        amount=debit.amount,
+        balance=balance,
+    )
+
+
+@router.post(
+    AccountsPaths.ADMIN_RECONCILIATION,
+    response_model=ReconciliationJobPublic,
+    dependencies=[Depends(get_current_admin)],
+    summary=ApiSummary.ADMIN_RECONCILIATION,
+    openapi_extra=query_budget(QueryBudgets.ADMIN_RECONCILIATION),
+    description=ApiDescription.ADMIN_RECONCILIATION,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        202: ApiSuccessResponses.RECONCILIATION_JOB_202,
+        401: ApiErrorResponses.NOT_AUTHENTICATED,
+        403: ApiErrorResponses.FORBIDDEN,
+    },
+)
+async def admin_start_reconciliation(
+    reconciliation_service: BalanceReconciliationService = Depends(get_reconciliation_service),
+) -> ReconciliationJobPublic:
+    """Запускает фоновую сверку балансов всех счетов с суммами платежей.
+
+    Args:
+        reconciliation_service (BalanceReconciliationService): Сервис сверки балансов.
+
+    Returns:
+        ReconciliationJobPublic: Задача сверки для отслеживания прогресса.
+
+    Raises:
+        HTTPException: 401 если неавторизован.
+        HTTPException: 403 если недостаточно прав (не админ).
+    """
+    job = await reconciliation_service.start_reconciliation()
+    return ReconciliationJobPublic.model_validate(job)
+
+
+@router.get(
+    AccountsPaths.ADMIN_RECONCILIATION_JOB,
+    response_model=ReconciliationJobPublic,
+    dependencies=[Depends(get_current_admin)],
+    summary=ApiSummary.ADMIN_RECONCILIATION_JOB_GET,
+    openapi_extra=query_budget(QueryBudgets.ADMIN_RECONCILIATION_JOB_GET),
+    description=ApiDescription.ADMIN_RECONCILIATION_JOB_GET,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: ApiSuccessResponses.RECONCILIATION_JOB_200,
+        401: ApiErrorResponses.NOT_AUTHENTICATED,
+        403: ApiErrorResponses.FORBIDDEN,
+        404: ApiErrorResponses.RECONCILIATION_JOB_NOT_FOUND,
+    },
+)
+async def admin_get_reconciliation_job(
+    job_id: str,
+    reconciliation_service: BalanceReconciliationService = Depends(get_reconciliation_service),
+) -> ReconciliationJobPublic:
+    """Возвращает прогресс задачи сверки и первые найденные расхождения.
+
+    Args:
+        job_id (str): Идентификатор задачи.
+        reconciliation_service (BalanceReconciliationService): Сервис сверки балансов.
+
+    Returns:
+        ReconciliationJobPublic: Задача сверки.
+
+    Raises:
+        HTTPException: 401 если неавторизован.
+        HTTPException: 403 если недостаточно прав (не админ).
+        HTTPException: 404 если задача не найдена.
+    """
+    return ReconciliationJobPublic.model_validate(reconciliation_service.get_job(job_id))
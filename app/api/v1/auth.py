@@ -11,8 +11,10 @@ from app.core.constants import (
     ApiSuccessResponses,
     ApiSummary,
     AuthPaths,
+    QueryBudgets,
 )
-from app.core.deps import get_auth_service
+from app.core.deps import get_auth_service, limit_login
+from app.core.query_budget import query_budget
 from app.db.session import get_db_session
 from app.schemas import LoginRequest, Token
 from app.services.auth import AuthService
@@ -25,13 +27,17 @@ router = APIRouter(prefix=AuthPaths.PREFIX, tags=[AuthPaths.TAG])
     AuthPaths.LOGIN,
     response_model=Token,
     summary=ApiSummary.AUTH_LOGIN,
+    openapi_extra=query_budget(QueryBudgets.AUTH_LOGIN),
     description=ApiDescription.AUTH_LOGIN,
     status_code=status.HTTP_200_OK,
     responses={
         200: ApiSuccessResponses.AUTH_LOGIN_200,
         400: ApiErrorResponses.INVALID_PARAMS,
         401: ApiErrorResponses.INVALID_CREDENTIALS,
+        429: ApiErrorResponses.TOO_MANY_REQUESTS,
+        503: ApiErrorResponses.SERVICE_OVERLOADED,
     },
+    dependencies=[Depends(limit_login)],
 )
 async def login_route(
     payload: LoginRequest,
@@ -51,6 +57,7 @@ async def login_route(
     Raises:
         HTTPException: 400 при некорректных параметрах запроса.
         HTTPException: 401 если пара логин/пароль неверна.
+        HTTPException: 429/503 при превышении лимитов нагрузки.
     """
     token = await auth_service.authenticate_user(db, payload)
     return Token(access_token=token)
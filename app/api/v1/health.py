@@ -2,20 +2,21 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, status
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, Response, status
 
-from app.core.config import get_settings
+from app.core.config import Settings
 from app.core.constants import (
     ApiDescription,
     ApiErrorResponses,
     ApiSuccessResponses,
     ApiSummary,
     HealthPaths,
+    QueryBudgets,
 )
+from app.core.deps import get_app_settings, get_health_monitor
 from app.core.errors import ServiceUnavailableError, to_http_exc
-from app.db.session import get_db_session
+from app.core.query_budget import query_budget
+from app.services.health import HealthMonitor
 
 
 router = APIRouter(prefix=HealthPaths.PREFIX, tags=[HealthPaths.TAG])
@@ -24,23 +25,27 @@ router = APIRouter(prefix=HealthPaths.PREFIX, tags=[HealthPaths.TAG])
 @router.get(
     HealthPaths.HEALTH,
     summary=ApiSummary.HEALTH_APP,
+    openapi_extra=query_budget(QueryBudgets.HEALTH_APP),
     description=ApiDescription.HEALTH_APP,
     status_code=status.HTTP_200_OK,
     responses={200: ApiSuccessResponses.HEALTH_APP_200},
 )
-async def health_app() -> dict:
+async def health_app(settings: Settings = Depends(get_app_settings)) -> dict:
     """Проверяет доступность приложения.
 
+    Args:
+        settings (Settings): Настройки приложения.
+
     Returns:
         dict: Краткая информация о состоянии приложения c именем и режимом `debug`.
     """
-    settings = get_settings()
     return {'status': 'ok', 'app': settings.app_name, 'debug': settings.debug}
 
 
 @router.get(
     HealthPaths.HEALTH_DB,
     summary=ApiSummary.HEALTH_DB,
+    openapi_extra=query_budget(QueryBudgets.HEALTH_DB),
     description=ApiDescription.HEALTH_DB,
     status_code=status.HTTP_200_OK,
     responses={
@@ -48,11 +53,11 @@ async def health_app() -> dict:
         503: ApiErrorResponses.DB_CONNECTION_ERROR,
     },
 )
-async def health_db(db: AsyncSession = Depends(get_db_session)) -> dict:
-    """Проверяет доступность базы данных простым запросом `SELECT 1`.
+async def health_db(monitor: HealthMonitor = Depends(get_health_monitor)) -> dict:
+    """Проверяет доступность базы данных по последнему замеру монитора.
 
     Args:
-        db (AsyncSession): Асинхронная сессия БД.
+        monitor (HealthMonitor): Фоновые замеры состояния приложения.
 
     Returns:
         dict: Статус подключения к базе данных.
@@ -60,9 +65,39 @@ async def health_db(db: AsyncSession = Depends(get_db_session)) -> dict:
     Raises:
         HTTPException: 503 если подключение к БД недоступно.
     """
-    try:
-        await db.execute(text('SELECT 1'))
-    except Exception as exc:  # noqa: BLE001 - в health допускается широкий перехват
-        http_exc = to_http_exc(ServiceUnavailableError())
-        raise http_exc from exc
+    sample = await monitor.current()
+    if not sample.db_ok:
+        raise to_http_exc(ServiceUnavailableError())
     return {'status': 'ok'}
+
+
+@router.get(
+    HealthPaths.HEALTH_READY,
+    summary=ApiSummary.HEALTH_READY,
+    openapi_extra=query_budget(QueryBudgets.HEALTH_READY),
+    description=ApiDescription.HEALTH_READY,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: ApiSuccessResponses.HEALTH_READY_200,
+        503: ApiErrorResponses.HEALTH_READY_503,
+    },
+)
+async def health_ready(
+    response: Response, monitor: HealthMonitor = Depends(get_health_monitor)
+) -> dict:
+    """Возвращает готовность приложения с показателями последнего замера.
+
+    Если БД недоступна, показатели замера (пул, задержка цикла событий)
+    отдаются со статусом 503: по ним видно, чем занят под.
+
+    Args:
+        response (Response): Ответ, которому выставляется статус 503.
+        monitor (HealthMonitor): Фоновые замеры состояния приложения.
+
+    Returns:
+        dict: Статус, время ответа БД, состояние пула и задержка цикла событий.
+    """
+    sample = await monitor.current()
+    if not sample.db_ok:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return monitor.describe(sample)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from datetime import datetime
+
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -13,8 +15,11 @@ from app.core.constants import (
     PaginationParamDescriptions,
     PaginationParams,
     PaymentsPaths,
+    PeriodParamDescriptions,
+    QueryBudgets,
 )
 from app.core.deps import get_current_user, get_payment_service
+from app.core.query_budget import query_budget
 from app.db.session import get_db_session
 from app.models import User
 from app.schemas import PaymentPublic
@@ -29,6 +34,7 @@ router = APIRouter(prefix=PaymentsPaths.PREFIX, tags=[PaymentsPaths.TAG])
     PaymentsPaths.LIST,
     response_model=list[PaymentPublic],
     summary=ApiSummary.PAYMENTS_LIST,
+    openapi_extra=query_budget(QueryBudgets.PAYMENTS_LIST),
     description=ApiDescription.PAYMENTS_LIST,
     status_code=status.HTTP_200_OK,
     responses={
@@ -64,6 +70,8 @@ async def list_my_payments(
             }
         },
     ),
+    created_from: datetime | None = Query(None, description=PeriodParamDescriptions.CREATED_FROM),
+    created_to: datetime | None = Query(None, description=PeriodParamDescriptions.CREATED_TO),
 ) -> list[PaymentPublic]:
     """Получает список платежей текущего пользователя.
 
@@ -73,6 +81,8 @@ async def list_my_payments(
         payment_service (PaymentService): Сервис для работы с платежами.
         limit (int): Максимум записей.
         offset (int): Смещение.
+        created_from (datetime | None): Начало периода по времени создания.
+        created_to (datetime | None): Конец периода по времени создания (не включительно).
 
     Returns:
         list[PaymentPublic]: Список платежей.
@@ -83,5 +93,7 @@ async def list_my_payments(
     """
     AccountValidator.validate_pagination_params(limit, offset)
 
-    payments = await payment_service.get_user_payments(db, current_user.id, limit, offset)
+    payments = await payment_service.get_user_payments(
+        db, current_user.id, limit, offset, created_from, created_to
+    )
     return [PaymentPublic.model_validate(p) for p in payments]
@@ -0,0 +1,182 @@
+"""Маршруты профилирования запросов и журнала медленных SQL (админ)."""
+
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, status
+
+from app.core.constants import (
+    ApiDescription,
+    ApiErrorResponses,
+    ApiSuccessResponses,
+    ApiSummary,
+    ErrorMessages,
+    ProfilingPaths,
+    QueryBudgets,
+    RequestProfiling,
+)
+from app.core.deps import get_current_admin, get_request_profiler, get_slow_query_log
+from app.core.errors import NotFoundError
+from app.core.profiling import RequestProfiler
+from app.core.query_budget import query_budget
+from app.db.slow_queries import SlowQueryLog
+from app.models import User
+from app.schemas import (
+    ProfileDetailPublic,
+    ProfileFramePublic,
+    ProfilePublic,
+    ProfilingTokenPublic,
+    SlowQueryPublic,
+)
+
+
+router = APIRouter(prefix=ProfilingPaths.PREFIX, tags=[ProfilingPaths.TAG])
+
+
+@router.post(
+    ProfilingPaths.ADMIN_PROFILING_TOKEN,
+    response_model=ProfilingTokenPublic,
+    summary=ApiSummary.ADMIN_PROFILING_TOKEN,
+    openapi_extra=query_budget(QueryBudgets.ADMIN_PROFILING_TOKEN),
+    description=ApiDescription.ADMIN_PROFILING_TOKEN,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        201: ApiSuccessResponses.PROFILING_TOKEN_201,
+        401: ApiErrorResponses.NOT_AUTHENTICATED,
+        403: ApiErrorResponses.FORBIDDEN,
+        404: ApiErrorResponses.PROFILING_DISABLED,
+    },
+)
+async def admin_issue_profiling_token(
+    admin: User = Depends(get_current_admin),
+    profiler: RequestProfiler = Depends(get_request_profiler),
+) -> ProfilingTokenPublic:
+    """Выдаёт токен, с которым запросы выполняются под профилировщиком.
+
+    Args:
+        admin (User): Текущий администратор.
+        profiler (RequestProfiler): Профилировщик запросов.
+
+    Returns:
+        ProfilingTokenPublic: Токен, заголовок для него и время жизни в секундах.
+
+    Raises:
+        HTTPException: 401 если неавторизован.
+        HTTPException: 403 если недостаточно прав (не админ).
+        HTTPException: 404 если профилирование выключено.
+    """
+    return ProfilingTokenPublic(
+        token=profiler.issue_token(admin.id),
+        header=RequestProfiling.TOKEN_HEADER,
+        expires_in=profiler.token_ttl_seconds,
+    )
+
+
+@router.get(
+    ProfilingPaths.ADMIN_PROFILES,
+    response_model=list[ProfilePublic],
+    dependencies=[Depends(get_current_admin)],
+    summary=ApiSummary.ADMIN_PROFILES_LIST,
+    openapi_extra=query_budget(QueryBudgets.ADMIN_PROFILES_LIST),
+    description=ApiDescription.ADMIN_PROFILES_LIST,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: ApiSuccessResponses.PROFILES_LIST_200,
+        401: ApiErrorResponses.NOT_AUTHENTICATED,
+        403: ApiErrorResponses.FORBIDDEN,
+        404: ApiErrorResponses.PROFILING_DISABLED,
+    },
+)
+async def admin_list_profiles(
+    profiler: RequestProfiler = Depends(get_request_profiler),
+) -> list[ProfilePublic]:
+    """Возвращает сохранённые профили запросов от новых к старым.
+
+    Args:
+        profiler (RequestProfiler): Профилировщик запросов.
+
+    Returns:
+        list[ProfilePublic]: Описания профилей.
+
+    Raises:
+        HTTPException: 401 если неавторизован.
+        HTTPException: 403 если недостаточно прав (не админ).
+        HTTPException: 404 если профилирование выключено.
+    """
+    return [ProfilePublic.model_validate(info) for info in await profiler.list_profiles()]
+
+
+@router.get(
+    ProfilingPaths.ADMIN_PROFILE_ID,
+    response_model=ProfileDetailPublic,
+    dependencies=[Depends(get_current_admin)],
+    summary=ApiSummary.ADMIN_PROFILE_GET,
+    openapi_extra=query_budget(QueryBudgets.ADMIN_PROFILE_GET),
+    description=ApiDescription.ADMIN_PROFILE_GET,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: ApiSuccessResponses.PROFILE_200,
+        401: ApiErrorResponses.NOT_AUTHENTICATED,
+        403: ApiErrorResponses.FORBIDDEN,
+        404: ApiErrorResponses.PROFILE_NOT_FOUND,
+    },
+)
+async def admin_get_profile(
+    profile_id: str,
+    profiler: RequestProfiler = Depends(get_request_profiler),
+) -> ProfileDetailPublic:
+    """Возвращает описание профиля и функции с наибольшим накопленным временем.
+
+    Args:
+        profile_id (str): Идентификатор профиля.
+        profiler (RequestProfiler): Профилировщик запросов.
+
+    Returns:
+        ProfileDetailPublic: Профиль запроса.
+
+    Raises:
+        HTTPException: 401 если неавторизован.
+        HTTPException: 403 если недостаточно прав (не админ).
+        HTTPException: 404 если профилирование выключено или профиль не найден.
+    """
+    profile = await profiler.get(profile_id)
+    if profile is None:
+        raise NotFoundError(ErrorMessages.PROFILE_NOT_FOUND)
+    info, frames = profile
+    return ProfileDetailPublic(
+        **ProfilePublic.model_validate(info).model_dump(),
+        frames=[ProfileFramePublic.model_validate(frame) for frame in frames],
+    )
+
+
+@router.get(
+    ProfilingPaths.ADMIN_SLOW_QUERIES,
+    response_model=list[SlowQueryPublic],
+    dependencies=[Depends(get_current_admin)],
+    summary=ApiSummary.ADMIN_SLOW_QUERIES,
+    openapi_extra=query_budget(QueryBudgets.ADMIN_SLOW_QUERIES),
+    description=ApiDescription.ADMIN_SLOW_QUERIES,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: ApiSuccessResponses.SLOW_QUERIES_200,
+        401: ApiErrorResponses.NOT_AUTHENTICATED,
+        403: ApiErrorResponses.FORBIDDEN,
+        404: ApiErrorResponses.SLOW_QUERY_LOG_DISABLED,
+    },
+)
+async def admin_list_slow_queries(
+    slow_query_log: SlowQueryLog = Depends(get_slow_query_log),
+) -> list[SlowQueryPublic]:
+    """Возвращает последние медленные SQL-выражения воркера с планами выполнения.
+
+    Args:
+        slow_query_log (SlowQueryLog): Журнал медленных SQL-выражений.
+
+    Returns:
+        list[SlowQueryPublic]: Записи журнала от новых к старым.
+
+    Raises:
+        HTTPException: 401 если неавторизован.
+        HTTPException: 403 если недостаточно прав (не админ).
+        HTTPException: 404 если журнал выключен.
+    """
+    return [SlowQueryPublic.model_validate(entry) for entry in slow_query_log.entries()]
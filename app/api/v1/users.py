@@ -12,13 +12,20 @@ from app.core.constants import (
     ApiSummary,
     PaginationParamDescriptions,
     PaginationParams,
+    QueryBudgets,
     UsersPaths,
 )
-from app.core.deps import get_current_admin, get_current_user, get_user_service
+from app.core.deps import (
+    get_current_admin,
+    get_current_user,
+    get_user_purge_service,
+    get_user_service,
+)
+from app.core.query_budget import query_budget
 from app.db.session import get_db_session
 from app.models import User
-from app.schemas import UserCreate, UserPublic, UserUpdate
-from app.services import UserService
+from app.schemas import PurgeJobPublic, UserCreate, UserPublic, UserUpdate
+from app.services import UserPurgeService, UserService
 from app.validators import AccountValidator, UserValidator
 
 
@@ -29,6 +36,7 @@ router = APIRouter(prefix=UsersPaths.PREFIX, tags=[UsersPaths.TAG])
     UsersPaths.ME,
     response_model=UserPublic,
     summary=ApiSummary.USERS_ME,
+    openapi_extra=query_budget(QueryBudgets.USERS_ME),
     description=ApiDescription.USERS_ME,
     status_code=status.HTTP_200_OK,
     responses={
@@ -56,6 +64,7 @@ async def read_me(current_user: User = Depends(get_current_user)) -> UserPublic:
     response_model=UserPublic,
     dependencies=[Depends(get_current_admin)],
     summary=ApiSummary.ADMIN_USERS_CREATE,
+    openapi_extra=query_budget(QueryBudgets.ADMIN_USERS_CREATE),
     description=ApiDescription.ADMIN_USERS_CREATE,
     status_code=status.HTTP_201_CREATED,
     responses={
@@ -96,6 +105,7 @@ async def admin_create_user(
     response_model=list[UserPublic],
     dependencies=[Depends(get_current_admin)],
     summary=ApiSummary.ADMIN_USERS_LIST,
+    openapi_extra=query_budget(QueryBudgets.ADMIN_USERS_LIST),
     description=ApiDescription.ADMIN_USERS_LIST,
     status_code=status.HTTP_200_OK,
     responses={
@@ -159,6 +169,7 @@ async def admin_list_users(
     response_model=UserPublic,
     dependencies=[Depends(get_current_admin)],
     summary=ApiSummary.ADMIN_USERS_GET,
+    openapi_extra=query_budget(QueryBudgets.ADMIN_USERS_GET),
     description=ApiDescription.ADMIN_USERS_GET,
     status_code=status.HTTP_200_OK,
     responses={
@@ -201,6 +212,7 @@ async def admin_get_user(
     response_model=UserPublic,
     dependencies=[Depends(get_current_admin)],
     summary=ApiSummary.ADMIN_USERS_UPDATE,
+    openapi_extra=query_budget(QueryBudgets.ADMIN_USERS_UPDATE),
     description=ApiDescription.ADMIN_USERS_UPDATE,
     status_code=status.HTTP_200_OK,
     responses={
@@ -245,6 +257,7 @@ async def admin_update_user(
     UsersPaths.ADMIN_USER_ID,
     dependencies=[Depends(get_current_admin)],
     summary=ApiSummary.ADMIN_USERS_DELETE,
+    openapi_extra=query_budget(QueryBudgets.ADMIN_USERS_DELETE),
     description=ApiDescription.ADMIN_USERS_DELETE,
     status_code=status.HTTP_204_NO_CONTENT,
     responses={
@@ -280,3 +293,85 @@ async def admin_delete_user(
 
     await user_service.delete_user(db, user_id)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.post(
+    UsersPaths.ADMIN_USER_PURGE,
+    response_model=PurgeJobPublic,
+    dependencies=[Depends(get_current_admin)],
+    summary=ApiSummary.ADMIN_USERS_PURGE,
+    openapi_extra=query_budget(QueryBudgets.ADMIN_USERS_PURGE),
+    description=ApiDescription.ADMIN_USERS_PURGE,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        202: ApiSuccessResponses.PURGE_JOB_202,
+        401: ApiErrorResponses.NOT_AUTHENTICATED,
+        403: ApiErrorResponses.FORBIDDEN,
+        404: ApiErrorResponses.USER_NOT_FOUND,
+        400: ApiErrorResponses.INVALID_PARAMS,
+    },
+)
+async def admin_purge_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_db_session),
+    purge_service: UserPurgeService = Depends(get_user_purge_service),
+) -> PurgeJobPublic:
+    """Запускает фоновое пакетное удаление пользователя и его истории.
+
+    Args:
+        user_id (int): Идентификатор пользователя.
+        db (AsyncSession): Сессия БД.
+        purge_service (UserPurgeService): Сервис фоновой очистки.
+
+    Returns:
+        PurgeJobPublic: Задача очистки для отслеживания прогресса.
+
+    Raises:
+        HTTPException: 400 при некорректных параметрах запроса.
+        HTTPException: 401 если неавторизован.
+        HTTPException: 403 если недостаточно прав (не админ).
+        HTTPException: 404 если пользователь не найден.
+    """
+    AccountValidator.validate_user_id(user_id)
+
+    job = await purge_service.start_purge(db, user_id)
+    return PurgeJobPublic.model_validate(job)
+
+
+@router.get(
+    UsersPaths.ADMIN_PURGE_JOB,
+    response_model=PurgeJobPublic,
+    dependencies=[Depends(get_current_admin)],
+    summary=ApiSummary.ADMIN_PURGE_JOB_GET,
+    openapi_extra=query_budget(QueryBudgets.ADMIN_PURGE_JOB_GET),
+    description=ApiDescription.ADMIN_PURGE_JOB_GET,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: ApiSuccessResponses.PURGE_JOB_200,
+        401: ApiErrorResponses.NOT_AUTHENTICATED,
+        403: ApiErrorResponses.FORBIDDEN,
+        404: ApiErrorResponses.PURGE_JOB_NOT_FOUND,
+    },
+)
+async def admin_get_purge_job(
+    job_id: str,
+    purge_service: UserPurgeService = Depends(get_user_purge_service),
+) -> PurgeJobPublic:
+    """Возвращает статус и прогресс задачи очистки.
+
+    Задачи живут в памяти воркера, который запустил очистку, поэтому другой
+    воркер (или тот же после перезапуска) отвечает 404.
+
+    Args:
+        job_id (str): Идентификатор задачи.
+        purge_service (UserPurgeService): Сервис фоновой очистки.
+
+    Returns:
+        PurgeJobPublic: Задача очистки.
+
+    Raises:
+        HTTPException: 401 если неавторизован.
+        HTTPException: 403 если недостаточно прав (не админ).
+        HTTPException: 404 если задача не найдена.
+    """
+    return PurgeJobPublic.model_validate(purge_service.get_job(job_id))
@@ -5,15 +5,17 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import get_settings
+from app.core.config import Settings
 from app.core.constants import (
     ApiDescription,
     ApiErrorResponses,
     ApiSuccessResponses,
     ApiSummary,
+    QueryBudgets,
     WebhookPaths,
 )
-from app.core.deps import get_webhook_service
+from app.core.deps import get_app_settings, get_webhook_service, limit_webhook
+from app.core.query_budget import query_budget
 from app.db.session import get_db_session
 from app.schemas import PaymentPublic, WebhookPayment
 from app.services import WebhookService
@@ -27,18 +29,23 @@ router = APIRouter(prefix=WebhookPaths.PREFIX, tags=[WebhookPaths.TAG])
     WebhookPaths.PAYMENT,
     response_model=PaymentPublic,
     summary=ApiSummary.WEBHOOK_PAYMENT,
+    openapi_extra=query_budget(QueryBudgets.WEBHOOK_PAYMENT),
     description=ApiDescription.WEBHOOK_PAYMENT,
     status_code=status.HTTP_201_CREATED,
     responses={
         201: ApiSuccessResponses.WEBHOOK_PAYMENT_201,
         400: ApiErrorResponses.INVALID_PAYMENT_DATA,
         409: ApiErrorResponses.TRANSACTION_ALREADY_PROCESSED,
+        429: ApiErrorResponses.TOO_MANY_REQUESTS,
+        503: ApiErrorResponses.SERVICE_OVERLOADED,
     },
+    dependencies=[Depends(limit_webhook)],
 )
 async def webhook_payment(
     payload: WebhookPayment,
     db: AsyncSession = Depends(get_db_session),
     webhook_service: WebhookService = Depends(get_webhook_service),
+    settings: Settings = Depends(get_app_settings),
 ) -> PaymentPublic:
     """Проверяет подпись и обрабатывает пополнение баланса.
 
@@ -46,6 +53,7 @@ async def webhook_payment(
         payload (WebhookPayment): Тело вебхука.
         db (AsyncSession): Сессия БД.
         webhook_service (WebhookService): Сервис для работы с вебхуками.
+        settings (Settings): Настройки приложения.
 
     Returns:
         PaymentPublic: Информация о платеже.
@@ -53,10 +61,10 @@ async def webhook_payment(
     Raises:
         HTTPException: 400 при некорректных данных платежа или неверной подписи.
         HTTPException: 409 при уже обработанной транзакции.
+        HTTPException: 429/503 при превышении лимитов нагрузки.
     """
     WebhookValidator.validate_payment_data(payload)
 
-    settings = get_settings()
     WebhookValidator.validate_signature(payload, secret_key=settings.webhook_secret_key)
 
     payment = await webhook_service.process_topup(
@@ -0,0 +1,28 @@
+"""Процессные кэши горячих данных с инвалидацией между воркерами."""
+
+from __future__ import annotations
+
+from .balances import BalanceCache, BalanceSnapshot, build_balance_cache
+from .bus import (
+    InvalidationBus,
+    InvalidationMessage,
+    PostgresInvalidationBus,
+    build_invalidation_bus,
+)
+from .coalescing import SingleFlight, build_single_flight
+from .ownership import OwnershipIndex, build_ownership_index
+
+
+__all__ = [
+    'BalanceCache',
+    'BalanceSnapshot',
+    'InvalidationBus',
+    'InvalidationMessage',
+    'OwnershipIndex',
+    'PostgresInvalidationBus',
+    'SingleFlight',
+    'build_balance_cache',
+    'build_invalidation_bus',
+    'build_ownership_index',
+    'build_single_flight',
+]
@@ -0,0 +1,291 @@
+"""Кэш снимков балансов счетов со сквозной записью (write-through).
+
+Балансы меняются только при пополнении, поэтому после коммита сервис вебхуков
+записывает новый снимок счёта прямо в кэш, а листинги счетов пользователя
+читаются из него без обращения к БД.
+
+Каждый снимок несёт `Account.version`. Кэш принимает только снимки не старее
+уже известной версии, а инвалидация запоминает минимальную допустимую версию,
+поэтому запоздавшая загрузка из БД не может вернуть устаревший баланс.
+
+Для нескольких воркеров изменения рассылаются сообщениями инвалидации через
+`InvalidationBus` (например, PostgreSQL LISTEN/NOTIFY).
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import TYPE_CHECKING, Callable
+
+from .bus import InvalidationBus, InvalidationMessage
+
+
+if TYPE_CHECKING:
+    from app.core.config import Settings
+    from app.models.account import Account
+
+
+@dataclass(frozen=True, slots=True)
+class BalanceSnapshot:
+    """Неизменяемый снимок счёта, достаточный для `AccountPublic`.
+
+    Атрибуты:
+        id: Идентификатор счёта.
+        user_id: Идентификатор владельца.
+        balance: Баланс на момент снимка.
+        version: Версия строки счёта (`Account.version`).
+    """
+
+    id: int
+    user_id: int
+    balance: Decimal
+    version: int
+
+    @classmethod
+    def from_account(cls, account: Account) -> BalanceSnapshot:
+        """Создаёт снимок из ORM-объекта счёта.
+
+        Args:
+            account (Account): Загруженный счёт.
+
+        Returns:
+            BalanceSnapshot: Снимок счёта.
+        """
+        return cls(
+            id=account.id,
+            user_id=account.user_id,
+            balance=account.balance,
+            version=account.version,
+        )
+
+
+class BalanceCache:
+    """Процессный LRU-кэш снимков балансов с индексом счетов по пользователю."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        max_accounts_per_user: int,
+        ttl_seconds: float,
+        bus: InvalidationBus | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Инициализирует кэш.
+
+        Args:
+            max_entries (int): Максимум снимков счетов в памяти.
+            max_accounts_per_user (int): Максимум счетов пользователя для кэширования листинга.
+            ttl_seconds (float): Время жизни записи; страхует от потерянных инвалидаций.
+            bus (InvalidationBus | None): Шина инвалидаций; кэш подписывается на её сообщения.
+            clock (Callable[[], float]): Источник монотонного времени.
+        """
+        self.max_entries = max_entries
+        self.max_accounts_per_user = max_accounts_per_user
+        self.ttl_seconds = ttl_seconds
+        self.origin = uuid.uuid4().hex if bus is None else bus.origin
+        if bus is not None:
+            bus.subscribe(self.apply_message)
+            bus.subscribe_reset(self.clear)
+        self._clock = clock
+        self._accounts: OrderedDict[int, tuple[BalanceSnapshot, float]] = OrderedDict()
+        self._user_index: OrderedDict[int, tuple[list[int], float]] = OrderedDict()
+        self._min_versions: OrderedDict[int, int] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    # --- Чтение ---
+
+    def get(self, account_id: int) -> BalanceSnapshot | None:
+        """Возвращает актуальный снимок счёта или None.
+
+        Args:
+            account_id (int): Идентификатор счёта.
+
+        Returns:
+            BalanceSnapshot | None: Снимок из кэша.
+        """
+        entry = self._accounts.get(account_id)
+        if entry is None:
+            return None
+        snapshot, expires_at = entry
+        if expires_at <= self._clock():
+            del self._accounts[account_id]
+            return None
+        self._accounts.move_to_end(account_id)
+        return snapshot
+
+    def list_for_user(
+        self, user_id: int, *, limit: int, offset: int
+    ) -> list[BalanceSnapshot] | None:
+        """Возвращает страницу счетов пользователя (по возрастанию id) из кэша.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+            limit (int): Максимум записей.
+            offset (int): Смещение.
+
+        Returns:
+            list[BalanceSnapshot] | None: Страница счетов или None при промахе.
+        """
+        entry = self._user_index.get(user_id)
+        if entry is None or entry[1] <= self._clock():
+            self._user_index.pop(user_id, None)
+            self.misses += 1
+            return None
+        page = []
+        for account_id in entry[0][offset : offset + limit]:
+            snapshot = self.get(account_id)
+            if snapshot is None:
+                del self._user_index[user_id]
+                self.misses += 1
+                return None
+            page.append(snapshot)
+        self._user_index.move_to_end(user_id)
+        self.hits += 1
+        return page
+
+    # --- Запись ---
+
+    def put(self, snapshot: BalanceSnapshot) -> bool:
+        """Записывает снимок, если он не старее известной версии.
+
+        Args:
+            snapshot (BalanceSnapshot): Снимок счёта.
+
+        Returns:
+            bool: True, если снимок принят.
+        """
+        if snapshot.version < self._min_versions.get(snapshot.id, 0):
+            return False
+        current = self._accounts.get(snapshot.id)
+        if current is not None and current[0].version > snapshot.version:
+            return False
+        self._accounts[snapshot.id] = (snapshot, self._clock() + self.ttl_seconds)
+        self._accounts.move_to_end(snapshot.id)
+        self._remember_version(snapshot.id, snapshot.version)
+        while len(self._accounts) > self.max_entries:
+            self._accounts.popitem(last=False)
+        return True
+
+    def set_user_accounts(self, user_id: int, snapshots: list[BalanceSnapshot]) -> bool:
+        """Кэширует полный список счетов пользователя, загруженный из БД.
+
+        Список не кэшируется, если он слишком велик или хотя бы один снимок
+        устарел относительно уже полученной инвалидации.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+            snapshots (list[BalanceSnapshot]): Все счета пользователя по возрастанию id.
+
+        Returns:
+            bool: True, если листинг закэширован.
+        """
+        if len(snapshots) > self.max_accounts_per_user:
+            return False
+        if not all(self.put(snapshot) for snapshot in snapshots):
+            return False
+        self._user_index[user_id] = (
+            [snapshot.id for snapshot in snapshots],
+            self._clock() + self.ttl_seconds,
+        )
+        self._user_index.move_to_end(user_id)
+        while len(self._user_index) > self.max_entries:
+            self._user_index.popitem(last=False)
+        return True
+
+    def add_account(self, snapshot: BalanceSnapshot) -> None:
+        """Добавляет новый счёт в кэш и в индекс пользователя, если он загружен.
+
+        Args:
+            snapshot (BalanceSnapshot): Снимок созданного счёта.
+        """
+        self.put(snapshot)
+        entry = self._user_index.get(snapshot.user_id)
+        if entry is not None and snapshot.id not in entry[0]:
+            account_ids = sorted([*entry[0], snapshot.id])
+            if len(account_ids) > self.max_accounts_per_user:
+                del self._user_index[snapshot.user_id]
+            else:
+                self._user_index[snapshot.user_id] = (account_ids, entry[1])
+
+    # --- Инвалидация ---
+
+    def invalidate(self, account_id: int, version: int = 0) -> None:
+        """Удаляет снимок счёта и запрещает снимки старее `version`.
+
+        Args:
+            account_id (int): Идентификатор счёта.
+            version (int): Минимальная допустимая версия после инвалидации.
+        """
+        current = self._accounts.get(account_id)
+        if current is not None and current[0].version >= version > 0:
+            return
+        self._accounts.pop(account_id, None)
+        self._remember_version(account_id, version)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Сбрасывает индекс счетов пользователя.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+        """
+        self._user_index.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Удаляет все снимки и листинги (например, после потери инвалидаций).
+
+        Минимальные версии счетов сохраняются: они лишь отсекают устаревшие снимки.
+        """
+        self._accounts.clear()
+        self._user_index.clear()
+
+    def apply_message(self, message: InvalidationMessage) -> None:
+        """Применяет сообщение инвалидации от другого воркера.
+
+        Args:
+            message (InvalidationMessage): Сообщение инвалидации.
+        """
+        if message.origin == self.origin:
+            return
+        if message.kind == 'account':
+            self.invalidate(message.key, message.version)
+        elif message.kind == 'account_deleted':
+            self.invalidate(message.key)
+            self.invalidate_user(message.user_id)
+        elif message.kind in ('user', 'user_deleted'):
+            self.invalidate_user(message.key)
+
+    def _remember_version(self, account_id: int, version: int) -> None:
+        if version <= self._min_versions.get(account_id, 0):
+            return
+        self._min_versions[account_id] = version
+        self._min_versions.move_to_end(account_id)
+        while len(self._min_versions) > self.max_entries:
+            self._min_versions.popitem(last=False)
+
+
+def build_balance_cache(
+    settings: Settings, bus: InvalidationBus | None = None
+) -> BalanceCache | None:
+    """Создаёт кэш балансов по настройкам приложения.
+
+    Args:
+        settings (Settings): Настройки приложения.
+        bus (InvalidationBus | None): Шина инвалидаций между воркерами.
+
+    Returns:
+        BalanceCache | None: Кэш или None, если он выключен.
+    """
+    if not settings.balance_cache_enabled:
+        return None
+    return BalanceCache(
+        max_entries=settings.balance_cache_max_entries,
+        max_accounts_per_user=settings.balance_cache_max_accounts_per_user,
+        ttl_seconds=settings.balance_cache_ttl_seconds,
+        bus=bus,
+    )
@@ -0,0 +1,532 @@
+"""Шина инвалидаций процессных кэшей между воркерами.
+
+Каждый воркер держит горячие данные в памяти: снимки балансов, индекс
+владения счетами, результаты объединённых чтений (текущий пользователь,
+листинги счетов). Сервисы обновляют эти данные своего процесса сразу после
+коммита, а остальным воркерам рассылают сообщения инвалидации через шину.
+
+Сообщения копятся в сессии до коммита (`publish`) и уходят только после него:
+откат транзакции их отбрасывает. Повторы одного ключа склеиваются (для счёта
+остаётся наибольшая версия) как внутри транзакции, так и между транзакциями,
+ожидающими отправки. Шина PostgreSQL отправляет накопленное пакетом — одним
+`pg_notify` на выделенном соединении раз в `flush_interval_seconds`, — поэтому
+транзакции запросов не выполняют лишних запросов, а поток уведомлений не
+растёт линейно с числом изменений. Потерянное при падении процесса сообщение
+страхует TTL кэшей.
+
+Обрыв соединения PostgreSQL шина переживает сама: переподключается с
+экспоненциальной паузой и заново выполняет LISTEN. Уведомления, пришедшие, пока
+соединения не было, потеряны, поэтому после переподключения шина сбрасывает
+подписанные кэши процесса (`subscribe_reset`).
+
+Тем же соединением пользуются другие потоки уведомлений между воркерами
+(например, события счетов для SSE): `listen` подписывает обработчик на
+собственный канал, а `publish_payload` отправляет готовую полезную нагрузку
+после коммита вместе с пакетами инвалидаций.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Callable, Iterable, Literal
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+if TYPE_CHECKING:
+    from app.cache.balances import BalanceSnapshot
+    from app.core.config import Settings
+
+
+logger = logging.getLogger(__name__)
+
+InvalidationKind = Literal['account', 'account_deleted', 'user', 'profile', 'user_deleted']
+
+# Лимит полезной нагрузки NOTIFY в PostgreSQL — 8000 байт; оставляем запас
+MAX_NOTIFY_PAYLOAD_BYTES = 7900
+
+
+@dataclass(frozen=True, slots=True)
+class InvalidationMessage:
+    """Сообщение инвалидации для других воркеров.
+
+    Атрибуты:
+        kind: `account` — изменился баланс счёта, `account_deleted` — счёт удалён,
+            `user` — изменился состав счетов, `profile` — изменились данные пользователя,
+            `user_deleted` — пользователь удалён.
+        key: Идентификатор счёта (для `account`, `account_deleted`) или пользователя.
+        version: Новая версия счёта (для `account`).
+        user_id: Владелец счёта (для `account`, `account_deleted`).
+        origin: Идентификатор процесса-отправителя.
+    """
+
+    kind: InvalidationKind
+    key: int
+    version: int = 0
+    user_id: int = 0
+    origin: str = ''
+
+    @classmethod
+    def account(cls, snapshot: BalanceSnapshot) -> InvalidationMessage:
+        """Создаёт сообщение об изменении баланса счёта.
+
+        Args:
+            snapshot (BalanceSnapshot): Новый снимок счёта.
+
+        Returns:
+            InvalidationMessage: Сообщение `account`.
+        """
+        return cls('account', snapshot.id, version=snapshot.version, user_id=snapshot.user_id)
+
+    @property
+    def coalescing_key(self) -> tuple[str, int]:
+        """Ключ, по которому склеиваются повторные сообщения."""
+        return self.kind, self.key
+
+    def to_dict(self) -> dict[str, str | int]:
+        """Возвращает компактное представление для рассылки."""
+        return {
+            'k': self.kind,
+            'i': self.key,
+            'v': self.version,
+            'u': self.user_id,
+            'o': self.origin,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, str | int]) -> InvalidationMessage:
+        """Восстанавливает сообщение из представления `to_dict`.
+
+        Args:
+            data (dict[str, str | int]): Разобранное представление сообщения.
+
+        Returns:
+            InvalidationMessage: Сообщение инвалидации.
+        """
+        return cls(
+            kind=data['k'],
+            key=data['i'],
+            version=data['v'],
+            user_id=data['u'],
+            origin=data['o'],
+        )
+
+    def encode(self) -> str:
+        """Сериализует сообщение в компактный JSON."""
+        return json.dumps(self.to_dict(), separators=(',', ':'))
+
+    @classmethod
+    def decode(cls, payload: str) -> InvalidationMessage:
+        """Разбирает сообщение из JSON.
+
+        Args:
+            payload (str): Полезная нагрузка уведомления.
+
+        Returns:
+            InvalidationMessage: Сообщение инвалидации.
+        """
+        return cls.from_dict(json.loads(payload))
+
+
+def coalesce(
+    pending: dict[tuple[str, int], InvalidationMessage],
+    messages: Iterable[InvalidationMessage],
+) -> None:
+    """Добавляет сообщения в буфер, склеивая повторы одного ключа.
+
+    Для счёта сохраняется сообщение с наибольшей версией: инвалидация более
+    новой версии покрывает все предыдущие.
+
+    Args:
+        pending (dict): Буфер сообщений по `coalescing_key`.
+        messages (Iterable[InvalidationMessage]): Новые сообщения.
+    """
+    for message in messages:
+        current = pending.get(message.coalescing_key)
+        if current is None or message.version > current.version:
+            pending[message.coalescing_key] = message
+
+
+def encode_batches(
+    messages: Iterable[InvalidationMessage], max_bytes: int = MAX_NOTIFY_PAYLOAD_BYTES
+) -> list[str]:
+    """Упаковывает сообщения в JSON-массивы не длиннее `max_bytes`.
+
+    Args:
+        messages (Iterable[InvalidationMessage]): Сообщения для отправки.
+        max_bytes (int): Максимальный размер одной полезной нагрузки.
+
+    Returns:
+        list[str]: Полезные нагрузки уведомлений.
+    """
+    batches: list[str] = []
+    items: list[str] = []
+    size = 2
+    for message in messages:
+        item = message.encode()
+        if items and size + len(item) + 1 > max_bytes:
+            batches.append(f'[{",".join(items)}]')
+            items, size = [], 2
+        items.append(item)
+        size += len(item) + 1
+    if items:
+        batches.append(f'[{",".join(items)}]')
+    return batches
+
+
+class InvalidationBus:
+    """Шина инвалидаций внутри одного процесса.
+
+    Других воркеров нет, а кэши процесса сервисы обновляют сами, поэтому
+    публикация ничего не делает. Подписчики получают сообщения, доставленные
+    `deliver` (у распределённых реализаций — от других воркеров), а обработчики
+    сброса вызываются `reset`, когда сообщения могли быть потеряны.
+    """
+
+    def __init__(self) -> None:
+        """Инициализирует шину."""
+        self.origin = uuid.uuid4().hex
+        self._handlers: list[Callable[[InvalidationMessage], None]] = []
+        self._reset_handlers: list[Callable[[], None]] = []
+
+    # --- Жизненный цикл ---
+
+    async def start(self) -> None:
+        """Начинает приём сообщений от других воркеров."""
+
+    async def stop(self) -> None:
+        """Отправляет накопленные сообщения и прекращает приём."""
+
+    # --- Подписки ---
+
+    def subscribe(self, handler: Callable[[InvalidationMessage], None]) -> None:
+        """Регистрирует обработчик сообщений других воркеров.
+
+        Args:
+            handler (Callable[[InvalidationMessage], None]): Обработчик сообщения.
+        """
+        self._handlers.append(handler)
+
+    def deliver(self, messages: Iterable[InvalidationMessage]) -> None:
+        """Передаёт сообщения обработчикам, пропуская собственные.
+
+        Ошибка одного обработчика не мешает остальным.
+
+        Args:
+            messages (Iterable[InvalidationMessage]): Полученные сообщения.
+        """
+        for message in messages:
+            if message.origin == self.origin:
+                continue
+            for handler in self._handlers:
+                try:
+                    handler(message)
+                except Exception:  # noqa: BLE001 - кэш подстрахует TTL
+                    logger.exception('Ошибка обработчика инвалидации %r', message)
+
+    def subscribe_reset(self, handler: Callable[[], None]) -> None:
+        """Регистрирует сброс кэша на случай потери сообщений.
+
+        Args:
+            handler (Callable[[], None]): Функция, очищающая кэш процесса.
+        """
+        self._reset_handlers.append(handler)
+
+    def reset(self) -> None:
+        """Сбрасывает подписанные кэши процесса.
+
+        Ошибка одного обработчика не мешает остальным.
+        """
+        for handler in self._reset_handlers:
+            try:
+                handler()
+            except Exception:  # noqa: BLE001 - кэш подстрахует TTL
+                logger.exception('Ошибка сброса кэша после потери инвалидаций')
+
+    async def listen(self, channel: str, handler: Callable[[str], None]) -> None:
+        """Подписывает обработчик на полезные нагрузки другого канала.
+
+        Args:
+            channel (str): Имя канала.
+            handler (Callable[[str], None]): Обработчик полезной нагрузки уведомления.
+        """
+
+    # --- Публикация ---
+
+    def publish(self, db: AsyncSession, messages: Iterable[InvalidationMessage]) -> None:
+        """Публикует сообщения после коммита текущей транзакции.
+
+        Args:
+            db (AsyncSession): Сессия БД, транзакция которой ещё не закоммичена.
+            messages (Iterable[InvalidationMessage]): Сообщения для рассылки.
+        """
+
+    def publish_payload(self, db: AsyncSession, channel: str, payload: str) -> None:
+        """Отправляет полезную нагрузку в канал после коммита текущей транзакции.
+
+        Args:
+            db (AsyncSession): Сессия БД, транзакция которой ещё не закоммичена.
+            channel (str): Имя канала.
+            payload (str): Полезная нагрузка уведомления.
+        """
+
+
+class PostgresInvalidationBus(InvalidationBus):
+    """Шина инвалидаций через PostgreSQL LISTEN/NOTIFY с пакетной отправкой.
+
+    Сообщения транзакции копятся в `session.info` и после коммита переходят в
+    общий буфер процесса; фоновая задача склеивает повторы и отправляет буфер
+    JSON-массивами на выделенном соединении asyncpg, которое же слушает канал.
+    Полезные нагрузки `publish_payload` проходят тот же путь без склейки.
+    Пока соединение восстанавливается, буфер ждёт и уходит после переподключения.
+
+    Атрибуты:
+        reconnects: Сколько раз соединение восстанавливалось после обрыва.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        *,
+        flush_interval_seconds: float,
+        reconnect_initial_seconds: float = 0.5,
+        reconnect_max_seconds: float = 30.0,
+    ) -> None:
+        """Инициализирует шину.
+
+        Args:
+            dsn (str): DSN PostgreSQL (допускается URL SQLAlchemy с драйвером).
+            channel (str): Имя канала LISTEN/NOTIFY.
+            flush_interval_seconds (float): Сколько ждать новых сообщений перед отправкой пакета.
+            reconnect_initial_seconds (float): Пауза перед повторной попыткой подключения;
+                удваивается после каждой неудачи.
+            reconnect_max_seconds (float): Наибольшая пауза между попытками подключения.
+        """
+        super().__init__()
+        self.dsn = dsn.replace('postgresql+asyncpg://', 'postgresql://', 1)
+        self.channel = channel
+        self.flush_interval_seconds = flush_interval_seconds
+        self.reconnect_initial_seconds = reconnect_initial_seconds
+        self.reconnect_max_seconds = reconnect_max_seconds
+        self.sent_messages = 0
+        self.sent_notifications = 0
+        self.reconnects = 0
+        self._info_key = f'invalidation_bus:{self.origin}'
+        self._payloads_key = f'invalidation_bus_payloads:{self.origin}'
+        self._pending: dict[tuple[str, int], InvalidationMessage] = {}
+        self._outbox: list[tuple[str, str]] = []
+        self._listeners: dict[str, Callable[[str], None]] = {}
+        self._wakeup = asyncio.Event()
+        self._connection = None
+        self._flusher: asyncio.Task | None = None
+        self._reconnector: asyncio.Task | None = None
+        self._stopping = False
+
+    # --- Жизненный цикл ---
+
+    async def start(self) -> None:
+        """Открывает соединение, подписывается на канал и запускает отправку пакетов."""
+        self._stopping = False
+        await self._connect()
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Останавливает отправку, досылает буфер и закрывает соединение."""
+        self._stopping = True
+        if self._reconnector is not None:
+            self._reconnector.cancel()
+            await asyncio.gather(self._reconnector, return_exceptions=True)
+            self._reconnector = None
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        if self._connection is not None:
+            await self.flush()
+            await self._connection.close()
+            self._connection = None
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        connection = await asyncpg.connect(self.dsn)
+        try:
+            await connection.add_listener(self.channel, self._on_notify)
+            for channel, handler in self._listeners.items():
+                await connection.add_listener(channel, self._payload_listener(handler))
+        except BaseException:
+            await connection.close()
+            raise
+        connection.add_termination_listener(self._on_connection_lost)
+        self._connection = connection
+
+    def _on_connection_lost(self, connection) -> None:
+        if self._stopping or connection is not self._connection:
+            return
+        self._connection = None
+        logger.warning('Соединение шины инвалидаций потеряно, переподключение')
+        if self._reconnector is None:
+            self._reconnector = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = self.reconnect_initial_seconds
+        try:
+            while True:
+                try:
+                    await self._connect()
+                    break
+                except Exception as exc:  # noqa: BLE001 - повторяем с паузой
+                    logger.warning(
+                        'Не удалось подключить шину инвалидаций (%s), повтор через %.1f с',
+                        exc,
+                        delay,
+                    )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.reconnect_max_seconds)
+        finally:
+            self._reconnector = None
+        self.reconnects += 1
+        logger.info('Шина инвалидаций переподключена')
+        # Уведомления других воркеров за время обрыва потеряны
+        self.reset()
+        if self._pending or self._outbox:
+            self._wakeup.set()
+
+    async def listen(self, channel: str, handler: Callable[[str], None]) -> None:
+        """Подписывает обработчик на канал; подписка восстанавливается после обрыва."""
+        self._listeners[channel] = handler
+        if self._connection is not None:
+            await self._connection.add_listener(channel, self._payload_listener(handler))
+
+    @staticmethod
+    def _payload_listener(handler: Callable[[str], None]):
+        def _on_payload(_connection, _pid, _channel, payload: str) -> None:
+            handler(payload)
+
+        return _on_payload
+
+    # --- Публикация ---
+
+    def publish(self, db: AsyncSession, messages: Iterable[InvalidationMessage]) -> None:
+        """Копит сообщения в сессии; они уйдут после коммита и пропадут при откате."""
+        session = self._staging_session(db)
+        staged = session.info.setdefault(self._info_key, {})
+        coalesce(staged, (replace(message, origin=self.origin) for message in messages))
+
+    def publish_payload(self, db: AsyncSession, channel: str, payload: str) -> None:
+        """Копит полезную нагрузку в сессии; она уйдёт после коммита и пропадёт при откате."""
+        session = self._staging_session(db)
+        session.info.setdefault(self._payloads_key, []).append((channel, payload))
+
+    def _staging_session(self, db: AsyncSession):
+        session = db.sync_session
+        if not event.contains(session, 'after_commit', self._after_commit):
+            event.listen(session, 'after_commit', self._after_commit)
+            event.listen(session, 'after_soft_rollback', self._after_rollback)
+        return session
+
+    def _after_commit(self, session) -> None:
+        staged = session.info.pop(self._info_key, None)
+        payloads = session.info.pop(self._payloads_key, None)
+        if payloads:
+            self._outbox.extend(payloads)
+            self._wakeup.set()
+        if staged:
+            self.enqueue(staged.values())
+
+    def _after_rollback(self, session, previous_transaction) -> None:
+        if previous_transaction.parent is None:
+            session.info.pop(self._info_key, None)
+            session.info.pop(self._payloads_key, None)
+
+    def enqueue(self, messages: Iterable[InvalidationMessage]) -> None:
+        """Ставит закоммиченные сообщения в буфер отправки.
+
+        Args:
+            messages (Iterable[InvalidationMessage]): Сообщения с заполненным `origin`.
+        """
+        coalesce(self._pending, messages)
+        self._wakeup.set()
+
+    def pending_count(self) -> int:
+        """Возвращает число сообщений, ожидающих отправки."""
+        return len(self._pending)
+
+    async def flush(self) -> int:
+        """Отправляет буфер пакетами `pg_notify`.
+
+        Сначала уходят полезные нагрузки `publish_payload`, затем пакеты
+        инвалидаций. Ошибка отправки пишется в лог, а сообщения отбрасываются:
+        устаревшие записи других воркеров истекут по TTL.
+
+        Returns:
+            int: Число отправленных сообщений инвалидации.
+        """
+        if self._connection is None:
+            return 0
+        if self._outbox:
+            await self._flush_payloads()
+        if not self._pending:
+            return 0
+        messages = list(self._pending.values())
+        self._pending.clear()
+        try:
+            for payload in encode_batches(messages):
+                await self._connection.execute('SELECT pg_notify($1, $2)', self.channel, payload)
+                self.sent_notifications += 1
+        except Exception:  # noqa: BLE001 - кэш подстрахует TTL
+            logger.exception('Не удалось разослать %s сообщений инвалидации', len(messages))
+            return 0
+        self.sent_messages += len(messages)
+        return len(messages)
+
+    async def _flush_payloads(self) -> None:
+        payloads, self._outbox = self._outbox, []
+        try:
+            for channel, payload in payloads:
+                await self._connection.execute('SELECT pg_notify($1, $2)', channel, payload)
+                self.sent_notifications += 1
+        except Exception:  # noqa: BLE001 - подписчики перечитают данные сами
+            logger.exception('Не удалось разослать %s уведомлений', len(payloads))
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            await asyncio.sleep(self.flush_interval_seconds)
+            self._wakeup.clear()
+            await self.flush()
+
+    # --- Приём ---
+
+    def _on_notify(self, _connection, _pid, _channel, payload: str) -> None:
+        try:
+            messages = [InvalidationMessage.from_dict(item) for item in json.loads(payload)]
+        except (ValueError, KeyError, TypeError):
+            logger.warning('Некорректное сообщение инвалидации: %r', payload)
+            return
+        self.deliver(messages)
+
+
+def build_invalidation_bus(settings: Settings) -> InvalidationBus:
+    """Создаёт шину инвалидаций по настройкам приложения.
+
+    Args:
+        settings (Settings): Настройки приложения.
+
+    Returns:
+        InvalidationBus: Шина инвалидаций.
+    """
+    if settings.invalidation_bus_backend == 'postgres':
+        return PostgresInvalidationBus(
+            settings.database_url,
+            settings.invalidation_bus_channel,
+            flush_interval_seconds=settings.invalidation_bus_flush_interval_seconds,
+            reconnect_max_seconds=settings.invalidation_bus_reconnect_max_seconds,
+        )
+    return InvalidationBus()
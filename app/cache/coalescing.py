@@ -0,0 +1,198 @@
+"""Объединение одинаковых одновременных чтений (single-flight).
+
+Под нагрузкой много запросов одновременно читают одно и то же: текущего
+пользователя в `get_current_user`, одну страницу счетов на дашбордах.
+`SingleFlight` выполняет загрузку один раз на ключ: пока запрос-лидер ждёт
+БД, остальные вызовы с тем же ключом дожидаются его результата. С ненулевым
+окном результат ещё `window_seconds` отдаётся без обращения к БД.
+
+Ключ состоит из области и ключа внутри неё. Область — единица инвалидации:
+записи вызывают `forget(scope)`, после чего новые вызовы не присоединяются к
+уже идущей загрузке и не получают результат из окна. Другие воркеры сбрасывают
+свои области по сообщениям `InvalidationBus`; до их доставки окно ограничивает
+время, в течение которого воркер может отдавать устаревшие данные.
+
+Разделяемый результат должен быть неизменяемым или копироваться вызывающим
+кодом: ORM-объекты сессии лидера нельзя отдавать в чужие сессии.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Hashable, TypeVar
+
+
+if TYPE_CHECKING:
+    from app.core.config import Settings
+
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """Процессный реестр загрузок, разделяемых одновременными вызовами.
+
+    Атрибуты:
+        executed: Число выполненных загрузок (обращений к БД).
+        coalesced: Число вызовов, дождавшихся чужой загрузки.
+        reused: Число вызовов, обслуженных результатом из окна.
+    """
+
+    def __init__(
+        self,
+        *,
+        window_seconds: float = 0.0,
+        max_scopes: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Инициализирует реестр.
+
+        Args:
+            window_seconds (float): Сколько секунд результат отдаётся повторно после
+                завершения загрузки (0 — только одновременным вызовам).
+            max_scopes (int): Максимум областей с сохранёнными результатами (LRU).
+            clock (Callable[[], float]): Источник монотонного времени.
+        """
+        self.window_seconds = window_seconds
+        self.max_scopes = max_scopes
+        self._clock = clock
+        self._flights: dict[Hashable, dict[Hashable, asyncio.Future]] = {}
+        self._results: OrderedDict[Hashable, dict[Hashable, tuple[Any, float]]] = OrderedDict()
+        self.executed = 0
+        self.coalesced = 0
+        self.reused = 0
+
+    @property
+    def saved(self) -> int:
+        """Число сэкономленных загрузок."""
+        return self.coalesced + self.reused
+
+    async def run(self, scope: Hashable, key: Hashable, load: Callable[[], Awaitable[T]]) -> T:
+        """Возвращает результат загрузки, разделяя её с одновременными вызовами.
+
+        Ошибка загрузки получают все её ожидающие. Если лидера отменили,
+        ожидающие повторяют вызов и один из них становится новым лидером.
+
+        Args:
+            scope (Hashable): Область инвалидации.
+            key (Hashable): Ключ внутри области.
+            load (Callable[[], Awaitable[T]]): Загрузка, выполняемая лидером.
+
+        Returns:
+            T: Результат загрузки.
+        """
+        while True:
+            found, result = self._recent(scope, key)
+            if found:
+                self.reused += 1
+                return result
+            future = self._flights.get(scope, {}).get(key)
+            if future is None:
+                break
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    continue
+                raise
+            self.coalesced += 1
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._flights.setdefault(scope, {})[key] = future
+        self.executed += 1
+        try:
+            result = await load()
+        except asyncio.CancelledError:
+            self._finish(scope, key, future)
+            future.cancel()
+            raise
+        except Exception as exc:
+            self._finish(scope, key, future)
+            future.set_exception(exc)
+            # Ожидающих может не быть: помечаем исключение полученным
+            future.exception()
+            raise
+        if self._finish(scope, key, future) and self.window_seconds > 0:
+            self._remember(scope, key, result)
+        future.set_result(result)
+        return result
+
+    def forget(self, scope: Hashable) -> None:
+        """Инвалидирует область: новые вызовы загрузят данные заново.
+
+        Идущие загрузки завершаются для уже ожидающих, но их результат не
+        сохраняется в окне.
+
+        Args:
+            scope (Hashable): Область инвалидации.
+        """
+        self._flights.pop(scope, None)
+        self._results.pop(scope, None)
+
+    def clear(self) -> None:
+        """Инвалидирует все области (например, после потери инвалидаций)."""
+        self._flights.clear()
+        self._results.clear()
+
+    def stats(self) -> dict:
+        """Возвращает счётчики объединения чтений.
+
+        Returns:
+            dict: `executed`, `coalesced`, `reused` и `saved`.
+        """
+        return {
+            'executed': self.executed,
+            'coalesced': self.coalesced,
+            'reused': self.reused,
+            'saved': self.saved,
+        }
+
+    def _recent(self, scope: Hashable, key: Hashable) -> tuple[bool, Any]:
+        entries = self._results.get(scope)
+        if entries is None:
+            return False, None
+        entry = entries.get(key)
+        if entry is None:
+            return False, None
+        if entry[1] <= self._clock():
+            del entries[key]
+            if not entries:
+                del self._results[scope]
+            return False, None
+        return True, entry[0]
+
+    def _finish(self, scope: Hashable, key: Hashable, future: asyncio.Future) -> bool:
+        flights = self._flights.get(scope)
+        if flights is None or flights.get(key) is not future:
+            return False
+        del flights[key]
+        if not flights:
+            del self._flights[scope]
+        return True
+
+    def _remember(self, scope: Hashable, key: Hashable, result: Any) -> None:
+        entries = self._results.setdefault(scope, {})
+        entries[key] = (result, self._clock() + self.window_seconds)
+        self._results.move_to_end(scope)
+        while len(self._results) > self.max_scopes:
+            self._results.popitem(last=False)
+
+
+def build_single_flight(settings: Settings) -> SingleFlight | None:
+    """Создаёт реестр объединения чтений по настройкам приложения.
+
+    Args:
+        settings (Settings): Настройки приложения.
+
+    Returns:
+        SingleFlight | None: Реестр или None, если объединение выключено.
+    """
+    if not settings.read_coalescing_enabled:
+        return None
+    return SingleFlight(
+        window_seconds=settings.read_coalescing_window_seconds,
+        max_scopes=settings.read_coalescing_max_scopes,
+    )
@@ -0,0 +1,205 @@
+"""Процессный индекс владения счетами и известных пользователей.
+
+Владелец счёта не меняется после создания, поэтому отображение
+`account_id -> user_id` можно держать в памяти: оно прогревается при старте
+потоковым запросом и дополняется при создании счетов и пользователей. Индекс
+отвечает только положительно: промах означает «неизвестно» (например, запись
+создана другим воркером), и вызывающий код идёт в БД, после чего дообучает
+индекс. Удаления, выполненные этим воркером, удаляют записи сразу, а удаления
+в других воркерах и процессах (например, слияние счетов скриптом уплотнения)
+приходят через `InvalidationBus`. Устаревший положительный
+ответ до доставки сообщения обрабатывает вызывающий код (внешний ключ БД
+остаётся окончательной проверкой).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import Settings
+from app.models.account import Account
+from app.models.user import User
+
+
+if TYPE_CHECKING:
+    from .bus import InvalidationBus, InvalidationMessage
+
+
+logger = logging.getLogger(__name__)
+
+
+class OwnershipIndex:
+    """Индекс `account_id -> user_id` с обратным индексом и множество известных пользователей.
+
+    Атрибуты:
+        max_accounts: Максимум счетов в индексе; сверх лимита новые не добавляются.
+        hits: Число проверок, обслуженных индексом.
+        misses: Число проверок, ушедших в БД.
+    """
+
+    def __init__(self, *, max_accounts: int, bus: InvalidationBus | None = None) -> None:
+        """Инициализирует пустой индекс.
+
+        Args:
+            max_accounts (int): Максимум счетов в индексе.
+            bus (InvalidationBus | None): Шина инвалидаций; индекс забывает
+                пользователей, удалённых другими воркерами, и очищается после
+                потери сообщений.
+        """
+        self.max_accounts = max_accounts
+        self._owners: dict[int, int] = {}
+        self._accounts_by_user: dict[int, set[int]] = {}
+        self._users: set[int] = set()
+        self.hits = 0
+        self.misses = 0
+        if bus is not None:
+            bus.subscribe(self.apply_message)
+            bus.subscribe_reset(self.clear)
+
+    def __len__(self) -> int:
+        """Возвращает число счетов в индексе."""
+        return len(self._owners)
+
+    def owner_of(self, account_id: int) -> int | None:
+        """Возвращает владельца счёта, если он известен.
+
+        Args:
+            account_id (int): Идентификатор счёта.
+
+        Returns:
+            int | None: Идентификатор владельца или None при промахе.
+        """
+        owner = self._owners.get(account_id)
+        if owner is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return owner
+
+    def has_user(self, user_id: int) -> bool:
+        """Проверяет, известен ли пользователь индексу.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+
+        Returns:
+            bool: True, если пользователь точно существовал; False — неизвестно.
+        """
+        if user_id in self._users:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def add_user(self, user_id: int) -> None:
+        """Запоминает существующего пользователя.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+        """
+        self._users.add(user_id)
+
+    def add_account(self, account_id: int, user_id: int) -> None:
+        """Запоминает владельца счёта (и самого владельца как существующего).
+
+        Args:
+            account_id (int): Идентификатор счёта.
+            user_id (int): Идентификатор владельца.
+        """
+        self._users.add(user_id)
+        if account_id in self._owners or len(self._owners) < self.max_accounts:
+            self._remember_owner(account_id, user_id)
+
+    def remove_user(self, user_id: int) -> None:
+        """Забывает пользователя и все его счета.
+
+        Счета пользователя берутся из обратного индекса, поэтому удаление
+        занимает время, пропорциональное их числу, а не размеру индекса.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+        """
+        self._users.discard(user_id)
+        for account_id in self._accounts_by_user.pop(user_id, ()):
+            del self._owners[account_id]
+
+    def remove_account(self, account_id: int) -> None:
+        """Забывает удалённый счёт; его владелец остаётся известным.
+
+        Args:
+            account_id (int): Идентификатор счёта.
+        """
+        user_id = self._owners.pop(account_id, None)
+        if user_id is not None:
+            self._accounts_by_user[user_id].discard(account_id)
+
+    def clear(self) -> None:
+        """Забывает всех пользователей и счета; индекс дообучается по промахам."""
+        self._owners.clear()
+        self._accounts_by_user.clear()
+        self._users.clear()
+
+    def _remember_owner(self, account_id: int, user_id: int) -> None:
+        self._owners[account_id] = user_id
+        self._accounts_by_user.setdefault(user_id, set()).add(account_id)
+
+    def apply_message(self, message: InvalidationMessage) -> None:
+        """Применяет сообщение инвалидации от другого воркера.
+
+        Args:
+            message (InvalidationMessage): Сообщение инвалидации.
+        """
+        if message.kind == 'user_deleted':
+            self.remove_user(message.key)
+        elif message.kind == 'account_deleted':
+            self.remove_account(message.key)
+
+    async def warm(
+        self, session_factory: async_sessionmaker[AsyncSession], *, batch_size: int
+    ) -> None:
+        """Заполняет индекс потоковым чтением пользователей и счетов.
+
+        Args:
+            session_factory (async_sessionmaker): Фабрика сессий БД.
+            batch_size (int): Размер пакета строк серверного курсора.
+        """
+        async with session_factory() as db:
+            users = await db.stream_scalars(
+                select(User.id).execution_options(yield_per=batch_size)
+            )
+            async for user_id in users:
+                self._users.add(user_id)
+            accounts = await db.stream(
+                select(Account.id, Account.user_id).execution_options(yield_per=batch_size)
+            )
+            async for account_id, user_id in accounts:
+                if len(self._owners) >= self.max_accounts:
+                    break
+                self._remember_owner(account_id, user_id)
+            await accounts.close()
+        logger.info(
+            'Индекс владения прогрет: пользователей %s, счетов %s',
+            len(self._users),
+            len(self._owners),
+        )
+
+
+def build_ownership_index(
+    settings: Settings, bus: InvalidationBus | None = None
+) -> OwnershipIndex | None:
+    """Создаёт индекс владения по настройкам приложения.
+
+    Args:
+        settings (Settings): Настройки приложения.
+        bus (InvalidationBus | None): Шина инвалидаций между воркерами.
+
+    Returns:
+        OwnershipIndex | None: Индекс или None, если он выключен.
+    """
+    if not settings.ownership_index_enabled:
+        return None
+    return OwnershipIndex(max_accounts=settings.ownership_index_max_accounts, bus=bus)
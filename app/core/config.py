@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import List
+from typing import List, Literal
 
 from pydantic import AnyHttpUrl, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -54,6 +54,77 @@ class Settings(BaseSettings):
         webhook_secret_key: Секретный ключ для подписи вебхука.
         database_url: Строка подключения к БД (async, для приложения).
         sync_database_url: Строка подключения к БД (опционально для инструментов).
+        balance_cache_enabled: Включить кэш снимков балансов для листингов счетов.
+        balance_cache_max_entries: Максимум снимков счетов в кэше процесса.
+        balance_cache_max_accounts_per_user: Максимум счетов пользователя в кэше листинга.
+        balance_cache_ttl_seconds: Время жизни записи кэша балансов.
+        invalidation_bus_backend: Шина инвалидаций процессных кэшей: `memory` или `postgres`.
+        invalidation_bus_channel: Канал LISTEN/NOTIFY шины инвалидаций.
+        invalidation_bus_flush_interval_seconds: Окно накопления пакета инвалидаций.
+        invalidation_bus_reconnect_max_seconds: Наибольшая пауза между попытками
+            переподключения шины инвалидаций после обрыва соединения.
+        account_events_backend: Транспорт событий SSE между воркерами: `memory` или `postgres`.
+            `postgres` работает через соединение шины инвалидаций `postgres`.
+        account_events_channel: Канал LISTEN/NOTIFY для событий счетов.
+        account_events_queue_size: Размер очереди событий одного SSE-соединения.
+        account_events_heartbeat_seconds: Пауза без событий до комментария keep-alive.
+        db_query_cache_size: Размер кэша скомпилированных запросов SQLAlchemy.
+        db_prepared_statement_cache_size: Размер кэша подготовленных statement asyncpg.
+        ownership_index_enabled: Включить индекс владения счетами для вебхуков.
+        ownership_index_max_accounts: Максимум счетов в индексе владения процесса.
+        ownership_index_warm_batch_size: Размер пакета потокового прогрева индекса.
+        read_coalescing_enabled: Объединять одинаковые одновременные чтения (single-flight).
+        read_coalescing_window_seconds: Сколько секунд результат чтения отдаётся повторно.
+        read_coalescing_max_scopes: Максимум областей с сохранёнными результатами чтений.
+        user_purge_batch_size: Число строк, удаляемых одной транзакцией фоновой очистки.
+        payments_partitions_months_ahead: На сколько месяцев вперёд создавать секции платежей.
+        payments_partitions_retention_months: Сколько месяцев истории держать присоединённой
+            (0 — не отсоединять секции).
+        payments_partitions_ensure_on_start: Создавать недостающие секции при старте.
+        payments_idempotency_lookback_days: Глубина предварительной проверки дубликата
+            транзакции в днях (0 — вся история).
+        payments_archive_dir: Каталог холодного архива платежей (None — архив выключен).
+        payments_archive_hot_days: Сколько последних дней платежи остаются в БД.
+        payments_archive_chunk_size: Число платежей в одном сегменте архива.
+        payments_archive_delete_batch_size: Число строк, удаляемых одной транзакцией архивации.
+        reconciliation_range_size: Длина диапазона идентификаторов счетов при сверке балансов.
+        reconciliation_concurrency: Сколько диапазонов сверки обрабатывать одновременно.
+        reconciliation_max_reported: Сколько расхождений хранить в задаче сверки.
+        reconciliation_checkpoint_path: Файл контрольной точки сверки (None — без возобновления).
+        balance_mode: Режим баланса: `row` — пополнение обновляет строку счёта, `ledger` —
+            только добавляет платёж, а баланс вычисляется при чтении.
+        ledger_checkpoint_interval_seconds: Период фоновых контрольных точек режима `ledger`.
+        ledger_checkpoint_batch_size: Число платежей, учитываемых одной транзакцией.
+        rate_limit_enabled: Включить ограничение частоты запросов и сброс нагрузки.
+        rate_limit_max_keys: Максимум ключей token bucket на область (LRU).
+        auth_login_ip_rate: Скорость пополнения корзины логина по IP, запросов/с.
+        auth_login_ip_burst: Ёмкость корзины логина по IP.
+        auth_login_email_rate: Скорость пополнения корзины логина по email, запросов/с.
+        auth_login_email_burst: Ёмкость корзины логина по email.
+        auth_login_max_in_flight: Максимум одновременных логинов (0 — без ограничения).
+        webhook_source_rate: Скорость пополнения корзины вебхука по IP источника, запросов/с.
+        webhook_source_burst: Ёмкость корзины вебхука по IP источника.
+        webhook_max_in_flight: Максимум одновременных вебхуков (0 — без ограничения).
+        health_monitor_enabled: Включить фоновые замеры состояния для проб доступности.
+        health_monitor_interval_seconds: Пауза между фоновыми замерами состояния.
+        health_monitor_max_age_seconds: Возраст замера, после которого проба проверяет БД сама.
+        health_monitor_db_timeout_seconds: Предельное время ответа БД на проверочный запрос.
+        loop_monitor_enabled: Включить детектор задержек цикла событий и блокирующих вызовов.
+        loop_monitor_interval_seconds: Период замера задержки цикла событий.
+        loop_monitor_threshold_seconds: Задержка, после которой снимается стек блокирующего вызова.
+        loop_monitor_report_interval_seconds: Период записи мест блокировки в лог.
+        loop_monitor_top_sites: Сколько мест блокировки выводить в отчёте.
+        profiling_enabled: Включить профилирование запросов по токену администратора и выборке.
+        profiling_dir: Каталог файлов профилей запросов.
+        profiling_sample_rates: Доля профилируемых запросов по шаблону маршрута.
+        profiling_token_ttl_seconds: Время жизни токена профилирования.
+        profiling_max_profiles: Сколько последних профилей хранить на диске.
+        profiling_top_frames: Сколько самых затратных функций отдавать из профиля.
+        slow_query_log_enabled: Включить журнал медленных SQL-выражений.
+        slow_query_threshold_ms: Время выражения, начиная с которого оно попадает в журнал.
+        slow_query_max_entries: Сколько последних медленных выражений хранить.
+        slow_query_explain: Запрашивать план выполнения медленных выражений.
+        slow_query_explain_analyze: Строить план `SELECT` через `EXPLAIN ANALYZE` (PostgreSQL).
     """
 
     model_config = SettingsConfigDict(
@@ -85,6 +156,104 @@ class Settings(BaseSettings):
     database_url: str | None = None
     sync_database_url: str | None = None
 
+    # Кэши компиляции SQLAlchemy и подготовленных statement asyncpg (на соединение)
+    db_query_cache_size: int = 1200
+    db_prepared_statement_cache_size: int = 500
+
+    # Кэш балансов (write-through из вебхуков)
+    balance_cache_enabled: bool = False
+    balance_cache_max_entries: int = 100_000
+    balance_cache_max_accounts_per_user: int = 200
+    balance_cache_ttl_seconds: float = 60.0
+
+    # Инвалидации процессных кэшей между воркерами; `postgres` — LISTEN/NOTIFY
+    invalidation_bus_backend: Literal['memory', 'postgres'] = 'memory'
+    invalidation_bus_channel: str = 'cache_invalidation'
+    invalidation_bus_flush_interval_seconds: float = 0.01
+    invalidation_bus_reconnect_max_seconds: float = 30.0
+
+    # События счетов для SSE; `postgres` — рассылка между воркерами
+    account_events_backend: Literal['memory', 'postgres'] = 'memory'
+    account_events_channel: str = 'account_events'
+    account_events_queue_size: int = 100
+    account_events_heartbeat_seconds: float = 15.0
+
+    # Индекс владения счетами (account_id -> user_id), прогревается при старте
+    ownership_index_enabled: bool = False
+    ownership_index_max_accounts: int = 5_000_000
+    ownership_index_warm_batch_size: int = 10_000
+
+    # Объединение одинаковых одновременных чтений; окно 0 — только одновременные вызовы
+    read_coalescing_enabled: bool = False
+    read_coalescing_window_seconds: float = 0.0
+    read_coalescing_max_scopes: int = 10_000
+
+    # Фоновая пакетная очистка пользователей
+    user_purge_batch_size: int = 5000
+
+    # Помесячные секции платежей (PostgreSQL) и глубина проверки дубликатов вебхука
+    payments_partitions_months_ahead: int = 3
+    payments_partitions_retention_months: int = 0
+    payments_partitions_ensure_on_start: bool = True
+    payments_idempotency_lookback_days: int = 31
+
+    # Холодный архив старых платежей (сжатые сегменты с индексами)
+    payments_archive_dir: str | None = None
+    payments_archive_hot_days: int = 365
+    payments_archive_chunk_size: int = 10_000
+    payments_archive_delete_batch_size: int = 1000
+
+    # Сверка балансов с суммами платежей (параллельно по диапазонам счетов)
+    reconciliation_range_size: int = 50_000
+    reconciliation_concurrency: int = 4
+    reconciliation_max_reported: int = 100
+    reconciliation_checkpoint_path: str | None = None
+
+    # Журнал пополнений: баланс = контрольная точка + неучтённые платежи
+    balance_mode: Literal['row', 'ledger'] = 'row'
+    ledger_checkpoint_interval_seconds: float = 30.0
+    ledger_checkpoint_batch_size: int = 5000
+
+    # Ограничение частоты и сброс нагрузки (на воркер); скорость 0 отключает корзину
+    rate_limit_enabled: bool = False
+    rate_limit_max_keys: int = 100_000
+    auth_login_ip_rate: float = 5.0
+    auth_login_ip_burst: int = 20
+    auth_login_email_rate: float = 0.2
+    auth_login_email_burst: int = 5
+    auth_login_max_in_flight: int = 32
+    webhook_source_rate: float = 500.0
+    webhook_source_burst: int = 1000
+    webhook_max_in_flight: int = 256
+
+    # Фоновые замеры состояния: пробы доступности отдают последний замер
+    health_monitor_enabled: bool = True
+    health_monitor_interval_seconds: float = 5.0
+    health_monitor_max_age_seconds: float = 15.0
+    health_monitor_db_timeout_seconds: float = 2.0
+
+    # Детектор блокировок цикла событий (сторожевой поток снимает стек при задержке)
+    loop_monitor_enabled: bool = False
+    loop_monitor_interval_seconds: float = 0.05
+    loop_monitor_threshold_seconds: float = 0.1
+    loop_monitor_report_interval_seconds: float = 60.0
+    loop_monitor_top_sites: int = 10
+
+    # Профилирование запросов (middleware подключается, только если оно включено)
+    profiling_enabled: bool = False
+    profiling_dir: str = 'profiles'
+    profiling_sample_rates: dict[str, float] = {}
+    profiling_token_ttl_seconds: int = 300
+    profiling_max_profiles: int = 100
+    profiling_top_frames: int = 30
+
+    # Журнал медленных SQL-выражений с планами выполнения
+    slow_query_log_enabled: bool = False
+    slow_query_threshold_ms: float = 200.0
+    slow_query_max_entries: int = 100
+    slow_query_explain: bool = True
+    slow_query_explain_analyze: bool = False
+
     @field_validator('cors_origins', mode='before')
     def split_cors_origins(cls, value: str | List[str]):  # type: ignore[override]
         """Преобразовать строку Origins в список.
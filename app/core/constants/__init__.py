@@ -7,16 +7,25 @@ from .api_paths import (
     AuthPaths,
     HealthPaths,
     PaymentsPaths,
+    ProfilingPaths,
     UsersPaths,
     WebhookPaths,
 )
 from .api_responses import ApiErrorResponses, ApiSuccessResponses
+from .archive import PaymentArchiveFiles
 from .auth import AuthConstants
+from .coalescing import CoalescingScopes
 from .domain import DomainConstraints
 from .error_messages import ErrorMessages
+from .events import AccountEventKinds, ServerSentEvents
 from .field_constraints import FieldConstraints
+from .jobs import PurgeJobStatus, ReconciliationJobStatus
+from .limits import LimitScopes, RouteLimitNames
 from .money import MonetaryConstants
-from .pagination import PaginationParamDescriptions, PaginationParams
+from .monitoring import EventLoopLag, RequestProfiling, SlowQueries
+from .pagination import PaginationParamDescriptions, PaginationParams, PeriodParamDescriptions
+from .partitions import PaymentPartitions
+from .query_budgets import QueryBudgets
 from .regex import RegexPatterns
 
 
@@ -25,12 +34,16 @@ __all__ = [
     'ErrorMessages',
     'PaginationParams',
     'PaginationParamDescriptions',
+    'PeriodParamDescriptions',
+    'PaymentPartitions',
+    'PaymentArchiveFiles',
     'ApiErrorResponses',
     'ApiSuccessResponses',
     'ApiSummary',
     'ApiDescription',
     'MonetaryConstants',
     'AuthConstants',
+    'CoalescingScopes',
     'ApiPrefixes',
     'AuthPaths',
     'UsersPaths',
@@ -38,6 +51,17 @@ __all__ = [
     'AccountsPaths',
     'PaymentsPaths',
     'HealthPaths',
+    'ProfilingPaths',
     'RegexPatterns',
     'FieldConstraints',
+    'LimitScopes',
+    'PurgeJobStatus',
+    'ReconciliationJobStatus',
+    'QueryBudgets',
+    'RouteLimitNames',
+    'AccountEventKinds',
+    'ServerSentEvents',
+    'EventLoopLag',
+    'RequestProfiling',
+    'SlowQueries',
 ]
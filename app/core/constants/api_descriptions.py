@@ -14,9 +14,21 @@ class ApiSummary:
     ADMIN_USERS_GET = 'Получить пользователя по id (админ)'
     ADMIN_USERS_UPDATE = 'Обновить пользователя (админ)'
     ADMIN_USERS_DELETE = 'Удалить пользователя (админ)'
+    ADMIN_USERS_PURGE = 'Фоновая очистка пользователя с историей (админ)'
+    ADMIN_PURGE_JOB_GET = 'Статус задачи очистки (админ)'
 
     ACCOUNTS_LIST_ABAC = 'Список счетов пользователя (ABAC: владелец или админ)'
     ADMIN_CREATE_ACCOUNT = 'Создать счет пользователю (админ)'
+    ACCOUNT_DEBIT = 'Списать сумму со счёта (ABAC: владелец или админ)'
+    ACCOUNT_TRANSFER = 'Перевести сумму на другой счёт (ABAC: владелец или админ)'
+    ME_ACCOUNT_EVENTS = 'Поток изменений балансов и платежей текущего пользователя (SSE)'
+    ADMIN_RECONCILIATION = 'Запустить сверку балансов (админ)'
+    ADMIN_RECONCILIATION_JOB_GET = 'Статус задачи сверки балансов (админ)'
+
+    ADMIN_PROFILING_TOKEN = 'Выдать токен профилирования запросов (админ)'
+    ADMIN_PROFILES_LIST = 'Список сохранённых профилей запросов (админ)'
+    ADMIN_PROFILE_GET = 'Самые затратные функции профиля запроса (админ)'
+    ADMIN_SLOW_QUERIES = 'Журнал медленных SQL-выражений (админ)'
 
     PAYMENTS_LIST = 'Список моих платежей'
 
@@ -24,6 +36,7 @@ class ApiSummary:
 
     HEALTH_APP = 'Проверка доступности приложения'
     HEALTH_DB = 'Проверка доступности подключения к БД'
+    HEALTH_READY = 'Детальная проверка готовности'
 
 
 class ApiDescription:
@@ -37,23 +50,87 @@ class ApiDescription:
     ADMIN_USERS_GET = 'Получить данные пользователя по идентификатору.'
     ADMIN_USERS_UPDATE = 'Обновить поля существующего пользователя.'
     ADMIN_USERS_DELETE = 'Удалить пользователя по идентификатору.'
+    ADMIN_USERS_PURGE = (
+        'Запустить фоновое удаление пользователя вместе с платежами и счетами пакетами. '
+        'Возвращает идентификатор задачи для отслеживания прогресса.'
+    )
+    ADMIN_PURGE_JOB_GET = (
+        'Получить статус и прогресс задачи фоновой очистки пользователя. Задачи хранятся '
+        'в памяти воркера, запустившего очистку: другой воркер и тот же воркер после '
+        'перезапуска отвечают 404.'
+    )
 
     ACCOUNTS_LIST_ABAC = (
         'Получить список счетов пользователя с политикой ABAC (сам владелец или админ).'
     )
     ADMIN_CREATE_ACCOUNT = 'Создать счет для указанного пользователя.'
+    ACCOUNT_DEBIT = (
+        'Атомарно списать сумму со счёта, если баланса достаточно. Повтор с тем же '
+        '`transaction_id` отклоняется. Возвращает списание и баланс после него.'
+    )
+    ACCOUNT_TRANSFER = (
+        'Перевести сумму со счёта пользователя на любой счёт одной транзакцией: '
+        'списание с источника и платёж получателю. Платёж получателя хранится с ключом '
+        '`transfer:<transaction_id>` и не пересекается с транзакциями провайдера. Повтор '
+        'с тем же `transaction_id` отклоняется. Возвращает перевод и баланс источника '
+        'после него.'
+    )
+    ME_ACCOUNT_EVENTS = (
+        'Server-Sent Events вместо опроса списка счетов: `balance` — новый баланс счёта, '
+        '`payment` — новый платёж. При переполнении очереди соединения приходит `resync`, '
+        'после чего поток закрывается: перечитайте счета и подключитесь заново.'
+    )
+    ADMIN_RECONCILIATION = (
+        'Запустить фоновую сверку баланса каждого счёта с суммой его платежей. '
+        'Диапазоны счетов обрабатываются параллельно; прерванная сверка продолжается '
+        'с контрольной точки. Повторный запуск во время работы возвращает текущую задачу.'
+    )
+    ADMIN_RECONCILIATION_JOB_GET = (
+        'Получить прогресс задачи сверки балансов и первые найденные расхождения.'
+    )
 
-    PAYMENTS_LIST = 'Получить список платежей текущего пользователя с пагинацией.'
+    ADMIN_PROFILING_TOKEN = (
+        'Выдать короткоживущий токен профилирования. Запрос с токеном в заголовке '
+        '`X-Profile-Token` выполняется под cProfile, а идентификатор сохранённого '
+        'профиля возвращается в заголовке `X-Profile-Id`. 404, если профилирование выключено.'
+    )
+    ADMIN_PROFILES_LIST = (
+        'Получить сохранённые профили запросов (по токену или по выборке маршрутов), '
+        'от новых к старым.'
+    )
+    ADMIN_PROFILE_GET = (
+        'Получить описание профиля запроса и функции с наибольшим накопленным временем.'
+    )
+    ADMIN_SLOW_QUERIES = (
+        'Получить последние SQL-выражения воркера дольше порога `SLOW_QUERY_THRESHOLD_MS`, '
+        'от новых к старым. Вместо значений параметров показаны их типы; план выполнения '
+        'строится в фоне и появляется в записи, когда готов. 404, если журнал выключен.'
+    )
+
+    PAYMENTS_LIST = (
+        'Получить список платежей текущего пользователя с пагинацией '
+        '(в хронологическом порядке).\n\n'
+        'Период `created_from`/`created_to` ограничивает чтение нужными месяцами истории.'
+    )
 
     WEBHOOK_PAYMENT = (
         'Проверить подпись и обработать пополнение баланса.\n\n'
         'Алгоритм:\n'
         '1. Проверить подпись по формуле.\n'
         '2. Убедиться, что транзакция не существует (идемпотентность).\n'
-        '3. Убедиться, что счет пользователя существует, при отсутствии — создать.\n'
+        '3. Найти счет пользователя; если `account_id` не указан или не найден —\n'
+        '   использовать счет пользователя по умолчанию (создаётся при первом пополнении).\n'
         '4. Сохранить транзакцию и начислить сумму на счет.\n\n'
         'При попытке повторной обработки той же транзакции возвращается ошибка 409.'
     )
 
     HEALTH_APP = 'Базовая проверка доступности приложения и режима (debug).'
-    HEALTH_DB = 'Проверка подключения к БД простым запросом SELECT 1.'
+    HEALTH_DB = (
+        'Проверка подключения к БД по последнему фоновому замеру; без свежего замера '
+        'выполняется запрос SELECT 1.'
+    )
+    HEALTH_READY = (
+        'Готовность приложения с показателями последнего замера: время ответа БД, '
+        'загрузка пула соединений и задержка цикла событий. Если БД недоступна, '
+        'те же показатели возвращаются со статусом 503.'
+    )
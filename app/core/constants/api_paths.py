@@ -34,6 +34,8 @@ class UsersPaths:
     ME = '/users/me'
     ADMIN_USERS = '/admin/users'
     ADMIN_USER_ID = '/admin/users/{user_id}'
+    ADMIN_USER_PURGE = '/admin/users/{user_id}/purge'
+    ADMIN_PURGE_JOB = '/admin/purge-jobs/{job_id}'
 
 
 class AccountsPaths:
@@ -43,6 +45,11 @@ class AccountsPaths:
     TAG = 'accounts'
     USERS_ACCOUNTS = '/users/{user_id}/accounts'
     ADMIN_USERS_ACCOUNTS = '/admin/users/{user_id}/accounts'
+    USERS_ACCOUNT_DEBITS = '/users/{user_id}/accounts/{account_id}/debits'
+    USERS_TRANSFERS = '/users/{user_id}/transfers'
+    ME_ACCOUNT_EVENTS = '/users/me/accounts/events'
+    ADMIN_RECONCILIATION = '/admin/accounts/reconciliation'
+    ADMIN_RECONCILIATION_JOB = '/admin/reconciliation-jobs/{job_id}'
 
 
 class PaymentsPaths:
@@ -60,3 +67,15 @@ class HealthPaths:
     TAG = 'health'
     HEALTH = '/health'
     HEALTH_DB = '/health/db'
+    HEALTH_READY = '/health/ready'
+
+
+class ProfilingPaths:
+    """Константы API профилирования запросов и журнала медленных SQL (админ)."""
+
+    PREFIX = ApiPrefixes.API_V1
+    TAG = 'profiling'
+    ADMIN_PROFILING_TOKEN = '/admin/profiling/token'
+    ADMIN_PROFILES = '/admin/profiles'
+    ADMIN_PROFILE_ID = '/admin/profiles/{profile_id}'
+    ADMIN_SLOW_QUERIES = '/admin/slow-queries'
@@ -80,6 +80,101 @@ class ApiErrorResponses:
         },
     }
 
+    TOO_MANY_REQUESTS = {
+        'model': ErrorResponse,
+        'description': ErrorMessages.TOO_MANY_REQUESTS,
+        'content': {'application/json': {'example': {'detail': ErrorMessages.TOO_MANY_REQUESTS}}},
+    }
+
+    SERVICE_OVERLOADED = {
+        'model': ErrorResponse,
+        'description': ErrorMessages.SERVICE_OVERLOADED,
+        'content': {'application/json': {'example': {'detail': ErrorMessages.SERVICE_OVERLOADED}}},
+    }
+
+    PURGE_JOB_NOT_FOUND = {
+        'model': ErrorResponse,
+        'description': ErrorMessages.PURGE_JOB_NOT_FOUND,
+        'content': {
+            'application/json': {'example': {'detail': ErrorMessages.PURGE_JOB_NOT_FOUND}}
+        },
+    }
+
+    ACCOUNT_NOT_FOUND = {
+        'model': ErrorResponse,
+        'description': ErrorMessages.ACCOUNT_NOT_FOUND,
+        'content': {'application/json': {'example': {'detail': ErrorMessages.ACCOUNT_NOT_FOUND}}},
+    }
+
+    DEBIT_CONFLICT = {
+        'model': ErrorResponse,
+        'description': (
+            f'{ErrorMessages.INSUFFICIENT_FUNDS} или {ErrorMessages.TRANSACTION_ALREADY_PROCESSED}'
+        ),
+        'content': {
+            'application/json': {
+                'examples': {
+                    'insufficient_funds': {'value': {'detail': ErrorMessages.INSUFFICIENT_FUNDS}},
+                    'duplicate': {
+                        'value': {'detail': ErrorMessages.TRANSACTION_ALREADY_PROCESSED}
+                    },
+                }
+            }
+        },
+    }
+
+    TRANSFER_SAME_ACCOUNT = {
+        'model': ErrorResponse,
+        'description': ErrorMessages.TRANSFER_SAME_ACCOUNT,
+        'content': {
+            'application/json': {'example': {'detail': ErrorMessages.TRANSFER_SAME_ACCOUNT}}
+        },
+    }
+
+    RECONCILIATION_JOB_NOT_FOUND = {
+        'model': ErrorResponse,
+        'description': ErrorMessages.RECONCILIATION_JOB_NOT_FOUND,
+        'content': {
+            'application/json': {'example': {'detail': ErrorMessages.RECONCILIATION_JOB_NOT_FOUND}}
+        },
+    }
+
+    PROFILING_DISABLED = {
+        'model': ErrorResponse,
+        'description': ErrorMessages.PROFILING_DISABLED,
+        'content': {'application/json': {'example': {'detail': ErrorMessages.PROFILING_DISABLED}}},
+    }
+
+    PROFILE_NOT_FOUND = {
+        'model': ErrorResponse,
+        'description': ErrorMessages.PROFILE_NOT_FOUND,
+        'content': {'application/json': {'example': {'detail': ErrorMessages.PROFILE_NOT_FOUND}}},
+    }
+
+    SLOW_QUERY_LOG_DISABLED = {
+        'model': ErrorResponse,
+        'description': ErrorMessages.SLOW_QUERY_LOG_DISABLED,
+        'content': {
+            'application/json': {'example': {'detail': ErrorMessages.SLOW_QUERY_LOG_DISABLED}}
+        },
+    }
+
+    HEALTH_READY_503 = {
+        'description': 'БД недоступна; тело — показатели того же замера',
+        'content': {
+            'application/json': {
+                'example': {
+                    'status': 'unavailable',
+                    'checked_at': '2025-01-01T12:00:00+00:00',
+                    'age_seconds': 0.3,
+                    'db': {'ok': False, 'latency_ms': None, 'error': 'TimeoutError'},
+                    'pool': {'size': 5, 'checked_out': 5, 'checked_in': 0, 'overflow': 10},
+                    'event_loop_lag_ms': 250.0,
+                }
+            }
+        },
+    }
+
 
 class ApiSuccessResponses:
     """Константы успешных ответов API для OpenAPI."""
@@ -108,6 +203,22 @@ class ApiSuccessResponses:
         'content': {'application/json': {'example': {'status': 'ok'}}},
     }
 
+    HEALTH_READY_200 = {
+        'description': 'Приложение готово принимать запросы',
+        'content': {
+            'application/json': {
+                'example': {
+                    'status': 'ok',
+                    'checked_at': '2025-01-01T12:00:00+00:00',
+                    'age_seconds': 1.25,
+                    'db': {'ok': True, 'latency_ms': 0.84, 'error': None},
+                    'pool': {'size': 5, 'checked_out': 2, 'checked_in': 3, 'overflow': 0},
+                    'event_loop_lag_ms': 0.4,
+                }
+            }
+        },
+    }
+
     ACCOUNTS_LIST_ABAC_200 = {
         'description': 'Список счетов пользователя',
         'content': {
@@ -136,6 +247,53 @@ class ApiSuccessResponses:
         },
     }
 
+    DEBIT_201 = {
+        'description': 'Сумма списана',
+        'content': {
+            'application/json': {
+                'example': {
+                    'id': 7,
+                    'transaction_id': '2f1c8a9e-0b7d-4c55-9a43-8e6f1d2b3c4a',
+                    'user_id': 1,
+                    'account_id': 1,
+                    'amount': '25.00',
+                    'balance': '75.00',
+                }
+            }
+        },
+    }
+
+    TRANSFER_201 = {
+        'description': 'Перевод выполнен',
+        'content': {
+            'application/json': {
+                'example': {
+                    'id': 8,
+                    'transaction_id': '6d0b3f7e-2a41-4c8e-b1f9-5e7a9c2d4b10',
+                    'from_account_id': 1,
+                    'to_account_id': 2,
+                    'amount': '25.00',
+                    'balance': '50.00',
+                }
+            }
+        },
+    }
+
+    ME_ACCOUNT_EVENTS_200 = {
+        'description': 'Поток событий счетов',
+        'content': {
+            'text/event-stream': {
+                'example': (
+                    'event: payment\n'
+                    'data: {"id":10,"transaction_id":"5eae174f-7cd0-472c-bd36-35660f00132b",'
+                    '"user_id":1,"account_id":1,"amount":"100.00"}\n\n'
+                    'event: balance\n'
+                    'data: {"id":1,"user_id":1,"balance":"200.00","version":3}\n\n'
+                )
+            }
+        },
+    }
+
     PAYMENTS_LIST_200 = {
         'description': 'Список платежей',
         'content': {
@@ -246,3 +404,161 @@ class ApiSuccessResponses:
     }
 
     DELETED_204 = {'description': 'Удалено'}
+
+    PURGE_JOB_202 = {
+        'description': 'Очистка запущена',
+        'content': {
+            'application/json': {
+                'example': {
+                    'id': '0f8e3c1a2b4d4e6f8a9b0c1d2e3f4a5b',
+                    'user_id': 1,
+                    'status': 'pending',
+                    'payments_deleted': 0,
+                    'accounts_deleted': 0,
+                    'error': None,
+                }
+            }
+        },
+    }
+
+    PURGE_JOB_200 = {
+        'description': 'Статус задачи очистки',
+        'content': {
+            'application/json': {
+                'example': {
+                    'id': '0f8e3c1a2b4d4e6f8a9b0c1d2e3f4a5b',
+                    'user_id': 1,
+                    'status': 'running',
+                    'payments_deleted': 20000,
+                    'accounts_deleted': 0,
+                    'error': None,
+                }
+            }
+        },
+    }
+
+    RECONCILIATION_JOB_202 = {
+        'description': 'Сверка балансов запущена',
+        'content': {
+            'application/json': {
+                'example': {
+                    'id': '7c1d2e3f4a5b6c7d8e9f0a1b2c3d4e5f',
+                    'status': 'pending',
+                    'ranges_total': 0,
+                    'ranges_done': 0,
+                    'accounts_checked': 0,
+                    'mismatch_count': 0,
+                    'mismatches': [],
+                    'error': None,
+                }
+            }
+        },
+    }
+
+    RECONCILIATION_JOB_200 = {
+        'description': 'Статус задачи сверки балансов',
+        'content': {
+            'application/json': {
+                'example': {
+                    'id': '7c1d2e3f4a5b6c7d8e9f0a1b2c3d4e5f',
+                    'status': 'done',
+                    'ranges_total': 20,
+                    'ranges_done': 20,
+                    'accounts_checked': 1000000,
+                    'mismatch_count': 1,
+                    'mismatches': [
+                        {
+                            'account_id': 42,
+                            'user_id': 7,
+                            'balance': '150.00',
+                            'payments_total': '100.00',
+                            'difference': '50.00',
+                        }
+                    ],
+                    'error': None,
+                }
+            }
+        },
+    }
+
+    PROFILING_TOKEN_201 = {
+        'description': 'Токен профилирования выдан',
+        'content': {
+            'application/json': {
+                'example': {
+                    'token': 'eyJhbGciOi...signature',
+                    'header': 'X-Profile-Token',
+                    'expires_in': 300,
+                }
+            }
+        },
+    }
+
+    PROFILES_LIST_200 = {
+        'description': 'Сохранённые профили запросов',
+        'content': {
+            'application/json': {
+                'example': [
+                    {
+                        'id': '0b9f2c4e6a8d4f1e9c3b5a7d2e4f6a8c',
+                        'method': 'GET',
+                        'path': '/api/v1/users/7/accounts',
+                        'route': '/api/v1/users/{user_id}/accounts',
+                        'status_code': 200,
+                        'duration_ms': 182.4,
+                        'trigger': 'sample',
+                        'created_at': '2025-01-01T12:00:00+00:00',
+                    }
+                ]
+            }
+        },
+    }
+
+    PROFILE_200 = {
+        'description': 'Профиль запроса',
+        'content': {
+            'application/json': {
+                'example': {
+                    'id': '0b9f2c4e6a8d4f1e9c3b5a7d2e4f6a8c',
+                    'method': 'GET',
+                    'path': '/api/v1/users/7/accounts',
+                    'route': '/api/v1/users/{user_id}/accounts',
+                    'status_code': 200,
+                    'duration_ms': 182.4,
+                    'trigger': 'sample',
+                    'created_at': '2025-01-01T12:00:00+00:00',
+                    'frames': [
+                        {
+                            'function': 'app/crud/accounts.py:88(list_for_user)',
+                            'calls': 1,
+                            'primitive_calls': 1,
+                            'total_ms': 0.21,
+                            'cumulative_ms': 151.7,
+                        }
+                    ],
+                }
+            }
+        },
+    }
+
+    SLOW_QUERIES_200 = {
+        'description': 'Последние медленные SQL-выражения',
+        'content': {
+            'application/json': {
+                'example': [
+                    {
+                        'id': 42,
+                        'statement': 'SELECT payments.id, payments.amount FROM payments '
+                        'WHERE payments.user_id = $1::INTEGER ORDER BY payments.created_at',
+                        'parameters': ['<int>'],
+                        'duration_ms': 412.7,
+                        'executemany': False,
+                        'captured_at': '2025-01-01T12:00:00+00:00',
+                        'plan': 'Sort  (cost=1520.33..1532.41 rows=4832 width=24)\n'
+                        '  ->  Seq Scan on payments  (cost=0.00..1224.40 rows=4832 width=24)',
+                        'plan_error': None,
+                    }
+                ]
+            }
+        },
+    }
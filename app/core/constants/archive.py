@@ -0,0 +1,29 @@
+"""Константы холодного архива платежей."""
+
+from __future__ import annotations
+
+
+class PaymentArchiveFiles:
+    """Имена и формат файлов архива платежей.
+
+    Сегмент — gzip-файл JSON Lines с платежами одного прохода архивации;
+    рядом лежит индекс сегмента (JSON) с позициями строк по `user_id` и
+    `transaction_id`. Индекс записывается после сегмента, поэтому сегмент без
+    индекса считается незавершённым и не читается. Позиции строк пользователя
+    хранятся вместе с `id` и `created_at` платежа.
+
+    В памяти читателя от индекса остаётся фильтр Блума по ключам
+    `TRANSACTION_KEY`/`USER_KEY`: `FILTER_BITS_PER_KEY` бит на ключ и
+    `FILTER_HASHES` хеш-функций, около 0,05% ложных срабатываний.
+    """
+
+    FORMAT_VERSION = 2
+    SEGMENT_TEMPLATE = 'payments-{number:08d}.jsonl.gz'
+    INDEX_TEMPLATE = 'payments-{number:08d}.idx.json'
+    INDEX_PATTERN = r'^payments-(\d{8})\.idx\.json$'
+    TMP_SUFFIX = '.tmp'
+    COMPRESS_LEVEL = 6
+    FILTER_BITS_PER_KEY = 16
+    FILTER_HASHES = 11
+    TRANSACTION_KEY = 't:{}'
+    USER_KEY = 'u:{}'
@@ -0,0 +1,13 @@
+"""Области объединения одинаковых чтений."""
+
+from __future__ import annotations
+
+
+class CoalescingScopes:
+    """Имена областей `SingleFlight`, инвалидируемых записями.
+
+    Область объекта модели строится `CRUDBase.coalescing_scope`; здесь —
+    области составных чтений.
+    """
+
+    USER_ACCOUNTS = 'user_accounts'
@@ -8,3 +8,5 @@ class DomainConstraints:
 
     MIN_ID: int = 1
     NO_ACCOUNT: int = 0
+    # Пространство ключей зачислений переводов в платежах; вебхук такие ключи отклоняет
+    TRANSFER_CREDIT_PREFIX: str = 'transfer:'
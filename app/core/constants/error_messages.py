@@ -37,7 +37,17 @@ class ErrorMessages:
     ACCESS_DENIED = 'Доступ запрещён'
 
     USER_NOT_FOUND = 'Пользователь не найден'
+    ACCOUNT_NOT_FOUND = 'Счёт не найден'
+    INSUFFICIENT_FUNDS = 'Недостаточно средств на счёте'
+    TRANSFER_SAME_ACCOUNT = 'Счёт списания и счёт зачисления совпадают'
+    PURGE_JOB_NOT_FOUND = 'Задача очистки не найдена'
+    RECONCILIATION_JOB_NOT_FOUND = 'Задача сверки балансов не найдена'
+    PROFILING_DISABLED = 'Профилирование запросов выключено'
+    PROFILE_NOT_FOUND = 'Профиль запроса не найден'
+    SLOW_QUERY_LOG_DISABLED = 'Журнал медленных SQL-выражений выключен'
     TRANSACTION_ALREADY_PROCESSED = 'Транзакция уже обработана'
     INVALID_CREDENTIALS = 'Неверные учетные данные'
     EMAIL_ALREADY_EXISTS = 'Email уже используется'
     DB_CONNECTION_ERROR = 'Ошибка подключения к БД'
+    TOO_MANY_REQUESTS = 'Слишком много запросов, повторите позже'
+    SERVICE_OVERLOADED = 'Сервис перегружен, повторите позже'
@@ -0,0 +1,24 @@
+"""Константы потока событий счетов (Server-Sent Events)."""
+
+from __future__ import annotations
+
+
+class AccountEventKinds:
+    """Типы событий потока счетов (поле `event` в SSE)."""
+
+    BALANCE = 'balance'
+    PAYMENT = 'payment'
+    # Очередь подписчика переполнена: клиент перечитывает счета и переподключается
+    RESYNC = 'resync'
+
+
+class ServerSentEvents:
+    """Параметры протокола SSE."""
+
+    MEDIA_TYPE = 'text/event-stream'
+    KEEPALIVE = b': keep-alive\n\n'
+    HEADERS = {
+        'Cache-Control': 'no-cache',
+        # Отключает буферизацию ответа в nginx
+        'X-Accel-Buffering': 'no',
+    }
@@ -13,6 +13,8 @@ class FieldConstraints:
     # Транзакции
     TRANSACTION_ID_MIN_LENGTH: int = 1
     TRANSACTION_ID_MAX_LENGTH: int = 64  # UUID + дополнительные символы
+    # Зачисление перевода хранится в платежах с префиксом `TRANSFER_CREDIT_PREFIX`
+    TRANSFER_TRANSACTION_ID_MAX_LENGTH: int = 55
 
     # Пользователь
     USER_EMAIL_MIN_LENGTH: int = 5  # a@b.c
@@ -0,0 +1,18 @@
+"""Константы фоновых задач."""
+
+from __future__ import annotations
+
+
+class PurgeJobStatus:
+    """Статусы задачи фоновой очистки пользователя."""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    ACTIVE = frozenset({PENDING, RUNNING})
+
+
+class ReconciliationJobStatus(PurgeJobStatus):
+    """Статусы задачи сверки балансов (те же, что у задачи очистки)."""
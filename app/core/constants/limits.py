@@ -0,0 +1,22 @@
+"""Константы ограничения частоты запросов и сброса нагрузки."""
+
+from __future__ import annotations
+
+
+class RouteLimitNames:
+    """Имена маршрутов с ограничением нагрузки (ключи счётчиков отказов)."""
+
+    AUTH_LOGIN = 'auth_login'
+    WEBHOOK_PAYMENT = 'webhook_payment'
+
+
+class LimitScopes:
+    """Области ключей token bucket и причины отказов."""
+
+    IP = 'ip'
+    EMAIL = 'email'
+    SOURCE = 'source'
+    OVERLOAD = 'overload'
+
+    UNKNOWN_CLIENT = 'unknown'
+    RETRY_AFTER_HEADER = 'Retry-After'
@@ -0,0 +1,44 @@
+"""Константы мониторинга: цикл событий, профилирование запросов и медленные SQL."""
+
+from __future__ import annotations
+
+
+class EventLoopLag:
+    """Параметры гистограммы задержки цикла событий."""
+
+    # Верхние границы корзин гистограммы, мс (последняя корзина — `+Inf`)
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+    INF_BUCKET = '+Inf'
+
+
+class RequestProfiling:
+    """Заголовки и файлы профилирования запросов."""
+
+    # Заголовок с токеном профилирования, выданным администратору
+    TOKEN_HEADER = 'X-Profile-Token'
+    # Заголовок ответа с идентификатором сохранённого профиля
+    ID_HEADER = 'X-Profile-Id'
+    # Claim `scope` токена профилирования и контекст ключа его подписи
+    TOKEN_SCOPE = 'profile'
+    KEY_CONTEXT = b'balance-hub:request-profiling'
+    # Причины профилирования запроса
+    TRIGGER_TOKEN = 'token'
+    TRIGGER_SAMPLE = 'sample'
+    # Файлы профиля: статистика pstats и описание запроса
+    STATS_SUFFIX = '.pstats'
+    META_SUFFIX = '.json'
+
+
+class SlowQueries:
+    """Параметры журнала медленных SQL-выражений."""
+
+    # Параметр выполнения соединения плана: его выражения не попадают в журнал
+    EXPLAIN_OPTION = 'slow_query_explain'
+    # Выражения, для которых строится план выполнения
+    EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH')
+    # Блокирующее чтение: план для него не строится, чтобы не брать блокировки строк
+    LOCKING_PATTERN = r'\bFOR\s+(?:NO\s+KEY\s+UPDATE|KEY\s+SHARE|UPDATE|SHARE)\b'
+    # Причины отсутствия плана
+    PLAN_NOT_EXPLAINABLE = 'План для этого выражения не строится'
+    PLAN_SKIPPED = 'Пропущено: уже строятся другие планы'
+    PLAN_LOCKING = 'План для блокирующего выражения (FOR UPDATE/FOR SHARE) не строится'
@@ -18,3 +18,10 @@ class PaginationParamDescriptions:
 
     LIMIT = 'Максимум записей'
     OFFSET = 'Смещение'
+
+
+class PeriodParamDescriptions:
+    """Описание параметров периода для OpenAPI."""
+
+    CREATED_FROM = 'Начало периода по времени создания (включительно)'
+    CREATED_TO = 'Конец периода по времени создания (не включительно)'
@@ -0,0 +1,25 @@
+"""Константы помесячного секционирования таблицы платежей."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+
+class PaymentPartitions:
+    """Параметры секций `payments` (PostgreSQL, RANGE по `created_at`).
+
+    Границы `MIN_CREATED_AT`/`MAX_CREATED_AT` подставляются в запросы без
+    явного периода только ради одного текста запроса: такие запросы читают все
+    секции. Секции отсекаются, когда вызывающий код задаёт период.
+    """
+
+    TABLE = 'payments'
+    TRANSACTION_IDS_TABLE = 'payment_transaction_ids'
+    DEFAULT_NAME = 'payments_default'
+    MOVED_TABLE = 'payments_moved'
+    NAME_TEMPLATE = 'payments_p{year:04d}_{month:02d}'
+    NAME_PATTERN = r'^payments_p(\d{4})_(\d{2})$'
+    LOCK_TIMEOUT = '5s'
+
+    MIN_CREATED_AT = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    MAX_CREATED_AT = datetime(9999, 1, 1, tzinfo=timezone.utc)
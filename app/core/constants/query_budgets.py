@@ -0,0 +1,66 @@
+"""Бюджеты SQL-выражений на запрос для маршрутов API."""
+
+from __future__ import annotations
+
+
+class QueryBudgets:
+    """Максимум SQL-выражений, которые маршрут выполняет за один запрос.
+
+    Бюджет объявляется у маршрута (`openapi_extra`) и проверяется тестами по
+    заголовкам ответа; в режиме отладки превышение пишется в лог.
+    """
+
+    OPENAPI_KEY = 'x-query-budget'
+    COUNT_HEADER = 'X-DB-Query-Count'
+    BUDGET_HEADER = 'X-DB-Query-Budget'
+
+    # Аутентификация: поиск пользователя по email
+    AUTH_LOGIN = 1
+
+    # Проверки доступности
+    HEALTH_APP = 0
+    # Без свежего фонового замера проба сама выполняет SELECT 1
+    HEALTH_DB = 1
+    HEALTH_READY = 1
+
+    # Пользователи: текущий пользователь + операция
+    USERS_ME = 1
+    ADMIN_USERS_CREATE = 3
+    ADMIN_USERS_LIST = 2
+    ADMIN_USERS_GET = 2
+    ADMIN_USERS_UPDATE = 4
+    ADMIN_USERS_DELETE = 3
+    ADMIN_USERS_PURGE = 2
+    ADMIN_PURGE_JOB_GET = 1
+
+    # Счета: текущий пользователь, проверка владельца (для админа) и выборка
+    ACCOUNTS_LIST_ABAC = 3
+    ADMIN_CREATE_ACCOUNT = 3
+
+    # Списание: текущий пользователь, условный UPDATE (на SQLite — чтение версии и
+    # запись) и строка списания; при отказе вместо вставки — поиск дубля и счёта
+    ACCOUNT_DEBIT = 5
+
+    # Перевод: текущий пользователь, блокировка обоих счетов, обновление балансов,
+    # списание и платёж
+    ACCOUNT_TRANSFER = 5
+
+    # Поток событий: только текущий пользователь, дальше события идут без БД
+    ME_ACCOUNT_EVENTS = 1
+
+    # Сверка балансов: только текущий пользователь, работа идёт в фоне
+    ADMIN_RECONCILIATION = 1
+    ADMIN_RECONCILIATION_JOB_GET = 1
+
+    # Профилирование и медленные SQL: только текущий пользователь, данные вне БД
+    ADMIN_PROFILING_TOKEN = 1
+    ADMIN_PROFILES_LIST = 1
+    ADMIN_PROFILE_GET = 1
+    ADMIN_SLOW_QUERIES = 1
+
+    # Платежи: текущий пользователь + страница платежей
+    PAYMENTS_LIST = 2
+
+    # Вебхук: дубль, счёт (или upsert по умолчанию с проверкой пользователя),
+    # платёж, баланс
+    WEBHOOK_PAYMENT = 5
@@ -0,0 +1,308 @@
+"""Контейнер зависимостей уровня приложения.
+
+Все объекты без состояния запроса (настройки, CRUD, валидаторы, сервисы,
+кэши и лимиты) создаются один раз при сборке приложения и хранятся в
+`app.state.container`. DI-провайдеры лишь возвращают готовые экземпляры,
+поэтому разрешение зависимостей не создаёт объектов на запрос и не уходит
+в пул потоков, как это происходит с синхронными `def`-провайдерами FastAPI.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache import (
+    BalanceCache,
+    InvalidationBus,
+    OwnershipIndex,
+    SingleFlight,
+    build_balance_cache,
+    build_invalidation_bus,
+    build_ownership_index,
+    build_single_flight,
+)
+from app.core.config import Settings
+from app.core.limits import RouteLimits, build_route_limits
+from app.core.loop_monitor import EventLoopMonitor, build_event_loop_monitor
+from app.core.profiling import RequestProfiler, build_request_profiler
+from app.crud.accounts import CRUDAccount, crud_account
+from app.crud.debits import crud_debit
+from app.crud.payments import CRUDPayment, crud_payment
+from app.crud.users import CRUDUser, crud_user
+from app.db.archive import build_payment_archive
+from app.db.slow_queries import SlowQueryLog, build_slow_query_log
+from app.events import AccountEventHub, build_account_event_hub
+from app.services.accounts import AccountService
+from app.services.auth import AuthService
+from app.services.health import HealthMonitor
+from app.services.ledger import LedgerCheckpointer
+from app.services.partitions import PaymentPartitionService
+from app.services.payments import PaymentService
+from app.services.purge import UserPurgeService
+from app.services.reconciliation import BalanceReconciliationService
+from app.services.transfers import TransferService
+from app.services.users import UserService
+from app.services.webhook import WebhookService
+from app.validators.async_ import UserAsyncValidator
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ServiceContainer:
+    """Готовые зависимости приложения.
+
+    Атрибуты:
+        settings: Настройки приложения.
+        users_crud: CRUD пользователей.
+        accounts_crud: CRUD счетов.
+        payments_crud: CRUD платежей (с архивом, если он настроен).
+        user_validator: Асинхронный валидатор пользователей.
+        invalidation_bus: Шина инвалидаций процессных кэшей между воркерами.
+        balance_cache: Кэш балансов или None.
+        ownership_index: Индекс владения счетами или None.
+        read_flights: Реестр объединения одинаковых чтений или None.
+        account_events: Хаб событий счетов для SSE-подписчиков.
+        route_limits: Реестр лимитов нагрузки или None.
+        user_service: Сервис пользователей.
+        account_service: Сервис счетов.
+        payment_service: Сервис платежей.
+        auth_service: Сервис аутентификации.
+        webhook_service: Сервис вебхуков.
+        transfer_service: Сервис переводов между счетами.
+        purge_service: Сервис фоновой очистки пользователей.
+        partition_service: Сервис обслуживания секций платежей.
+        reconciliation_service: Сервис сверки балансов с платежами.
+        ledger_checkpointer: Контрольные точки балансов режима `ledger`.
+        health_monitor: Фоновые замеры состояния для проб доступности.
+        loop_monitor: Детектор блокировок цикла событий или None.
+        request_profiler: Профилировщик запросов или None.
+        slow_query_log: Журнал медленных SQL-выражений или None.
+        session_factory: Фабрика сессий для фоновых задач.
+    """
+
+    settings: Settings
+    users_crud: CRUDUser
+    accounts_crud: CRUDAccount
+    payments_crud: CRUDPayment
+    user_validator: UserAsyncValidator
+    invalidation_bus: InvalidationBus
+    balance_cache: BalanceCache | None
+    ownership_index: OwnershipIndex | None
+    read_flights: SingleFlight | None
+    account_events: AccountEventHub
+    route_limits: RouteLimits | None
+    user_service: UserService
+    account_service: AccountService
+    payment_service: PaymentService
+    auth_service: AuthService
+    webhook_service: WebhookService
+    transfer_service: TransferService
+    purge_service: UserPurgeService
+    partition_service: PaymentPartitionService
+    reconciliation_service: BalanceReconciliationService
+    ledger_checkpointer: LedgerCheckpointer
+    health_monitor: HealthMonitor
+    loop_monitor: EventLoopMonitor | None
+    request_profiler: RequestProfiler | None
+    slow_query_log: SlowQueryLog | None
+    session_factory: async_sessionmaker[AsyncSession]
+
+    @classmethod
+    def build(
+        cls,
+        settings: Settings,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> ServiceContainer:
+        """Собирает контейнер по настройкам приложения.
+
+        Args:
+            settings (Settings): Настройки приложения.
+            session_factory (async_sessionmaker | None): Фабрика сессий для фоновых
+                задач; по умолчанию — фабрика приложения.
+
+        Returns:
+            ServiceContainer: Контейнер с готовыми зависимостями.
+        """
+        if session_factory is None:
+            from app.db.session import AsyncSessionLocal
+
+            session_factory = AsyncSessionLocal
+        ledger = settings.balance_mode == 'ledger'
+        bus = build_invalidation_bus(settings)
+        balance_cache = None
+        if ledger and settings.balance_cache_enabled:
+            logger.warning('Кэш балансов не поддерживает режим ledger и отключён')
+        else:
+            balance_cache = build_balance_cache(settings, bus)
+        ownership = build_ownership_index(settings, bus)
+        flights = build_single_flight(settings)
+        if flights is not None:
+            bus.subscribe_reset(flights.clear)
+        events = build_account_event_hub(settings, bus)
+        loop_monitor = build_event_loop_monitor(settings)
+        archive = build_payment_archive(settings)
+        payments = crud_payment if archive is None else CRUDPayment(archive)
+        user_validator = UserAsyncValidator(crud_user, ownership)
+        lookback = None
+        if settings.payments_idempotency_lookback_days > 0:
+            lookback = timedelta(days=settings.payments_idempotency_lookback_days)
+        return cls(
+            settings=settings,
+            users_crud=crud_user,
+            accounts_crud=crud_account,
+            payments_crud=payments,
+            user_validator=user_validator,
+            invalidation_bus=bus,
+            balance_cache=balance_cache,
+            ownership_index=ownership,
+            read_flights=flights,
+            account_events=events,
+            route_limits=build_route_limits(settings),
+            user_service=UserService(
+                crud_user, user_validator, balance_cache, ownership, flights, bus=bus
+            ),
+            account_service=AccountService(
+                crud_account,
+                crud_user,
+                balance_cache,
+                ownership,
+                user_validator,
+                flights,
+                ledger=ledger,
+                payments_crud=payments,
+                events=events,
+                bus=bus,
+            ),
+            payment_service=PaymentService(payments),
+            auth_service=AuthService(crud_user, settings),
+            webhook_service=WebhookService(
+                crud_account,
+                payments,
+                user_validator,
+                balance_cache,
+                ownership,
+                flights,
+                idempotency_lookback=lookback,
+                ledger=ledger,
+                events=events,
+                bus=bus,
+            ),
+            transfer_service=TransferService(
+                crud_account,
+                payments,
+                crud_debit,
+                balance_cache,
+                flights,
+                ledger=ledger,
+                events=events,
+                bus=bus,
+            ),
+            purge_service=UserPurgeService(
+                session_factory,
+                crud_user,
+                crud_account,
+                payments,
+                user_validator,
+                batch_size=settings.user_purge_batch_size,
+                balance_cache=balance_cache,
+                ownership=ownership,
+                flights=flights,
+                bus=bus,
+            ),
+            partition_service=PaymentPartitionService(
+                session_factory,
+                months_ahead=settings.payments_partitions_months_ahead,
+                retention_months=settings.payments_partitions_retention_months,
+            ),
+            reconciliation_service=BalanceReconciliationService(
+                session_factory,
+                crud_account,
+                payments,
+                range_size=settings.reconciliation_range_size,
+                concurrency=settings.reconciliation_concurrency,
+                max_reported=settings.reconciliation_max_reported,
+                archive=archive,
+                checkpoint_path=settings.reconciliation_checkpoint_path,
+            ),
+            ledger_checkpointer=LedgerCheckpointer(
+                session_factory,
+                crud_account,
+                payments,
+                batch_size=settings.ledger_checkpoint_batch_size,
+                interval_seconds=settings.ledger_checkpoint_interval_seconds,
+            ),
+            health_monitor=HealthMonitor(
+                session_factory,
+                interval_seconds=settings.health_monitor_interval_seconds,
+                max_age_seconds=settings.health_monitor_max_age_seconds,
+                db_timeout_seconds=settings.health_monitor_db_timeout_seconds,
+                loop_monitor=loop_monitor,
+            ),
+            loop_monitor=loop_monitor,
+            request_profiler=build_request_profiler(settings),
+            slow_query_log=build_slow_query_log(settings),
+            session_factory=session_factory,
+        )
+
+    async def start(self) -> None:
+        """Запускает фоновые компоненты: шину инвалидаций, события, прогрев индекса и секции.
+
+        Ошибка прогрева не мешает старту: индекс остаётся пустым и дообучается
+        по мере запросов. Недостающие будущие секции платежей создаются, но не
+        отсоединяются: срок хранения применяет команда обслуживания. В режиме
+        `ledger` запускается цикл контрольных точек балансов, а в режиме `row`
+        однократно учитываются платежи, оставшиеся от режима `ledger`. Фоновые
+        замеры состояния запускаются последними, когда приложение готово.
+        Журнал медленных выражений подключается к движку фабрики сессий первым.
+        """
+        if self.slow_query_log is not None:
+            self.slow_query_log.install(self.session_factory.kw['bind'])
+        await self.invalidation_bus.start()
+        await self.account_events.start()
+        if self.ownership_index is not None:
+            try:
+                await self.ownership_index.warm(
+                    self.session_factory,
+                    batch_size=self.settings.ownership_index_warm_batch_size,
+                )
+            except Exception:  # noqa: BLE001 - индекс работает и без прогрева
+                logger.exception('Не удалось прогреть индекс владения счетами')
+        if self.settings.payments_partitions_ensure_on_start:
+            try:
+                await self.partition_service.ensure_future()
+            except Exception:  # noqa: BLE001 - секции создаёт и команда обслуживания
+                logger.exception('Не удалось создать секции платежей')
+        if self.settings.balance_mode == 'ledger':
+            self.ledger_checkpointer.start()
+        else:
+            try:
+                await self.ledger_checkpointer.run_once()
+            except Exception:  # noqa: BLE001 - платежи учтёт скрипт или следующий старт
+                logger.exception('Не удалось учесть платежи режима ledger')
+        if self.loop_monitor is not None:
+            self.loop_monitor.start()
+        if self.settings.health_monitor_enabled:
+            self.health_monitor.start()
+
+    async def stop(self) -> None:
+        """Останавливает фоновые компоненты и пишет в лог итоги объединения чтений и лимитов."""
+        await self.health_monitor.stop()
+        if self.loop_monitor is not None:
+            await self.loop_monitor.stop()
+        await self.purge_service.stop()
+        await self.reconciliation_service.stop()
+        await self.ledger_checkpointer.stop()
+        if self.read_flights is not None:
+            logger.info('Объединение чтений: %s', self.read_flights.stats())
+        if self.route_limits is not None:
+            logger.info('Лимиты маршрутов: %s', self.route_limits.stats())
+        await self.invalidation_bus.stop()
+        await self.account_events.stop()
+        if self.slow_query_log is not None:
+            await self.slow_query_log.uninstall()
@@ -1,12 +1,22 @@
 """Пакет DI провайдеров для FastAPI."""
 
 from .auth import get_current_admin, get_current_user
+from .cache import get_balance_cache, get_read_flights
+from .container import get_app_settings, get_container
 from .crud import get_account_crud, get_payment_crud, get_user_crud
+from .events import get_account_events
+from .limits import get_route_limits, limit_login, limit_webhook
 from .policies import require_self_or_admin_user
 from .services import (
     get_account_service,
     get_auth_service,
+    get_health_monitor,
     get_payment_service,
+    get_reconciliation_service,
+    get_request_profiler,
+    get_slow_query_log,
+    get_transfer_service,
+    get_user_purge_service,
     get_user_service,
     get_webhook_service,
 )
@@ -16,14 +26,28 @@ from .validators import get_user_async_validator
 __all__ = [
     'get_current_admin',
     'get_current_user',
+    'get_balance_cache',
+    'get_read_flights',
+    'get_app_settings',
+    'get_container',
+    'get_account_events',
     'get_account_crud',
     'get_payment_crud',
     'get_user_crud',
     'get_account_service',
     'get_auth_service',
+    'get_health_monitor',
     'get_payment_service',
+    'get_reconciliation_service',
+    'get_request_profiler',
+    'get_slow_query_log',
+    'get_transfer_service',
+    'get_user_purge_service',
     'get_user_service',
     'get_webhook_service',
     'get_user_async_validator',
+    'get_route_limits',
+    'limit_login',
+    'limit_webhook',
     'require_self_or_admin_user',
 ]
@@ -5,13 +5,16 @@ from __future__ import annotations
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import Settings, get_settings
+from app.cache import SingleFlight
+from app.core.config import Settings
 from app.core.constants.api_paths import AuthPaths
 from app.core.constants.auth import AuthConstants
 from app.core.constants.error_messages import ErrorMessages
+from app.core.deps.cache import get_read_flights
+from app.core.deps.container import get_app_settings
+from app.crud.users import crud_user
 from app.db.session import get_db_session
 from app.models import User
 
@@ -22,16 +25,21 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl=AuthPaths.TOKEN_URL)
 async def get_current_user(
     db: AsyncSession = Depends(get_db_session),
     token: str = Depends(oauth2_scheme),
-    settings: Settings = Depends(get_settings),
+    settings: Settings = Depends(get_app_settings),
+    flights: SingleFlight | None = Depends(get_read_flights),
 ) -> User:
     """Извлекает текущего пользователя из JWT-токена.
 
     Декодирует токен, валидирует subject и загружает пользователя из БД. При
     некорректных учётных данных возвращает 401 с заголовком `WWW-Authenticate`.
+    Одновременные запросы одного пользователя разделяют один `SELECT`, если
+    включено объединение чтений.
 
     Args:
         db (AsyncSession): Асинхронная сессия БД.
         token (str): JWT-токен из схемы OAuth2.
+        settings (Settings): Настройки приложения.
+        flights (SingleFlight | None): Реестр объединения чтений.
 
     Returns:
         User: Аутентифицированный пользователь.
@@ -53,8 +61,7 @@ async def get_current_user(
     except (JWTError, ValueError):
         raise credentials_exception
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    user = await crud_user.get_coalesced(db, user_id, flights)
     if user is None:
         raise credentials_exception
     return user
@@ -0,0 +1,32 @@
+"""DI провайдеры для процессных кэшей."""
+
+from __future__ import annotations
+
+from fastapi import Request
+
+from app.cache import BalanceCache, SingleFlight
+from app.core.deps.container import container_of
+
+
+async def get_balance_cache(request: Request) -> BalanceCache | None:
+    """Возвращает кэш балансов приложения.
+
+    Args:
+        request (Request): Текущий запрос.
+
+    Returns:
+        BalanceCache | None: Кэш или None, если он выключен.
+    """
+    return container_of(request).balance_cache
+
+
+async def get_read_flights(request: Request) -> SingleFlight | None:
+    """Возвращает реестр объединения одинаковых чтений.
+
+    Args:
+        request (Request): Текущий запрос.
+
+    Returns:
+        SingleFlight | None: Реестр или None, если объединение выключено.
+    """
+    return container_of(request).read_flights
@@ -0,0 +1,44 @@
+"""DI провайдеры контейнера зависимостей приложения."""
+
+from __future__ import annotations
+
+from fastapi import Request
+
+from app.core.config import Settings
+from app.core.container import ServiceContainer
+
+
+def container_of(request: Request) -> ServiceContainer:
+    """Возвращает контейнер приложения, обслуживающего запрос.
+
+    Args:
+        request (Request): Текущий запрос.
+
+    Returns:
+        ServiceContainer: Контейнер зависимостей.
+    """
+    return request.app.state.container
+
+
+async def get_container(request: Request) -> ServiceContainer:
+    """Возвращает контейнер зависимостей приложения.
+
+    Args:
+        request (Request): Текущий запрос.
+
+    Returns:
+        ServiceContainer: Контейнер зависимостей.
+    """
+    return container_of(request)
+
+
+async def get_app_settings(request: Request) -> Settings:
+    """Возвращает настройки, с которыми собрано приложение.
+
+    Args:
+        request (Request): Текущий запрос.
+
+    Returns:
+        Settings: Настройки приложения.
+    """
+    return container_of(request).settings
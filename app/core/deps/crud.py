@@ -2,18 +2,21 @@
 
 from __future__ import annotations
 
-from app.crud.accounts import CRUDAccount, crud_account
-from app.crud.payments import CRUDPayment, crud_payment
-from app.crud.users import CRUDUser, crud_user
+from fastapi import Request
 
+from app.core.deps.container import container_of
+from app.crud.accounts import CRUDAccount
+from app.crud.payments import CRUDPayment
+from app.crud.users import CRUDUser
 
-def get_user_crud() -> CRUDUser:
-    return crud_user
 
+async def get_user_crud(request: Request) -> CRUDUser:
+    return container_of(request).users_crud
 
-def get_account_crud() -> CRUDAccount:
-    return crud_account
 
+async def get_account_crud(request: Request) -> CRUDAccount:
+    return container_of(request).accounts_crud
 
-def get_payment_crud() -> CRUDPayment:
-    return crud_payment
+
+async def get_payment_crud(request: Request) -> CRUDPayment:
+    return container_of(request).payments_crud
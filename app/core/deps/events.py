@@ -0,0 +1,20 @@
+"""DI провайдеры для потоков событий."""
+
+from __future__ import annotations
+
+from fastapi import Request
+
+from app.core.deps.container import container_of
+from app.events import AccountEventHub
+
+
+async def get_account_events(request: Request) -> AccountEventHub:
+    """Возвращает хаб событий счетов приложения.
+
+    Args:
+        request (Request): Текущий запрос.
+
+    Returns:
+        AccountEventHub: Хаб событий счетов.
+    """
+    return container_of(request).account_events
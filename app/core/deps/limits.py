@@ -0,0 +1,79 @@
+"""DI провайдеры ограничения частоты запросов и сброса нагрузки."""
+
+from __future__ import annotations
+
+from typing import AsyncIterator
+
+from fastapi import Depends, Request
+
+from app.core.constants import LimitScopes, RouteLimitNames
+from app.core.deps.container import container_of
+from app.core.limits import RouteLimits
+from app.schemas import LoginRequest, WebhookPayment
+
+
+async def get_route_limits(request: Request) -> RouteLimits | None:
+    """Возвращает реестр лимитов приложения.
+
+    Args:
+        request (Request): Текущий запрос.
+
+    Returns:
+        RouteLimits | None: Реестр или None, если ограничение выключено.
+    """
+    return container_of(request).route_limits
+
+
+def _client_ip(request: Request) -> str:
+    return request.client.host if request.client else LimitScopes.UNKNOWN_CLIENT
+
+
+async def limit_login(
+    request: Request,
+    payload: LoginRequest,
+    limits: RouteLimits | None = Depends(get_route_limits),
+) -> AsyncIterator[None]:
+    """Ограничивает логин по IP клиента и email до проверки пароля.
+
+    Args:
+        request (Request): Текущий запрос.
+        payload (LoginRequest): Тело запроса логина.
+        limits (RouteLimits | None): Реестр лимитов.
+
+    Raises:
+        RateLimitedError: 429 при превышении частоты.
+        OverloadedError: 503 при превышении числа одновременных логинов.
+    """
+    if limits is None:
+        yield
+        return
+    keys = {LimitScopes.IP: _client_ip(request), LimitScopes.EMAIL: payload.email.lower()}
+    with limits.guard(RouteLimitNames.AUTH_LOGIN, keys):
+        yield
+
+
+async def limit_webhook(
+    request: Request,
+    payload: WebhookPayment,
+    limits: RouteLimits | None = Depends(get_route_limits),
+) -> AsyncIterator[None]:
+    """Ограничивает вебхук по источнику до проверки подписи и работы с БД.
+
+    Источник — IP клиента. Заголовки запроса не учитываются: до проверки подписи
+    их может подставить кто угодно и получать новую корзину на каждый запрос.
+
+    Args:
+        request (Request): Текущий запрос.
+        payload (WebhookPayment): Тело вебхука.
+        limits (RouteLimits | None): Реестр лимитов.
+
+    Raises:
+        RateLimitedError: 429 при превышении частоты.
+        OverloadedError: 503 при превышении числа одновременных вебхуков.
+    """
+    if limits is None:
+        yield
+        return
+    keys = {LimitScopes.SOURCE: _client_ip(request)}
+    with limits.guard(RouteLimitNames.WEBHOOK_PAYMENT, keys):
+        yield
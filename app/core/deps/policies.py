@@ -9,7 +9,7 @@ from app.core.deps.auth import get_current_user
 from app.models import User
 
 
-def require_self_or_admin_user(
+async def require_self_or_admin_user(
     user_id: int, current_user: User = Depends(get_current_user)
 ) -> None:
     """Проверяет доступ: текущий пользователь — владелец ресурса или администратор.
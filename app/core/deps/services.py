@@ -1,93 +1,168 @@
-"""DI провайдеры для сервисов приложения."""
+"""DI провайдеры для сервисов приложения.
+
+Сервисы не хранят состояния запроса и создаются один раз в контейнере
+приложения; провайдеры асинхронные, чтобы FastAPI не уводил их в пул потоков.
+"""
 
 from __future__ import annotations
 
-from fastapi import Depends
+from fastapi import Request
 
-from app.core.deps.crud import get_account_crud, get_payment_crud, get_user_crud
-from app.core.deps.validators import get_user_async_validator
-from app.crud.accounts import CRUDAccount
-from app.crud.payments import CRUDPayment
-from app.crud.users import CRUDUser
+from app.core.constants import ErrorMessages
+from app.core.deps.container import container_of
+from app.core.errors import NotFoundError
+from app.core.profiling import RequestProfiler
+from app.db.slow_queries import SlowQueryLog
 from app.services.accounts import AccountService
 from app.services.auth import AuthService
+from app.services.health import HealthMonitor
 from app.services.payments import PaymentService
+from app.services.purge import UserPurgeService
+from app.services.reconciliation import BalanceReconciliationService
+from app.services.transfers import TransferService
 from app.services.users import UserService
 from app.services.webhook import WebhookService
-from app.validators.async_ import UserAsyncValidator
 
 
-def get_user_service(
-    users_crud: CRUDUser = Depends(get_user_crud),
-    user_validator: UserAsyncValidator = Depends(get_user_async_validator),
-) -> UserService:
-    """Возвращает инстанс `UserService` с внедрёнными зависимостями.
+async def get_user_service(request: Request) -> UserService:
+    """Возвращает `UserService` из контейнера приложения.
 
     Args:
-        users_crud (CRUDUser): CRUD-уровень для пользователей.
-        user_validator (UserAsyncValidator): Асинхронный валидатор пользователей.
+        request (Request): Текущий запрос.
 
     Returns:
         UserService: Сервис пользователей.
     """
-    return UserService(users_crud, user_validator)
+    return container_of(request).user_service
 
 
-def get_account_service(
-    accounts_crud: CRUDAccount = Depends(get_account_crud),
-    users_crud: CRUDUser = Depends(get_user_crud),
-) -> AccountService:
-    """Возвращает инстанс `AccountService` с внедрёнными зависимостями.
+async def get_account_service(request: Request) -> AccountService:
+    """Возвращает `AccountService` из контейнера приложения.
 
     Args:
-        accounts_crud (CRUDAccount): CRUD-уровень для счетов.
-        users_crud (CRUDUser): CRUD-уровень для пользователей.
+        request (Request): Текущий запрос.
 
     Returns:
         AccountService: Сервис счетов.
     """
-    return AccountService(accounts_crud, users_crud)
+    return container_of(request).account_service
 
 
-def get_payment_service(
-    payments_crud: CRUDPayment = Depends(get_payment_crud),
-) -> PaymentService:
-    """Возвращает инстанс `PaymentService` с внедрёнными зависимостями.
+async def get_payment_service(request: Request) -> PaymentService:
+    """Возвращает `PaymentService` из контейнера приложения.
 
     Args:
-        payments_crud (CRUDPayment): CRUD-уровень для платежей.
+        request (Request): Текущий запрос.
 
     Returns:
         PaymentService: Сервис платежей.
     """
-    return PaymentService(payments_crud)
+    return container_of(request).payment_service
 
 
-def get_auth_service(users_crud: CRUDUser = Depends(get_user_crud)) -> AuthService:
-    """Возвращает инстанс `AuthService` с внедрёнными зависимостями.
+async def get_auth_service(request: Request) -> AuthService:
+    """Возвращает `AuthService` из контейнера приложения.
 
     Args:
-        users_crud (CRUDUser): CRUD-уровень для пользователей.
+        request (Request): Текущий запрос.
 
     Returns:
         AuthService: Сервис аутентификации.
     """
-    return AuthService(users_crud)
+    return container_of(request).auth_service
 
 
-def get_webhook_service(
-    accounts_crud: CRUDAccount = Depends(get_account_crud),
-    payments_crud: CRUDPayment = Depends(get_payment_crud),
-    user_validator: UserAsyncValidator = Depends(get_user_async_validator),
-) -> WebhookService:
-    """Возвращает инстанс `WebhookService` с внедрёнными зависимостями.
+async def get_webhook_service(request: Request) -> WebhookService:
+    """Возвращает `WebhookService` из контейнера приложения.
 
     Args:
-        accounts_crud (CRUDAccount): CRUD-уровень для счетов.
-        payments_crud (CRUDPayment): CRUD-уровень для платежей.
-        user_validator (UserAsyncValidator): Валидатор пользователей.
+        request (Request): Текущий запрос.
 
     Returns:
         WebhookService: Сервис вебхуков.
     """
-    return WebhookService(accounts_crud, payments_crud, user_validator)
+    return container_of(request).webhook_service
+
+
+async def get_user_purge_service(request: Request) -> UserPurgeService:
+    """Возвращает `UserPurgeService` из контейнера приложения.
+
+    Args:
+        request (Request): Текущий запрос.
+
+    Returns:
+        UserPurgeService: Сервис фоновой очистки пользователей.
+    """
+    return container_of(request).purge_service
+
+
+async def get_reconciliation_service(request: Request) -> BalanceReconciliationService:
+    """Возвращает `BalanceReconciliationService` из контейнера приложения.
+
+    Args:
+        request (Request): Текущий запрос.
+
+    Returns:
+        BalanceReconciliationService: Сервис сверки балансов.
+    """
+    return container_of(request).reconciliation_service
+
+
+async def get_transfer_service(request: Request) -> TransferService:
+    """Возвращает `TransferService` из контейнера приложения.
+
+    Args:
+        request (Request): Текущий запрос.
+
+    Returns:
+        TransferService: Сервис переводов между счетами.
+    """
+    return container_of(request).transfer_service
+
+
+async def get_health_monitor(request: Request) -> HealthMonitor:
+    """Возвращает `HealthMonitor` из контейнера приложения.
+
+    Args:
+        request (Request): Текущий запрос.
+
+    Returns:
+        HealthMonitor: Фоновые замеры состояния приложения.
+    """
+    return container_of(request).health_monitor
+
+
+async def get_request_profiler(request: Request) -> RequestProfiler:
+    """Возвращает `RequestProfiler` из контейнера приложения.
+
+    Args:
+        request (Request): Текущий запрос.
+
+    Returns:
+        RequestProfiler: Профилировщик запросов.
+
+    Raises:
+        NotFoundError: Если профилирование запросов выключено.
+    """
+    profiler = container_of(request).request_profiler
+    if profiler is None:
+        raise NotFoundError(ErrorMessages.PROFILING_DISABLED)
+    return profiler
+
+
+async def get_slow_query_log(request: Request) -> SlowQueryLog:
+    """Возвращает `SlowQueryLog` из контейнера приложения.
+
+    Args:
+        request (Request): Текущий запрос.
+
+    Returns:
+        SlowQueryLog: Журнал медленных SQL-выражений.
+
+    Raises:
+        NotFoundError: Если журнал медленных выражений выключен.
+    """
+    log = container_of(request).slow_query_log
+    if log is None:
+        raise NotFoundError(ErrorMessages.SLOW_QUERY_LOG_DISABLED)
+    return log
@@ -2,22 +2,19 @@
 
 from __future__ import annotations
 
-from fastapi import Depends
+from fastapi import Request
 
-from app.core.deps.crud import get_user_crud
-from app.crud.users import CRUDUser
+from app.core.deps.container import container_of
 from app.validators.async_ import UserAsyncValidator
 
 
-def get_user_async_validator(
-    users_crud: CRUDUser = Depends(get_user_crud),
-) -> UserAsyncValidator:
+async def get_user_async_validator(request: Request) -> UserAsyncValidator:
     """Возвращает асинхронный валидатор пользователей.
 
     Args:
-        users_crud (CRUDUser): CRUD-уровень для пользователей.
+        request (Request): Текущий запрос.
 
     Returns:
         UserAsyncValidator: Валидатор для асинхронных проверок инвариантов.
     """
-    return UserAsyncValidator(users_crud)
+    return container_of(request).user_validator
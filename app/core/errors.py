@@ -1,44 +1,170 @@
-"""Доменные исключения и маппинг в HTTP ошибки."""
+"""Доменные исключения и маппинг в HTTP ошибки.
+
+Маппинг табличный: каждый класс `DomainError` регистрируется декоратором
+`register_domain_error` со своим HTTP-статусом и сообщением по умолчанию. Поиск
+идёт по MRO класса исключения, результат кэшируется на конкретный класс, а
+JSON-тела ответов для повторяющихся сообщений кодируются один раз.
+"""
 
 from __future__ import annotations
 
-from fastapi import HTTPException, status
+import json
+import math
+from functools import lru_cache
+from typing import Callable, NamedTuple, TypeVar
+
+from fastapi import HTTPException, Response, status
 
 from app.core.constants.error_messages import ErrorMessages
+from app.core.constants.limits import LimitScopes
+
+
+ErrorT = TypeVar('ErrorT', bound=type['DomainError'])
+
+# Размер кэша предкодированных тел: сообщения ошибок — конечный набор констант
+ENCODED_BODY_CACHE_SIZE = 1024
+
+
+class ErrorSpec(NamedTuple):
+    """HTTP-представление доменной ошибки.
+
+    Атрибуты:
+        status_code: HTTP-статус ответа.
+        default_detail: Сообщение, если исключение создано без текста.
+    """
+
+    status_code: int
+    default_detail: str
+
+
+_registry: dict[type[BaseException], ErrorSpec] = {}
+_resolved: dict[type[BaseException], ErrorSpec] = {}
+
 
+def register_domain_error(status_code: int, default_detail: str) -> Callable[[ErrorT], ErrorT]:
+    """Регистрирует класс доменной ошибки в таблице HTTP-маппинга.
 
+    Наследники зарегистрированного класса получают его статус, пока не
+    зарегистрируют собственный.
+
+    Args:
+        status_code (int): HTTP-статус ответа.
+        default_detail (str): Сообщение по умолчанию для исключения без текста.
+
+    Returns:
+        Callable: Декоратор класса, возвращающий класс без изменений.
+    """
+
+    def decorator(cls: ErrorT) -> ErrorT:
+        _registry[cls] = ErrorSpec(status_code, default_detail)
+        _resolved.clear()
+        return cls
+
+    return decorator
+
+
+def resolve_error_spec(err_type: type[BaseException]) -> ErrorSpec:
+    """Находит HTTP-представление для класса ошибки по его MRO.
+
+    Args:
+        err_type (type[BaseException]): Класс доменного исключения.
+
+    Returns:
+        ErrorSpec: Статус и сообщение по умолчанию ближайшего зарегистрированного предка.
+    """
+    spec = _resolved.get(err_type)
+    if spec is None:
+        spec = next(
+            (_registry[klass] for klass in err_type.__mro__ if klass in _registry),
+            _registry[DomainError],
+        )
+        _resolved[err_type] = spec
+    return spec
+
+
+@lru_cache(maxsize=ENCODED_BODY_CACHE_SIZE)
+def _encode_error_body(detail: str) -> bytes:
+    """Кодирует тело ошибки так же, как `JSONResponse`, и кэширует результат."""
+    return json.dumps(
+        {'detail': detail}, ensure_ascii=False, allow_nan=False, indent=None, separators=(',', ':')
+    ).encode('utf-8')
+
+
+@register_domain_error(status.HTTP_400_BAD_REQUEST, ErrorMessages.INVALID_PARAMS)
 class DomainError(Exception):
     """Базовое доменное исключение.
 
     Является родительским для прикладных ошибок домена, которые затем
     транслируются в HTTP-исключения на API-слое.
+
+    Атрибуты:
+        headers: Дополнительные HTTP-заголовки ответа (например, `Retry-After`).
     """
 
+    headers: dict[str, str] | None = None
+
 
+@register_domain_error(status.HTTP_404_NOT_FOUND, ErrorMessages.NOT_FOUND)
 class NotFoundError(DomainError):
     """Обозначает отсутствие запрошенного объекта."""
 
 
+@register_domain_error(status.HTTP_403_FORBIDDEN, ErrorMessages.FORBIDDEN)
 class ForbiddenError(DomainError):
     """Обозначает запрет на выполнение операции/доступ."""
 
 
+@register_domain_error(status.HTTP_401_UNAUTHORIZED, ErrorMessages.NOT_AUTHENTICATED)
 class AuthError(DomainError):
     """Обозначает ошибку аутентификации/учётных данных."""
 
 
+@register_domain_error(status.HTTP_400_BAD_REQUEST, ErrorMessages.INVALID_PARAMS)
 class ValidationError(DomainError):
     """Обозначает ошибку валидации входных данных."""
 
 
+@register_domain_error(status.HTTP_503_SERVICE_UNAVAILABLE, ErrorMessages.DB_CONNECTION_ERROR)
 class ServiceUnavailableError(DomainError):
     """Обозначает временную недоступность сервиса (например, БД)."""
 
 
+@register_domain_error(status.HTTP_409_CONFLICT, ErrorMessages.TRANSACTION_ALREADY_PROCESSED)
 class DuplicateTransactionError(DomainError):
     """Обозначает попытку создать дублирующую транзакцию."""
 
 
+@register_domain_error(status.HTTP_409_CONFLICT, ErrorMessages.INSUFFICIENT_FUNDS)
+class InsufficientFundsError(DomainError):
+    """Обозначает списание, превышающее баланс счёта."""
+
+
+@register_domain_error(status.HTTP_429_TOO_MANY_REQUESTS, ErrorMessages.TOO_MANY_REQUESTS)
+class RateLimitedError(DomainError):
+    """Обозначает превышение лимита частоты запросов."""
+
+    def __init__(self, *args: object, retry_after: float | None = None) -> None:
+        """Инициализирует ошибку.
+
+        Args:
+            *args: Аргументы исключения (сообщение).
+            retry_after (float | None): Через сколько секунд можно повторить запрос.
+        """
+        super().__init__(*args)
+        if retry_after is not None:
+            self.headers = {LimitScopes.RETRY_AFTER_HEADER: str(max(1, math.ceil(retry_after)))}
+
+
+@register_domain_error(status.HTTP_503_SERVICE_UNAVAILABLE, ErrorMessages.SERVICE_OVERLOADED)
+class OverloadedError(ServiceUnavailableError):
+    """Обозначает сброс нагрузки: превышен лимит одновременных запросов."""
+
+
+def _status_and_detail(err: DomainError) -> tuple[int, str]:
+    spec = resolve_error_spec(type(err))
+    return spec.status_code, str(err) or spec.default_detail
+
+
 def to_http_exc(err: DomainError) -> HTTPException:
     """Преобразует доменную ошибку в HTTPException.
 
@@ -48,24 +174,23 @@ def to_http_exc(err: DomainError) -> HTTPException:
     Returns:
         HTTPException: Соответствующая HTTP-ошибка.
     """
-    if isinstance(err, NotFoundError):
-        detail = str(err) if str(err) else ErrorMessages.NOT_FOUND
-        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
-    if isinstance(err, ForbiddenError):
-        detail = str(err) if str(err) else ErrorMessages.FORBIDDEN
-        return HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
-    if isinstance(err, AuthError):
-        detail = str(err) if str(err) else ErrorMessages.NOT_AUTHENTICATED
-        return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
-    if isinstance(err, ValidationError):
-        detail = str(err) if str(err) else ErrorMessages.INVALID_PARAMS
-        return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
-    if isinstance(err, ServiceUnavailableError):
-        detail = str(err) if str(err) else ErrorMessages.DB_CONNECTION_ERROR
-        return HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
-    if isinstance(err, DuplicateTransactionError):
-        detail = str(err) if str(err) else ErrorMessages.TRANSACTION_ALREADY_PROCESSED
-        return HTTPException(status_code=status.HTTP_409_CONFLICT, detail=detail)
-    # Fallback: 400 с общим сообщением
-    detail = str(err) if str(err) else ErrorMessages.INVALID_PARAMS
-    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+    status_code, detail = _status_and_detail(err)
+    return HTTPException(status_code=status_code, detail=detail, headers=err.headers)
+
+
+def to_error_response(err: DomainError) -> Response:
+    """Строит JSON-ответ для доменной ошибки из предкодированного тела.
+
+    Args:
+        err: Исключение доменного слоя.
+
+    Returns:
+        Response: Ответ `{"detail": ...}` с соответствующим статусом.
+    """
+    status_code, detail = _status_and_detail(err)
+    return Response(
+        content=_encode_error_body(detail),
+        status_code=status_code,
+        headers=err.headers,
+        media_type='application/json',
+    )
@@ -0,0 +1,240 @@
+"""Ограничение частоты запросов (token bucket) и сброс нагрузки.
+
+Каждый защищённый маршрут описывается `RoutePolicy`: набор token bucket по
+областям ключей (IP клиента, email, источник вебхука) и ограничитель
+одновременных запросов. Проверка выполняется до дорогой работы маршрута
+(bcrypt, транзакция БД); отказы отдаются как 429/503 и учитываются в счётчиках.
+
+Состояние хранится в памяти процесса, поэтому лимиты действуют на воркер.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Iterator, Mapping
+
+from app.core.constants import LimitScopes, RouteLimitNames
+from app.core.errors import OverloadedError, RateLimitedError
+
+
+if TYPE_CHECKING:
+    from app.core.config import Settings
+
+
+class TokenBucketLimiter:
+    """Token bucket с отдельной корзиной на каждый ключ.
+
+    Корзины хранятся в LRU ограниченного размера: вытесненный ключ
+    начинает с полной корзины, что допустимо для защиты от всплесков.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        *,
+        max_keys: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Инициализирует лимитер.
+
+        Args:
+            rate (float): Скорость пополнения, токенов в секунду.
+            burst (int): Ёмкость корзины (допустимый всплеск).
+            max_keys (int): Максимум отслеживаемых ключей.
+            clock (Callable[[], float]): Источник монотонного времени.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._clock = clock
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def acquire(self, key: str) -> float:
+        """Списывает токен для ключа.
+
+        Args:
+            key (str): Ключ корзины.
+
+        Returns:
+            float: 0, если запрос разрешён, иначе секунды до появления токена.
+        """
+        now = self._clock()
+        tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class ConcurrencyLimiter:
+    """Счётчик одновременных запросов с жёстким пределом (без очереди)."""
+
+    def __init__(self, max_in_flight: int) -> None:
+        """Инициализирует ограничитель.
+
+        Args:
+            max_in_flight (int): Максимум одновременно обрабатываемых запросов.
+        """
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+
+    @property
+    def saturated(self) -> bool:
+        """Достигнут ли предел одновременных запросов."""
+        return self.in_flight >= self.max_in_flight
+
+    def acquire(self) -> None:
+        """Занимает слот."""
+        self.in_flight += 1
+
+    def release(self) -> None:
+        """Освобождает слот."""
+        self.in_flight -= 1
+
+
+@dataclass
+class RoutePolicy:
+    """Политика нагрузки маршрута.
+
+    Атрибуты:
+        buckets: Token bucket по областям ключей (`ip`, `email`, `source`).
+        shedder: Ограничитель одновременных запросов или None.
+    """
+
+    buckets: dict[str, TokenBucketLimiter] = field(default_factory=dict)
+    shedder: ConcurrencyLimiter | None = None
+
+
+class RouteLimits:
+    """Реестр политик маршрутов и счётчики отказов."""
+
+    def __init__(self, policies: Mapping[str, RoutePolicy]) -> None:
+        """Инициализирует реестр.
+
+        Args:
+            policies (Mapping[str, RoutePolicy]): Политики по имени маршрута.
+        """
+        self.policies = dict(policies)
+        self.rejections: Counter[str] = Counter()
+
+    @contextmanager
+    def guard(self, route: str, keys: Mapping[str, str]) -> Iterator[None]:
+        """Пропускает запрос через лимиты маршрута и удерживает слот до выхода.
+
+        Сначала проверяется насыщение (отказ 503 не тратит токены), затем
+        корзины всех областей; слот конкурентности занимается последним.
+
+        Args:
+            route (str): Имя маршрута (`RouteLimitNames`).
+            keys (Mapping[str, str]): Ключи запроса по областям.
+
+        Raises:
+            OverloadedError: Если превышен лимит одновременных запросов.
+            RateLimitedError: Если исчерпана корзина хотя бы одной области.
+        """
+        policy = self.policies.get(route)
+        if policy is None:
+            yield
+            return
+
+        shedder = policy.shedder
+        if shedder is not None and shedder.saturated:
+            self.rejections[f'{route}:{LimitScopes.OVERLOAD}'] += 1
+            raise OverloadedError()
+
+        for scope, key in keys.items():
+            bucket = policy.buckets.get(scope)
+            if bucket is None:
+                continue
+            wait = bucket.acquire(key)
+            if wait:
+                self.rejections[f'{route}:{scope}'] += 1
+                raise RateLimitedError(retry_after=wait)
+
+        if shedder is None:
+            yield
+            return
+        shedder.acquire()
+        try:
+            yield
+        finally:
+            shedder.release()
+
+    def stats(self) -> dict:
+        """Возвращает счётчики отказов и текущую загрузку маршрутов.
+
+        Returns:
+            dict: `rejections` по `маршрут:причина` и `in_flight` по маршрутам.
+        """
+        return {
+            'rejections': dict(self.rejections),
+            'in_flight': {
+                route: policy.shedder.in_flight
+                for route, policy in self.policies.items()
+                if policy.shedder is not None
+            },
+        }
+
+
+def _build_policy(
+    buckets: Mapping[str, tuple[float, int]], max_in_flight: int, max_keys: int
+) -> RoutePolicy:
+    return RoutePolicy(
+        buckets={
+            scope: TokenBucketLimiter(rate, burst, max_keys=max_keys)
+            for scope, (rate, burst) in buckets.items()
+            if rate > 0
+        },
+        shedder=ConcurrencyLimiter(max_in_flight) if max_in_flight > 0 else None,
+    )
+
+
+def build_route_limits(settings: Settings) -> RouteLimits | None:
+    """Создаёт реестр лимитов по настройкам приложения.
+
+    Нулевая скорость или предел отключает соответствующий лимит.
+
+    Args:
+        settings (Settings): Настройки приложения.
+
+    Returns:
+        RouteLimits | None: Реестр или None, если ограничение выключено.
+    """
+    if not settings.rate_limit_enabled:
+        return None
+    max_keys = settings.rate_limit_max_keys
+    return RouteLimits(
+        {
+            RouteLimitNames.AUTH_LOGIN: _build_policy(
+                {
+                    LimitScopes.IP: (settings.auth_login_ip_rate, settings.auth_login_ip_burst),
+                    LimitScopes.EMAIL: (
+                        settings.auth_login_email_rate,
+                        settings.auth_login_email_burst,
+                    ),
+                },
+                settings.auth_login_max_in_flight,
+                max_keys,
+            ),
+            RouteLimitNames.WEBHOOK_PAYMENT: _build_policy(
+                {
+                    LimitScopes.SOURCE: (
+                        settings.webhook_source_rate,
+                        settings.webhook_source_burst,
+                    ),
+                },
+                settings.webhook_max_in_flight,
+                max_keys,
+            ),
+        }
+    )
@@ -0,0 +1,304 @@
+"""Детектор задержек цикла событий и блокирующих вызовов.
+
+Синхронная работа в корутине (хеширование bcrypt, разбор окружения,
+`hashlib` над большим телом запроса) останавливает весь воркер, а снаружи
+видна лишь как хвост задержек. `EventLoopMonitor` раз в `interval_seconds`
+засыпает в цикле событий и записывает, насколько пробуждение опоздало, в
+гистограмму. Параллельно сторожевой поток следит за пульсом цикла: если
+пробуждение опаздывает больше чем на `threshold_seconds`, он снимает стек
+потока цикла — это и есть блокирующий вызов. Места вызова агрегируются, а
+самые частые пишутся в лог раз в `report_interval_seconds` и при остановке.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from app.core.constants import EventLoopLag
+
+
+if TYPE_CHECKING:
+    from app.core.config import Settings
+
+
+logger = logging.getLogger(__name__)
+
+# Корень проекта: место блокировки ищется в его файлах, а не в библиотеках
+_PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+
+
+class LagHistogram:
+    """Кумулятивная гистограмма задержек в миллисекундах (как в Prometheus)."""
+
+    def __init__(self, buckets_ms: tuple[float, ...] = EventLoopLag.BUCKETS_MS) -> None:
+        """Инициализирует пустую гистограмму.
+
+        Args:
+            buckets_ms (tuple[float, ...]): Возрастающие верхние границы корзин.
+        """
+        self.buckets_ms = buckets_ms
+        self._counts = [0] * (len(buckets_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        """Учитывает одно измерение.
+
+        Args:
+            value_ms (float): Задержка в миллисекундах.
+        """
+        index = len(self.buckets_ms)
+        for i, bound in enumerate(self.buckets_ms):
+            if value_ms <= bound:
+                index = i
+                break
+        self._counts[index] += 1
+        self.count += 1
+        self.sum_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Возвращает корзины (число измерений не больше границы), сумму и максимум."""
+        buckets = {}
+        total = 0
+        for bound, count in zip(self.buckets_ms, self._counts):
+            total += count
+            buckets[str(bound)] = total
+        buckets[EventLoopLag.INF_BUCKET] = self.count
+        return {
+            'buckets': buckets,
+            'count': self.count,
+            'sum_ms': round(self.sum_ms, 3),
+            'max_ms': round(self.max_ms, 3),
+        }
+
+
+@dataclass
+class BlockingSite:
+    """Место блокирующего вызова и его статистика.
+
+    Атрибуты:
+        site: Файл, строка и функция в коде проекта.
+        stack: Стек первого захвата (для лога).
+        count: Сколько раз блокировка застала цикл в этом месте.
+        total_ms: Суммарная задержка цикла, приписанная месту.
+        max_ms: Наибольшая задержка цикла, приписанная месту.
+    """
+
+    site: str
+    stack: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class EventLoopMonitor:
+    """Измеряет задержку цикла событий и захватывает стеки блокирующих вызовов.
+
+    Атрибуты:
+        lag: Гистограмма задержек цикла событий.
+        captures: Число захваченных блокировок.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval_seconds: float,
+        threshold_seconds: float,
+        report_interval_seconds: float,
+        top_sites: int,
+        max_sites: int = 1000,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Инициализирует монитор.
+
+        Args:
+            interval_seconds (float): Период замера задержки.
+            threshold_seconds (float): Задержка, после которой снимается стек цикла.
+            report_interval_seconds (float): Период записи самых частых мест в лог.
+            top_sites (int): Сколько мест блокировки выводить в отчёте.
+            max_sites (int): Максимум различных мест в памяти; новые сверх него не учитываются.
+            clock (Callable[[], float]): Источник монотонного времени.
+        """
+        self.interval_seconds = interval_seconds
+        self.threshold_seconds = threshold_seconds
+        self.report_interval_seconds = report_interval_seconds
+        self.top_sites = top_sites
+        self.max_sites = max_sites
+        self.lag = LagHistogram()
+        self.captures = 0
+        self._clock = clock
+        self._sites: dict[str, BlockingSite] = {}
+        self._lock = threading.Lock()
+        self._heartbeat = 0.0
+        self._captured_heartbeat: float | None = None
+        self._stalled_site: str | None = None
+        self._reported_captures = 0
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    # --- Жизненный цикл ---
+
+    def start(self) -> None:
+        """Запускает замеры в текущем цикле событий и сторожевой поток."""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = self._clock()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._tick())
+        self._watchdog = threading.Thread(
+            target=self._watch, name='event-loop-watchdog', daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Останавливает замеры и пишет итоговый отчёт в лог."""
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+        self.log_report()
+
+    # --- Замеры ---
+
+    async def _tick(self) -> None:
+        reported_at = self._clock()
+        while True:
+            started = self._clock()
+            self._heartbeat = started
+            await asyncio.sleep(self.interval_seconds)
+            now = self._clock()
+            lag_ms = max(now - started - self.interval_seconds, 0.0) * 1000
+            self.lag.observe(lag_ms)
+            self._attribute(lag_ms)
+            if now - reported_at >= self.report_interval_seconds:
+                reported_at = now
+                if self.captures != self._reported_captures:
+                    self._reported_captures = self.captures
+                    self.log_report()
+
+    def _watch(self) -> None:
+        # Проверяем пульс чаще порога, чтобы застать блокировку до её окончания
+        period = min(self.threshold_seconds, self.interval_seconds) / 2
+        while not self._stopped.wait(period):
+            heartbeat = self._heartbeat
+            overdue = self._clock() - heartbeat - self.interval_seconds
+            if overdue > self.threshold_seconds and heartbeat != self._captured_heartbeat:
+                self._captured_heartbeat = heartbeat
+                self._capture()
+
+    def _capture(self) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame)
+        site = _call_site(stack)
+        with self._lock:
+            if site not in self._sites:
+                if len(self._sites) >= self.max_sites:
+                    return
+                self._sites[site] = BlockingSite(site, ''.join(stack.format()))
+            self._sites[site].count += 1
+            self.captures += 1
+            self._stalled_site = site
+
+    def _attribute(self, lag_ms: float) -> None:
+        with self._lock:
+            site, self._stalled_site = self._stalled_site, None
+            if site is None:
+                return
+            blocking = self._sites[site]
+            blocking.total_ms += lag_ms
+            blocking.max_ms = max(blocking.max_ms, lag_ms)
+
+    # --- Отчёты ---
+
+    def blocking_sites(self) -> list[BlockingSite]:
+        """Возвращает самые частые места блокировки.
+
+        Returns:
+            list[BlockingSite]: До `top_sites` мест по убыванию числа захватов.
+        """
+        with self._lock:
+            sites = sorted(self._sites.values(), key=lambda site: site.count, reverse=True)
+        return sites[: self.top_sites]
+
+    def report(self) -> dict[str, Any]:
+        """Возвращает гистограмму задержек и самые частые места блокировки.
+
+        Returns:
+            dict[str, Any]: Отчёт монитора.
+        """
+        return {
+            'lag': self.lag.to_dict(),
+            'blocking_calls': [
+                {
+                    'site': site.site,
+                    'count': site.count,
+                    'total_ms': round(site.total_ms, 3),
+                    'max_ms': round(site.max_ms, 3),
+                }
+                for site in self.blocking_sites()
+            ],
+        }
+
+    def log_report(self) -> None:
+        """Пишет в лог самые частые места блокировки цикла событий."""
+        for site in self.blocking_sites():
+            logger.warning(
+                'Блокировка цикла событий: %s (раз: %s, макс. %.1f мс)\n%s',
+                site.site,
+                site.count,
+                site.max_ms,
+                site.stack,
+            )
+
+
+def _call_site(stack: traceback.StackSummary) -> str:
+    """Возвращает самый глубокий кадр стека в коде проекта (или просто самый глубокий)."""
+    frames = [
+        frame
+        for frame in stack
+        if frame.filename.startswith(_PROJECT_ROOT) and 'site-packages' not in frame.filename
+    ]
+    frame = (frames or list(stack))[-1]
+    filename = frame.filename
+    if filename.startswith(_PROJECT_ROOT):
+        filename = filename[len(_PROJECT_ROOT) + 1 :]
+    return f'{filename}:{frame.lineno} in {frame.name}'
+
+
+def build_event_loop_monitor(settings: Settings) -> EventLoopMonitor | None:
+    """Создаёт монитор цикла событий по настройкам приложения.
+
+    Args:
+        settings (Settings): Настройки приложения.
+
+    Returns:
+        EventLoopMonitor | None: Монитор или None, если он выключен.
+    """
+    if not settings.loop_monitor_enabled:
+        return None
+    return EventLoopMonitor(
+        interval_seconds=settings.loop_monitor_interval_seconds,
+        threshold_seconds=settings.loop_monitor_threshold_seconds,
+        report_interval_seconds=settings.loop_monitor_report_interval_seconds,
+        top_sites=settings.loop_monitor_top_sites,
+    )
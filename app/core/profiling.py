@@ -0,0 +1,406 @@
+"""Профилирование отдельных запросов по требованию администратора.
+
+Когда маршрут замедляется на реальных данных, его профиль нужен с рабочего
+сервера, а не с машины разработчика. `ProfilingMiddleware` выполняет запрос
+под `cProfile`, если в нём есть заголовок `X-Profile-Token` с токеном, который
+администратор получил через API, или если запрос попал в выборку маршрута
+(`profiling_sample_rates`: доли по шаблонам путей, для любых методов).
+Статистика сохраняется в `profiling_dir` файлом pstats рядом с описанием
+запроса, а самые затратные функции отдаёт админский эндпойнт.
+
+Middleware подключается, только если профилирование включено в настройках,
+поэтому в обычном режиме накладных расходов нет. Токен подписан ключом,
+производным от `jwt_secret`: его проверяет любой воркер без обращения к БД, и
+он не принимается как токен доступа. Профилировщик работает на весь поток
+цикла событий, поэтому в профиль попадают и конкурентные запросы; одновременно
+профилируется не больше одного запроса воркера. Профиль завершается, как только
+отправлены заголовки ответа: тело потокового ответа (SSE) может идти всё время
+соединения, и профилировщик не должен оставаться занятым до его закрытия.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import hashlib
+import hmac
+import json
+import logging
+import pstats
+import random
+import re
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from jose import JWTError, jwt
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.constants import RequestProfiling
+
+
+if TYPE_CHECKING:
+    from app.core.config import Settings
+
+
+logger = logging.getLogger(__name__)
+
+# Корень проекта: пути функций проекта в профиле показываются относительно него
+_PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+_PROFILE_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileInfo:
+    """Описание профилированного запроса.
+
+    Атрибуты:
+        id: Идентификатор профиля (имя файлов в каталоге профилей).
+        method: HTTP-метод запроса.
+        path: Путь запроса.
+        route: Шаблон маршрута или None, если маршрут не найден.
+        status_code: Код ответа (500, если ответ не был начат).
+        duration_ms: Время обработки запроса под профилировщиком.
+        trigger: Причина профилирования: `token` или `sample`.
+        created_at: Время сохранения профиля (UTC).
+    """
+
+    id: str
+    method: str
+    path: str
+    route: str | None
+    status_code: int
+    duration_ms: float
+    trigger: str
+    created_at: datetime
+
+    def to_dict(self) -> dict[str, Any]:
+        """Возвращает описание для JSON-файла профиля."""
+        return {**asdict(self), 'created_at': self.created_at.isoformat()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ProfileInfo:
+        """Восстанавливает описание из JSON-файла профиля.
+
+        Args:
+            data (dict[str, Any]): Содержимое файла описания.
+
+        Returns:
+            ProfileInfo: Описание профиля.
+        """
+        return cls(**{**data, 'created_at': datetime.fromisoformat(data['created_at'])})
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileFrame:
+    """Функция профиля и её время.
+
+    Атрибуты:
+        function: Файл, строка и имя функции.
+        calls: Общее число вызовов.
+        primitive_calls: Число вызовов без рекурсии.
+        total_ms: Собственное время функции.
+        cumulative_ms: Время функции вместе с вызванными ею.
+    """
+
+    function: str
+    calls: int
+    primitive_calls: int
+    total_ms: float
+    cumulative_ms: float
+
+
+class RequestProfiler:
+    """Решает, какие запросы профилировать, и хранит их профили на диске.
+
+    Атрибуты:
+        directory: Каталог файлов профилей.
+        sample_rates: Доля профилируемых запросов по шаблону маршрута.
+        token_ttl_seconds: Время жизни токена профилирования.
+        max_profiles: Сколько последних профилей хранить; старые удаляются.
+        top_frames: Сколько функций отдавать из профиля.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        secret: str,
+        algorithm: str,
+        sample_rates: dict[str, float] | None = None,
+        token_ttl_seconds: int = 300,
+        max_profiles: int = 100,
+        top_frames: int = 30,
+    ) -> None:
+        """Инициализирует профилировщик.
+
+        Args:
+            directory (str | Path): Каталог файлов профилей.
+            secret (str): Секрет JWT, из которого выводится ключ токенов профилирования.
+            algorithm (str): Алгоритм подписи токенов.
+            sample_rates (dict[str, float] | None): Доля запросов по шаблону маршрута.
+            token_ttl_seconds (int): Время жизни токена профилирования.
+            max_profiles (int): Сколько последних профилей хранить.
+            top_frames (int): Сколько функций отдавать из профиля.
+        """
+        self.directory = Path(directory)
+        self.sample_rates = dict(sample_rates or {})
+        self._sample_patterns = [(compile_path(path)[0], path) for path in self.sample_rates]
+        self.token_ttl_seconds = token_ttl_seconds
+        self.max_profiles = max_profiles
+        self.top_frames = top_frames
+        self._key = hmac.new(
+            secret.encode(), RequestProfiling.KEY_CONTEXT, hashlib.sha256
+        ).hexdigest()
+        self._algorithm = algorithm
+        self._busy = False
+
+    # --- Токены ---
+
+    def issue_token(self, subject: str | int) -> str:
+        """Выдаёт токен, включающий профилирование запросов с ним.
+
+        Args:
+            subject (str | int): Идентификатор администратора.
+
+        Returns:
+            str: Подписанный токен для заголовка `X-Profile-Token`.
+        """
+        expire = datetime.now(tz=timezone.utc) + timedelta(seconds=self.token_ttl_seconds)
+        claims = {
+            'sub': str(subject),
+            'scope': RequestProfiling.TOKEN_SCOPE,
+            'exp': int(expire.timestamp()),
+        }
+        return jwt.encode(claims, self._key, algorithm=self._algorithm)
+
+    def token_valid(self, token: str) -> bool:
+        """Проверяет подпись, срок и назначение токена профилирования.
+
+        Args:
+            token (str): Значение заголовка `X-Profile-Token`.
+
+        Returns:
+            bool: True, если токен действителен.
+        """
+        try:
+            claims = jwt.decode(token, self._key, algorithms=[self._algorithm])
+        except JWTError:
+            return False
+        return claims.get('scope') == RequestProfiling.TOKEN_SCOPE
+
+    # --- Выбор запросов ---
+
+    def trigger(self, scope: Scope) -> str | None:
+        """Возвращает причину профилировать запрос или None.
+
+        Args:
+            scope (Scope): ASGI-scope HTTP-запроса.
+
+        Returns:
+            str | None: `token`, `sample` или None, если запрос не профилируется.
+        """
+        if self._busy:
+            return None
+        token = Headers(scope=scope).get(RequestProfiling.TOKEN_HEADER)
+        if token is not None:
+            return RequestProfiling.TRIGGER_TOKEN if self.token_valid(token) else None
+        for pattern, route in self._sample_patterns:
+            if pattern.match(scope['path']):
+                if random.random() < self.sample_rates[route]:
+                    return RequestProfiling.TRIGGER_SAMPLE
+                return None
+        return None
+
+    def acquire(self) -> bool:
+        """Занимает профилировщик воркера для одного запроса.
+
+        Returns:
+            bool: False, если другой запрос уже профилируется.
+        """
+        if self._busy:
+            return False
+        self._busy = True
+        return True
+
+    def release(self) -> None:
+        """Освобождает профилировщик после запроса."""
+        self._busy = False
+
+    # --- Хранение ---
+
+    async def save(self, profile: cProfile.Profile, info: ProfileInfo) -> None:
+        """Сохраняет статистику и описание запроса, удаляя самые старые профили.
+
+        Args:
+            profile (cProfile.Profile): Остановленный профилировщик запроса.
+            info (ProfileInfo): Описание запроса.
+        """
+        await asyncio.to_thread(self._write, profile, info)
+
+    def _write(self, profile: cProfile.Profile, info: ProfileInfo) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(self._file(info.id, RequestProfiling.STATS_SUFFIX))
+        self._file(info.id, RequestProfiling.META_SUFFIX).write_text(json.dumps(info.to_dict()))
+        for stale in self._read_all()[self.max_profiles :]:
+            for suffix in (RequestProfiling.STATS_SUFFIX, RequestProfiling.META_SUFFIX):
+                self._file(stale.id, suffix).unlink(missing_ok=True)
+
+    async def list_profiles(self) -> list[ProfileInfo]:
+        """Возвращает сохранённые профили от новых к старым.
+
+        Returns:
+            list[ProfileInfo]: Описания профилей.
+        """
+        return await asyncio.to_thread(self._read_all)
+
+    def _read_all(self) -> list[ProfileInfo]:
+        profiles = []
+        for meta in self.directory.glob(f'*{RequestProfiling.META_SUFFIX}'):
+            try:
+                profiles.append(ProfileInfo.from_dict(json.loads(meta.read_text())))
+            except (OSError, ValueError, TypeError, KeyError):
+                # Файл удалён соседним воркером или ещё не дописан
+                continue
+        return sorted(profiles, key=lambda info: info.created_at, reverse=True)
+
+    async def get(self, profile_id: str) -> tuple[ProfileInfo, list[ProfileFrame]] | None:
+        """Возвращает описание профиля и его самые затратные функции.
+
+        Args:
+            profile_id (str): Идентификатор профиля.
+
+        Returns:
+            tuple[ProfileInfo, list[ProfileFrame]] | None: Профиль или None, если его нет.
+        """
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        return await asyncio.to_thread(self._read, profile_id)
+
+    def _read(self, profile_id: str) -> tuple[ProfileInfo, list[ProfileFrame]] | None:
+        try:
+            meta = self._file(profile_id, RequestProfiling.META_SUFFIX).read_text()
+            stats = pstats.Stats(str(self._file(profile_id, RequestProfiling.STATS_SUFFIX)))
+        except OSError:
+            return None
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+        frames = [
+            ProfileFrame(
+                function=_function_name(func),
+                calls=calls,
+                primitive_calls=primitive_calls,
+                total_ms=round(total * 1000, 3),
+                cumulative_ms=round(cumulative * 1000, 3),
+            )
+            for func, (primitive_calls, calls, total, cumulative, _) in rows[: self.top_frames]
+        ]
+        return ProfileInfo.from_dict(json.loads(meta)), frames
+
+    def _file(self, profile_id: str, suffix: str) -> Path:
+        return self.directory / f'{profile_id}{suffix}'
+
+
+def _function_name(func: tuple[str, int, str]) -> str:
+    """Форматирует функцию pstats, сокращая пути проекта до относительных."""
+    filename, lineno, name = func
+    if filename.startswith(_PROJECT_ROOT):
+        filename = filename[len(_PROJECT_ROOT) + 1 :]
+    if filename == '~':
+        # Встроенные функции pstats записывает без файла и строки
+        return name
+    return f'{filename}:{lineno}({name})'
+
+
+class ProfilingMiddleware:
+    """ASGI-middleware профилирования выбранных запросов под `cProfile`."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Инициализирует middleware.
+
+        Args:
+            app (ASGIApp): Оборачиваемое приложение.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Обрабатывает запрос, при необходимости профилируя его."""
+        profiler = None
+        if scope['type'] == 'http':
+            profiler = scope['app'].state.container.request_profiler
+        trigger = profiler.trigger(scope) if profiler is not None else None
+        if trigger is None or not profiler.acquire():
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        status_code = 500
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        finished = False
+
+        async def finish() -> None:
+            nonlocal finished
+            if finished:
+                return
+            finished = True
+            profile.disable()
+            profiler.release()
+            route = scope.get('route')
+            info = ProfileInfo(
+                id=profile_id,
+                method=scope['method'],
+                path=scope['path'],
+                route=getattr(route, 'path', None),
+                status_code=status_code,
+                duration_ms=round((time.perf_counter() - started) * 1000, 3),
+                trigger=trigger,
+                created_at=datetime.now(timezone.utc),
+            )
+            try:
+                await profiler.save(profile, info)
+            except OSError:
+                logger.exception('Не удалось сохранить профиль запроса %s', profile_id)
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] != 'http.response.start':
+                await send(message)
+                return
+            status_code = message['status']
+            MutableHeaders(scope=message).append(RequestProfiling.ID_HEADER, profile_id)
+            await send(message)
+            # Обработчик уже отработал; тело потокового ответа не профилируем
+            await finish()
+
+        profile.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            await finish()
+
+
+def build_request_profiler(settings: Settings) -> RequestProfiler | None:
+    """Создаёт профилировщик запросов по настройкам приложения.
+
+    Args:
+        settings (Settings): Настройки приложения.
+
+    Returns:
+        RequestProfiler | None: Профилировщик или None, если профилирование выключено.
+    """
+    if not settings.profiling_enabled:
+        return None
+    return RequestProfiler(
+        settings.profiling_dir,
+        secret=settings.jwt_secret,
+        algorithm=settings.jwt_algorithm,
+        sample_rates=settings.profiling_sample_rates,
+        token_ttl_seconds=settings.profiling_token_ttl_seconds,
+        max_profiles=settings.profiling_max_profiles,
+        top_frames=settings.profiling_top_frames,
+    )
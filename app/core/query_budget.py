@@ -0,0 +1,86 @@
+"""Бюджеты SQL-выражений маршрутов и их учёт на время запроса.
+
+Маршрут объявляет максимум выражений через `openapi_extra=query_budget(n)`
+(бюджет попадает и в OpenAPI как `x-query-budget`). `QueryCountMiddleware`
+считает выражения запроса и добавляет в ответ заголовки с числом выражений и
+бюджетом маршрута; превышение бюджета пишется в лог. Тестовый клиент
+сравнивает заголовки и проваливает тест при превышении.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.constants import QueryBudgets
+from app.db.session import count_queries
+
+
+logger = logging.getLogger(__name__)
+
+
+def query_budget(limit: int) -> dict[str, Any]:
+    """Формирует `openapi_extra` маршрута с бюджетом SQL-выражений.
+
+    Args:
+        limit (int): Максимум выражений на один запрос.
+
+    Returns:
+        dict[str, Any]: Значение для параметра `openapi_extra` маршрута.
+    """
+    return {QueryBudgets.OPENAPI_KEY: limit}
+
+
+def route_query_budget(route: Any) -> int | None:
+    """Возвращает бюджет выражений маршрута, если он объявлен.
+
+    Args:
+        route (Any): Маршрут из `scope['route']`.
+
+    Returns:
+        int | None: Бюджет или None.
+    """
+    extra = getattr(route, 'openapi_extra', None) or {}
+    return extra.get(QueryBudgets.OPENAPI_KEY)
+
+
+class QueryCountMiddleware:
+    """ASGI-middleware подсчёта SQL-выражений HTTP-запроса (режим отладки)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Инициализирует middleware.
+
+        Args:
+            app (ASGIApp): Оборачиваемое приложение.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Обрабатывает запрос, добавляя заголовки с числом выражений и бюджетом."""
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as counter:
+
+            async def send_with_count(message: Message) -> None:
+                if message['type'] == 'http.response.start':
+                    headers = MutableHeaders(scope=message)
+                    headers.append(QueryBudgets.COUNT_HEADER, str(len(counter)))
+                    budget = route_query_budget(scope.get('route'))
+                    if budget is not None:
+                        headers.append(QueryBudgets.BUDGET_HEADER, str(budget))
+                        if len(counter) > budget:
+                            logger.warning(
+                                'Превышен бюджет SQL-выражений %s %s: %s > %s',
+                                scope['method'],
+                                scope['path'],
+                                len(counter),
+                                budget,
+                            )
+                await send(message)
+
+            await self.app(scope, receive, send_with_count)
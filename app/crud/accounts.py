@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-from sqlalchemy import select
+from decimal import Decimal
+
+from sqlalchemy import Executable, Row, and_, bindparam, delete, func, select, text, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, query_template
 from app.models.account import Account
+from app.models.payment import Payment
 
 
 class CRUDAccount(CRUDBase[Account]):
@@ -20,8 +24,47 @@ class CRUDAccount(CRUDBase[Account]):
         """
         super().__init__(Account)
 
+    @query_template
+    def _get_for_user(self) -> Executable:
+        return select(Account).where(
+            Account.id == bindparam('account_id'), Account.user_id == bindparam('user_id')
+        )
+
+    @query_template
+    def _get_for_user_locked(self) -> Executable:
+        return self._get_for_user.with_for_update()
+
+    @query_template
+    def _list_for_user_paginated(self) -> Executable:
+        return (
+            select(Account)
+            .where(Account.user_id == bindparam('user_id'))
+            .order_by(Account.id)
+            .limit(bindparam('limit'))
+            .offset(bindparam('offset'))
+        )
+
+    @query_template
+    def _get_default_for_user(self) -> Executable:
+        return select(Account).where(
+            Account.user_id == bindparam('user_id'), Account.is_default.is_(True)
+        )
+
+    async def get_default_for_user(self, db: AsyncSession, user_id: int) -> Account | None:
+        """Возвращает счёт пользователя по умолчанию без блокировки строки.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            user_id (int): Идентификатор пользователя.
+
+        Returns:
+            Account | None: Счёт по умолчанию или None.
+        """
+        result = await db.execute(self._get_default_for_user, {'user_id': user_id})
+        return result.scalar_one_or_none()
+
     async def get_for_user(
-        self, db: AsyncSession, account_id: int, user_id: int
+        self, db: AsyncSession, account_id: int, user_id: int, *, for_update: bool = False
     ) -> Account | None:
         """Возвращает счёт по идентификатору и владельцу.
 
@@ -29,13 +72,13 @@ class CRUDAccount(CRUDBase[Account]):
             db (AsyncSession): Сессия БД.
             account_id (int): Идентификатор счёта.
             user_id (int): Идентификатор пользователя.
+            for_update (bool): Заблокировать строку до конца транзакции (`FOR UPDATE`).
 
         Returns:
             Account | None: Счёт или None.
         """
-        result = await db.execute(
-            select(Account).where(Account.id == account_id, Account.user_id == user_id)
-        )
+        stmt = self._get_for_user_locked if for_update else self._get_for_user
+        result = await db.execute(stmt, {'account_id': account_id, 'user_id': user_id})
         return result.scalar_one_or_none()
 
     async def list_for_user(self, db: AsyncSession, user_id: int) -> list[Account]:
@@ -66,10 +109,306 @@ class CRUDAccount(CRUDBase[Account]):
             list[Account]: Счета пользователя.
         """
         result = await db.execute(
-            select(Account).where(Account.user_id == user_id).limit(limit).offset(offset)
+            self._list_for_user_paginated, {'user_id': user_id, 'limit': limit, 'offset': offset}
         )
         return result.scalars().all()
 
+    @query_template
+    def _list_ledger_balances_for_user(self) -> Executable:
+        page = (
+            select(Account.id)
+            .where(Account.user_id == bindparam('user_id'))
+            .order_by(Account.id)
+            .limit(bindparam('limit'))
+            .offset(bindparam('offset'))
+            .subquery()
+        )
+        return (
+            select(Account.id, Account.user_id, Account.balance, Account.version, Payment.amount)
+            .join(page, page.c.id == Account.id)
+            .outerjoin(
+                Payment,
+                and_(Payment.account_id == Account.id, Payment.checkpointed.is_(False)),
+            )
+            .order_by(Account.id)
+        )
+
+    async def list_ledger_balances_for_user(
+        self, db: AsyncSession, user_id: int, *, limit: int, offset: int
+    ) -> list[tuple[int, int, Decimal, int]]:
+        """Возвращает страницу счетов пользователя с балансами режима `ledger`.
+
+        Баланс — сумма последней контрольной точки (`Account.balance`) и ещё не
+        учтённых платежей, версия — версия строки плюс их число. Счета и платежи
+        читаются одним запросом, то есть из одного снимка БД; суммирование идёт в
+        `Decimal` (на SQLite суммы хранятся текстом).
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            user_id (int): Идентификатор пользователя.
+            limit (int): Максимум счетов.
+            offset (int): Смещение.
+
+        Returns:
+            list[tuple[int, int, Decimal, int]]: `(id, user_id, balance, version)` по
+            возрастанию `id`.
+        """
+        result = await db.execute(
+            self._list_ledger_balances_for_user,
+            {'user_id': user_id, 'limit': limit, 'offset': offset},
+        )
+        balances: dict[int, list] = {}
+        for account_id, owner_id, balance, version, amount in result:
+            entry = balances.setdefault(account_id, [account_id, owner_id, balance, version])
+            if amount is not None:
+                entry[2] += amount
+                entry[3] += 1
+        return [tuple(entry) for entry in balances.values()]
+
+    @query_template
+    def _list_by_ids_locked(self) -> Executable:
+        return (
+            select(Account)
+            .where(Account.id.in_(bindparam('account_ids', expanding=True)))
+            .order_by(Account.id)
+            .with_for_update()
+        )
+
+    async def list_by_ids_locked(self, db: AsyncSession, account_ids: list[int]) -> list[Account]:
+        """Возвращает счета по идентификаторам, блокируя строки до конца транзакции.
+
+        Строки блокируются в порядке `id`, поэтому параллельные вызовы не
+        взаимоблокируются.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            account_ids (list[int]): Идентификаторы счетов.
+
+        Returns:
+            list[Account]: Счета по возрастанию `id`.
+        """
+        result = await db.scalars(
+            self._list_by_ids_locked,
+            {'account_ids': account_ids},
+            execution_options={'populate_existing': True},
+        )
+        return list(result)
+
+    @query_template
+    def _delete_batch_for_user(self) -> Executable:
+        batch = (
+            select(Account.id)
+            .where(Account.user_id == bindparam('user_id'))
+            .limit(bindparam('limit'))
+            .scalar_subquery()
+        )
+        return delete(Account).where(Account.id.in_(batch))
+
+    async def delete_batch_for_user(self, db: AsyncSession, user_id: int, *, limit: int) -> int:
+        """Удаляет до `limit` счетов пользователя одним запросом без загрузки в память.
+
+        Платежи счетов должны быть удалены заранее (или каскадом БД).
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            user_id (int): Идентификатор пользователя.
+            limit (int): Максимум удаляемых строк.
+
+        Returns:
+            int: Число удалённых счетов.
+        """
+        result = await db.execute(
+            self._delete_batch_for_user, {'user_id': user_id, 'limit': limit}
+        )
+        return result.rowcount
+
+    @query_template
+    def _next_owner_ids(self) -> Executable:
+        return (
+            select(Account.user_id)
+            .where(Account.user_id > bindparam('after_user_id'))
+            .group_by(Account.user_id)
+            .order_by(Account.user_id)
+            .limit(bindparam('limit'))
+        )
+
+    async def next_owner_ids(
+        self, db: AsyncSession, *, after_user_id: int, limit: int
+    ) -> list[int]:
+        """Возвращает следующую страницу владельцев счетов (keyset по `user_id`).
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            after_user_id (int): Последний обработанный `user_id`.
+            limit (int): Размер страницы.
+
+        Returns:
+            list[int]: Идентификаторы пользователей по возрастанию.
+        """
+        result = await db.scalars(
+            self._next_owner_ids, {'after_user_id': after_user_id, 'limit': limit}
+        )
+        return list(result)
+
+    @query_template
+    def _list_for_users_locked(self) -> Executable:
+        return (
+            select(Account)
+            .where(Account.user_id.in_(bindparam('user_ids', expanding=True)))
+            .order_by(Account.user_id, Account.id)
+            .with_for_update()
+        )
+
+    async def list_for_users_locked(self, db: AsyncSession, user_ids: list[int]) -> list[Account]:
+        """Возвращает счета пользователей, блокируя строки до конца транзакции.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            user_ids (list[int]): Идентификаторы пользователей.
+
+        Returns:
+            list[Account]: Счета, упорядоченные по владельцу и идентификатору.
+        """
+        result = await db.scalars(self._list_for_users_locked, {'user_ids': user_ids})
+        return list(result)
+
+    @query_template
+    def _delete_by_ids(self) -> Executable:
+        return delete(Account).where(Account.id.in_(bindparam('account_ids', expanding=True)))
+
+    async def delete_by_ids(self, db: AsyncSession, account_ids: list[int]) -> int:
+        """Удаляет счета по идентификаторам одним запросом.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            account_ids (list[int]): Идентификаторы счетов.
+
+        Returns:
+            int: Число удалённых счетов.
+        """
+        result = await db.execute(self._delete_by_ids, {'account_ids': account_ids})
+        return result.rowcount
+
+    @query_template
+    def _id_bounds(self) -> Executable:
+        return select(func.min(Account.id), func.max(Account.id))
+
+    async def id_bounds(self, db: AsyncSession) -> tuple[int, int] | None:
+        """Возвращает наименьший и наибольший идентификаторы счетов.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+
+        Returns:
+            tuple[int, int] | None: Границы пространства ключей или None без счетов.
+        """
+        low, high = (await db.execute(self._id_bounds)).one()
+        return None if low is None else (low, high)
+
+    @query_template
+    def _list_balances_in_range(self) -> Executable:
+        return (
+            select(Account.id, Account.user_id, Account.balance)
+            .where(Account.id >= bindparam('low'), Account.id < bindparam('high'))
+            .order_by(Account.id)
+        )
+
+    async def list_balances_in_range(
+        self, db: AsyncSession, low: int, high: int
+    ) -> list[Row[tuple[int, int, Decimal]]]:
+        """Возвращает балансы счетов диапазона идентификаторов без загрузки ORM-объектов.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            low (int): Начало диапазона (включительно).
+            high (int): Конец диапазона (не включительно).
+
+        Returns:
+            list[Row]: Строки `(id, user_id, balance)` в порядке `id`.
+        """
+        result = await db.execute(self._list_balances_in_range, {'low': low, 'high': high})
+        return result.all()
+
+    @query_template
+    def _debit_postgresql(self) -> Executable:
+        # Имена параметров не совпадают с колонками: такие имена UPDATE резервирует за SET
+        return (
+            update(Account)
+            .where(
+                Account.id == bindparam('b_account_id'),
+                Account.user_id == bindparam('b_user_id'),
+                Account.balance >= bindparam('b_amount'),
+            )
+            .values(balance=Account.balance - bindparam('b_amount'), version=Account.version + 1)
+            .returning(Account.balance, Account.version)
+            .execution_options(synchronize_session=False)
+        )
+
+    @query_template
+    def _get_balance(self) -> Executable:
+        return select(Account.balance, Account.version).where(
+            Account.id == bindparam('account_id'), Account.user_id == bindparam('user_id')
+        )
+
+    @query_template
+    def _set_balance_if_version(self) -> Executable:
+        return (
+            update(Account)
+            .where(
+                Account.id == bindparam('account_id'),
+                Account.version == bindparam('expected_version'),
+            )
+            .values(balance=bindparam('new_balance'), version=Account.version + 1)
+            .returning(Account.balance, Account.version)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def debit(
+        self, db: AsyncSession, account_id: int, user_id: int, amount: Decimal
+    ) -> tuple[Decimal, int] | None:
+        """Списывает сумму со счёта, если баланса хватает, без явной блокировки.
+
+        На PostgreSQL это одно условное `UPDATE ... WHERE balance >= :amount
+        RETURNING`: строка блокируется самим обновлением до конца транзакции, а
+        условие перепроверяется после коммита конкурента, поэтому параллельные
+        списания не уводят баланс в минус. На SQLite суммы хранятся текстом и
+        сравнивать их в SQL нельзя: баланс читается, уменьшается в `Decimal` и
+        записывается условием по версии строки с повтором при конфликте.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            account_id (int): Идентификатор счёта.
+            user_id (int): Идентификатор владельца.
+            amount (Decimal): Положительная сумма списания.
+
+        Returns:
+            tuple[Decimal, int] | None: Новые баланс и версия счёта; None, если счёт не
+            найден или средств недостаточно.
+        """
+        params = {'account_id': account_id, 'user_id': user_id}
+        if db.get_bind().dialect.name == 'postgresql':
+            result = await db.execute(
+                self._debit_postgresql,
+                {'b_account_id': account_id, 'b_user_id': user_id, 'b_amount': amount},
+            )
+            row = result.first()
+            return None if row is None else (row.balance, row.version)
+        while True:
+            current = (await db.execute(self._get_balance, params)).first()
+            if current is None or current.balance < amount:
+                return None
+            result = await db.execute(
+                self._set_balance_if_version,
+                {
+                    'account_id': account_id,
+                    'expected_version': current.version,
+                    'new_balance': current.balance - amount,
+                },
+            )
+            row = result.first()
+            if row is not None:
+                return row.balance, row.version
+
     async def create_for_user(self, db: AsyncSession, user_id: int) -> Account:
         """Создаёт счёт для пользователя.
 
@@ -88,5 +427,48 @@ class CRUDAccount(CRUDBase[Account]):
         await db.flush()
         return account
 
+    def _build_upsert_default(self, insert) -> Executable:
+        return (
+            insert(Account)
+            .values(user_id=bindparam('user_id'), is_default=True)
+            .on_conflict_do_update(
+                index_elements=[Account.user_id],
+                index_where=text('is_default'),
+                set_={'version': Account.version + 1},
+            )
+            .returning(Account)
+        )
+
+    @query_template
+    def _upsert_default_postgresql(self) -> Executable:
+        return self._build_upsert_default(postgresql.insert)
+
+    @query_template
+    def _upsert_default_sqlite(self) -> Executable:
+        return self._build_upsert_default(sqlite.insert)
+
+    async def upsert_default_for_user(self, db: AsyncSession, user_id: int) -> Account:
+        """Возвращает счёт пользователя по умолчанию, создавая его при отсутствии.
+
+        Один `INSERT ... ON CONFLICT DO UPDATE ... RETURNING` по частичному
+        уникальному индексу: существующая строка блокируется до конца транзакции,
+        а её версия увеличивается. Созданный счёт имеет версию 1.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            user_id (int): Идентификатор пользователя.
+
+        Returns:
+            Account: Счёт по умолчанию.
+        """
+        if db.get_bind().dialect.name == 'postgresql':
+            stmt = self._upsert_default_postgresql
+        else:
+            stmt = self._upsert_default_sqlite
+        result = await db.scalars(
+            stmt, {'user_id': user_id}, execution_options={'populate_existing': True}
+        )
+        return result.one()
+
 
 crud_account = CRUDAccount()
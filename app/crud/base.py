@@ -1,16 +1,61 @@
-"""Базовый класс CRUD для асинхронной работы с моделями."""
+"""Базовый класс CRUD для асинхронной работы с моделями.
+
+Запросы горячих путей описываются шаблонами `query_template`: statement с
+`bindparam` строится один раз на класс CRUD и модель, а значения передаются
+параметрами при выполнении. Повторное использование одного объекта statement
+сохраняет его мемоизированный ключ кэша SQLAlchemy (компиляция берётся из
+кэша движка) и даёт один и тот же SQL-текст, поэтому драйвер asyncpg
+переиспользует подготовленный statement соединения.
+"""
 
 from __future__ import annotations
 
-from typing import Generic, Iterable, TypeVar
+import asyncio
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Generic, Iterable, TypeVar
 
-from sqlalchemy import select
+from sqlalchemy import Executable, bindparam, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.crud.loader import BatchLoader
+
+
+if TYPE_CHECKING:
+    from app.cache import SingleFlight
 
 
 ModelT = TypeVar('ModelT')
 
 
+class query_template:  # noqa: N801 - используется как декоратор
+    """Дескриптор шаблона запроса, кэшируемого на класс CRUD и модель.
+
+    Декорируемый метод строит statement с именованными `bindparam` и
+    вызывается только при первом обращении; далее возвращается тот же объект.
+    """
+
+    def __init__(self, build: Callable[[Any], Executable]) -> None:
+        """Инициализирует шаблон.
+
+        Args:
+            build (Callable[[Any], Executable]): Метод CRUD, строящий statement.
+        """
+        self.build = build
+        self.__doc__ = build.__doc__
+        self._statements: dict[tuple[type, type], Executable] = {}
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        """Возвращает statement для класса и модели экземпляра CRUD."""
+        if instance is None:
+            return self
+        key = (owner, instance.model)
+        statement = self._statements.get(key)
+        if statement is None:
+            statement = self._statements[key] = self.build(instance)
+        return statement
+
+
 class CRUDBase(Generic[ModelT]):
     """Базовый CRUD для ORM-модели.
 
@@ -26,6 +71,13 @@ class CRUDBase(Generic[ModelT]):
         """
         self.model = model
 
+    #: Максимум идентификаторов в одном `WHERE id IN (...)` пакетной загрузки
+    batch_load_size = 500
+
+    @query_template
+    def _get_by_id(self) -> Executable:
+        return select(self.model).where(self.model.id == bindparam('obj_id'))
+
     async def get(self, db: AsyncSession, obj_id: int) -> ModelT | None:
         """Возвращает объект по идентификатору.
 
@@ -36,9 +88,119 @@ class CRUDBase(Generic[ModelT]):
         Returns:
             ModelT | None: Найденный объект или None.
         """
-        result = await db.execute(select(self.model).where(self.model.id == obj_id))
+        result = await db.execute(self._get_by_id, {'obj_id': obj_id})
         return result.scalar_one_or_none()
 
+    @query_template
+    def _get_by_ids(self) -> Executable:
+        return select(self.model).where(self.model.id.in_(bindparam('obj_ids', expanding=True)))
+
+    async def get_many(self, db: AsyncSession, obj_ids: Iterable[int]) -> dict[int, ModelT]:
+        """Возвращает объекты по идентификаторам пакетами `WHERE id IN (...)`.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            obj_ids (Iterable[int]): Идентификаторы объектов.
+
+        Returns:
+            dict[int, ModelT]: Найденные объекты по идентификатору.
+        """
+        ids = list(dict.fromkeys(obj_ids))
+        found: dict[int, ModelT] = {}
+        for start in range(0, len(ids), self.batch_load_size):
+            chunk = ids[start : start + self.batch_load_size]
+            result = await db.scalars(self._get_by_ids, {'obj_ids': chunk})
+            found.update((obj.id, obj) for obj in result)
+        return found
+
+    def loader(self, db: AsyncSession) -> BatchLoader[ModelT]:
+        """Возвращает пакетный загрузчик модели, привязанный к сессии.
+
+        Args:
+            db (AsyncSession): Сессия БД (обычно — сессия запроса).
+
+        Returns:
+            BatchLoader[ModelT]: Загрузчик, общий для всех вызовов в этой сессии.
+        """
+        key = ('batch_loader', self.model)
+        loader = db.info.get(key)
+        if loader is None:
+            loader = db.info[key] = BatchLoader(self, db)
+        return loader
+
+    async def load(self, db: AsyncSession, obj_id: int) -> ModelT | None:
+        """Возвращает объект по идентификатору через пакетный загрузчик сессии.
+
+        Вызовы одного такта цикла событий выполняются одним запросом, а
+        найденные объекты переиспользуются до конца сессии.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            obj_id (int): Идентификатор объекта.
+
+        Returns:
+            ModelT | None: Найденный объект или None.
+        """
+        return await self.loader(db).load(obj_id)
+
+    async def load_many(self, db: AsyncSession, obj_ids: Iterable[int]) -> list[ModelT | None]:
+        """Возвращает объекты по идентификаторам через пакетный загрузчик сессии.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            obj_ids (Iterable[int]): Идентификаторы объектов.
+
+        Returns:
+            list[ModelT | None]: Объекты в порядке идентификаторов (None для отсутствующих).
+        """
+        loader = self.loader(db)
+        return list(await asyncio.gather(*(loader.load(obj_id) for obj_id in obj_ids)))
+
+    def coalescing_scope(self, obj_id: int) -> tuple[str, int]:
+        """Возвращает область объединения чтений объекта.
+
+        Args:
+            obj_id (int): Идентификатор объекта.
+
+        Returns:
+            tuple[str, int]: Область для `SingleFlight.forget` после записи объекта.
+        """
+        return (self.model.__tablename__, obj_id)
+
+    async def get_coalesced(
+        self, db: AsyncSession, obj_id: int, flights: SingleFlight | None
+    ) -> ModelT | None:
+        """Возвращает объект по идентификатору, объединяя одновременные чтения.
+
+        Одновременные вызовы разделяют один `SELECT`: лидер снимает значения
+        колонок, а каждый вызов получает собственный экземпляр, присоединённый
+        к своей сессии через `merge(load=False)` без обращения к БД.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            obj_id (int): Идентификатор объекта.
+            flights (SingleFlight | None): Реестр объединения чтений; None — обычный `get`.
+
+        Returns:
+            ModelT | None: Найденный объект или None.
+        """
+        if flights is None:
+            return await self.get(db, obj_id)
+        state = await flights.run(
+            self.coalescing_scope(obj_id), None, partial(self._load_state, db, obj_id)
+        )
+        if state is None:
+            return None
+        instance = self.model(**state)
+        make_transient_to_detached(instance)
+        return await db.merge(instance, load=False)
+
+    async def _load_state(self, db: AsyncSession, obj_id: int) -> dict[str, Any] | None:
+        obj = await self.get(db, obj_id)
+        if obj is None:
+            return None
+        return {attr.key: getattr(obj, attr.key) for attr in inspect(self.model).column_attrs}
+
     async def list_all(self, db: AsyncSession) -> Iterable[ModelT]:
         """Возвращает все объекты модели.
 
@@ -60,3 +222,4 @@ class CRUDBase(Generic[ModelT]):
         """
         await db.delete(obj)
         await db.flush()
+        self.loader(db).forget(obj.id)
@@ -0,0 +1,135 @@
+"""CRUD-операции для списаний."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from sqlalchemy import Executable, bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.constants import MonetaryConstants
+from app.crud.base import CRUDBase, query_template
+from app.models.debit import Debit
+
+
+class CRUDDebit(CRUDBase[Debit]):
+    """CRUD-класс для модели `Debit`."""
+
+    def __init__(self) -> None:
+        """Инициализирует CRUD-класс для модели `Debit`."""
+        super().__init__(Debit)
+
+    @query_template
+    def _get_by_transaction(self) -> Executable:
+        return select(Debit).where(Debit.transaction_id == bindparam('transaction_id'))
+
+    async def get_by_transaction(self, db: AsyncSession, transaction_id: str) -> Debit | None:
+        """Возвращает списание по идентификатору транзакции.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            transaction_id (str): Внешний идентификатор транзакции.
+
+        Returns:
+            Debit | None: Списание или None.
+        """
+        result = await db.execute(self._get_by_transaction, {'transaction_id': transaction_id})
+        return result.scalar_one_or_none()
+
+    @query_template
+    def _totals_by_account(self) -> Executable:
+        return (
+            select(Debit.account_id, func.sum(Debit.amount))
+            .where(Debit.account_id >= bindparam('low'), Debit.account_id < bindparam('high'))
+            .group_by(Debit.account_id)
+        )
+
+    @query_template
+    def _amounts_by_account(self) -> Executable:
+        return select(Debit.account_id, Debit.amount).where(
+            Debit.account_id >= bindparam('low'), Debit.account_id < bindparam('high')
+        )
+
+    async def totals_by_account(self, db: AsyncSession, low: int, high: int) -> dict[int, Decimal]:
+        """Возвращает суммы списаний по счетам диапазона идентификаторов.
+
+        Как и для платежей, на SQLite суммы складываются в `Decimal` на стороне
+        приложения.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            low (int): Начало диапазона счетов (включительно).
+            high (int): Конец диапазона счетов (не включительно).
+
+        Returns:
+            dict[int, Decimal]: Сумма списаний по идентификатору счёта.
+        """
+        params = {'low': low, 'high': high}
+        if db.get_bind().dialect.name == 'postgresql':
+            result = await db.execute(self._totals_by_account, params)
+            return {account_id: total for account_id, total in result}
+        totals: dict[int, Decimal] = {}
+        result = await db.stream(self._amounts_by_account, params)
+        async for account_id, amount in result:
+            totals[account_id] = totals.get(account_id, MonetaryConstants.ZERO) + amount
+        return totals
+
+    @query_template
+    def _move_to_account(self) -> Executable:
+        return (
+            update(Debit)
+            .where(Debit.account_id.in_(bindparam('from_ids', expanding=True)))
+            .values(account_id=bindparam('to_id'))
+        )
+
+    async def move_to_account(
+        self, db: AsyncSession, from_account_ids: list[int], to_account_id: int
+    ) -> int:
+        """Переносит списания со счетов на другой счёт одним запросом.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            from_account_ids (list[int]): Исходные счета.
+            to_account_id (int): Целевой счёт.
+
+        Returns:
+            int: Число перенесённых списаний.
+        """
+        result = await db.execute(
+            self._move_to_account, {'from_ids': from_account_ids, 'to_id': to_account_id}
+        )
+        return result.rowcount
+
+    async def create(
+        self,
+        db: AsyncSession,
+        *,
+        transaction_id: str,
+        user_id: int,
+        account_id: int,
+        amount: Decimal,
+    ) -> Debit:
+        """Создаёт списание.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            transaction_id (str): Идентификатор транзакции.
+            user_id (int): Идентификатор пользователя.
+            account_id (int): Идентификатор счёта.
+            amount (Decimal): Сумма списания (положительная).
+
+        Returns:
+            Debit: Созданное списание.
+        """
+        debit = Debit(
+            transaction_id=transaction_id,
+            user_id=user_id,
+            account_id=account_id,
+            amount=amount,
+        )
+        db.add(debit)
+        await db.flush()
+        return debit
+
+
+crud_debit = CRUDDebit()
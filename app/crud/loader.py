@@ -0,0 +1,111 @@
+"""Пакетная загрузка объектов по первичному ключу (в духе DataLoader).
+
+Вызовы `CRUDBase.load`, сделанные в одном такте цикла событий (например,
+через `asyncio.gather`), собираются в один `SELECT ... WHERE id IN (...)`.
+Загрузчик живёт в `AsyncSession.info`, поэтому его кэш ограничен сессией
+запроса и отдаёт те же экземпляры, что и identity map этой сессии.
+
+Кэшируются только найденные объекты: отсутствие не запоминается, а удалённые,
+отсоединённые и просроченные (после rollback) экземпляры загружаются заново.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+if TYPE_CHECKING:
+    from app.crud.base import CRUDBase
+
+
+ModelT = TypeVar('ModelT')
+
+
+class BatchLoader(Generic[ModelT]):
+    """Загрузчик объектов одной модели в пределах одной сессии.
+
+    Атрибуты:
+        batches: Число выполненных пакетных запросов.
+    """
+
+    def __init__(self, crud: CRUDBase[ModelT], db: AsyncSession) -> None:
+        """Инициализирует загрузчик.
+
+        Args:
+            crud (CRUDBase[ModelT]): CRUD модели, выполняющий пакетный запрос.
+            db (AsyncSession): Сессия, в которой загружаются объекты.
+        """
+        self.crud = crud
+        self.db = db
+        self.batches = 0
+        self._pending: dict[int, asyncio.Future] = {}
+        self._loaded: dict[int, ModelT] = {}
+        # Сессия не допускает одновременных запросов: пакеты выполняются по очереди
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, obj_id: int) -> ModelT | None:
+        """Возвращает объект по идентификатору, объединяя вызовы одного такта.
+
+        Args:
+            obj_id (int): Идентификатор объекта.
+
+        Returns:
+            ModelT | None: Найденный объект или None.
+        """
+        obj = self._loaded.get(obj_id)
+        if obj is not None and self._usable(obj):
+            return obj
+        future = self._pending.get(obj_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            if not self._pending:
+                loop.call_soon(self._dispatch)
+            future = self._pending[obj_id] = loop.create_future()
+        return await asyncio.shield(future)
+
+    def forget(self, obj_id: int) -> None:
+        """Убирает объект из кэша загрузчика.
+
+        Args:
+            obj_id (int): Идентификатор объекта.
+        """
+        self._loaded.pop(obj_id, None)
+
+    def _dispatch(self) -> None:
+        batch, self._pending = self._pending, {}
+        task = asyncio.get_running_loop().create_task(self._resolve(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _resolve(self, batch: dict[int, asyncio.Future]) -> None:
+        try:
+            async with self._lock:
+                found = await self.crud.get_many(self.db, list(batch))
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as exc:  # noqa: BLE001 - ошибка передаётся ожидающим
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+                    # Ожидающий мог быть отменён: помечаем исключение полученным
+                    future.exception()
+            return
+        self.batches += 1
+        for obj_id, future in batch.items():
+            obj = found.get(obj_id)
+            if obj is not None:
+                self._loaded[obj_id] = obj
+            if not future.done():
+                future.set_result(obj)
+
+    @staticmethod
+    def _usable(obj: ModelT) -> bool:
+        state = inspect(obj)
+        return state.persistent and not state.expired_attributes
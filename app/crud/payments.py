@@ -1,37 +1,148 @@
-"""CRUD-операции для платежей."""
+"""CRUD-операции для платежей.
+
+Запросы чтения содержат условие по `created_at` — ключу секционирования
+таблицы в PostgreSQL. С заданным периодом PostgreSQL читает только нужные
+помесячные секции. Без периода подставляются широкие границы
+`PaymentPartitions`: текст запроса (и подготовленный statement) остаётся одним,
+но читаются все секции.
+
+С архивом (`PaymentArchive`) поиск по транзакции и история пользователя
+дополняются платежами, перенесёнными задачей архивации в холодное хранилище.
+
+Платежи, ещё не учтённые в балансе счёта (`checkpointed = false`, режим
+баланса `ledger`), не архивируются и не входят в суммы сверки: их учитывает
+баланс, вычисляемый при чтении.
+"""
 
 from __future__ import annotations
 
-from sqlalchemy import select
+from datetime import datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from sqlalchemy import (
+    Executable,
+    Row,
+    Select,
+    bindparam,
+    column,
+    delete,
+    func,
+    literal,
+    select,
+    table,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.base import CRUDBase
+from app.core.constants import MonetaryConstants, PaymentPartitions
+from app.crud.base import CRUDBase, query_template
 from app.models.payment import Payment
 
 
+if TYPE_CHECKING:
+    from app.db.archive import PaymentArchive
+
+
 class CRUDPayment(CRUDBase[Payment]):
     """CRUD-класс для модели `Payment`."""
 
-    def __init__(self) -> None:
+    def __init__(self, archive: PaymentArchive | None = None) -> None:
         """Инициализирует CRUD-класс для модели `Payment`.
 
         Args:
-            model (type[Payment]): Класс ORM-модели.
+            archive (PaymentArchive | None): Холодный архив платежей (опционально).
         """
         super().__init__(Payment)
+        self.archive = archive
+
+    @query_template
+    def _get_by_transaction(self) -> Executable:
+        return select(Payment).where(
+            Payment.transaction_id == bindparam('transaction_id'),
+            Payment.created_at >= bindparam('created_from'),
+        )
 
-    async def get_by_transaction(self, db: AsyncSession, transaction_id: str) -> Payment | None:
+    @query_template
+    def _list_for_user_paginated(self) -> Executable:
+        return (
+            select(Payment)
+            .where(
+                Payment.user_id == bindparam('user_id'),
+                Payment.created_at >= bindparam('created_from'),
+                Payment.created_at < bindparam('created_to'),
+            )
+            .order_by(Payment.created_at, Payment.id)
+            .limit(bindparam('limit'))
+            .offset(bindparam('offset'))
+        )
+
+    @query_template
+    def _list_for_user_paginated_excluding(self) -> Executable:
+        return self._list_for_user_paginated.where(
+            Payment.id.not_in(bindparam('exclude_ids', expanding=True))
+        )
+
+    async def get_by_transaction(
+        self, db: AsyncSession, transaction_id: str, *, created_from: datetime | None = None
+    ) -> Payment | None:
         """Возвращает платёж по идентификатору транзакции.
 
+        Если в БД платежа нет, он ищется в архиве — без учёта `created_from`:
+        фильтр сегментов архива в памяти отсекает почти все чтения с диска, а
+        строки архива удалены из БД вместе с уникальным ключом, поэтому
+        идемпотентность держится на этой проверке.
+
         Args:
             db (AsyncSession): Сессия БД.
             transaction_id (str): Внешний идентификатор транзакции.
+            created_from (datetime | None): Искать в БД только среди платежей не старше
+                этой даты (читаются только секции с этой даты); None — во всех секциях.
 
         Returns:
-            Payment | None: Платёж или None.
+            Payment | None: Платёж или None; архивный платёж не привязан к сессии.
         """
-        result = await db.execute(select(Payment).where(Payment.transaction_id == transaction_id))
-        return result.scalar_one_or_none()
+        result = await db.execute(
+            self._get_by_transaction,
+            {
+                'transaction_id': transaction_id,
+                'created_from': created_from or PaymentPartitions.MIN_CREATED_AT,
+            },
+        )
+        payment = result.scalar_one_or_none()
+        if payment is None and self.archive is not None:
+            payment = await self.archive.find_transaction(transaction_id)
+        return payment
+
+    @query_template
+    def _transaction_claimed(self) -> Executable:
+        keys = table(PaymentPartitions.TRANSACTION_IDS_TABLE, column('transaction_id'))
+        return (
+            select(literal(1))
+            .select_from(keys)
+            .where(keys.c.transaction_id == bindparam('transaction_id'))
+        )
+
+    async def transaction_exists(self, db: AsyncSession, transaction_id: str) -> bool:
+        """Проверяет, что платёж с такой транзакцией уже есть.
+
+        Платёж ищется в БД и в архиве. На PostgreSQL дополнительно проверяется
+        таблица ключей `payment_transaction_ids`: в ней остаются и транзакции
+        платежей из секций, отсоединённых вручную.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            transaction_id (str): Внешний идентификатор транзакции.
+
+        Returns:
+            bool: True, если транзакция уже обработана.
+        """
+        if await self.get_by_transaction(db, transaction_id) is not None:
+            return True
+        if db.get_bind().dialect.name != 'postgresql':
+            return False
+        claimed = await db.scalar(self._transaction_claimed, {'transaction_id': transaction_id})
+        return claimed is not None
 
     async def list_for_user(self, db: AsyncSession, user_id: int) -> list[Payment]:
         """Возвращает список платежей пользователя.
@@ -47,24 +158,282 @@ class CRUDPayment(CRUDBase[Payment]):
         return result.scalars().all()
 
     async def list_for_user_paginated(
-        self, db: AsyncSession, user_id: int, *, limit: int, offset: int
+        self,
+        db: AsyncSession,
+        user_id: int,
+        *,
+        limit: int,
+        offset: int,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
     ) -> list[Payment]:
-        """Возвращает список платежей пользователя с пагинацией.
+        """Возвращает платежи пользователя за период в хронологическом порядке.
+
+        Архивные платежи старше оставшихся в БД, поэтому идут в начале выдачи:
+        страница сначала берётся из архива (по его индексу, без чтения всей
+        истории), а остаток — из БД со смещением, уменьшенным на число архивных
+        платежей периода. Строки последнего сегмента архива после прерванной
+        архивации могут оставаться и в БД; они исключаются в самом запросе,
+        чтобы не сдвигать смещение. Без периода запрос к БД читает все секции
+        пользователя.
 
         Args:
             db (AsyncSession): Сессия БД.
             user_id (int): Идентификатор пользователя.
             limit (int): Максимум объектов.
             offset (int): Смещение.
+            created_from (datetime | None): Начало периода (включительно).
+            created_to (datetime | None): Конец периода (не включительно).
 
         Returns:
             list[Payment]: Платежи пользователя.
         """
+        page: list[Payment] = []
+        archived = 0
+        exclude_ids: list[int] = []
+        if self.archive is not None:
+            page, archived = await self.archive.page_for_user(
+                user_id,
+                limit=limit,
+                offset=offset,
+                created_from=created_from,
+                created_to=created_to,
+            )
+            if archived and len(page) == limit:
+                return page
+            exclude_ids = await self.archive.latest_segment_ids(user_id)
+        params = {
+            'user_id': user_id,
+            'limit': limit - len(page),
+            'offset': max(offset - archived, 0),
+            'created_from': created_from or PaymentPartitions.MIN_CREATED_AT,
+            'created_to': created_to or PaymentPartitions.MAX_CREATED_AT,
+        }
+        statement = self._list_for_user_paginated
+        if exclude_ids:
+            statement = self._list_for_user_paginated_excluding
+            params['exclude_ids'] = exclude_ids
+        result = await db.execute(statement, params)
+        return page + list(result.scalars())
+
+    @staticmethod
+    def _account_range(statement: Select) -> Select:
+        return statement.where(
+            Payment.account_id >= bindparam('low'),
+            Payment.account_id < bindparam('high'),
+            Payment.checkpointed.is_(True),
+        )
+
+    @query_template
+    def _totals_by_account(self) -> Executable:
+        return self._account_range(select(Payment.account_id, func.sum(Payment.amount))).group_by(
+            Payment.account_id
+        )
+
+    @query_template
+    def _amounts_by_account(self) -> Executable:
+        return self._account_range(select(Payment.account_id, Payment.amount))
+
+    async def totals_by_account(self, db: AsyncSession, low: int, high: int) -> dict[int, Decimal]:
+        """Возвращает суммы учтённых в балансах платежей по счетам диапазона.
+
+        На PostgreSQL суммы считает `GROUP BY` по точному `NUMERIC`. На SQLite
+        суммы хранятся текстом и `SUM` дал бы float, поэтому строки читаются
+        потоком и складываются в `Decimal`.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            low (int): Начало диапазона счетов (включительно).
+            high (int): Конец диапазона счетов (не включительно).
+
+        Returns:
+            dict[int, Decimal]: Сумма платежей по идентификатору счёта.
+        """
+        params = {'low': low, 'high': high}
+        if db.get_bind().dialect.name == 'postgresql':
+            result = await db.execute(self._totals_by_account, params)
+            return {account_id: total for account_id, total in result}
+        totals: dict[int, Decimal] = {}
+        result = await db.stream(self._amounts_by_account, params)
+        async for account_id, amount in result:
+            totals[account_id] = totals.get(account_id, MonetaryConstants.ZERO) + amount
+        return totals
+
+    @query_template
+    def _list_archivable(self) -> Executable:
+        return (
+            select(Payment)
+            .where(
+                Payment.created_at < bindparam('before'),
+                Payment.id > bindparam('after_id'),
+                Payment.checkpointed.is_(True),
+            )
+            .order_by(Payment.id)
+            .limit(bindparam('limit'))
+        )
+
+    async def list_archivable(
+        self, db: AsyncSession, *, before: datetime, after_id: int, limit: int
+    ) -> list[Payment]:
+        """Возвращает порцию платежей старше границы (keyset по `id`).
+
+        Платежи, ещё не учтённые в балансе, пропускаются до контрольной точки.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            before (datetime): Граница горячего окна (не включительно).
+            after_id (int): Последний `id` предыдущей порции.
+            limit (int): Размер порции.
+
+        Returns:
+            list[Payment]: Платежи в порядке `id`.
+        """
         result = await db.execute(
-            select(Payment).where(Payment.user_id == user_id).limit(limit).offset(offset)
+            self._list_archivable, {'before': before, 'after_id': after_id, 'limit': limit}
         )
         return result.scalars().all()
 
+    @query_template
+    def _delete_archived(self) -> Executable:
+        return delete(Payment).where(
+            Payment.id.in_(bindparam('ids', expanding=True)),
+            Payment.created_at < bindparam('before'),
+        )
+
+    async def delete_archived(self, db: AsyncSession, ids: list[int], *, before: datetime) -> int:
+        """Удаляет заархивированные платежи одним запросом.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            ids (list[int]): Идентификаторы платежей.
+            before (datetime): Граница горячего окна — отсекает свежие секции.
+
+        Returns:
+            int: Число удалённых платежей.
+        """
+        result = await db.execute(self._delete_archived, {'ids': ids, 'before': before})
+        return result.rowcount
+
+    @query_template
+    def _list_pending_locked(self) -> Executable:
+        return (
+            select(Payment.id, Payment.account_id, Payment.amount)
+            .where(Payment.checkpointed.is_(False))
+            .order_by(Payment.id)
+            .limit(bindparam('limit'))
+            .with_for_update(skip_locked=True)
+        )
+
+    async def list_pending_locked(
+        self, db: AsyncSession, *, limit: int
+    ) -> list[Row[tuple[int, int, Decimal]]]:
+        """Возвращает порцию неучтённых в балансах платежей, блокируя их строки.
+
+        Строки, заблокированные другой транзакцией (параллельная контрольная
+        точка), пропускаются (`SKIP LOCKED`), поэтому платёж не учитывается дважды.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            limit (int): Размер порции.
+
+        Returns:
+            list[Row]: Строки `(id, account_id, amount)` в порядке `id`.
+        """
+        result = await db.execute(self._list_pending_locked, {'limit': limit})
+        return result.all()
+
+    @query_template
+    def _pending_amounts(self) -> Executable:
+        return select(Payment.amount).where(
+            Payment.account_id == bindparam('account_id'), Payment.checkpointed.is_(False)
+        )
+
+    async def pending_total(self, db: AsyncSession, account_id: int) -> Decimal:
+        """Возвращает сумму неучтённых в балансе платежей счёта.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            account_id (int): Идентификатор счёта.
+
+        Returns:
+            Decimal: Сумма платежей с `checkpointed = false`.
+        """
+        result = await db.scalars(self._pending_amounts, {'account_id': account_id})
+        return sum(result, MonetaryConstants.ZERO)
+
+    @query_template
+    def _mark_checkpointed(self) -> Executable:
+        return (
+            update(Payment)
+            .where(Payment.id.in_(bindparam('ids', expanding=True)))
+            .values(checkpointed=True)
+        )
+
+    async def mark_checkpointed(self, db: AsyncSession, ids: list[int]) -> int:
+        """Отмечает платежи учтёнными в балансах одним запросом.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            ids (list[int]): Идентификаторы платежей.
+
+        Returns:
+            int: Число отмеченных платежей.
+        """
+        result = await db.execute(self._mark_checkpointed, {'ids': ids})
+        return result.rowcount
+
+    @query_template
+    def _delete_batch_for_user(self) -> Executable:
+        batch = (
+            select(Payment.id)
+            .where(Payment.user_id == bindparam('user_id'))
+            .limit(bindparam('limit'))
+            .scalar_subquery()
+        )
+        return delete(Payment).where(Payment.id.in_(batch))
+
+    async def delete_batch_for_user(self, db: AsyncSession, user_id: int, *, limit: int) -> int:
+        """Удаляет до `limit` платежей пользователя одним запросом без загрузки в память.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            user_id (int): Идентификатор пользователя.
+            limit (int): Максимум удаляемых строк.
+
+        Returns:
+            int: Число удалённых платежей.
+        """
+        result = await db.execute(
+            self._delete_batch_for_user, {'user_id': user_id, 'limit': limit}
+        )
+        return result.rowcount
+
+    @query_template
+    def _move_to_account(self) -> Executable:
+        return (
+            update(Payment)
+            .where(Payment.account_id.in_(bindparam('from_ids', expanding=True)))
+            .values(account_id=bindparam('to_id'))
+        )
+
+    async def move_to_account(
+        self, db: AsyncSession, from_account_ids: list[int], to_account_id: int
+    ) -> int:
+        """Переносит платежи со счетов на другой счёт одним запросом.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            from_account_ids (list[int]): Исходные счета.
+            to_account_id (int): Целевой счёт.
+
+        Returns:
+            int: Число перенесённых платежей.
+        """
+        result = await db.execute(
+            self._move_to_account, {'from_ids': from_account_ids, 'to_id': to_account_id}
+        )
+        return result.rowcount
+
     async def create(
         self,
         db: AsyncSession,
@@ -73,6 +442,7 @@ class CRUDPayment(CRUDBase[Payment]):
         user_id: int,
         account_id: int,
         amount,
+        checkpointed: bool = True,
     ) -> Payment:
         """Создаёт платёж.
 
@@ -82,6 +452,8 @@ class CRUDPayment(CRUDBase[Payment]):
             user_id (int): Идентификатор пользователя.
             account_id (int): Идентификатор счета.
             amount: Сумма.
+            checkpointed (bool): Сумма уже учтена в балансе счёта; False — платёж
+                учтёт контрольная точка (режим `ledger`).
 
         Returns:
             Payment: Созданный платёж.
@@ -91,6 +463,7 @@ class CRUDPayment(CRUDBase[Payment]):
             user_id=user_id,
             account_id=account_id,
             amount=amount,
+            checkpointed=checkpointed,
         )
         db.add(payment)
         await db.flush()
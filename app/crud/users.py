@@ -4,11 +4,11 @@ from __future__ import annotations
 
 from typing import Iterable
 
-from sqlalchemy import select
+from sqlalchemy import Executable, bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import hash_password
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, query_template
 from app.models.user import User
 
 
@@ -23,6 +23,14 @@ class CRUDUser(CRUDBase[User]):
         """
         super().__init__(User)
 
+    @query_template
+    def _get_by_email(self) -> Executable:
+        return select(User).where(User.email == bindparam('email'))
+
+    @query_template
+    def _list_paginated(self) -> Executable:
+        return select(User).order_by(User.id).limit(bindparam('limit')).offset(bindparam('offset'))
+
     async def get_by_email(self, db: AsyncSession, email: str) -> User | None:
         """Возвращает пользователя по email.
 
@@ -33,7 +41,7 @@ class CRUDUser(CRUDBase[User]):
         Returns:
             User | None: Пользователь или None.
         """
-        result = await db.execute(select(User).where(User.email == email))
+        result = await db.execute(self._get_by_email, {'email': email})
         return result.scalar_one_or_none()
 
     async def create(
@@ -123,7 +131,7 @@ class CRUDUser(CRUDBase[User]):
         Returns:
             list[User]: Пользователи.
         """
-        result = await db.execute(select(User).limit(limit).offset(offset))
+        result = await db.execute(self._list_paginated, {'limit': limit, 'offset': offset})
         return result.scalars().all()
 
 
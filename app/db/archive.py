@@ -0,0 +1,469 @@
+"""Холодный архив платежей в сжатых сегментных файлах.
+
+Платежи старше горячего окна почти не читаются, но занимают большую часть
+таблицы `payments` и её индексов. Задача архивации переносит их в каталог
+архива: каждая порция строк становится неизменяемым сегментом (gzip JSON
+Lines), рядом с которым лежит небольшой индекс — позиции строк сегмента по
+`user_id` (с `id` и `created_at` платежа) и `transaction_id`, суммы по счетам и
+границы `created_at`. Новые данные только дописываются новыми сегментами;
+существующие файлы не изменяются.
+
+В памяти процесса хранятся только сведения о сегментах: границы `created_at`
+и фильтр Блума по `transaction_id` и `user_id` (около `FILTER_BITS_PER_KEY`
+бит на ключ), поэтому память не растёт со строками архива. Запрос отбирает
+сегменты по границам и фильтру и читает с диска только их индексы, а строки —
+только из сегментов, где они лежат. Каталог перечитывается, когда меняется
+время его модификации: сегменты, дописанные задачей архивации в другом
+процессе, становятся видны при следующем обращении. Файловые операции, включая
+проверку каталога, выполняются в пуле потоков.
+
+Писатель у архива один (задача архивации): номера сегментов не согласуются
+между процессами.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Sequence
+
+from app.core.constants import PaymentArchiveFiles
+from app.models.payment import Payment
+
+
+if TYPE_CHECKING:
+    from app.core.config import Settings
+
+
+def _utc(moment: datetime) -> datetime:
+    """Приводит момент времени к UTC; наивное время считается UTC (SQLite)."""
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc)
+
+
+def _filter_bits(key: str, size: int) -> list[int]:
+    """Номера битов ключа в фильтре размером `size` бит (двойное хеширование)."""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    first = int.from_bytes(digest[:8], 'little')
+    step = int.from_bytes(digest[8:], 'little') | 1
+    return [(first + i * step) % size for i in range(PaymentArchiveFiles.FILTER_HASHES)]
+
+
+def _build_filter(keys: list[str]) -> bytes:
+    """Строит фильтр Блума по ключам."""
+    bits = bytearray(max(len(keys) * PaymentArchiveFiles.FILTER_BITS_PER_KEY // 8, 1))
+    for key in keys:
+        for bit in _filter_bits(key, len(bits) * 8):
+            bits[bit >> 3] |= 1 << (bit & 7)
+    return bytes(bits)
+
+
+@dataclass(frozen=True)
+class ArchiveSegment:
+    """Сведения о сегменте архива.
+
+    Атрибуты:
+        number: Номер сегмента.
+        rows: Число платежей в сегменте.
+        min_created_at: Самый ранний `created_at` сегмента.
+        max_created_at: Самый поздний `created_at` сегмента.
+        keys: Фильтр Блума по `transaction_id` и `user_id` платежей сегмента.
+    """
+
+    number: int
+    rows: int
+    min_created_at: datetime
+    max_created_at: datetime
+    keys: bytes = field(default=b'', repr=False, compare=False)
+
+    @classmethod
+    def from_index(cls, number: int, index: dict[str, Any]) -> ArchiveSegment:
+        """Собирает сведения о сегменте из его индекса."""
+        keys = [PaymentArchiveFiles.TRANSACTION_KEY.format(key) for key in index['transactions']]
+        keys.extend(PaymentArchiveFiles.USER_KEY.format(key) for key in index['users'])
+        return cls(
+            number=number,
+            rows=index['rows'],
+            min_created_at=datetime.fromisoformat(index['min_created_at']),
+            max_created_at=datetime.fromisoformat(index['max_created_at']),
+            keys=_build_filter(keys),
+        )
+
+    def may_contain(self, key: str) -> bool:
+        """Проверяет ключ по фильтру; False — ключа в сегменте точно нет."""
+        return all(
+            self.keys[bit >> 3] & (1 << (bit & 7)) for bit in _filter_bits(key, len(self.keys) * 8)
+        )
+
+    def overlaps(self, created_from: datetime | None, created_to: datetime | None) -> bool:
+        """Проверяет, пересекается ли сегмент с периодом `[created_from, created_to)`."""
+        if created_from is not None and self.max_created_at < created_from:
+            return False
+        return created_to is None or self.min_created_at < created_to
+
+
+class PaymentArchive:
+    """Каталог сегментов архива платежей со сведениями о сегментах в памяти процесса."""
+
+    def __init__(self, directory: str | Path) -> None:
+        """Инициализирует архив.
+
+        Args:
+            directory (str | Path): Каталог сегментов; создаётся при первой записи.
+        """
+        self.directory = Path(directory)
+        self._segments: dict[int, ArchiveSegment] = {}
+        self._mtime_ns: int | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def segments(self) -> list[ArchiveSegment]:
+        """Загруженные сегменты в порядке номеров."""
+        return [self._segments[number] for number in sorted(self._segments)]
+
+    async def refresh(self) -> None:
+        """Подгружает сведения о сегментах, появившихся с прошлой проверки."""
+        try:
+            stat = await asyncio.to_thread(os.stat, self.directory)
+        except FileNotFoundError:
+            return
+        mtime_ns = stat.st_mtime_ns
+        if mtime_ns == self._mtime_ns:
+            return
+        async with self._lock:
+            if mtime_ns == self._mtime_ns:
+                return
+            loaded = await asyncio.to_thread(self._read_new_segments, set(self._segments))
+            for segment in loaded:
+                self._segments[segment.number] = segment
+            # Грубое время модификации может не измениться при записи в ту же
+            # секунду: свежее значение не запоминаем, чтобы перечитать каталог
+            if time.time_ns() - mtime_ns > 2_000_000_000:
+                self._mtime_ns = mtime_ns
+
+    async def find_transaction(self, transaction_id: str) -> Payment | None:
+        """Ищет архивный платёж по идентификатору транзакции.
+
+        Индексы читаются только у сегментов, чей фильтр допускает транзакцию.
+
+        Args:
+            transaction_id (str): Внешний идентификатор транзакции.
+
+        Returns:
+            Payment | None: Непривязанный к сессии платёж или None.
+        """
+        await self.refresh()
+        key = PaymentArchiveFiles.TRANSACTION_KEY.format(transaction_id)
+        numbers = self._candidates(key, None, None)
+        if not numbers:
+            return None
+        return await asyncio.to_thread(self._find_transaction, transaction_id, numbers)
+
+    async def list_for_user(
+        self,
+        user_id: int,
+        *,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> list[Payment]:
+        """Возвращает архивные платежи пользователя за период.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+            created_from (datetime | None): Начало периода (включительно).
+            created_to (datetime | None): Конец периода (не включительно).
+
+        Returns:
+            list[Payment]: Платежи в порядке `(created_at, id)`, без повторов.
+        """
+        page, _ = await self.page_for_user(
+            user_id, limit=None, offset=0, created_from=created_from, created_to=created_to
+        )
+        return page
+
+    async def page_for_user(
+        self,
+        user_id: int,
+        *,
+        limit: int | None,
+        offset: int,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> tuple[list[Payment], int]:
+        """Возвращает страницу архивных платежей пользователя за период.
+
+        Читаются индексы только тех сегментов, которые по фильтру и границам
+        `created_at` могут содержать платежи пользователя за период;
+        распаковываются только сегменты, в которых лежат строки страницы.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+            limit (int | None): Максимум платежей (None — все).
+            offset (int): Смещение.
+            created_from (datetime | None): Начало периода (включительно).
+            created_to (datetime | None): Конец периода (не включительно).
+
+        Returns:
+            tuple[list[Payment], int]: Платежи страницы в порядке `(created_at, id)`
+                и число архивных платежей пользователя за период.
+        """
+        await self.refresh()
+        created_from = None if created_from is None else _utc(created_from)
+        created_to = None if created_to is None else _utc(created_to)
+        key = PaymentArchiveFiles.USER_KEY.format(user_id)
+        numbers = self._candidates(key, created_from, created_to)
+        if not numbers:
+            return [], 0
+        return await asyncio.to_thread(
+            self._read_page, user_id, numbers, created_from, created_to, limit, offset
+        )
+
+    async def latest_segment_ids(self, user_id: int | None = None) -> list[int]:
+        """Возвращает идентификаторы платежей последнего сегмента.
+
+        Нужны задаче архивации, чтобы дочистить БД после сбоя между записью
+        сегмента и удалением его строк. Только строки последнего сегмента
+        могут одновременно оставаться в БД, поэтому чтение истории исключает
+        их из запроса к БД. Идентификаторы берутся из индекса сегмента.
+
+        Args:
+            user_id (int | None): Вернуть только платежи этого пользователя.
+
+        Returns:
+            list[int]: Идентификаторы платежей или пустой список.
+        """
+        await self.refresh()
+        if not self._segments:
+            return []
+        latest = self._segments[max(self._segments)]
+        if user_id is not None and not latest.may_contain(
+            PaymentArchiveFiles.USER_KEY.format(user_id)
+        ):
+            return []
+        index = await asyncio.to_thread(self._read_index, latest.number)
+        users = index['users']
+        if user_id is not None:
+            users = {str(user_id): users.get(str(user_id), [])}
+        return sorted(payment_id for entries in users.values() for _, payment_id, _ in entries)
+
+    async def account_totals(self) -> dict[int, Decimal]:
+        """Возвращает суммы архивных платежей по счетам.
+
+        Суммы берутся из индексов сегментов, которые читаются с диска по одному,
+        без распаковки самих сегментов.
+
+        Returns:
+            dict[int, Decimal]: Сумма платежей по идентификатору счёта.
+        """
+        await self.refresh()
+        return await asyncio.to_thread(self._sum_accounts, sorted(self._segments))
+
+    async def append(self, payments: Sequence[Payment]) -> ArchiveSegment:
+        """Записывает платежи новым сегментом вместе с его индексом.
+
+        Сегмент и индекс пишутся во временные файлы и переименовываются после
+        `fsync`; индекс появляется последним, поэтому к моменту удаления строк
+        из БД сегмент уже виден читателям.
+
+        Args:
+            payments (Sequence[Payment]): Непустая порция платежей.
+
+        Returns:
+            ArchiveSegment: Записанный сегмент.
+        """
+        rows = [self._to_row(payment) for payment in payments]
+        async with self._lock:
+            segment = await asyncio.to_thread(self._write_segment, rows)
+            self._segments[segment.number] = segment
+        return segment
+
+    def _candidates(
+        self, key: str, created_from: datetime | None, created_to: datetime | None
+    ) -> list[int]:
+        return [
+            number
+            for number, segment in sorted(self._segments.items())
+            if segment.overlaps(created_from, created_to) and segment.may_contain(key)
+        ]
+
+    def _find_transaction(self, transaction_id: str, numbers: list[int]) -> Payment | None:
+        for number in numbers:
+            position = self._read_index(number)['transactions'].get(transaction_id)
+            if position is not None:
+                return self._to_payment(self._read_segment(number)[position])
+        return None
+
+    def _read_page(
+        self,
+        user_id: int,
+        numbers: list[int],
+        created_from: datetime | None,
+        created_to: datetime | None,
+        limit: int | None,
+        offset: int,
+    ) -> tuple[list[Payment], int]:
+        keys: list[tuple[datetime, int, int, int]] = []
+        for number in numbers:
+            for position, payment_id, created_at in self._read_index(number)['users'].get(
+                str(user_id), ()
+            ):
+                moment = datetime.fromisoformat(created_at)
+                if (created_from is None or moment >= created_from) and (
+                    created_to is None or moment < created_to
+                ):
+                    keys.append((moment, payment_id, number, position))
+        keys.sort()
+        # Повтор платежа (сегмент записан дважды) стоит рядом: ключи упорядочены
+        selected: list[tuple[datetime, int, int, int]] = []
+        for key in keys:
+            if not selected or selected[-1][1] != key[1]:
+                selected.append(key)
+        end = None if limit is None else offset + limit
+        return self._read_rows(selected[offset:end]), len(selected)
+
+    def _read_rows(self, keys: list[tuple[datetime, int, int, int]]) -> list[Payment]:
+        segments: dict[int, list[dict[str, Any]]] = {}
+        payments = []
+        for _created_at, _payment_id, number, position in keys:
+            if number not in segments:
+                segments[number] = self._read_segment(number)
+            payments.append(self._to_payment(segments[number][position]))
+        return payments
+
+    def _read_new_segments(self, known: set[int]) -> list[ArchiveSegment]:
+        loaded = []
+        for name in sorted(os.listdir(self.directory)):
+            match = re.match(PaymentArchiveFiles.INDEX_PATTERN, name)
+            if match is None or int(match.group(1)) in known:
+                continue
+            number = int(match.group(1))
+            loaded.append(ArchiveSegment.from_index(number, self._read_index(number)))
+        return loaded
+
+    def _read_index(self, number: int) -> dict[str, Any]:
+        path = self.directory / PaymentArchiveFiles.INDEX_TEMPLATE.format(number=number)
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+
+    def _sum_accounts(self, numbers: list[int]) -> dict[int, Decimal]:
+        totals: dict[int, Decimal] = {}
+        for number in numbers:
+            accounts = self._read_index(number)['accounts']
+            for account_id, amount in accounts.items():
+                totals[int(account_id)] = totals.get(int(account_id), 0) + Decimal(amount)
+        return totals
+
+    def _read_segment(self, number: int) -> list[dict[str, Any]]:
+        path = self.directory / PaymentArchiveFiles.SEGMENT_TEMPLATE.format(number=number)
+        with gzip.open(path, 'rt', encoding='utf-8') as file:
+            return [json.loads(line) for line in file]
+
+    def _write_segment(self, rows: list[dict[str, Any]]) -> ArchiveSegment:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Сегмент без индекса (сбой записи) перезаписывается следующим номером
+        pattern = re.compile(PaymentArchiveFiles.INDEX_PATTERN)
+        matches = (pattern.match(name) for name in os.listdir(self.directory))
+        number = max((int(match.group(1)) for match in matches if match), default=0) + 1
+
+        transactions: dict[str, int] = {}
+        accounts: dict[str, Decimal] = {}
+        for position, row in enumerate(rows):
+            transactions[row['transaction_id']] = position
+            account_id = str(row['account_id'])
+            accounts[account_id] = accounts.get(account_id, 0) + Decimal(row['amount'])
+        created = [row['created_at'] for row in rows]
+        index = {
+            'version': PaymentArchiveFiles.FORMAT_VERSION,
+            'rows': len(rows),
+            'min_id': min(row['id'] for row in rows),
+            'max_id': max(row['id'] for row in rows),
+            'min_created_at': min(created, key=datetime.fromisoformat),
+            'max_created_at': max(created, key=datetime.fromisoformat),
+            'users': self._index_users(rows),
+            'transactions': transactions,
+            'accounts': {account_id: str(total) for account_id, total in accounts.items()},
+        }
+
+        segment = self.directory / PaymentArchiveFiles.SEGMENT_TEMPLATE.format(number=number)
+        self._replace(
+            segment,
+            gzip.compress(
+                ''.join(json.dumps(row) + '\n' for row in rows).encode('utf-8'),
+                compresslevel=PaymentArchiveFiles.COMPRESS_LEVEL,
+            ),
+        )
+        self._replace(
+            self.directory / PaymentArchiveFiles.INDEX_TEMPLATE.format(number=number),
+            json.dumps(index).encode('utf-8'),
+        )
+        directory = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+        return ArchiveSegment.from_index(number, index)
+
+    @staticmethod
+    def _index_users(rows: list[dict[str, Any]]) -> dict[str, list[list[Any]]]:
+        users: dict[str, list[list[Any]]] = {}
+        for position, row in enumerate(rows):
+            users.setdefault(str(row['user_id']), []).append(
+                [position, row['id'], row['created_at']]
+            )
+        return users
+
+    @staticmethod
+    def _replace(path: Path, data: bytes) -> None:
+        tmp = path.with_name(path.name + PaymentArchiveFiles.TMP_SUFFIX)
+        with open(tmp, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _to_row(payment: Payment) -> dict[str, Any]:
+        return {
+            'id': payment.id,
+            'transaction_id': payment.transaction_id,
+            'user_id': payment.user_id,
+            'account_id': payment.account_id,
+            'amount': str(payment.amount),
+            'created_at': _utc(payment.created_at).isoformat(),
+        }
+
+    @staticmethod
+    def _to_payment(row: dict[str, Any]) -> Payment:
+        return Payment(
+            id=row['id'],
+            transaction_id=row['transaction_id'],
+            user_id=row['user_id'],
+            account_id=row['account_id'],
+            amount=Decimal(row['amount']),
+            created_at=datetime.fromisoformat(row['created_at']),
+            checkpointed=True,
+        )
+
+
+def build_payment_archive(settings: Settings) -> PaymentArchive | None:
+    """Создаёт архив платежей по настройкам приложения.
+
+    Args:
+        settings (Settings): Настройки приложения.
+
+    Returns:
+        PaymentArchive | None: Архив или None, если каталог архива не задан.
+    """
+    if not settings.payments_archive_dir:
+        return None
+    return PaymentArchive(settings.payments_archive_dir)
@@ -2,8 +2,17 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
-    """Базовый класс для всех ORM-моделей."""
+    """Базовый класс для всех ORM-моделей.
+
+    `eager_defaults` получает серверные значения по умолчанию тем же
+    `INSERT/UPDATE ... RETURNING`, поэтому после записи объект не нужно
+    перечитывать через `refresh`.
+    """
+
+    __mapper_args__: dict[str, Any] = {'eager_defaults': True}
@@ -1,16 +1,142 @@
-"""Инициализация асинхронного движка БД и фабрики сессий."""
+"""Инициализация асинхронного движка БД и фабрики сессий.
+
+Также содержит счётчик SQL-выражений: слушатель `before_cursor_execute` на
+движке записывает каждое выражение в счётчики, активные в текущем контексте
+(`count_queries`). Контекст наследуется задачами asyncio, поэтому счётчик,
+открытый на время HTTP-запроса или теста, видит все его запросы к БД.
+"""
 
 from __future__ import annotations
 
-from typing import AsyncGenerator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncGenerator, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.core.config import Settings, get_settings
+
+
+def build_engine_options(settings: Settings) -> dict[str, Any]:
+    """Формирует параметры движка с учётом кэшей запросов.
+
+    Для asyncpg задаётся размер кэша подготовленных statement соединения:
+    шаблоны запросов CRUD дают стабильный SQL-текст и попадают в этот кэш.
+
+    Args:
+        settings (Settings): Настройки приложения.
+
+    Returns:
+        dict[str, Any]: Именованные аргументы для `create_async_engine`.
+    """
+    options: dict[str, Any] = {
+        'echo': settings.debug,
+        'future': True,
+        'query_cache_size': settings.db_query_cache_size,
+    }
+    if settings.database_url.startswith('postgresql+asyncpg'):
+        options['connect_args'] = {
+            'prepared_statement_cache_size': settings.db_prepared_statement_cache_size
+        }
+    return options
+
+
+class QueryCounter:
+    """Счётчик SQL-выражений, выполненных в контексте `count_queries`.
+
+    Атрибуты:
+        statements: Выполненные выражения по порядку.
+        parent: Внешний счётчик, который также получает выражения.
+    """
+
+    def __init__(self, parent: QueryCounter | None = None) -> None:
+        """Инициализирует пустой счётчик.
+
+        Args:
+            parent (QueryCounter | None): Внешний активный счётчик.
+        """
+        self.statements: list[str] = []
+        self.parent = parent
+
+    def __len__(self) -> int:
+        """Возвращает число выполненных выражений."""
+        return len(self.statements)
+
+    def clear(self) -> None:
+        """Сбрасывает счётчик (например, после подготовки данных в тесте)."""
+        self.statements.clear()
+
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+_current_counter: ContextVar[QueryCounter | None] = ContextVar('query_counter', default=None)
 
-from app.core.config import get_settings
+
+def _record_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _current_counter.get()
+    while counter is not None:
+        counter.statements.append(statement)
+        counter = counter.parent
+
+
+def install_query_counter(engine: AsyncEngine) -> None:
+    """Подключает подсчёт выражений к движку (повторный вызов ничего не меняет).
+
+    Args:
+        engine (AsyncEngine): Асинхронный движок SQLAlchemy.
+    """
+    if not event.contains(engine.sync_engine, 'before_cursor_execute', _record_statement):
+        event.listen(engine.sync_engine, 'before_cursor_execute', _record_statement)
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+
+def install_sqlite_foreign_keys(engine: AsyncEngine) -> None:
+    """Включает проверку внешних ключей в каждом соединении SQLite.
+
+    SQLite по умолчанию игнорирует `ON DELETE CASCADE`, а связи моделей
+    объявлены с `passive_deletes=True` и полагаются на каскад БД. Для других
+    диалектов ничего не делает; повторный вызов ничего не меняет.
+
+    Args:
+        engine (AsyncEngine): Асинхронный движок SQLAlchemy.
+    """
+    target = engine.sync_engine
+    if target.dialect.name != 'sqlite':
+        return
+    if not event.contains(target, 'connect', _enable_sqlite_foreign_keys):
+        event.listen(target, 'connect', _enable_sqlite_foreign_keys)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """Считает SQL-выражения, выполненные внутри блока.
+
+    Вложенные блоки поддерживаются: выражение попадает во все активные счётчики.
+
+    Yields:
+        QueryCounter: Счётчик выражений блока.
+    """
+    counter = QueryCounter(_current_counter.get())
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
 
 
 settings = get_settings()
-engine = create_async_engine(settings.database_url, echo=settings.debug, future=True)
+engine = create_async_engine(settings.database_url, **build_engine_options(settings))
+install_query_counter(engine)
+install_sqlite_foreign_keys(engine)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
 
@@ -0,0 +1,272 @@
+"""Журнал медленных SQL-выражений с автоматическим планом выполнения.
+
+Какие запросы слоя CRUD медленные на реальных данных, видно только на
+рабочем сервере. `SlowQueryLog` подключается к событиям движка
+`before_cursor_execute`/`after_cursor_execute` и записывает выражения дольше
+`threshold_ms` в кольцевой буфер последних `max_entries` записей. Значения
+параметров в журнал не попадают: вместо них сохраняются только типы.
+
+План выполнения запрашивается в фоне отдельным соединением (`EXPLAIN`, на
+PostgreSQL с `ANALYZE` по настройке) и дописывается в запись, когда будет
+готов. `ANALYZE` выполняет выражение, поэтому применяется только к `SELECT`;
+на PostgreSQL план строится в транзакции только для чтения с `statement_timeout`,
+а соединение плана закрывается с откатом. Блокирующие чтения (`FOR UPDATE`,
+`FOR SHARE` и их варианты) не перезапускаются совсем. Одновременно строится не
+больше `max_concurrent_explains` планов; остальные записи остаются без плана.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import itertools
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.constants import SlowQueries
+
+
+if TYPE_CHECKING:
+    from app.core.config import Settings
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SlowQueryEntry:
+    """Запись журнала медленных выражений.
+
+    Атрибуты:
+        id: Порядковый номер записи в процессе.
+        statement: Текст выражения в формате драйвера.
+        parameters: Типы параметров вместо значений.
+        duration_ms: Время выполнения выражения.
+        executemany: Выражение выполнено пакетом параметров.
+        captured_at: Время записи (UTC).
+        plan: План выполнения или None, пока он не получен.
+        plan_error: Причина, по которой плана нет.
+    """
+
+    id: int
+    statement: str
+    parameters: Any
+    duration_ms: float
+    executemany: bool
+    captured_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    plan: str | None = None
+    plan_error: str | None = None
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Заменяет значения параметров их типами.
+
+    Args:
+        parameters (Any): Параметры выражения (кортеж, словарь или их список).
+
+    Returns:
+        Any: Та же структура с именами типов вместо значений.
+    """
+    if isinstance(parameters, dict):
+        return {key: redact_parameters(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) for value in parameters]
+    return f'<{type(parameters).__name__}>'
+
+
+class SlowQueryLog:
+    """Кольцевой буфер медленных выражений движка.
+
+    Атрибуты:
+        threshold_ms: Время выражения, начиная с которого оно попадает в журнал.
+        explain: Запрашивать план выполнения медленных выражений.
+        explain_analyze: Выполнять `SELECT` под `EXPLAIN ANALYZE` (только PostgreSQL).
+        captured: Сколько выражений записано за время работы процесса.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold_ms: float,
+        max_entries: int,
+        explain: bool = True,
+        explain_analyze: bool = False,
+        max_concurrent_explains: int = 2,
+        explain_timeout_seconds: float = 10.0,
+    ) -> None:
+        """Инициализирует журнал.
+
+        Args:
+            threshold_ms (float): Порог времени выражения в миллисекундах.
+            max_entries (int): Сколько последних записей хранить.
+            explain (bool): Запрашивать план выполнения.
+            explain_analyze (bool): Использовать `EXPLAIN ANALYZE` для `SELECT`.
+            max_concurrent_explains (int): Сколько планов строить одновременно.
+            explain_timeout_seconds (float): Предельное время построения плана.
+        """
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.explain_analyze = explain_analyze
+        self.max_concurrent_explains = max_concurrent_explains
+        self.explain_timeout_seconds = explain_timeout_seconds
+        self.captured = 0
+        self._entries: deque[SlowQueryEntry] = deque(maxlen=max_entries)
+        self._ids = itertools.count(1)
+        self._engine: AsyncEngine | None = None
+        self._explains: set[asyncio.Task] = set()
+
+    # --- Подключение к движку ---
+
+    def install(self, engine: AsyncEngine) -> None:
+        """Подключает журнал к событиям движка (повторный вызов ничего не меняет).
+
+        Args:
+            engine (AsyncEngine): Асинхронный движок SQLAlchemy.
+        """
+        self._engine = engine
+        target = engine.sync_engine
+        for name, listener in self._listeners():
+            if not event.contains(target, name, listener):
+                event.listen(target, name, listener)
+
+    async def uninstall(self) -> None:
+        """Отключает журнал от движка и дожидается построения начатых планов."""
+        if self._engine is None:
+            return
+        target = self._engine.sync_engine
+        for name, listener in self._listeners():
+            if event.contains(target, name, listener):
+                event.remove(target, name, listener)
+        await self.wait_explains()
+        self._engine = None
+
+    def _listeners(self) -> tuple[tuple[str, Any], ...]:
+        return (
+            ('before_cursor_execute', self._before_cursor_execute),
+            ('after_cursor_execute', self._after_cursor_execute),
+        )
+
+    # --- Замер выражений ---
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        started = getattr(context, '_slow_query_started', None)
+        if started is None or context.execution_options.get(SlowQueries.EXPLAIN_OPTION):
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+        entry = SlowQueryEntry(
+            id=next(self._ids),
+            statement=statement,
+            parameters=redact_parameters(parameters),
+            duration_ms=round(duration_ms, 3),
+            executemany=executemany,
+        )
+        self._entries.append(entry)
+        self.captured += 1
+        logger.warning('Медленное SQL-выражение (%.1f мс): %s', duration_ms, statement)
+        if self.explain:
+            self._schedule_explain(entry, statement, parameters, executemany)
+
+    # --- План выполнения ---
+
+    def _schedule_explain(
+        self, entry: SlowQueryEntry, statement: str, parameters: Any, executemany: bool
+    ) -> None:
+        if executemany or not statement.lstrip().upper().startswith(SlowQueries.EXPLAINABLE):
+            entry.plan_error = SlowQueries.PLAN_NOT_EXPLAINABLE
+            return
+        if re.search(SlowQueries.LOCKING_PATTERN, statement, re.IGNORECASE):
+            entry.plan_error = SlowQueries.PLAN_LOCKING
+            return
+        if len(self._explains) >= self.max_concurrent_explains:
+            entry.plan_error = SlowQueries.PLAN_SKIPPED
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            entry.plan_error = SlowQueries.PLAN_NOT_EXPLAINABLE
+            return
+        # Пустой контекст: план не попадает в счётчики выражений HTTP-запроса
+        task = contextvars.Context().run(
+            loop.create_task, self._explain(entry, statement, parameters)
+        )
+        self._explains.add(task)
+        task.add_done_callback(self._explains.discard)
+
+    async def _explain(self, entry: SlowQueryEntry, statement: str, parameters: Any) -> None:
+        try:
+            entry.plan = await asyncio.wait_for(
+                self._fetch_plan(statement, parameters), self.explain_timeout_seconds
+            )
+        except Exception as exc:  # noqa: BLE001 - запись остаётся без плана
+            entry.plan_error = f'{type(exc).__name__}: {exc}'
+
+    async def _fetch_plan(self, statement: str, parameters: Any) -> str:
+        engine = self._engine
+        postgresql = engine.dialect.name == 'postgresql'
+        if postgresql:
+            analyze = self.explain_analyze and statement.lstrip().upper().startswith('SELECT')
+            prefix = 'EXPLAIN (ANALYZE, BUFFERS) ' if analyze else 'EXPLAIN '
+        else:
+            prefix = 'EXPLAIN QUERY PLAN '
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(**{SlowQueries.EXPLAIN_OPTION: True})
+            if postgresql:
+                # ANALYZE выполняет выражение: запрещаем запись и ограничиваем время на сервере
+                timeout_ms = int(self.explain_timeout_seconds * 1000)
+                await conn.exec_driver_sql('SET TRANSACTION READ ONLY')
+                await conn.exec_driver_sql(f'SET LOCAL statement_timeout = {timeout_ms}')
+            result = await conn.exec_driver_sql(prefix + statement, parameters)
+            # PostgreSQL отдаёт строку плана в единственной колонке, SQLite — в последней
+            return '\n'.join(str(row[-1]) for row in result)
+
+    async def wait_explains(self) -> None:
+        """Дожидается построения всех начатых планов."""
+        while self._explains:
+            await asyncio.gather(*self._explains, return_exceptions=True)
+
+    # --- Записи ---
+
+    def entries(self) -> list[SlowQueryEntry]:
+        """Возвращает записи журнала от новых к старым.
+
+        Returns:
+            list[SlowQueryEntry]: Последние медленные выражения.
+        """
+        return list(reversed(self._entries))
+
+
+def build_slow_query_log(settings: Settings) -> SlowQueryLog | None:
+    """Создаёт журнал медленных выражений по настройкам приложения.
+
+    Args:
+        settings (Settings): Настройки приложения.
+
+    Returns:
+        SlowQueryLog | None: Журнал или None, если он выключен.
+    """
+    if not settings.slow_query_log_enabled:
+        return None
+    return SlowQueryLog(
+        threshold_ms=settings.slow_query_threshold_ms,
+        max_entries=settings.slow_query_max_entries,
+        explain=settings.slow_query_explain,
+        explain_analyze=settings.slow_query_explain_analyze,
+    )
@@ -0,0 +1,22 @@
+"""Потоки событий для клиентов (Server-Sent Events)."""
+
+from __future__ import annotations
+
+from .accounts import (
+    AccountEvent,
+    AccountEventHub,
+    AccountEventSubscription,
+    AccountEventTransport,
+    PostgresAccountEventTransport,
+    build_account_event_hub,
+)
+
+
+__all__ = [
+    'AccountEvent',
+    'AccountEventHub',
+    'AccountEventSubscription',
+    'AccountEventTransport',
+    'PostgresAccountEventTransport',
+    'build_account_event_hub',
+]
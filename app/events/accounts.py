@@ -0,0 +1,397 @@
+"""Поток событий счетов пользователя для Server-Sent Events.
+
+Клиенты вместо периодического опроса листинга счетов держат SSE-соединение и
+получают изменения балансов и новые платежи. Сервисы публикуют события в
+транзакции изменения (`publish`) и раздают их локальным подписчикам после
+коммита (`dispatch`), поэтому откатившееся изменение не доходит до клиентов.
+
+У каждого соединения своя ограниченная очередь. Клиент, не успевший её
+разобрать, получает событие `resync` и отключается: он перечитывает счета и
+подключается заново, а публикующий запрос и остальные подписчики его не ждут.
+
+Для нескольких воркеров события рассылаются через `AccountEventTransport`
+(например, PostgreSQL LISTEN/NOTIFY на соединении шины инвалидаций); отправитель
+пропускает собственные уведомления, потому что уже раздал их локально. Если
+уведомления могли потеряться (обрыв соединения шины), все подписчики процесса
+получают `resync`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import InvalidationBus, PostgresInvalidationBus
+from app.core.constants import AccountEventKinds, ServerSentEvents
+
+
+if TYPE_CHECKING:
+    from app.cache import BalanceSnapshot
+    from app.core.config import Settings
+    from app.models.payment import Payment
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class AccountEvent:
+    """Событие счёта, адресованное его владельцу.
+
+    Атрибуты:
+        kind: Тип события (`AccountEventKinds`).
+        user_id: Получатель события — владелец счёта.
+        data: Полезная нагрузка в JSON-совместимом виде.
+        origin: Идентификатор процесса-отправителя.
+    """
+
+    kind: str
+    user_id: int
+    data: dict[str, Any] = field(default_factory=dict)
+    origin: str = ''
+
+    @classmethod
+    def balance(cls, snapshot: BalanceSnapshot) -> AccountEvent:
+        """Создаёт событие изменения баланса по снимку счёта.
+
+        Args:
+            snapshot (BalanceSnapshot): Снимок счёта после изменения.
+
+        Returns:
+            AccountEvent: Событие `balance` с полями `AccountPublic` и версией.
+        """
+        return cls(
+            AccountEventKinds.BALANCE,
+            snapshot.user_id,
+            {
+                'id': snapshot.id,
+                'user_id': snapshot.user_id,
+                'balance': str(snapshot.balance),
+                'version': snapshot.version,
+            },
+        )
+
+    @classmethod
+    def payment(cls, payment: Payment) -> AccountEvent:
+        """Создаёт событие нового платежа.
+
+        Args:
+            payment (Payment): Созданный платёж.
+
+        Returns:
+            AccountEvent: Событие `payment` с полями `PaymentPublic`.
+        """
+        return cls(
+            AccountEventKinds.PAYMENT,
+            payment.user_id,
+            {
+                'id': payment.id,
+                'transaction_id': payment.transaction_id,
+                'user_id': payment.user_id,
+                'account_id': payment.account_id,
+                'amount': str(payment.amount),
+            },
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Возвращает компактное представление для рассылки между воркерами."""
+        return {'k': self.kind, 'u': self.user_id, 'd': self.data, 'o': self.origin}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> AccountEvent:
+        """Восстанавливает событие из представления `to_dict`.
+
+        Args:
+            data (dict[str, Any]): Разобранное представление события.
+
+        Returns:
+            AccountEvent: Событие.
+        """
+        return cls(kind=data['k'], user_id=data['u'], data=data['d'], origin=data['o'])
+
+    def to_sse(self) -> bytes:
+        """Кодирует событие в кадр Server-Sent Events."""
+        data = json.dumps(self.data, separators=(',', ':'))
+        return f'event: {self.kind}\ndata: {data}\n\n'.encode()
+
+
+class AccountEventTransport:
+    """Транспорт событий счетов между воркерами.
+
+    Базовая реализация ничего не рассылает и подходит для одного процесса.
+    """
+
+    async def publish(self, db: AsyncSession, events: Sequence[AccountEvent]) -> None:
+        """Публикует события для рассылки после коммита текущей транзакции.
+
+        Args:
+            db (AsyncSession): Сессия БД, транзакция которой ещё не закоммичена.
+            events (Sequence[AccountEvent]): События для рассылки.
+        """
+
+    async def start(self, handler: Callable[[AccountEvent], None]) -> None:
+        """Начинает приём событий от других воркеров.
+
+        Args:
+            handler (Callable[[AccountEvent], None]): Обработчик события.
+        """
+
+    async def stop(self) -> None:
+        """Прекращает приём событий."""
+
+
+class PostgresAccountEventTransport(AccountEventTransport):
+    """Рассылка событий счетов через PostgreSQL LISTEN/NOTIFY шины инвалидаций.
+
+    Отдельного соединения транспорт не открывает: события одной транзакции
+    уходят одним уведомлением с соединения `PostgresInvalidationBus` после
+    коммита, а подписка на канал переживает переподключения шины.
+    """
+
+    def __init__(self, bus: InvalidationBus, channel: str) -> None:
+        """Инициализирует транспорт.
+
+        Args:
+            bus (InvalidationBus): Шина инвалидаций, соединением которой пользуется транспорт.
+            channel (str): Имя канала LISTEN/NOTIFY.
+        """
+        self.bus = bus
+        self.channel = channel
+
+    async def publish(self, db: AsyncSession, events: Sequence[AccountEvent]) -> None:
+        """Передаёт события шине одним уведомлением после коммита транзакции."""
+        if not events:
+            return
+        payload = json.dumps([event.to_dict() for event in events], separators=(',', ':'))
+        self.bus.publish_payload(db, self.channel, payload)
+
+    async def start(self, handler: Callable[[AccountEvent], None]) -> None:
+        """Подписывается на канал через соединение шины."""
+
+        def _on_payload(payload: str) -> None:
+            try:
+                events = [AccountEvent.from_dict(item) for item in json.loads(payload)]
+            except (ValueError, KeyError, TypeError):
+                logger.warning('Некорректное уведомление о событиях счетов: %r', payload)
+                return
+            for event in events:
+                handler(event)
+
+        await self.bus.listen(self.channel, _on_payload)
+
+
+class AccountEventSubscription:
+    """Ограниченная очередь событий одного SSE-соединения."""
+
+    def __init__(self, user_id: int, queue_size: int) -> None:
+        """Инициализирует подписку.
+
+        Args:
+            user_id (int): Пользователь, события которого получает соединение.
+            queue_size (int): Максимум событий, ожидающих отправки клиенту.
+        """
+        self.user_id = user_id
+        self.overflowed = False
+        self._queue: asyncio.Queue[AccountEvent | None] = asyncio.Queue(maxsize=queue_size)
+
+    def offer(self, event: AccountEvent) -> None:
+        """Ставит событие в очередь, не дожидаясь клиента.
+
+        При переполнении подписка помечается `overflowed`, и дальнейшие события
+        ей не доставляются.
+
+        Args:
+            event (AccountEvent): Событие для клиента.
+        """
+        if self.overflowed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def close(self) -> None:
+        """Завершает подписку (при остановке приложения)."""
+        try:
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def resync(self) -> None:
+        """Отправляет клиенту `resync`: часть событий могла быть потеряна."""
+        self.overflowed = True
+        try:
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    async def get(self) -> AccountEvent | None:
+        """Ожидает следующее событие; None — подписка закрыта."""
+        return await self._queue.get()
+
+
+class AccountEventHub:
+    """Процессный pub/sub событий счетов с подписками по пользователю."""
+
+    def __init__(
+        self,
+        *,
+        queue_size: int,
+        heartbeat_seconds: float,
+        transport: AccountEventTransport | None = None,
+    ) -> None:
+        """Инициализирует хаб.
+
+        Args:
+            queue_size (int): Размер очереди одного соединения.
+            heartbeat_seconds (float): Пауза без событий, после которой клиенту
+                уходит комментарий keep-alive (держит соединение через прокси).
+            transport (AccountEventTransport | None): Транспорт событий между воркерами.
+        """
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.transport = transport or AccountEventTransport()
+        self.origin = uuid.uuid4().hex
+        self._subscriptions: dict[int, set[AccountEventSubscription]] = {}
+
+    # --- Жизненный цикл ---
+
+    async def start(self) -> None:
+        """Подписывается на события других воркеров."""
+        await self.transport.start(self._on_remote)
+
+    async def stop(self) -> None:
+        """Отписывается от транспорта и завершает все открытые потоки."""
+        await self.transport.stop()
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.close()
+
+    # --- Публикация ---
+
+    async def publish(self, db: AsyncSession, events: Sequence[AccountEvent]) -> None:
+        """Передаёт события другим воркерам в рамках текущей транзакции.
+
+        Args:
+            db (AsyncSession): Сессия БД до коммита.
+            events (Sequence[AccountEvent]): События изменения.
+        """
+        await self.transport.publish(db, [replace(event, origin=self.origin) for event in events])
+
+    def dispatch(self, events: Sequence[AccountEvent]) -> None:
+        """Раздаёт события локальным подписчикам (после коммита).
+
+        Args:
+            events (Sequence[AccountEvent]): События изменения.
+        """
+        for event in events:
+            for subscription in self._subscriptions.get(event.user_id, ()):
+                subscription.offer(event)
+
+    def _on_remote(self, event: AccountEvent) -> None:
+        if event.origin != self.origin:
+            self.dispatch([event])
+
+    def resync(self) -> None:
+        """Просит всех подписчиков процесса перечитать счета и переподключиться."""
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.resync()
+
+    # --- Подписки ---
+
+    def subscribe(self, user_id: int) -> AccountEventSubscription:
+        """Открывает подписку на события пользователя.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+
+        Returns:
+            AccountEventSubscription: Подписка; закрывается `unsubscribe`.
+        """
+        subscription = AccountEventSubscription(user_id, self.queue_size)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: AccountEventSubscription) -> None:
+        """Удаляет подписку.
+
+        Args:
+            subscription (AccountEventSubscription): Открытая подписка.
+        """
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.user_id]
+
+    def subscriber_count(self) -> int:
+        """Возвращает число открытых подписок процесса."""
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    async def stream(self, user_id: int) -> AsyncIterator[bytes]:
+        """Отдаёт кадры SSE с событиями пользователя, пока соединение открыто.
+
+        Args:
+            user_id (int): Идентификатор пользователя.
+
+        Yields:
+            bytes: Кадр события, keep-alive или завершающий `resync`.
+        """
+        subscription = self.subscribe(user_id)
+        try:
+            while True:
+                if subscription.overflowed:
+                    yield AccountEvent(AccountEventKinds.RESYNC, user_id).to_sse()
+                    return
+                try:
+                    event = await asyncio.wait_for(subscription.get(), self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ServerSentEvents.KEEPALIVE
+                    continue
+                if event is None:
+                    if subscription.overflowed:
+                        continue
+                    return
+                yield event.to_sse()
+        finally:
+            self.unsubscribe(subscription)
+
+
+def build_account_event_hub(settings: Settings, bus: InvalidationBus) -> AccountEventHub:
+    """Создаёт хаб событий счетов по настройкам приложения.
+
+    Транспорт PostgreSQL работает через соединение шины инвалидаций, поэтому
+    требует `invalidation_bus_backend=postgres`; иначе события остаются в процессе.
+
+    Args:
+        settings (Settings): Настройки приложения.
+        bus (InvalidationBus): Шина инвалидаций процесса.
+
+    Returns:
+        AccountEventHub: Хаб событий.
+    """
+    transport = None
+    if settings.account_events_backend == 'postgres':
+        if isinstance(bus, PostgresInvalidationBus):
+            transport = PostgresAccountEventTransport(bus, settings.account_events_channel)
+        else:
+            logger.warning(
+                'События счетов через PostgreSQL требуют шину инвалидаций PostgreSQL '
+                'и рассылаются только внутри процесса'
+            )
+    hub = AccountEventHub(
+        queue_size=settings.account_events_queue_size,
+        heartbeat_seconds=settings.account_events_heartbeat_seconds,
+        transport=transport,
+    )
+    if transport is not None:
+        bus.subscribe_reset(hub.resync)
+    return hub
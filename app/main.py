@@ -5,13 +5,33 @@
 
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
 from app.api.routers import create_api_router
 from app.core.config import get_settings
-from app.core.errors import DomainError, to_http_exc
+from app.core.container import ServiceContainer
+from app.core.errors import DomainError, to_error_response
+from app.core.profiling import ProfilingMiddleware
+from app.core.query_budget import QueryCountMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Запускает и останавливает фоновые компоненты приложения.
+
+    Args:
+        app (FastAPI): Экземпляр приложения.
+    """
+    container: ServiceContainer = app.state.container
+    await container.start()
+    try:
+        yield
+    finally:
+        await container.stop()
 
 
 def create_app() -> FastAPI:
@@ -24,6 +44,7 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.app_name,
         debug=settings.debug,
+        lifespan=lifespan,
         description=(
             'Асинхронный REST API для управления пользователями, счетами и платежами.\n\n'
             'Доступные разделы:\n'
@@ -51,8 +72,13 @@ def create_app() -> FastAPI:
                 'name': 'webhook',
                 'description': 'Обработка входящих уведомлений о пополнении от внешней системы.',
             },
+            {
+                'name': 'profiling',
+                'description': 'Профилирование запросов и журнал медленных SQL (админ).',
+            },
         ],
     )
+    app.state.container = ServiceContainer.build(settings)
 
     if settings.cors_origins == ['*']:
         app.add_middleware(
@@ -71,23 +97,30 @@ def create_app() -> FastAPI:
             allow_headers=['*'],
         )
 
+    if settings.debug:
+        # Заголовки с числом SQL-выражений запроса и бюджетом маршрута
+        app.add_middleware(QueryCountMiddleware)
+
+    if settings.profiling_enabled:
+        # Без включённого профилирования middleware не подключается вовсе
+        app.add_middleware(ProfilingMiddleware)
+
     app.include_router(create_api_router())
 
     @app.exception_handler(DomainError)
     async def domain_error_handler(_: Request, exc: DomainError):
         """Возвращает JSON-ответ для доменных исключений.
 
-        Преобразует `DomainError` в HTTP-ответ через `to_http_exc`.
+        Преобразует `DomainError` в HTTP-ответ через таблицу `to_error_response`.
 
         Args:
             _ (Request): Входящий запрос (не используется).
             exc (DomainError): Доменное исключение.
 
         Returns:
-            JSONResponse: Ответ с кодом статуса и сообщением об ошибке.
+            Response: Ответ с кодом статуса и сообщением об ошибке.
         """
-        http_exc = to_http_exc(exc)
-        return JSONResponse(status_code=http_exc.status_code, content={'detail': http_exc.detail})
+        return to_error_response(exc)
 
     return app
 
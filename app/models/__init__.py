@@ -2,5 +2,6 @@
 
 from app.db.base import Base  # noqa: F401
 from app.models.account import Account  # noqa: F401
+from app.models.debit import Debit  # noqa: F401
 from app.models.payment import Payment  # noqa: F401
 from app.models.user import User  # noqa: F401
@@ -6,7 +6,7 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Integer
+from sqlalchemy import Boolean, CheckConstraint, DateTime, ForeignKey, Index, Integer, false, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.constants.money import MonetaryConstants
@@ -15,6 +15,7 @@ from app.db.types import SafeMoney
 
 
 if TYPE_CHECKING:
+    from app.models.debit import Debit
     from app.models.payment import Payment
     from app.models.user import User
 
@@ -23,7 +24,17 @@ class Account(Base):
     """ORM-модель счёта пользователя с балансом."""
 
     __tablename__ = 'accounts'
-    __table_args__ = (CheckConstraint('balance >= 0', name='ck_accounts_balance_nonnegative'),)
+    __table_args__ = (
+        CheckConstraint('balance >= 0', name='ck_accounts_balance_nonnegative'),
+        # Не более одного счёта по умолчанию на пользователя; цель upsert в вебхуке
+        Index(
+            'uq_accounts_user_default',
+            'user_id',
+            unique=True,
+            postgresql_where=text('is_default'),
+            sqlite_where=text('is_default'),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(
@@ -32,11 +43,20 @@ class Account(Base):
     balance: Mapped[Decimal] = mapped_column(
         SafeMoney(), default=MonetaryConstants.ZERO_TWO_PLACES, nullable=False
     )
+    # Версия строки: увеличивается при каждом изменении баланса (см. кэш балансов)
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default='1', nullable=False)
+    # Счёт для пополнений без явного account_id (один на пользователя)
+    is_default: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=false(), nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
 
     user: Mapped['User'] = relationship('User', back_populates='accounts')
     payments: Mapped[list['Payment']] = relationship(
-        'Payment', back_populates='account', cascade='all,delete'
+        'Payment', back_populates='account', cascade='all,delete', passive_deletes=True
+    )
+    debits: Mapped[list['Debit']] = relationship(
+        'Debit', back_populates='account', cascade='all,delete', passive_deletes=True
     )
@@ -0,0 +1,51 @@
+"""ORM-модель списания со счёта."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.constants.field_constraints import FieldConstraints
+from app.db.base import Base
+from app.db.types import SafeMoney
+
+
+if TYPE_CHECKING:
+    from app.models.account import Account
+    from app.models.user import User
+
+
+class Debit(Base):
+    """ORM-модель списания со счёта пользователя.
+
+    Строка пишется в одной транзакции с уменьшением `Account.balance`, поэтому
+    баланс счёта равен сумме его платежей за вычетом суммы списаний.
+    `transaction_id` делает повтор списания идемпотентным.
+    """
+
+    __tablename__ = 'debits'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    transaction_id: Mapped[str] = mapped_column(
+        String(FieldConstraints.TRANSACTION_ID_MAX_LENGTH),
+        unique=True,
+        nullable=False,
+        index=True,
+    )
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True
+    )
+    account_id: Mapped[int] = mapped_column(
+        ForeignKey('accounts.id', ondelete='CASCADE'), nullable=False, index=True
+    )
+    amount: Mapped[Decimal] = mapped_column(SafeMoney(), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+
+    user: Mapped['User'] = relationship('User', back_populates='debits')
+    account: Mapped['Account'] = relationship('Account', back_populates='debits')
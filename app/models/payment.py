@@ -6,7 +6,7 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, text, true
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.constants.field_constraints import FieldConstraints
@@ -20,9 +20,29 @@ if TYPE_CHECKING:
 
 
 class Payment(Base):
-    """ORM-модель платежа пополнения счёта пользователя."""
+    """ORM-модель платежа пополнения счёта пользователя.
+
+    В PostgreSQL таблица секционирована помесячно по `created_at` (миграция
+    `payments_partitioning`): первичный ключ — `(id, created_at)`, а
+    уникальность `transaction_id` обеспечивает таблица ключей
+    `payment_transaction_ids`, заполняемая триггером. В SQLite и при
+    `create_all` таблица остаётся обычной с уникальным индексом.
+
+    `checkpointed` отмечает платежи, уже учтённые в `Account.balance`. В режиме
+    баланса `ledger` пополнение только добавляет неучтённый платёж, а фоновые
+    контрольные точки переносят суммы таких платежей в баланс счёта.
+    """
 
     __tablename__ = 'payments'
+    __table_args__ = (
+        Index('ix_payments_user_created', 'user_id', 'created_at'),
+        Index(
+            'ix_payments_pending',
+            'account_id',
+            postgresql_where=text('NOT checkpointed'),
+            sqlite_where=text('NOT checkpointed'),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     transaction_id: Mapped[str] = mapped_column(
@@ -39,7 +59,10 @@ class Payment(Base):
     )
     amount: Mapped[Decimal] = mapped_column(SafeMoney(), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+    checkpointed: Mapped[bool] = mapped_column(
+        Boolean, default=True, server_default=true(), nullable=False
     )
 
     user: Mapped['User'] = relationship('User', back_populates='payments')
@@ -14,6 +14,7 @@ from app.db.base import Base
 
 if TYPE_CHECKING:
     from app.models.account import Account
+    from app.models.debit import Debit
     from app.models.payment import Payment
 
 
@@ -41,8 +42,11 @@ class User(Base):
     )
 
     accounts: Mapped[list['Account']] = relationship(
-        'Account', back_populates='user', cascade='all,delete'
+        'Account', back_populates='user', cascade='all,delete', passive_deletes=True
     )
     payments: Mapped[list['Payment']] = relationship(
-        'Payment', back_populates='user', cascade='all,delete'
+        'Payment', back_populates='user', cascade='all,delete', passive_deletes=True
+    )
+    debits: Mapped[list['Debit']] = relationship(
+        'Debit', back_populates='user', cascade='all,delete', passive_deletes=True
     )
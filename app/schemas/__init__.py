@@ -4,15 +4,38 @@ from __future__ import annotations
 
 from .account import AccountPublic
 from .common import ErrorResponse
+from .debit import DebitCreate, DebitPublic
 from .payment import PaymentPublic, WebhookPayment
+from .profiling import (
+    ProfileDetailPublic,
+    ProfileFramePublic,
+    ProfilePublic,
+    ProfilingTokenPublic,
+    SlowQueryPublic,
+)
+from .purge import PurgeJobPublic
+from .reconciliation import BalanceMismatchPublic, ReconciliationJobPublic
+from .transfer import TransferCreate, TransferPublic
 from .user import LoginRequest, Token, UserCreate, UserPublic, UserUpdate
 
 
 __all__ = [
     'AccountPublic',
     'ErrorResponse',
+    'DebitCreate',
+    'DebitPublic',
     'PaymentPublic',
     'WebhookPayment',
+    'ProfileDetailPublic',
+    'ProfileFramePublic',
+    'ProfilePublic',
+    'ProfilingTokenPublic',
+    'SlowQueryPublic',
+    'PurgeJobPublic',
+    'BalanceMismatchPublic',
+    'ReconciliationJobPublic',
+    'TransferCreate',
+    'TransferPublic',
     'LoginRequest',
     'Token',
     'UserCreate',
@@ -0,0 +1,65 @@
+"""Pydantic-схемы для списаний."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.core.constants.field_constraints import FieldConstraints
+from app.core.constants.money import MonetaryConstants
+
+
+class DebitCreate(BaseModel):
+    """Тело запроса списания со счёта."""
+
+    transaction_id: str = Field(
+        min_length=FieldConstraints.TRANSACTION_ID_MIN_LENGTH,
+        max_length=FieldConstraints.TRANSACTION_ID_MAX_LENGTH,
+    )
+    amount: Decimal = Field(gt=MonetaryConstants.ZERO)
+
+    @field_validator('amount')
+    @classmethod
+    def normalize_amount(cls, v: Decimal) -> Decimal:
+        """Нормализует сумму до двух знаков после запятой.
+
+        Args:
+            v (Decimal): Входная сумма.
+
+        Returns:
+            Decimal: Нормализованная сумма с точностью до копеек.
+        """
+        return v.quantize(MonetaryConstants.ONE_CENT)
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            'examples': [{'transaction_id': '2f1c8a9e-0b7d-4c55-9a43-8e6f1d2b3c4a', 'amount': 25}]
+        }
+    )
+
+
+class DebitPublic(BaseModel):
+    """Публичное представление выполненного списания."""
+
+    id: int
+    transaction_id: str
+    user_id: int
+    account_id: int
+    amount: Decimal
+    balance: Decimal
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            'examples': [
+                {
+                    'id': 7,
+                    'transaction_id': '2f1c8a9e-0b7d-4c55-9a43-8e6f1d2b3c4a',
+                    'user_id': 1,
+                    'account_id': 1,
+                    'amount': '25.00',
+                    'balance': '75.00',
+                }
+            ]
+        }
+    )
@@ -0,0 +1,64 @@
+"""Pydantic-схемы профилирования запросов и журнала медленных SQL."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ProfilingTokenPublic(BaseModel):
+    """Токен, включающий профилирование запросов с ним."""
+
+    token: str
+    header: str
+    expires_in: int
+
+
+class ProfileFramePublic(BaseModel):
+    """Функция профиля и её время."""
+
+    function: str
+    calls: int
+    primitive_calls: int
+    total_ms: float
+    cumulative_ms: float
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProfilePublic(BaseModel):
+    """Описание сохранённого профиля запроса."""
+
+    id: str
+    method: str
+    path: str
+    route: str | None
+    status_code: int
+    duration_ms: float
+    trigger: str
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProfileDetailPublic(ProfilePublic):
+    """Профиль запроса с самыми затратными функциями."""
+
+    frames: list[ProfileFramePublic]
+
+
+class SlowQueryPublic(BaseModel):
+    """Медленное SQL-выражение с планом выполнения."""
+
+    id: int
+    statement: str
+    parameters: Any
+    duration_ms: float
+    executemany: bool
+    captured_at: datetime
+    plan: str | None
+    plan_error: str | None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,32 @@
+"""Pydantic-схемы фоновых задач очистки."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel, ConfigDict
+
+
+class PurgeJobPublic(BaseModel):
+    """Публичное представление задачи фоновой очистки пользователя."""
+
+    id: str
+    user_id: int
+    status: str
+    payments_deleted: int
+    accounts_deleted: int
+    error: str | None = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            'examples': [
+                {
+                    'id': '0f8e3c1a2b4d4e6f8a9b0c1d2e3f4a5b',
+                    'user_id': 1,
+                    'status': 'running',
+                    'payments_deleted': 20000,
+                    'accounts_deleted': 0,
+                    'error': None,
+                }
+            ]
+        },
+    )
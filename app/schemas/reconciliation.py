@@ -0,0 +1,50 @@
+"""Pydantic-схемы сверки балансов."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from pydantic import BaseModel, ConfigDict
+
+
+class BalanceMismatchPublic(BaseModel):
+    """Расхождение баланса счёта с суммой его платежей."""
+
+    account_id: int
+    user_id: int
+    balance: Decimal
+    payments_total: Decimal
+    difference: Decimal
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ReconciliationJobPublic(BaseModel):
+    """Публичное представление задачи сверки балансов."""
+
+    id: str
+    status: str
+    ranges_total: int
+    ranges_done: int
+    accounts_checked: int
+    mismatch_count: int
+    mismatches: list[BalanceMismatchPublic]
+    error: str | None = None
+
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={
+            'examples': [
+                {
+                    'id': '7c1d2e3f4a5b6c7d8e9f0a1b2c3d4e5f',
+                    'status': 'running',
+                    'ranges_total': 20,
+                    'ranges_done': 5,
+                    'accounts_checked': 250000,
+                    'mismatch_count': 0,
+                    'mismatches': [],
+                    'error': None,
+                }
+            ]
+        },
+    )
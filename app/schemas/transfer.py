@@ -0,0 +1,74 @@
+"""Pydantic-схемы для переводов между счетами."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from app.core.constants.field_constraints import FieldConstraints
+from app.core.constants.money import MonetaryConstants
+
+
+class TransferCreate(BaseModel):
+    """Тело запроса перевода между счетами."""
+
+    transaction_id: str = Field(
+        min_length=FieldConstraints.TRANSACTION_ID_MIN_LENGTH,
+        max_length=FieldConstraints.TRANSFER_TRANSACTION_ID_MAX_LENGTH,
+    )
+    from_account_id: int
+    to_account_id: int
+    amount: Decimal = Field(gt=MonetaryConstants.ZERO)
+
+    @field_validator('amount')
+    @classmethod
+    def normalize_amount(cls, v: Decimal) -> Decimal:
+        """Нормализует сумму до двух знаков после запятой.
+
+        Args:
+            v (Decimal): Входная сумма.
+
+        Returns:
+            Decimal: Нормализованная сумма с точностью до копеек.
+        """
+        return v.quantize(MonetaryConstants.ONE_CENT)
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            'examples': [
+                {
+                    'transaction_id': '6d0b3f7e-2a41-4c8e-b1f9-5e7a9c2d4b10',
+                    'from_account_id': 1,
+                    'to_account_id': 2,
+                    'amount': 25,
+                }
+            ]
+        }
+    )
+
+
+class TransferPublic(BaseModel):
+    """Публичное представление выполненного перевода."""
+
+    id: int
+    transaction_id: str
+    from_account_id: int
+    to_account_id: int
+    amount: Decimal
+    balance: Decimal
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            'examples': [
+                {
+                    'id': 8,
+                    'transaction_id': '6d0b3f7e-2a41-4c8e-b1f9-5e7a9c2d4b10',
+                    'from_account_id': 1,
+                    'to_account_id': 2,
+                    'amount': '25.00',
+                    'balance': '50.00',
+                }
+            ]
+        }
+    )
@@ -1,16 +1,37 @@
 """Сервисы бизнес-логики приложения."""
 
 from .accounts import AccountService
+from .archival import ArchivalReport, PaymentArchivalService
 from .auth import AuthService
+from .compaction import AccountCompactionService, CompactionReport
+from .health import HealthMonitor, HealthSample
+from .partitions import PartitionReport, PaymentPartitionService
 from .payments import PaymentService
+from .purge import PurgeJob, UserPurgeService
+from .reconciliation import BalanceMismatch, BalanceReconciliationService, ReconciliationJob
+from .transfers import TransferService
 from .users import UserService
 from .webhook import WebhookService
 
 
 __all__ = [
+    'AccountCompactionService',
     'AccountService',
+    'ArchivalReport',
     'AuthService',
+    'BalanceMismatch',
+    'BalanceReconciliationService',
+    'CompactionReport',
+    'HealthMonitor',
+    'HealthSample',
+    'PartitionReport',
+    'PaymentArchivalService',
+    'PaymentPartitionService',
     'PaymentService',
+    'PurgeJob',
+    'ReconciliationJob',
+    'TransferService',
+    'UserPurgeService',
     'UserService',
     'WebhookService',
 ]
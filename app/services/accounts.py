@@ -2,29 +2,80 @@
 
 from __future__ import annotations
 
+from decimal import Decimal
+from functools import partial
 from typing import List
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.constants import ErrorMessages, PaginationParams
-from app.core.errors import NotFoundError
+from app.cache import (
+    BalanceCache,
+    BalanceSnapshot,
+    InvalidationBus,
+    InvalidationMessage,
+    OwnershipIndex,
+    SingleFlight,
+)
+from app.core.constants import CoalescingScopes, ErrorMessages, MonetaryConstants, PaginationParams
+from app.core.errors import DuplicateTransactionError, InsufficientFundsError, NotFoundError
 from app.crud.accounts import CRUDAccount
+from app.crud.debits import CRUDDebit, crud_debit
+from app.crud.payments import CRUDPayment, crud_payment
 from app.crud.users import CRUDUser
+from app.events import AccountEvent, AccountEventHub
 from app.models.account import Account
+from app.models.debit import Debit
+from app.validators.async_ import UserAsyncValidator
 
 
 class AccountService:
     """Сервис для работы со счетами пользователей."""
 
-    def __init__(self, accounts_crud: CRUDAccount, users_crud: CRUDUser):
+    def __init__(
+        self,
+        accounts_crud: CRUDAccount,
+        users_crud: CRUDUser,
+        balance_cache: BalanceCache | None = None,
+        ownership: OwnershipIndex | None = None,
+        user_validator: UserAsyncValidator | None = None,
+        flights: SingleFlight | None = None,
+        *,
+        ledger: bool = False,
+        debits_crud: CRUDDebit | None = None,
+        payments_crud: CRUDPayment | None = None,
+        events: AccountEventHub | None = None,
+        bus: InvalidationBus | None = None,
+    ):
         """Инициализирует сервис.
 
         Args:
             accounts_crud (CRUDAccount): CRUD для счетов.
             users_crud (CRUDUser): CRUD для пользователей.
+            balance_cache (BalanceCache | None): Кэш балансов (опционально).
+            ownership (OwnershipIndex | None): Индекс владения счетами (опционально).
+            user_validator (UserAsyncValidator | None): Валидатор существования пользователя.
+            flights (SingleFlight | None): Реестр объединения одинаковых чтений (опционально).
+            ledger (bool): Режим баланса `ledger`: балансы складываются из контрольной
+                точки и неучтённых платежей.
+            debits_crud (CRUDDebit | None): CRUD списаний.
+            payments_crud (CRUDPayment | None): CRUD платежей (неучтённые платежи `ledger`).
+            events (AccountEventHub | None): Хаб событий счетов для SSE-подписчиков.
+            bus (InvalidationBus | None): Шина инвалидаций между воркерами.
         """
         self.accounts_crud = accounts_crud
         self.users_crud = users_crud
+        self.balance_cache = balance_cache
+        self.ownership = ownership
+        self.user_validator = user_validator or UserAsyncValidator(users_crud, ownership)
+        self.flights = flights
+        self.ledger = ledger
+        self.debits_crud = debits_crud or crud_debit
+        self.payments_crud = payments_crud or crud_payment
+        self.events = events
+        self.bus = bus
+        if bus is not None and flights is not None:
+            bus.subscribe(self.apply_invalidation)
 
     async def get_user_accounts(
         self,
@@ -32,24 +83,82 @@ class AccountService:
         user_id: int,
         limit: int = PaginationParams.DEFAULT_LIMIT,
         offset: int = PaginationParams.DEFAULT_OFFSET,
-    ) -> List[Account]:
+        *,
+        user_exists: bool = False,
+    ) -> List[Account] | List[BalanceSnapshot]:
         """Возвращает список счетов пользователя.
 
+        При включённом кэше страница отдаётся из снимков балансов; при промахе
+        загружаются все счета пользователя и кэшируются целиком, если их не больше
+        лимита кэша; иначе страница за пределами загруженных строк читается
+        обычным запросом. С объединением
+        чтений одновременные запросы одной страницы разделяют одну загрузку и
+        получают неизменяемые снимки счетов. В режиме `ledger` страница всегда
+        состоит из снимков с балансом, вычисленным одним запросом.
+
         Args:
             db (AsyncSession): Сессия БД.
             user_id (int): Идентификатор пользователя.
             limit (int): Максимум записей.
             offset (int): Смещение.
+            user_exists (bool): Пользователь уже загружен вызывающим кодом (например,
+                это текущий пользователь), повторная проверка не нужна.
 
         Returns:
-            list[Account]: Список счетов пользователя.
+            list[Account] | list[BalanceSnapshot]: Список счетов пользователя.
 
         Raises:
             NotFoundError: Если пользователь не найден.
         """
-        user = await self.users_crud.get(db, user_id)
-        if not user:
-            raise NotFoundError(ErrorMessages.USER_NOT_FOUND)
+        if self.balance_cache is not None:
+            cached = self.balance_cache.list_for_user(user_id, limit=limit, offset=offset)
+            if cached is not None:
+                return cached
+
+        if self.flights is not None:
+            return await self.flights.run(
+                (CoalescingScopes.USER_ACCOUNTS, user_id),
+                (limit, offset),
+                partial(self._load_snapshots, db, user_id, limit, offset, user_exists),
+            )
+        return await self._load_user_accounts(db, user_id, limit, offset, user_exists)
+
+    async def _load_snapshots(
+        self, db: AsyncSession, user_id: int, limit: int, offset: int, user_exists: bool
+    ) -> List[BalanceSnapshot]:
+        accounts = await self._load_user_accounts(db, user_id, limit, offset, user_exists)
+        if self.ledger:
+            return accounts
+        return [BalanceSnapshot.from_account(account) for account in accounts]
+
+    async def _load_user_accounts(
+        self, db: AsyncSession, user_id: int, limit: int, offset: int, user_exists: bool
+    ) -> List[Account] | List[BalanceSnapshot]:
+        if not user_exists:
+            await self.user_validator.assert_user_exists(db, user_id)
+
+        if self.ledger:
+            rows = await self.accounts_crud.list_ledger_balances_for_user(
+                db, user_id, limit=limit, offset=offset
+            )
+            return [BalanceSnapshot(*row) for row in rows]
+
+        if self.balance_cache is not None:
+            cap = self.balance_cache.max_accounts_per_user
+            accounts = await self.accounts_crud.list_for_user_paginated(
+                db, user_id, limit=cap + 1, offset=0
+            )
+            if len(accounts) <= cap:
+                self.balance_cache.set_user_accounts(
+                    user_id, [BalanceSnapshot.from_account(account) for account in accounts]
+                )
+                return accounts[offset : offset + limit]
+            # Листинг не помещается в кэш: страницу отдаёт обычный запрос
+            if offset + limit > len(accounts):
+                return await self.accounts_crud.list_for_user_paginated(
+                    db, user_id, limit=limit, offset=offset
+                )
+            return accounts[offset : offset + limit]
 
         accounts = await self.accounts_crud.list_for_user_paginated(
             db, user_id, limit=limit, offset=offset
@@ -69,11 +178,114 @@ class AccountService:
         Raises:
             NotFoundError: Если пользователь не найден.
         """
-        user = await self.users_crud.get(db, user_id)
-        if not user:
-            raise NotFoundError(ErrorMessages.USER_NOT_FOUND)
+        await self.user_validator.assert_user_exists(db, user_id)
 
         account = await self.accounts_crud.create_for_user(db, user_id)
+        if self.bus is not None:
+            self.bus.publish(db, [InvalidationMessage('user', user_id)])
         await db.commit()
-        await db.refresh(account)
+        if self.balance_cache is not None:
+            self.balance_cache.add_account(BalanceSnapshot.from_account(account))
+        if self.ownership is not None:
+            self.ownership.add_account(account.id, user_id)
+        if self.flights is not None:
+            self.flights.forget((CoalescingScopes.USER_ACCOUNTS, user_id))
         return account
+
+    async def debit(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        account_id: int,
+        *,
+        transaction_id: str,
+        amount: Decimal,
+    ) -> tuple[Debit, Decimal]:
+        """Атомарно списывает сумму со счёта пользователя.
+
+        Баланс уменьшается одним условным `UPDATE` (см. `CRUDAccount.debit`) без
+        блокировок на стороне приложения, а строка списания пишется в той же
+        транзакции. Ограничение `ck_accounts_balance_nonnegative` страхует от
+        отрицательного баланса. Повтор `transaction_id` отклоняется уникальным
+        ключом списаний.
+
+        В режиме `ledger` списать можно только баланс последней контрольной точки:
+        неучтённые пополнения становятся доступны после неё. Возвращаемый баланс
+        включает неучтённые пополнения; событие баланса для SSE-подписчиков в этом
+        режиме не публикуется.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            user_id (int): Идентификатор владельца счёта.
+            account_id (int): Идентификатор счёта.
+            transaction_id (str): Внешний идентификатор операции (идемпотентность).
+            amount (Decimal): Положительная сумма списания.
+
+        Returns:
+            tuple[Debit, Decimal]: Списание и баланс счёта после него.
+
+        Raises:
+            DuplicateTransactionError: Если списание с таким `transaction_id` уже есть.
+            NotFoundError: Если у пользователя нет такого счёта.
+            InsufficientFundsError: Если средств на счёте недостаточно.
+        """
+        amount = amount.quantize(MonetaryConstants.ONE_CENT)
+        try:
+            applied = await self.accounts_crud.debit(db, account_id, user_id, amount)
+            if applied is None:
+                await db.rollback()
+                await self._reject_debit(db, account_id, user_id, transaction_id)
+            debit = await self.debits_crud.create(
+                db,
+                transaction_id=transaction_id,
+                user_id=user_id,
+                account_id=account_id,
+                amount=amount,
+            )
+        except IntegrityError:
+            await db.rollback()
+            if await self.debits_crud.get_by_transaction(db, transaction_id) is not None:
+                raise DuplicateTransactionError()
+            raise InsufficientFundsError()
+        balance, version = applied
+
+        snapshot = None
+        events = []
+        if self.ledger:
+            balance += await self.payments_crud.pending_total(db, account_id)
+        else:
+            snapshot = BalanceSnapshot(account_id, user_id, balance, version)
+            if self.bus is not None:
+                self.bus.publish(db, [InvalidationMessage.account(snapshot)])
+            if self.events is not None:
+                events = [AccountEvent.balance(snapshot)]
+                await self.events.publish(db, events)
+        await db.commit()
+
+        if snapshot is not None and self.balance_cache is not None:
+            self.balance_cache.put(snapshot)
+        if events:
+            self.events.dispatch(events)
+        if self.flights is not None:
+            self.flights.forget((CoalescingScopes.USER_ACCOUNTS, user_id))
+        return debit, balance
+
+    def apply_invalidation(self, message: InvalidationMessage) -> None:
+        """Сбрасывает объединённые листинги счетов по сообщению другого воркера.
+
+        Args:
+            message (InvalidationMessage): Сообщение инвалидации.
+        """
+        if message.kind in ('account', 'account_deleted'):
+            self.flights.forget((CoalescingScopes.USER_ACCOUNTS, message.user_id))
+        elif message.kind in ('user', 'user_deleted'):
+            self.flights.forget((CoalescingScopes.USER_ACCOUNTS, message.key))
+
+    async def _reject_debit(
+        self, db: AsyncSession, account_id: int, user_id: int, transaction_id: str
+    ) -> None:
+        if await self.debits_crud.get_by_transaction(db, transaction_id) is not None:
+            raise DuplicateTransactionError()
+        if await self.accounts_crud.get_for_user(db, account_id, user_id) is None:
+            raise NotFoundError(ErrorMessages.ACCOUNT_NOT_FOUND)
+        raise InsufficientFundsError()
@@ -0,0 +1,120 @@
+"""Перенос старых платежей из БД в холодный архив.
+
+Платежи старше горячего окна (`hot_days`) читаются порциями по `id`
+(keyset); каждая порция записывается в архив отдельным сегментом и только
+затем удаляется из БД пакетами по `delete_batch_size` строк, каждый в своей
+короткой транзакции. Так запись сегмента всегда предшествует удалению, и
+потерять платёж при сбое нельзя.
+
+Сбой между записью сегмента и удалением оставляет его строки и в архиве, и в
+БД. Следующий запуск сначала дочищает строки последнего сегмента, поэтому
+повторно они не архивируются. Задачу можно прерывать и запускать повторно.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.crud.payments import CRUDPayment
+from app.db.archive import PaymentArchive
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ArchivalReport:
+    """Итоги архивации платежей.
+
+    Атрибуты:
+        segments: Записано сегментов.
+        archived: Заархивировано платежей (в dry-run — найдено для архивации).
+        deleted: Удалено платежей из БД.
+        recovered: Дочищено строк сегмента прерванного запуска.
+    """
+
+    segments: int = 0
+    archived: int = 0
+    deleted: int = 0
+    recovered: int = 0
+
+
+class PaymentArchivalService:
+    """Сервис архивации платежей старше горячего окна."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        payments_crud: CRUDPayment,
+        archive: PaymentArchive,
+        *,
+        hot_days: int,
+        chunk_size: int,
+        delete_batch_size: int,
+        dry_run: bool = False,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        """Инициализирует сервис.
+
+        Args:
+            session_factory: Фабрика сессий.
+            payments_crud: CRUD платежей.
+            archive: Архив, в который переносятся платежи.
+            hot_days: Сколько последних дней платежи остаются в БД.
+            chunk_size: Число платежей в одном сегменте архива.
+            delete_batch_size: Число строк, удаляемых одной транзакцией.
+            dry_run: Только подсчитать платежи для архивации.
+            clock: Источник текущего времени (UTC).
+        """
+        self.session_factory = session_factory
+        self.payments_crud = payments_crud
+        self.archive = archive
+        self.hot_days = hot_days
+        self.chunk_size = chunk_size
+        self.delete_batch_size = delete_batch_size
+        self.dry_run = dry_run
+        self._clock = clock
+
+    async def run(self) -> ArchivalReport:
+        """Архивирует все платежи старше горячего окна.
+
+        Returns:
+            ArchivalReport: Итоги архивации.
+        """
+        before = self._clock() - timedelta(days=self.hot_days)
+        report = ArchivalReport()
+        if not self.dry_run:
+            report.recovered = await self._delete(await self.archive.latest_segment_ids(), before)
+
+        after_id = 0
+        while True:
+            async with self.session_factory() as db:
+                chunk = await self.payments_crud.list_archivable(
+                    db, before=before, after_id=after_id, limit=self.chunk_size
+                )
+            if not chunk:
+                break
+            after_id = chunk[-1].id
+            report.archived += len(chunk)
+            if self.dry_run:
+                continue
+            segment = await self.archive.append(chunk)
+            report.segments += 1
+            report.deleted += await self._delete([p.id for p in chunk], before)
+            logger.info('Архивация платежей: сегмент %s, до id=%s', segment.number, after_id)
+        return report
+
+    async def _delete(self, ids: list[int], before: datetime) -> int:
+        deleted = 0
+        for start in range(0, len(ids), self.delete_batch_size):
+            async with self.session_factory() as db:
+                deleted += await self.payments_crud.delete_archived(
+                    db, ids[start : start + self.delete_batch_size], before=before
+                )
+                await db.commit()
+        return deleted
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
 from app.core.constants import ErrorMessages
 from app.core.errors import AuthError
 from app.core.security import create_access_token, verify_password
@@ -15,13 +15,15 @@ from app.schemas import LoginRequest
 class AuthService:
     """Сервис для аутентификации пользователей."""
 
-    def __init__(self, users_crud: CRUDUser):
+    def __init__(self, users_crud: CRUDUser, settings: Settings | None = None):
         """Инициализирует сервис.
 
         Args:
             users_crud: CRUD для пользователей.
+            settings: Настройки приложения; по умолчанию читаются при каждом вызове.
         """
         self.users_crud = users_crud
+        self.settings = settings
 
     async def authenticate_user(self, db: AsyncSession, login_data: LoginRequest) -> str:
         """Аутентифицирует пользователя и возвращает JWT-токен.
@@ -40,7 +42,7 @@ class AuthService:
         if not user or not verify_password(login_data.password, user.hashed_password):
             raise AuthError(ErrorMessages.INVALID_CREDENTIALS)
 
-        settings = get_settings()
+        settings = self.settings or get_settings()
         token = create_access_token(
             user.id,
             settings.jwt_secret,
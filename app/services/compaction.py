@@ -0,0 +1,185 @@
+"""Пакетное уплотнение счетов: назначение счёта по умолчанию и слияние пустых дублей.
+
+До появления счёта по умолчанию каждый вебхук без `account_id` создавал новый
+счёт, поэтому у пользователей накопились тысячи почти пустых счетов. Сервис
+обходит владельцев счетов страницами (keyset по `user_id`, отдельная транзакция
+на страницу) и для каждого пользователя:
+
+- назначает счёт по умолчанию (самый старый), если его ещё нет;
+- переносит платежи и списания пустых (нулевой баланс) счетов на счёт по
+  умолчанию и удаляет эти счета.
+
+Счета с ненулевым балансом не трогаются: сливать деньги между счетами без
+согласия владельца сервис не вправе. Пустые счета с историей в архиве платежей
+тоже сохраняются: архивные сегменты неизменяемы, и их строки нельзя перенести
+на счёт по умолчанию, не сломав сверку и идемпотентность вебхуков. Список
+таких счетов читается один раз за запуск, поэтому уплотнение не запускают
+одновременно с архивацией.
+
+Слияние публикует через `InvalidationBus` (после коммита страницы) сообщения
+`account` для счёта по умолчанию, `account_deleted` для удалённых счетов и
+`user` для владельца, чтобы воркеры сбросили снимки балансов, листинги счетов и
+записи индекса владения.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache.bus import InvalidationBus, InvalidationMessage
+from app.core.constants import MonetaryConstants
+from app.crud.accounts import CRUDAccount
+from app.crud.debits import CRUDDebit, crud_debit
+from app.crud.payments import CRUDPayment
+from app.db.archive import PaymentArchive
+from app.models.account import Account
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CompactionReport:
+    """Итоги уплотнения счетов.
+
+    Атрибуты:
+        users_scanned: Обработано владельцев счетов.
+        defaults_assigned: Назначено счетов по умолчанию.
+        accounts_merged: Удалено пустых счетов-дублей.
+        payments_moved: Перенесено платежей на счета по умолчанию.
+        accounts_archived: Пропущено пустых счетов с историей в архиве.
+    """
+
+    users_scanned: int = 0
+    defaults_assigned: int = 0
+    accounts_merged: int = 0
+    payments_moved: int = 0
+    accounts_archived: int = 0
+
+
+class AccountCompactionService:
+    """Сервис пакетного уплотнения счетов пользователей."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        accounts_crud: CRUDAccount,
+        payments_crud: CRUDPayment,
+        *,
+        batch_size: int,
+        dry_run: bool = False,
+        debits_crud: CRUDDebit | None = None,
+        archive: PaymentArchive | None = None,
+        bus: InvalidationBus | None = None,
+    ):
+        """Инициализирует сервис.
+
+        Args:
+            session_factory: Фабрика сессий; одна транзакция на страницу пользователей.
+            accounts_crud: CRUD счетов.
+            payments_crud: CRUD платежей.
+            batch_size: Число пользователей в одной транзакции.
+            dry_run: Только подсчитать изменения и откатить транзакции.
+            debits_crud: CRUD списаний.
+            archive: Архив платежей; счета с архивной историей не сливаются.
+            bus: Шина инвалидаций для кэшей воркеров.
+        """
+        self.session_factory = session_factory
+        self.accounts_crud = accounts_crud
+        self.payments_crud = payments_crud
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.debits_crud = debits_crud or crud_debit
+        self.archive = archive
+        self.bus = bus or InvalidationBus()
+        self._archived: set[int] = set()
+
+    async def run(self) -> CompactionReport:
+        """Выполняет уплотнение всех пользователей.
+
+        Страница, столкнувшаяся с параллельным созданием счёта по умолчанию
+        (нарушение частичного уникального индекса), повторяется один раз.
+
+        Returns:
+            CompactionReport: Итоги уплотнения.
+        """
+        report = CompactionReport()
+        self._archived = set(await self.archive.account_totals()) if self.archive else set()
+        after_user_id = 0
+        retried = False
+        while True:
+            async with self.session_factory() as db:
+                user_ids = await self.accounts_crud.next_owner_ids(
+                    db, after_user_id=after_user_id, limit=self.batch_size
+                )
+                if not user_ids:
+                    break
+                page = CompactionReport(users_scanned=len(user_ids))
+                try:
+                    await self._compact_page(db, user_ids, page)
+                    if self.dry_run:
+                        await db.rollback()
+                    else:
+                        await db.commit()
+                except IntegrityError:
+                    await db.rollback()
+                    if retried:
+                        raise
+                    retried = True
+                    continue
+            retried = False
+            after_user_id = user_ids[-1]
+            for name, value in vars(page).items():
+                setattr(report, name, getattr(report, name) + value)
+            logger.info('Уплотнение счетов: до user_id=%s, %s', after_user_id, page)
+        return report
+
+    async def _compact_page(
+        self, db: AsyncSession, user_ids: list[int], page: CompactionReport
+    ) -> None:
+        accounts = await self.accounts_crud.list_for_users_locked(db, user_ids)
+        by_user: dict[int, list[Account]] = {}
+        for account in accounts:
+            by_user.setdefault(account.user_id, []).append(account)
+
+        messages: list[InvalidationMessage] = []
+        for user_id, user_accounts in by_user.items():
+            default = next((a for a in user_accounts if a.is_default), None)
+            assigned = default is None
+            if default is None:
+                default = user_accounts[0]
+                default.is_default = True
+                page.defaults_assigned += 1
+            empty_ids = [
+                a.id
+                for a in user_accounts
+                if a is not default and a.balance == MonetaryConstants.ZERO_TWO_PLACES
+            ]
+            page.accounts_archived += sum(a in self._archived for a in empty_ids)
+            empty_ids = [a for a in empty_ids if a not in self._archived]
+            if empty_ids:
+                page.payments_moved += await self.payments_crud.move_to_account(
+                    db, empty_ids, default.id
+                )
+                await self.debits_crud.move_to_account(db, empty_ids, default.id)
+                page.accounts_merged += await self.accounts_crud.delete_by_ids(db, empty_ids)
+            elif not assigned:
+                continue
+            default.version += 1
+            messages.append(
+                InvalidationMessage(
+                    'account', default.id, version=default.version, user_id=user_id
+                )
+            )
+            messages.extend(
+                InvalidationMessage('account_deleted', account_id, user_id=user_id)
+                for account_id in empty_ids
+            )
+            messages.append(InvalidationMessage('user', user_id))
+        await db.flush()
+        if messages and not self.dry_run:
+            self.bus.publish(db, messages)
@@ -0,0 +1,214 @@
+"""Фоновый мониторинг состояния приложения для проб доступности.
+
+Пробы Kubernetes на каждом поде часто дёргают `/health/db`; если каждая из них
+открывает сессию и выполняет `SELECT 1`, под нагрузкой это заметная доля
+запросов к БД. `HealthMonitor` раз в `interval_seconds` снимает замер в фоне:
+время ответа БД, загрузку пула соединений и задержку цикла событий. Пробы
+получают последний замер без обращения к БД; если фоновый цикл не запущен или
+замер устарел, проверка выполняется сразу.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.loop_monitor import EventLoopMonitor
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class HealthSample:
+    """Замер состояния приложения.
+
+    Атрибуты:
+        db_ok: БД ответила на `SELECT 1`.
+        db_latency_ms: Время ответа БД в миллисекундах (None при ошибке).
+        db_error: Тип ошибки подключения к БД.
+        pool: Состояние пула соединений (`size`, `checked_out`, `checked_in`, `overflow`).
+        loop_lag_ms: Последняя измеренная задержка цикла событий в миллисекундах.
+        checked_at: Время замера (UTC).
+        sampled_at: Монотонное время замера для проверки свежести.
+    """
+
+    db_ok: bool
+    db_latency_ms: float | None
+    db_error: str | None
+    pool: dict[str, int]
+    loop_lag_ms: float
+    checked_at: datetime
+    sampled_at: float
+
+    def to_dict(self, now: float) -> dict[str, Any]:
+        """Возвращает замер в виде ответа детальной пробы готовности.
+
+        Args:
+            now (float): Текущее монотонное время.
+
+        Returns:
+            dict[str, Any]: Статус и показатели замера.
+        """
+        return {
+            'status': 'ok' if self.db_ok else 'unavailable',
+            'checked_at': self.checked_at.isoformat(),
+            'age_seconds': round(max(now - self.sampled_at, 0.0), 3),
+            'db': {
+                'ok': self.db_ok,
+                'latency_ms': self.db_latency_ms,
+                'error': self.db_error,
+            },
+            'pool': self.pool,
+            'event_loop_lag_ms': self.loop_lag_ms,
+        }
+
+
+class HealthMonitor:
+    """Периодические замеры БД, пула соединений и цикла событий."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        interval_seconds: float,
+        max_age_seconds: float,
+        db_timeout_seconds: float,
+        loop_monitor: EventLoopMonitor | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Инициализирует монитор.
+
+        Args:
+            session_factory: Фабрика сессий для проверки БД.
+            interval_seconds: Пауза между фоновыми замерами.
+            max_age_seconds: Возраст замера, после которого проба проверяет БД сама.
+            db_timeout_seconds: Предельное время ответа БД на проверочный запрос.
+            loop_monitor: Детектор блокировок; его гистограмма задержек попадает в отчёт.
+            clock: Источник монотонного времени.
+        """
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.max_age_seconds = max_age_seconds
+        self.db_timeout_seconds = db_timeout_seconds
+        self.loop_monitor = loop_monitor
+        self._clock = clock
+        self._latest: HealthSample | None = None
+        self._loop_lag_ms = 0.0
+        self._task: asyncio.Task | None = None
+
+    # --- Замеры ---
+
+    async def sample(self) -> HealthSample:
+        """Снимает замер: проверяет БД и читает состояние пула.
+
+        Returns:
+            HealthSample: Новый замер.
+        """
+        db_latency_ms = None
+        db_error = None
+        started = self._clock()
+        try:
+            await asyncio.wait_for(self._ping(), self.db_timeout_seconds)
+            db_latency_ms = round((self._clock() - started) * 1000, 3)
+        except Exception as exc:  # noqa: BLE001 - в health допускается широкий перехват
+            db_error = type(exc).__name__
+        return HealthSample(
+            db_ok=db_error is None,
+            db_latency_ms=db_latency_ms,
+            db_error=db_error,
+            pool=self.pool_status(),
+            loop_lag_ms=self._loop_lag_ms,
+            checked_at=datetime.now(timezone.utc),
+            sampled_at=self._clock(),
+        )
+
+    async def _ping(self) -> None:
+        async with self.session_factory() as db:
+            await db.execute(text('SELECT 1'))
+
+    def pool_status(self) -> dict[str, int]:
+        """Возвращает состояние пула соединений движка фабрики сессий.
+
+        Returns:
+            dict[str, int]: Показатели пула; пусто, если пул их не ведёт.
+        """
+        bind = self.session_factory.kw.get('bind')
+        pool = getattr(bind, 'pool', None)
+        status = {}
+        for name, method in (
+            ('size', 'size'),
+            ('checked_out', 'checkedout'),
+            ('checked_in', 'checkedin'),
+            ('overflow', 'overflow'),
+        ):
+            if callable(getattr(pool, method, None)):
+                status[name] = getattr(pool, method)()
+        return status
+
+    def cached(self) -> HealthSample | None:
+        """Возвращает последний фоновый замер, если он не устарел.
+
+        Returns:
+            HealthSample | None: Свежий замер или None.
+        """
+        latest = self._latest
+        if latest is None or self._clock() - latest.sampled_at > self.max_age_seconds:
+            return None
+        return latest
+
+    def describe(self, sample: HealthSample) -> dict[str, Any]:
+        """Возвращает замер с его возрастом для детальной пробы готовности.
+
+        Args:
+            sample (HealthSample): Замер состояния.
+
+        Returns:
+            dict[str, Any]: Статус и показатели замера.
+        """
+        report = sample.to_dict(self._clock())
+        if self.loop_monitor is not None:
+            report['event_loop_lag_histogram'] = self.loop_monitor.lag.to_dict()
+        return report
+
+    async def current(self) -> HealthSample:
+        """Возвращает свежий фоновый замер или снимает новый.
+
+        Returns:
+            HealthSample: Замер состояния.
+        """
+        return self.cached() or await self.sample()
+
+    # --- Фоновый цикл ---
+
+    def start(self) -> None:
+        """Запускает фоновые замеры."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                self._latest = await self.sample()
+            except Exception:  # noqa: BLE001 - следующий замер повторит попытку
+                logger.exception('Замер состояния приложения завершился ошибкой')
+            started = self._clock()
+            await asyncio.sleep(self.interval_seconds)
+            # Сон длиннее запрошенного — время, которое цикл событий был занят
+            lag = self._clock() - started - self.interval_seconds
+            self._loop_lag_ms = round(max(lag, 0.0) * 1000, 3)
+
+    async def stop(self) -> None:
+        """Останавливает фоновые замеры (при остановке приложения)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
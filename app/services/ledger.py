@@ -0,0 +1,118 @@
+"""Контрольные точки балансов в режиме `ledger`.
+
+В режиме `ledger` пополнение не обновляет строку счёта: оно только добавляет
+платёж с `checkpointed = false`, поэтому горячие счета не становятся точкой
+конкуренции за блокировку строки. Баланс при чтении — `Account.balance`
+(последняя контрольная точка) плюс суммы неучтённых платежей.
+
+Контрольная точка переносит неучтённые платежи в балансы порциями по
+`batch_size`: одна транзакция блокирует порцию платежей (`SKIP LOCKED`),
+затем их счета в порядке `id`, прибавляет суммы к балансам, увеличивает
+версии на число платежей и отмечает платежи учтёнными. Вычисляемый баланс при
+этом не меняется, а параллельные контрольные точки (несколько воркеров) не
+учитывают платёж дважды.
+
+В режиме `row` фоновый цикл не нужен, но при старте приложения контрольная
+точка один раз учитывает платежи, оставшиеся после работы в режиме `ledger`.
+Неучтённые платежи не архивируются, а секция с платежами не отсоединяется
+(`app.services.partitions`), поэтому их суммы не теряются и после истечения
+срока хранения.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.constants import MonetaryConstants
+from app.crud.accounts import CRUDAccount
+from app.crud.payments import CRUDPayment
+
+
+logger = logging.getLogger(__name__)
+
+
+class LedgerCheckpointer:
+    """Сервис периодического переноса неучтённых платежей в балансы счетов."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        accounts_crud: CRUDAccount,
+        payments_crud: CRUDPayment,
+        *,
+        batch_size: int,
+        interval_seconds: float,
+    ):
+        """Инициализирует сервис.
+
+        Args:
+            session_factory: Фабрика сессий; одна транзакция на порцию платежей.
+            accounts_crud: CRUD счетов.
+            payments_crud: CRUD платежей.
+            batch_size: Число платежей, учитываемых одной транзакцией.
+            interval_seconds: Пауза между проходами фонового цикла.
+        """
+        self.session_factory = session_factory
+        self.accounts_crud = accounts_crud
+        self.payments_crud = payments_crud
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> int:
+        """Учитывает в балансах все неучтённые на момент вызова платежи.
+
+        Returns:
+            int: Число учтённых платежей.
+        """
+        total = 0
+        while True:
+            applied = await self._checkpoint_batch()
+            total += applied
+            if applied < self.batch_size:
+                break
+        if total:
+            logger.info('Контрольная точка балансов: учтено платежей %s', total)
+        return total
+
+    async def _checkpoint_batch(self) -> int:
+        async with self.session_factory() as db:
+            pending = await self.payments_crud.list_pending_locked(db, limit=self.batch_size)
+            if not pending:
+                return 0
+            deltas: dict[int, list] = {}
+            for _, account_id, amount in pending:
+                delta = deltas.setdefault(account_id, [MonetaryConstants.ZERO, 0])
+                delta[0] += amount
+                delta[1] += 1
+            for account in await self.accounts_crud.list_by_ids_locked(db, sorted(deltas)):
+                amount, count = deltas[account.id]
+                account.balance += amount
+                account.version += count
+            await self.payments_crud.mark_checkpointed(db, [row[0] for row in pending])
+            await db.commit()
+        return len(pending)
+
+    def start(self) -> None:
+        """Запускает фоновый цикл контрольных точек."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop())
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:  # noqa: BLE001 - следующий проход повторит порцию
+                logger.exception('Контрольная точка балансов завершилась ошибкой')
+            await asyncio.sleep(self.interval_seconds)
+
+    async def stop(self) -> None:
+        """Останавливает фоновый цикл (при остановке приложения)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
@@ -0,0 +1,268 @@
+"""Обслуживание помесячных секций таблицы платежей (PostgreSQL).
+
+Таблица `payments` секционирована по `created_at` (RANGE, одна секция на
+календарный месяц UTC, имена `payments_pYYYY_MM`). Секции создаются заранее на
+`months_ahead` месяцев вперёд; платежи вне созданных секций попадают в секцию
+по умолчанию `payments_default` и переносятся из неё, когда создаётся секция их
+месяца.
+
+Секции старше `retention_months` отсоединяются (`DETACH PARTITION`), только если
+они пусты: платежи из них сначала переносит в архив и удаляет архивация
+(`scripts/archive_payments.py`), а неучтённые платежи режима `ledger` она не
+трогает до контрольной точки. Секция с платежами остаётся присоединённой и
+попадает в `PartitionReport.retained`, поэтому отсоединение не теряет ни
+историю, ни суммы балансов.
+
+На SQLite и на несекционированной таблице (например, созданной `create_all`)
+сервис ничего не делает.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.constants import PaymentPartitions
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, order=True)
+class MonthPartition:
+    """Секция одного календарного месяца.
+
+    Атрибуты:
+        year: Год.
+        month: Месяц (1–12).
+    """
+
+    year: int
+    month: int
+
+    @classmethod
+    def containing(cls, moment: datetime) -> MonthPartition:
+        """Возвращает секцию месяца, в который попадает момент времени (UTC)."""
+        moment = moment.astimezone(timezone.utc)
+        return cls(moment.year, moment.month)
+
+    @classmethod
+    def from_name(cls, name: str) -> MonthPartition | None:
+        """Разбирает имя секции; None для чужих таблиц."""
+        match = re.match(PaymentPartitions.NAME_PATTERN, name)
+        if match is None:
+            return None
+        return cls(int(match.group(1)), int(match.group(2)))
+
+    @property
+    def name(self) -> str:
+        """Имя таблицы секции."""
+        return PaymentPartitions.NAME_TEMPLATE.format(year=self.year, month=self.month)
+
+    @property
+    def start(self) -> datetime:
+        """Нижняя граница секции (включительно)."""
+        return datetime(self.year, self.month, 1, tzinfo=timezone.utc)
+
+    @property
+    def end(self) -> datetime:
+        """Верхняя граница секции (не включительно)."""
+        return self.shift(1).start
+
+    def shift(self, months: int) -> MonthPartition:
+        """Возвращает секцию через `months` месяцев (отрицательное — назад)."""
+        index = self.year * 12 + self.month - 1 + months
+        return MonthPartition(index // 12, index % 12 + 1)
+
+
+@dataclass
+class PartitionReport:
+    """Итоги обслуживания секций.
+
+    Атрибуты:
+        created: Созданные секции.
+        detached: Отсоединённые секции.
+        retained: Секции старше срока хранения, оставленные из-за платежей в них.
+        partitioned: Таблица секционирована (иначе обслуживание пропущено).
+    """
+
+    created: list[str] = field(default_factory=list)
+    detached: list[str] = field(default_factory=list)
+    retained: list[str] = field(default_factory=list)
+    partitioned: bool = False
+
+
+class PaymentPartitionService:
+    """Сервис создания будущих и отсоединения старых секций платежей."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        months_ahead: int,
+        retention_months: int = 0,
+        dry_run: bool = False,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        """Инициализирует сервис.
+
+        Args:
+            session_factory: Фабрика сессий.
+            months_ahead: Сколько месяцев после текущего покрыть секциями.
+            retention_months: Сколько полных месяцев до текущего оставлять в таблице
+                (0 — не отсоединять секции).
+            dry_run: Только спланировать изменения.
+            clock: Источник текущего времени (UTC).
+        """
+        self.session_factory = session_factory
+        self.months_ahead = months_ahead
+        self.retention_months = retention_months
+        self.dry_run = dry_run
+        self._clock = clock
+
+    def plan(
+        self, existing: set[str], *, detach: bool = True
+    ) -> tuple[list[MonthPartition], list[MonthPartition]]:
+        """Вычисляет секции для создания и отсоединения.
+
+        Args:
+            existing (set[str]): Имена присоединённых секций.
+            detach (bool): Планировать отсоединение старых секций.
+
+        Returns:
+            tuple[list[MonthPartition], list[MonthPartition]]: Создать и отсоединить.
+        """
+        current = MonthPartition.containing(self._clock())
+        to_create = [
+            partition
+            for partition in (current.shift(i) for i in range(self.months_ahead + 1))
+            if partition.name not in existing
+        ]
+        to_detach: list[MonthPartition] = []
+        if detach and self.retention_months > 0:
+            oldest_kept = current.shift(-self.retention_months)
+            to_detach = sorted(
+                partition
+                for partition in map(MonthPartition.from_name, existing)
+                if partition is not None and partition < oldest_kept
+            )
+        return to_create, to_detach
+
+    async def ensure_future(self) -> PartitionReport:
+        """Создаёт недостающие секции текущего и следующих месяцев.
+
+        Returns:
+            PartitionReport: Итоги обслуживания.
+        """
+        return await self._run(detach=False)
+
+    async def run(self) -> PartitionReport:
+        """Создаёт будущие секции и отсоединяет пустые секции старше срока хранения.
+
+        Returns:
+            PartitionReport: Итоги обслуживания.
+        """
+        return await self._run(detach=True)
+
+    async def _run(self, *, detach: bool) -> PartitionReport:
+        report = PartitionReport()
+        async with self.session_factory() as db:
+            connection = await db.connection()
+            if connection.dialect.name != 'postgresql' or not await self._is_partitioned(db):
+                return report
+            report.partitioned = True
+            to_create, to_detach = self.plan(await self._attached(db), detach=detach)
+            # DDL берёт блокировку родительской таблицы: не ждём её дольше таймаута
+            await db.execute(text(f"SET LOCAL lock_timeout = '{PaymentPartitions.LOCK_TIMEOUT}'"))
+            for partition in to_create:
+                await self._create(db, partition)
+                report.created.append(partition.name)
+            for partition in to_detach:
+                if await self._has_rows(db, partition.name):
+                    report.retained.append(partition.name)
+                    continue
+                await db.execute(
+                    text(
+                        f'ALTER TABLE {PaymentPartitions.TABLE} DETACH PARTITION {partition.name}'
+                    )
+                )
+                report.detached.append(partition.name)
+            if self.dry_run:
+                await db.rollback()
+            else:
+                await db.commit()
+        if report.created or report.detached:
+            logger.info(
+                'Секции платежей: созданы %s, отсоединены %s', report.created, report.detached
+            )
+        if report.retained:
+            logger.warning(
+                'Секции платежей %s старше срока хранения не отсоединены: в них есть '
+                'неархивированные или неучтённые в балансах платежи',
+                report.retained,
+            )
+        return report
+
+    @staticmethod
+    async def _create(db: AsyncSession, partition: MonthPartition) -> None:
+        bounds = (
+            f"created_at >= '{partition.start.isoformat()}' "
+            f"AND created_at < '{partition.end.isoformat()}'"
+        )
+        default = PaymentPartitions.DEFAULT_NAME
+        moved = PaymentPartitions.MOVED_TABLE
+        # Секция не создаётся, пока в секции по умолчанию есть платежи её месяца.
+        # Удаление освобождает ключи транзакций, вставка через `payments` занимает их снова.
+        query = f'SELECT EXISTS (SELECT 1 FROM {default} WHERE {bounds})'
+        has_moved = await db.scalar(text(query))
+        if has_moved:
+            await db.execute(
+                text(f'CREATE TEMP TABLE {moved} AS SELECT * FROM {default} WHERE {bounds}')
+            )
+            await db.execute(text(f'DELETE FROM {default} WHERE {bounds}'))
+        await db.execute(
+            text(
+                f'CREATE TABLE IF NOT EXISTS {partition.name} '
+                f'PARTITION OF {PaymentPartitions.TABLE} '
+                f"FOR VALUES FROM ('{partition.start.isoformat()}') "
+                f"TO ('{partition.end.isoformat()}')"
+            )
+        )
+        if has_moved:
+            await db.execute(text(f'INSERT INTO {PaymentPartitions.TABLE} SELECT * FROM {moved}'))
+            await db.execute(text(f'DROP TABLE {moved}'))
+
+    @staticmethod
+    async def _has_rows(db: AsyncSession, name: str) -> bool:
+        return bool(await db.scalar(text(f'SELECT EXISTS (SELECT 1 FROM {name})')))
+
+    @staticmethod
+    async def _is_partitioned(db: AsyncSession) -> bool:
+        result = await db.execute(
+            text(
+                'SELECT 1 FROM pg_partitioned_table p '
+                'JOIN pg_class c ON c.oid = p.partrelid '
+                'WHERE c.relname = :table AND pg_table_is_visible(c.oid)'
+            ),
+            {'table': PaymentPartitions.TABLE},
+        )
+        return result.first() is not None
+
+    @staticmethod
+    async def _attached(db: AsyncSession) -> set[str]:
+        result = await db.execute(
+            text(
+                'SELECT child.relname FROM pg_inherits i '
+                'JOIN pg_class parent ON parent.oid = i.inhparent '
+                'JOIN pg_class child ON child.oid = i.inhrelid '
+                'WHERE parent.relname = :table AND pg_table_is_visible(parent.oid)'
+            ),
+            {'table': PaymentPartitions.TABLE},
+        )
+        return set(result.scalars())
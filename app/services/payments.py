@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import List
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -28,19 +29,31 @@ class PaymentService:
         user_id: int,
         limit: int = PaginationParams.DEFAULT_LIMIT,
         offset: int = PaginationParams.DEFAULT_OFFSET,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
     ) -> List[Payment]:
         """Возвращает список платежей пользователя.
 
+        Период по времени создания ограничивает чтение нужными помесячными
+        секциями таблицы платежей.
+
         Args:
             db (AsyncSession): Сессия БД.
             user_id (int): Идентификатор пользователя.
             limit (int): Максимум записей.
             offset (int): Смещение.
+            created_from (datetime | None): Начало периода (включительно).
+            created_to (datetime | None): Конец периода (не включительно).
 
         Returns:
             list[Payment]: Список платежей пользователя.
         """
         payments = await self.payments_crud.list_for_user_paginated(
-            db, user_id, limit=limit, offset=offset
+            db,
+            user_id,
+            limit=limit,
+            offset=offset,
+            created_from=created_from,
+            created_to=created_to,
         )
         return payments
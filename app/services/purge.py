@@ -0,0 +1,218 @@
+"""Фоновая пакетная очистка пользователей с большой историей.
+
+Удаление пользователя через ORM загружает все его счета и платежи. Для
+пользователей с миллионами платежей сервис удаляет строки пакетами
+фиксированного размера (отдельная транзакция на пакет), не загружая их в
+память, и отражает прогресс в `PurgeJob`. Задачи живут в памяти процесса.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache import (
+    BalanceCache,
+    InvalidationBus,
+    InvalidationMessage,
+    OwnershipIndex,
+    SingleFlight,
+)
+from app.core.constants import CoalescingScopes, ErrorMessages, PurgeJobStatus
+from app.core.errors import NotFoundError
+from app.crud.accounts import CRUDAccount
+from app.crud.payments import CRUDPayment
+from app.crud.users import CRUDUser
+from app.validators.async_ import UserAsyncValidator
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PurgeJob:
+    """Задача очистки пользователя и её прогресс.
+
+    Атрибуты:
+        id: Идентификатор задачи.
+        user_id: Идентификатор удаляемого пользователя.
+        status: Статус (`PurgeJobStatus`).
+        payments_deleted: Удалено платежей.
+        accounts_deleted: Удалено счетов.
+        error: Текст ошибки для статуса `failed`.
+    """
+
+    id: str
+    user_id: int
+    status: str = PurgeJobStatus.PENDING
+    payments_deleted: int = 0
+    accounts_deleted: int = 0
+    error: str | None = None
+
+
+class UserPurgeService:
+    """Сервис фоновой пакетной очистки пользователей."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        users_crud: CRUDUser,
+        accounts_crud: CRUDAccount,
+        payments_crud: CRUDPayment,
+        user_validator: UserAsyncValidator,
+        *,
+        batch_size: int,
+        max_jobs: int = 1000,
+        balance_cache: BalanceCache | None = None,
+        ownership: OwnershipIndex | None = None,
+        flights: SingleFlight | None = None,
+        bus: InvalidationBus | None = None,
+    ):
+        """Инициализирует сервис.
+
+        Args:
+            session_factory: Фабрика сессий для фоновых транзакций.
+            users_crud: CRUD пользователей.
+            accounts_crud: CRUD счетов.
+            payments_crud: CRUD платежей.
+            user_validator: Валидатор существования пользователя.
+            batch_size: Число строк, удаляемых одной транзакцией.
+            max_jobs: Сколько последних задач хранить для запросов статуса.
+            balance_cache: Кэш балансов для инвалидации по завершении (опционально).
+            ownership: Индекс владения счетами (опционально).
+            flights: Реестр объединения чтений для инвалидации (опционально).
+            bus: Шина инвалидаций между воркерами (опционально).
+        """
+        self.session_factory = session_factory
+        self.users_crud = users_crud
+        self.accounts_crud = accounts_crud
+        self.payments_crud = payments_crud
+        self.user_validator = user_validator
+        self.batch_size = batch_size
+        self.max_jobs = max_jobs
+        self.balance_cache = balance_cache
+        self.ownership = ownership
+        self.flights = flights
+        self.bus = bus
+        self._jobs: OrderedDict[str, PurgeJob] = OrderedDict()
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    async def start_purge(self, db: AsyncSession, user_id: int) -> PurgeJob:
+        """Запускает фоновую очистку пользователя.
+
+        Повторный запуск для пользователя с активной задачей возвращает её же.
+
+        Args:
+            db (AsyncSession): Сессия БД запроса.
+            user_id (int): Идентификатор пользователя.
+
+        Returns:
+            PurgeJob: Задача очистки.
+
+        Raises:
+            NotFoundError: Если пользователь не найден.
+        """
+        for job in self._jobs.values():
+            if job.user_id == user_id and job.status in PurgeJobStatus.ACTIVE:
+                return job
+        await self.user_validator.get_user_or_error(db, user_id)
+
+        job = PurgeJob(id=uuid.uuid4().hex, user_id=user_id)
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+        task = asyncio.create_task(self.run(job))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        return job
+
+    def get_job(self, job_id: str) -> PurgeJob:
+        """Возвращает задачу очистки по идентификатору.
+
+        Args:
+            job_id (str): Идентификатор задачи.
+
+        Returns:
+            PurgeJob: Задача очистки.
+
+        Raises:
+            NotFoundError: Если задача не найдена.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise NotFoundError(ErrorMessages.PURGE_JOB_NOT_FOUND)
+        return job
+
+    async def run(self, job: PurgeJob) -> None:
+        """Выполняет очистку: платежи, затем счета, затем пользователь.
+
+        Args:
+            job (PurgeJob): Задача очистки.
+        """
+        job.status = PurgeJobStatus.RUNNING
+        try:
+            async with self.session_factory() as db:
+                await self._drain(
+                    db, self.payments_crud.delete_batch_for_user, job, 'payments_deleted'
+                )
+                await self._drain(
+                    db, self.accounts_crud.delete_batch_for_user, job, 'accounts_deleted'
+                )
+                user = await self.users_crud.get(db, job.user_id)
+                if user is not None:
+                    await self.users_crud.delete(db, user)
+                if self.bus is not None:
+                    self.bus.publish(db, [InvalidationMessage('user_deleted', job.user_id)])
+                await db.commit()
+        except Exception as exc:  # noqa: BLE001 - статус задачи фиксирует любую ошибку
+            job.status = PurgeJobStatus.FAILED
+            job.error = str(exc) or type(exc).__name__
+            logger.exception('Очистка пользователя %s завершилась ошибкой', job.user_id)
+            return
+
+        if self.balance_cache is not None:
+            self.balance_cache.invalidate_user(job.user_id)
+        if self.ownership is not None:
+            self.ownership.remove_user(job.user_id)
+        if self.flights is not None:
+            self.flights.forget(self.users_crud.coalescing_scope(job.user_id))
+            self.flights.forget((CoalescingScopes.USER_ACCOUNTS, job.user_id))
+        job.status = PurgeJobStatus.DONE
+        logger.info(
+            'Пользователь %s удалён: платежей %s, счетов %s',
+            job.user_id,
+            job.payments_deleted,
+            job.accounts_deleted,
+        )
+
+    async def _drain(
+        self,
+        db: AsyncSession,
+        delete_batch: Callable[..., Awaitable[int]],
+        job: PurgeJob,
+        counter: str,
+    ) -> None:
+        while True:
+            deleted = await delete_batch(db, job.user_id, limit=self.batch_size)
+            await db.commit()
+            setattr(job, counter, getattr(job, counter) + deleted)
+            logger.debug('Очистка пользователя %s: %s=%s', job.user_id, counter, deleted)
+            if deleted < self.batch_size:
+                return
+
+    async def wait_all(self) -> None:
+        """Дожидается завершения всех запущенных задач."""
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def stop(self) -> None:
+        """Отменяет незавершённые задачи (при остановке приложения)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
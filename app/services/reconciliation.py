@@ -0,0 +1,349 @@
+"""Параллельная сверка балансов счетов с суммами их платежей.
+
+Пространство ключей `accounts` делится на диапазоны идентификаторов длины
+`range_size`, выровненные на кратные ей значения: границы не зависят от
+текущего минимума и сохраняются между запусками. До `concurrency` диапазонов
+обрабатываются одновременно, каждый в своей сессии и снимке БД: балансы счетов
+диапазона и суммы их платежей (`GROUP BY`) сравниваются в памяти, поэтому
+расход памяти ограничен размером диапазона. Платежи холодного архива
+учитываются по суммам из индексов его сегментов, списания вычитаются. Секции
+`payments` отсоединяются, только когда архивация уже перенесла их платежи в
+архив (`app.services.partitions`), поэтому их история тоже попадает в суммы. Баланс
+сравнивается только с платежами, уже учтёнными контрольной точкой (режим `ledger`).
+
+Расхождения передаются в `on_mismatch` по мере обнаружения, а задача хранит
+только первые `max_reported`. С контрольной точкой (JSON-файл) прогресс
+сохраняется после каждого диапазона, и прерванная сверка продолжается с места
+остановки; расхождения прерванного запуска остаются только в счётчике.
+Во время архивации платежей суммы могут учитывать строки дважды, поэтому
+сверку не стоит запускать одновременно с ней. Задачи живут в памяти процесса.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.constants import ErrorMessages, MonetaryConstants, ReconciliationJobStatus
+from app.core.errors import NotFoundError
+from app.crud.accounts import CRUDAccount
+from app.crud.debits import CRUDDebit, crud_debit
+from app.crud.payments import CRUDPayment
+from app.db.archive import PaymentArchive
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BalanceMismatch:
+    """Расхождение баланса счёта с суммой его платежей.
+
+    Атрибуты:
+        account_id: Идентификатор счёта.
+        user_id: Владелец счёта.
+        balance: Баланс счёта.
+        payments_total: Сумма платежей счёта (БД и архив) за вычетом списаний.
+    """
+
+    account_id: int
+    user_id: int
+    balance: Decimal
+    payments_total: Decimal
+
+    @property
+    def difference(self) -> Decimal:
+        """Превышение баланса над суммой платежей."""
+        return self.balance - self.payments_total
+
+
+@dataclass
+class ReconciliationJob:
+    """Задача сверки балансов и её прогресс.
+
+    Атрибуты:
+        id: Идентификатор задачи.
+        status: Статус (`ReconciliationJobStatus`).
+        ranges_total: Число диапазонов счетов.
+        ranges_done: Обработано диапазонов (включая пройденные до возобновления).
+        accounts_checked: Проверено счетов.
+        mismatch_count: Найдено расхождений.
+        mismatches: Первые найденные расхождения.
+        error: Текст ошибки для статуса `failed`.
+    """
+
+    id: str
+    status: str = ReconciliationJobStatus.PENDING
+    ranges_total: int = 0
+    ranges_done: int = 0
+    accounts_checked: int = 0
+    mismatch_count: int = 0
+    mismatches: list[BalanceMismatch] = field(default_factory=list)
+    error: str | None = None
+
+
+@dataclass
+class ReconciliationCheckpoint:
+    """Контрольная точка сверки.
+
+    Атрибуты:
+        range_size: Длина диапазона, с которой сохранена точка.
+        done_below: Все диапазоны с началом ниже этого значения пройдены.
+        done: Начала пройденных диапазонов не ниже `done_below`.
+        accounts_checked: Проверено счетов.
+        mismatch_count: Найдено расхождений.
+    """
+
+    range_size: int
+    done_below: int = 0
+    done: set[int] = field(default_factory=set)
+    accounts_checked: int = 0
+    mismatch_count: int = 0
+
+    def is_done(self, low: int) -> bool:
+        """Проверяет, пройден ли диапазон с началом `low`."""
+        return low < self.done_below or low in self.done
+
+    def mark_done(self, low: int) -> None:
+        """Отмечает диапазон пройденным и сдвигает сплошную границу."""
+        self.done.add(low)
+        while self.done_below in self.done:
+            self.done.remove(self.done_below)
+            self.done_below += self.range_size
+
+
+class BalanceReconciliationService:
+    """Сервис параллельной сверки балансов по диапазонам счетов."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        accounts_crud: CRUDAccount,
+        payments_crud: CRUDPayment,
+        *,
+        range_size: int,
+        concurrency: int,
+        max_reported: int = 100,
+        archive: PaymentArchive | None = None,
+        checkpoint_path: str | Path | None = None,
+        max_jobs: int = 100,
+        debits_crud: CRUDDebit | None = None,
+    ):
+        """Инициализирует сервис.
+
+        Args:
+            session_factory: Фабрика сессий; одна сессия на диапазон.
+            accounts_crud: CRUD счетов.
+            payments_crud: CRUD платежей.
+            range_size: Длина диапазона идентификаторов счетов.
+            concurrency: Сколько диапазонов обрабатывать одновременно.
+            max_reported: Сколько расхождений хранить в задаче.
+            archive: Холодный архив платежей (опционально).
+            checkpoint_path: Файл контрольной точки (None — без возобновления).
+            max_jobs: Сколько последних задач хранить для запросов статуса.
+            debits_crud: CRUD списаний.
+        """
+        self.session_factory = session_factory
+        self.accounts_crud = accounts_crud
+        self.payments_crud = payments_crud
+        self.range_size = range_size
+        self.concurrency = concurrency
+        self.max_reported = max_reported
+        self.archive = archive
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.max_jobs = max_jobs
+        self.debits_crud = debits_crud or crud_debit
+        self._jobs: OrderedDict[str, ReconciliationJob] = OrderedDict()
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._checkpoint_lock = asyncio.Lock()
+
+    async def start_reconciliation(self) -> ReconciliationJob:
+        """Запускает фоновую сверку; при уже идущей сверке возвращает её задачу.
+
+        Returns:
+            ReconciliationJob: Задача сверки.
+        """
+        for job in self._jobs.values():
+            if job.status in ReconciliationJobStatus.ACTIVE:
+                return job
+        job = ReconciliationJob(id=uuid.uuid4().hex)
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+        task = asyncio.create_task(self.run(job))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        return job
+
+    def get_job(self, job_id: str) -> ReconciliationJob:
+        """Возвращает задачу сверки по идентификатору.
+
+        Args:
+            job_id (str): Идентификатор задачи.
+
+        Returns:
+            ReconciliationJob: Задача сверки.
+
+        Raises:
+            NotFoundError: Если задача не найдена.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise NotFoundError(ErrorMessages.RECONCILIATION_JOB_NOT_FOUND)
+        return job
+
+    async def run(
+        self,
+        job: ReconciliationJob | None = None,
+        *,
+        on_mismatch: Callable[[BalanceMismatch], None] | None = None,
+        resume: bool = True,
+    ) -> ReconciliationJob:
+        """Выполняет сверку всех счетов.
+
+        Args:
+            job (ReconciliationJob | None): Задача для отражения прогресса.
+            on_mismatch (Callable | None): Вызывается для каждого расхождения.
+            resume (bool): Продолжить с контрольной точки, если она есть.
+
+        Returns:
+            ReconciliationJob: Завершённая задача.
+        """
+        job = job or ReconciliationJob(id=uuid.uuid4().hex)
+        job.status = ReconciliationJobStatus.RUNNING
+        try:
+            await self._reconcile(job, on_mismatch, resume)
+        except Exception as exc:  # noqa: BLE001 - статус задачи фиксирует любую ошибку
+            job.status = ReconciliationJobStatus.FAILED
+            job.error = str(exc) or type(exc).__name__
+            logger.exception('Сверка балансов завершилась ошибкой')
+            return job
+        job.status = ReconciliationJobStatus.DONE
+        logger.info(
+            'Сверка балансов: проверено счетов %s, расхождений %s',
+            job.accounts_checked,
+            job.mismatch_count,
+        )
+        return job
+
+    async def _reconcile(
+        self,
+        job: ReconciliationJob,
+        on_mismatch: Callable[[BalanceMismatch], None] | None,
+        resume: bool,
+    ) -> None:
+        async with self.session_factory() as db:
+            bounds = await self.accounts_crud.id_bounds(db)
+        if bounds is None:
+            await self._remove_checkpoint()
+            return
+        first = bounds[0] // self.range_size * self.range_size
+        ranges = range(first, bounds[1] + 1, self.range_size)
+
+        checkpoint = await self._load_checkpoint() if resume else None
+        if checkpoint is None:
+            checkpoint = ReconciliationCheckpoint(range_size=self.range_size, done_below=first)
+        checkpoint.done_below = max(checkpoint.done_below, first)
+        job.ranges_total = len(ranges)
+        job.ranges_done = sum(checkpoint.is_done(low) for low in ranges)
+        job.accounts_checked = checkpoint.accounts_checked
+        job.mismatch_count = checkpoint.mismatch_count
+
+        archived = await self.archive.account_totals() if self.archive is not None else {}
+        pending = iter([low for low in ranges if not checkpoint.is_done(low)])
+
+        async def worker() -> None:
+            for low in pending:
+                checked, mismatches = await self._reconcile_range(
+                    low, low + self.range_size, archived
+                )
+                for mismatch in mismatches:
+                    if on_mismatch is not None:
+                        on_mismatch(mismatch)
+                    if len(job.mismatches) < self.max_reported:
+                        job.mismatches.append(mismatch)
+                job.ranges_done += 1
+                job.accounts_checked += checked
+                job.mismatch_count += len(mismatches)
+                checkpoint.accounts_checked = job.accounts_checked
+                checkpoint.mismatch_count = job.mismatch_count
+                checkpoint.mark_done(low)
+                await self._save_checkpoint(checkpoint)
+
+        tasks = [asyncio.create_task(worker()) for _ in range(max(self.concurrency, 1))]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        await self._remove_checkpoint()
+
+    async def _reconcile_range(
+        self, low: int, high: int, archived: dict[int, Decimal]
+    ) -> tuple[int, list[BalanceMismatch]]:
+        async with self.session_factory() as db:
+            if db.get_bind().dialect.name == 'postgresql':
+                # Балансы и суммы платежей читаются из одного снимка
+                await db.connection(execution_options={'isolation_level': 'REPEATABLE READ'})
+            balances = await self.accounts_crud.list_balances_in_range(db, low, high)
+            totals = await self.payments_crud.totals_by_account(db, low, high)
+            debits = await self.debits_crud.totals_by_account(db, low, high)
+        mismatches = []
+        for account_id, user_id, balance in balances:
+            total = (
+                totals.get(account_id, MonetaryConstants.ZERO)
+                + archived.get(account_id, MonetaryConstants.ZERO)
+                - debits.get(account_id, MonetaryConstants.ZERO)
+            )
+            if balance != total:
+                mismatches.append(BalanceMismatch(account_id, user_id, balance, total))
+        return len(balances), mismatches
+
+    async def _load_checkpoint(self) -> ReconciliationCheckpoint | None:
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return None
+        data = json.loads(await asyncio.to_thread(self.checkpoint_path.read_text, 'utf-8'))
+        if data['range_size'] != self.range_size:
+            logger.warning('Контрольная точка сверки с другим range_size пропущена')
+            return None
+        return ReconciliationCheckpoint(**{**data, 'done': set(data['done'])})
+
+    async def _save_checkpoint(self, checkpoint: ReconciliationCheckpoint) -> None:
+        if self.checkpoint_path is None:
+            return
+        data = json.dumps({**asdict(checkpoint), 'done': sorted(checkpoint.done)})
+        async with self._checkpoint_lock:
+            await asyncio.to_thread(self._write_atomic, self.checkpoint_path, data)
+
+    async def _remove_checkpoint(self) -> None:
+        if self.checkpoint_path is not None:
+            self.checkpoint_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _write_atomic(path: Path, data: str) -> None:
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_text(data, encoding='utf-8')
+        os.replace(tmp, path)
+
+    async def wait_all(self) -> None:
+        """Дожидается завершения всех запущенных задач."""
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def stop(self) -> None:
+        """Отменяет незавершённые задачи (при остановке приложения)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,189 @@
+"""Сервис переводов между счетами."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import (
+    BalanceCache,
+    BalanceSnapshot,
+    InvalidationBus,
+    InvalidationMessage,
+    SingleFlight,
+)
+from app.core.constants import (
+    CoalescingScopes,
+    DomainConstraints,
+    ErrorMessages,
+    MonetaryConstants,
+)
+from app.core.errors import (
+    DuplicateTransactionError,
+    InsufficientFundsError,
+    NotFoundError,
+    ValidationError,
+)
+from app.crud.accounts import CRUDAccount
+from app.crud.debits import CRUDDebit
+from app.crud.payments import CRUDPayment
+from app.events import AccountEvent, AccountEventHub
+from app.models.debit import Debit
+
+
+class TransferService:
+    """Сервис переводов со счёта пользователя на любой счёт.
+
+    Перевод — это пара записей в одной транзакции: списание со счёта-источника
+    (`debits`) и платёж на счёт-получатель (`payments`). Поэтому сверка балансов
+    и уплотнение счетов учитывают переводы без отдельной логики, а повтор
+    `transaction_id` отклоняется уникальными ключами обеих таблиц. Платёж
+    получателя хранится с ключом `transfer:<transaction_id>`: пространство
+    ключей провайдера пополнений вебхук не делит с переводами и такие ключи
+    отклоняет.
+
+    Обе строки счетов блокируются одним `SELECT ... FOR UPDATE` в порядке `id`:
+    встречные переводы A→B и B→A ждут друг друга, но не взаимоблокируются.
+    В режиме `ledger` баланс получателя не меняется, а зачисление добавляется
+    неучтённым платежом, как пополнение через вебхук.
+    """
+
+    def __init__(
+        self,
+        accounts_crud: CRUDAccount,
+        payments_crud: CRUDPayment,
+        debits_crud: CRUDDebit,
+        balance_cache: BalanceCache | None = None,
+        flights: SingleFlight | None = None,
+        *,
+        ledger: bool = False,
+        events: AccountEventHub | None = None,
+        bus: InvalidationBus | None = None,
+    ):
+        """Инициализирует сервис.
+
+        Args:
+            accounts_crud (CRUDAccount): CRUD для работы со счетами.
+            payments_crud (CRUDPayment): CRUD платежей (зачисления получателю).
+            debits_crud (CRUDDebit): CRUD списаний (списания с источника).
+            balance_cache (BalanceCache | None): Кэш балансов для сквозной записи.
+            flights (SingleFlight | None): Реестр объединения чтений для инвалидации листингов.
+            ledger (bool): Режим баланса `ledger`: зачисление неучтённым платежом.
+            events (AccountEventHub | None): Хаб событий счетов для SSE-подписчиков.
+            bus (InvalidationBus | None): Шина инвалидаций между воркерами.
+        """
+        self.accounts_crud = accounts_crud
+        self.payments_crud = payments_crud
+        self.debits_crud = debits_crud
+        self.balance_cache = balance_cache
+        self.flights = flights
+        self.ledger = ledger
+        self.events = events
+        self.bus = bus
+
+    async def transfer(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        *,
+        transaction_id: str,
+        from_account_id: int,
+        to_account_id: int,
+        amount: Decimal,
+    ) -> tuple[Debit, Decimal]:
+        """Переводит сумму со счёта пользователя на другой счёт.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            user_id (int): Владелец счёта-источника.
+            transaction_id (str): Внешний идентификатор перевода (идемпотентность).
+            from_account_id (int): Счёт-источник (должен принадлежать `user_id`).
+            to_account_id (int): Счёт-получатель (любого пользователя).
+            amount (Decimal): Положительная сумма перевода.
+
+        Returns:
+            tuple[Debit, Decimal]: Списание с источника и баланс источника после перевода.
+
+        Raises:
+            ValidationError: Если источник и получатель совпадают.
+            NotFoundError: Если у пользователя нет источника или получателя не существует.
+            InsufficientFundsError: Если средств на источнике недостаточно.
+            DuplicateTransactionError: Если перевод с таким `transaction_id` уже был.
+            IntegrityError: Если запись перевода нарушила ограничение, не связанное
+                с повтором (например, счёт удалён параллельно).
+        """
+        if from_account_id == to_account_id:
+            raise ValidationError(ErrorMessages.TRANSFER_SAME_ACCOUNT)
+        amount = amount.quantize(MonetaryConstants.ONE_CENT)
+
+        locked = await self.accounts_crud.list_by_ids_locked(db, [from_account_id, to_account_id])
+        accounts = {account.id: account for account in locked}
+        source, target = accounts.get(from_account_id), accounts.get(to_account_id)
+        if source is None or source.user_id != user_id or target is None:
+            await db.rollback()
+            raise NotFoundError(ErrorMessages.ACCOUNT_NOT_FOUND)
+        if source.balance < amount:
+            await db.rollback()
+            raise InsufficientFundsError()
+
+        source.balance -= amount
+        source.version += 1
+        if not self.ledger:
+            target.balance += amount
+            target.version += 1
+        owners = (source.user_id, target.user_id)
+        credit_transaction_id = DomainConstraints.TRANSFER_CREDIT_PREFIX + transaction_id
+        try:
+            debit = await self.debits_crud.create(
+                db,
+                transaction_id=transaction_id,
+                user_id=source.user_id,
+                account_id=source.id,
+                amount=amount,
+            )
+            credit = await self.payments_crud.create(
+                db,
+                transaction_id=credit_transaction_id,
+                user_id=target.user_id,
+                account_id=target.id,
+                amount=amount,
+                checkpointed=not self.ledger,
+            )
+        except IntegrityError:
+            await db.rollback()
+            if await self._is_duplicate(db, transaction_id, credit_transaction_id):
+                raise DuplicateTransactionError()
+            raise
+
+        balance = source.balance
+        snapshots: list[BalanceSnapshot] = []
+        if self.ledger:
+            balance += await self.payments_crud.pending_total(db, source.id)
+        else:
+            snapshots = [BalanceSnapshot.from_account(account) for account in (source, target)]
+            if self.bus is not None:
+                self.bus.publish(db, map(InvalidationMessage.account, snapshots))
+        events = []
+        if self.events is not None:
+            events = [AccountEvent.payment(credit), *map(AccountEvent.balance, snapshots)]
+            await self.events.publish(db, events)
+        await db.commit()
+
+        if self.balance_cache is not None:
+            for snapshot in snapshots:
+                self.balance_cache.put(snapshot)
+        if events:
+            self.events.dispatch(events)
+        if self.flights is not None:
+            for owner in set(owners):
+                self.flights.forget((CoalescingScopes.USER_ACCOUNTS, owner))
+        return debit, balance
+
+    async def _is_duplicate(
+        self, db: AsyncSession, transaction_id: str, credit_transaction_id: str
+    ) -> bool:
+        if await self.debits_crud.get_by_transaction(db, transaction_id) is not None:
+            return True
+        return await self.payments_crud.transaction_exists(db, credit_transaction_id)
@@ -7,7 +7,14 @@ from typing import List
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.constants import ErrorMessages, PaginationParams
+from app.cache import (
+    BalanceCache,
+    InvalidationBus,
+    InvalidationMessage,
+    OwnershipIndex,
+    SingleFlight,
+)
+from app.core.constants import CoalescingScopes, ErrorMessages, PaginationParams
 from app.core.errors import NotFoundError, ValidationError
 from app.crud.users import CRUDUser
 from app.models import User
@@ -18,14 +25,34 @@ from app.validators.async_ import UserAsyncValidator
 class UserService:
     """Сервис для работы с пользователями."""
 
-    def __init__(self, users_crud: CRUDUser, user_validator: UserAsyncValidator | None = None):
+    def __init__(
+        self,
+        users_crud: CRUDUser,
+        user_validator: UserAsyncValidator | None = None,
+        balance_cache: BalanceCache | None = None,
+        ownership: OwnershipIndex | None = None,
+        flights: SingleFlight | None = None,
+        *,
+        bus: InvalidationBus | None = None,
+    ):
         """Инициализирует сервис.
 
         Args:
             users_crud: CRUD для пользователей.
+            user_validator: Асинхронный валидатор пользователей.
+            balance_cache: Кэш балансов для инвалидации при удалении (опционально).
+            ownership: Индекс владения счетами (опционально).
+            flights: Реестр объединения чтений для инвалидации (опционально).
+            bus: Шина инвалидаций между воркерами (опционально).
         """
         self.users_crud = users_crud
-        self.user_validator = user_validator or UserAsyncValidator(users_crud)
+        self.user_validator = user_validator or UserAsyncValidator(users_crud, ownership)
+        self.balance_cache = balance_cache
+        self.ownership = ownership
+        self.flights = flights
+        self.bus = bus
+        if bus is not None and flights is not None:
+            bus.subscribe(self.apply_invalidation)
 
     async def create_user(self, db: AsyncSession, user_data: UserCreate) -> User:
         """Создаёт нового пользователя.
@@ -57,7 +84,8 @@ class UserService:
             await db.rollback()
             raise ValidationError(ErrorMessages.EMAIL_ALREADY_EXISTS)
 
-        await db.refresh(user)
+        if self.ownership is not None:
+            self.ownership.add_user(user.id)
         return user
 
     async def get_all_users(
@@ -128,13 +156,19 @@ class UserService:
             password=user_data.password,
             is_admin=user_data.is_admin,
         )
+        if self.bus is not None:
+            self.bus.publish(db, [InvalidationMessage('profile', user_id)])
         await db.commit()
-        await db.refresh(user)
+        if self.flights is not None:
+            self.flights.forget(self.users_crud.coalescing_scope(user_id))
         return user
 
     async def delete_user(self, db: AsyncSession, user_id: int) -> None:
         """Удаляет пользователя по идентификатору.
 
+        Счета и платежи удаляются каскадом внешних ключей БД без загрузки в
+        память; для пользователей с большой историей есть `UserPurgeService`.
+
         Args:
             db (AsyncSession): Сессия БД.
             user_id (int): Идентификатор пользователя.
@@ -144,4 +178,22 @@ class UserService:
         """
         user = await self.user_validator.get_user_or_error(db, user_id)
         await self.users_crud.delete(db, user)
+        if self.bus is not None:
+            self.bus.publish(db, [InvalidationMessage('user_deleted', user_id)])
         await db.commit()
+        if self.balance_cache is not None:
+            self.balance_cache.invalidate_user(user_id)
+        if self.ownership is not None:
+            self.ownership.remove_user(user_id)
+        if self.flights is not None:
+            self.flights.forget(self.users_crud.coalescing_scope(user_id))
+            self.flights.forget((CoalescingScopes.USER_ACCOUNTS, user_id))
+
+    def apply_invalidation(self, message: InvalidationMessage) -> None:
+        """Сбрасывает объединённые чтения пользователя по сообщению другого воркера.
+
+        Args:
+            message (InvalidationMessage): Сообщение инвалидации.
+        """
+        if message.kind in ('profile', 'user_deleted'):
+            self.flights.forget(self.users_crud.coalescing_scope(message.key))
@@ -5,14 +5,25 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.constants import MonetaryConstants
-from app.core.errors import DuplicateTransactionError
+from app.cache import (
+    BalanceCache,
+    BalanceSnapshot,
+    InvalidationBus,
+    InvalidationMessage,
+    OwnershipIndex,
+    SingleFlight,
+)
+from app.core.constants import CoalescingScopes, ErrorMessages, MonetaryConstants
+from app.core.errors import DuplicateTransactionError, NotFoundError
 from app.crud.accounts import CRUDAccount
 from app.crud.payments import CRUDPayment
+from app.events import AccountEvent, AccountEventHub
 from app.models.payment import Payment
 from app.validators.async_ import UserAsyncValidator
 
@@ -25,6 +36,14 @@ class WebhookService:
         accounts_crud: CRUDAccount,
         payments_crud: CRUDPayment,
         user_validator: UserAsyncValidator,
+        balance_cache: BalanceCache | None = None,
+        ownership: OwnershipIndex | None = None,
+        flights: SingleFlight | None = None,
+        *,
+        idempotency_lookback: timedelta | None = None,
+        ledger: bool = False,
+        events: AccountEventHub | None = None,
+        bus: InvalidationBus | None = None,
     ):
         """Инициализирует сервис вебхуков.
 
@@ -32,10 +51,25 @@ class WebhookService:
             accounts_crud: CRUD-уровень для работы с счетами.
             payments_crud: CRUD-уровень для работы с платежами.
             user_validator: Валидатор пользователей для проверки существования.
+            balance_cache: Кэш балансов для сквозной записи (опционально).
+            ownership: Индекс владения счетами (опционально).
+            flights: Реестр объединения чтений для инвалидации листингов (опционально).
+            idempotency_lookback: Глубина предварительной проверки дубликата; None — вся
+                история. Более старые повторы отсекает уникальный ключ транзакции в БД.
+            ledger: Режим баланса `ledger`: пополнение только добавляет неучтённый платёж.
+            events: Хаб событий счетов для SSE-подписчиков (опционально).
+            bus: Шина инвалидаций между воркерами (опционально).
         """
         self.accounts_crud = accounts_crud
         self.payments_crud = payments_crud
         self.user_validator = user_validator
+        self.balance_cache = balance_cache
+        self.ownership = ownership
+        self.flights = flights
+        self.idempotency_lookback = idempotency_lookback
+        self.ledger = ledger
+        self.events = events
+        self.bus = bus
 
     async def process_topup(
         self,
@@ -50,9 +84,32 @@ class WebhookService:
 
         Шаги:
             1. Проверить существование транзакции (идемпотентность).
-            2. Найти счет пользователя или создать новый.
+            2. Найти счёт пользователя; при отсутствии — взять счёт по умолчанию.
             3. Создать запись платежа.
-            4. Начислить сумму на баланс и закоммитить транзакцию.
+            4. Начислить сумму на баланс, увеличить версию счёта и закоммитить транзакцию.
+            5. Записать новый снимок баланса в кэш (если он включён) и раздать события
+               платежа и баланса SSE-подписчикам.
+
+        Строка счёта блокируется до коммита, поэтому параллельные пополнения
+        одного счёта не теряют начисления, а версии снимков строго возрастают.
+        Пополнения без известного `account_id` зачисляются на единственный счёт
+        пользователя по умолчанию: он находится или создаётся одним upsert.
+
+        С индексом владения счёт другого пользователя распознаётся без запроса
+        к БД, а существование известного пользователя не проверяется загрузкой.
+
+        Предварительная проверка дубликата смотрит только последние
+        `idempotency_lookback` (свежие секции платежей); более старый или
+        параллельный повтор отклоняется уникальным ключом транзакции при
+        вставке платежа. После такой ошибки транзакция ищется во всех
+        хранилищах, и `DuplicateTransactionError` возникает, только если она
+        действительно есть; иначе ошибка целостности пробрасывается.
+
+        В режиме `ledger` строка счёта не блокируется и не изменяется: платёж
+        добавляется неучтённым, а баланс сворачивает `LedgerCheckpointer`.
+        Существующий счёт по умолчанию находится обычным чтением, upsert
+        выполняется только при его отсутствии. SSE-подписчики получают только
+        событие платежа.
 
         Args:
             db (AsyncSession): Сессия БД.
@@ -65,31 +122,98 @@ class WebhookService:
             Payment: Созданный платёж.
 
         Raises:
-            IntegrityError: Если транзакция уже существует.
+            DuplicateTransactionError: Если транзакция уже существует.
+            IntegrityError: Если вставка платежа нарушила ограничение, не связанное
+                с повтором транзакции (например, владелец удалён параллельно).
         """
         # 1. Проверяем идемпотентность ДО создания
-        existing_payment = await self.payments_crud.get_by_transaction(db, transaction_id)
+        created_from = None
+        if self.idempotency_lookback is not None:
+            created_from = datetime.now(timezone.utc) - self.idempotency_lookback
+        existing_payment = await self.payments_crud.get_by_transaction(
+            db, transaction_id, created_from=created_from
+        )
         if existing_payment is not None:
             raise DuplicateTransactionError()
 
-        # 2. Находим или создаем счет
+        # Сохраняемое значение совпадает с возвращаемым без перечитывания из БД
+        amount = amount.quantize(MonetaryConstants.ONE_CENT)
+
+        # 2. Находим счёт либо берём (создаём) счёт по умолчанию
         account = None
-        if account_id:
-            account = await self.accounts_crud.get_for_user(db, account_id, user_id)
-        if not account:
-            await self.user_validator.get_user_or_error(db, user_id)
-            account = await self.accounts_crud.create_for_user(db, user_id)
+        created = False
+        if account_id and self._may_own(account_id, user_id):
+            account = await self.accounts_crud.get_for_user(
+                db, account_id, user_id, for_update=not self.ledger
+            )
+        if account is None and self.ledger:
+            account = await self.accounts_crud.get_default_for_user(db, user_id)
+        found = account is not None
+        if not found:
+            await self.user_validator.assert_user_exists(db, user_id)
+            try:
+                # Upsert сам увеличивает версию существующего счёта
+                account = await self.accounts_crud.upsert_default_for_user(db, user_id)
+            except IntegrityError:
+                # Пользователь удалён другим воркером после попадания в индекс
+                await db.rollback()
+                if self.ownership is None:
+                    raise
+                self.ownership.remove_user(user_id)
+                raise NotFoundError(ErrorMessages.USER_NOT_FOUND)
+            created = account.version == 1
 
         # 3. Создаем платеж и обновляем баланс
-        payment = await self.payments_crud.create(
-            db,
-            transaction_id=transaction_id,
-            user_id=user_id,
-            account_id=account.id,
-            amount=amount,
-        )
-        account.balance = (account.balance or MonetaryConstants.ZERO_TWO_PLACES) + amount
+        try:
+            payment = await self.payments_crud.create(
+                db,
+                transaction_id=transaction_id,
+                user_id=user_id,
+                account_id=account.id,
+                amount=amount,
+                checkpointed=not self.ledger,
+            )
+        except IntegrityError:
+            # Повтор старше окна проверки или параллельный дубликат
+            await db.rollback()
+            if await self.payments_crud.transaction_exists(db, transaction_id):
+                raise DuplicateTransactionError()
+            raise
+        if not self.ledger:
+            # Версия меняется вместе с балансом, чтобы оба поля ушли одним UPDATE
+            account.balance = (account.balance or MonetaryConstants.ZERO_TWO_PLACES) + amount
+            if found:
+                account.version += 1
+
+        snapshot = None
+        # Снимки кэша опираются на версию строки, которую режим `ledger` не меняет
+        if self.balance_cache is not None and not self.ledger:
+            snapshot = BalanceSnapshot.from_account(account)
+        if self.bus is not None:
+            messages = [InvalidationMessage('user', user_id)] if created else []
+            if not self.ledger:
+                messages.append(InvalidationMessage.account(BalanceSnapshot.from_account(account)))
+            self.bus.publish(db, messages)
+        events = []
+        if self.events is not None:
+            events.append(AccountEvent.payment(payment))
+            if not self.ledger:
+                events.append(AccountEvent.balance(BalanceSnapshot.from_account(account)))
+            await self.events.publish(db, events)
         await db.commit()
 
-        await db.refresh(payment)
+        if snapshot is not None:
+            self.balance_cache.add_account(snapshot)
+        if events:
+            self.events.dispatch(events)
+        if self.ownership is not None:
+            self.ownership.add_account(account.id, user_id)
+        if self.flights is not None:
+            self.flights.forget((CoalescingScopes.USER_ACCOUNTS, user_id))
         return payment
+
+    def _may_own(self, account_id: int, user_id: int) -> bool:
+        if self.ownership is None:
+            return True
+        owner = self.ownership.owner_of(account_id)
+        return owner is None or owner == user_id
@@ -4,6 +4,7 @@ from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache import OwnershipIndex
 from app.core.constants import ErrorMessages
 from app.core.errors import NotFoundError, ValidationError
 from app.crud.users import CRUDUser
@@ -16,13 +17,15 @@ class UserAsyncValidator:
     Использует CRUD-уровень для запросов к БД. Бросает доменные ошибки.
     """
 
-    def __init__(self, users_crud: CRUDUser) -> None:
+    def __init__(self, users_crud: CRUDUser, ownership: OwnershipIndex | None = None) -> None:
         """Инициализирует валидатор пользователей.
 
         Args:
             users_crud: CRUD-уровень для работы с пользователями.
+            ownership: Индекс известных пользователей (опционально).
         """
         self.users_crud = users_crud
+        self.ownership = ownership
 
     async def assert_email_unique(
         self, db: AsyncSession, email: str, *, exclude_user_id: Optional[int] = None
@@ -48,6 +51,9 @@ class UserAsyncValidator:
     async def get_user_or_error(self, db: AsyncSession, user_id: int) -> User:
         """Возвращает пользователя или бросает `NotFoundError`.
 
+        Пользователь ищется пакетным загрузчиком сессии: одновременные проверки
+        нескольких пользователей в одной сессии выполняются одним запросом.
+
         Args:
             db (AsyncSession): Сессия БД.
             user_id (int): Идентификатор пользователя.
@@ -58,7 +64,23 @@ class UserAsyncValidator:
         Raises:
             NotFoundError: Если пользователь не найден.
         """
-        user = await self.users_crud.get(db, user_id)
+        user = await self.users_crud.load(db, user_id)
         if user is None:
             raise NotFoundError(ErrorMessages.USER_NOT_FOUND)
         return user
+
+    async def assert_user_exists(self, db: AsyncSession, user_id: int) -> None:
+        """Проверяет существование пользователя без загрузки, если он известен индексу.
+
+        Args:
+            db (AsyncSession): Сессия БД.
+            user_id (int): Идентификатор пользователя.
+
+        Raises:
+            NotFoundError: Если пользователь не найден.
+        """
+        if self.ownership is not None and self.ownership.has_user(user_id):
+            return
+        await self.get_user_or_error(db, user_id)
+        if self.ownership is not None:
+            self.ownership.add_user(user_id)
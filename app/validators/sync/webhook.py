@@ -50,3 +50,7 @@ class WebhookValidator:
 
         if not payload.transaction_id or not payload.transaction_id.strip():
             raise ValidationError(ErrorMessages.INVALID_TRANSACTION_ID)
+
+        # Ключи зачислений переводов не должны занимать идентификаторы провайдера
+        if payload.transaction_id.startswith(DomainConstraints.TRANSFER_CREDIT_PREFIX):
+            raise ValidationError(ErrorMessages.INVALID_TRANSACTION_ID)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Архивация платежей старше горячего окна в холодное хранилище.
+
+Переносит старые платежи порциями в сжатые сегменты каталога
+`PAYMENTS_ARCHIVE_DIR` и удаляет их из БД пакетами. Запускается по
+расписанию; прерванный запуск можно повторить.
+
+Примеры:
+    python -m scripts.archive_payments --dry-run
+    python -m scripts.archive_payments --hot-days 180 --chunk-size 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в PYTHONPATH
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import get_settings  # noqa: E402
+from app.crud.payments import CRUDPayment  # noqa: E402
+from app.db.archive import PaymentArchive  # noqa: E402
+from app.db.session import AsyncSessionLocal  # noqa: E402
+from app.services.archival import PaymentArchivalService  # noqa: E402
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создаёт парсер аргументов командной строки."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Архивация старых платежей")
+    parser.add_argument("--archive-dir", default=settings.payments_archive_dir,
+                        help="каталог архива (по умолчанию PAYMENTS_ARCHIVE_DIR)")
+    parser.add_argument("--hot-days", type=int, default=settings.payments_archive_hot_days,
+                        help="сколько последних дней платежи остаются в БД")
+    parser.add_argument("--chunk-size", type=int, default=settings.payments_archive_chunk_size,
+                        help="число платежей в одном сегменте")
+    parser.add_argument("--delete-batch-size", type=int,
+                        default=settings.payments_archive_delete_batch_size,
+                        help="число строк, удаляемых одной транзакцией")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="только подсчитать платежи, ничего не перенося")
+    return parser
+
+
+async def main(argv: list[str] | None = None) -> dict:
+    """Точка входа CLI."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.archive_dir:
+        parser.error("не задан каталог архива (--archive-dir или PAYMENTS_ARCHIVE_DIR)")
+    archive = PaymentArchive(args.archive_dir)
+    service = PaymentArchivalService(
+        AsyncSessionLocal,
+        CRUDPayment(archive),
+        archive,
+        hot_days=args.hot_days,
+        chunk_size=args.chunk_size,
+        delete_batch_size=args.delete_batch_size,
+        dry_run=args.dry_run,
+    )
+    report = asdict(await service.run())
+    print(json.dumps({"dry_run": args.dry_run, **report}, ensure_ascii=False, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Контрольная точка балансов режима `ledger`.
+
+Однократно переносит все неучтённые платежи в балансы счетов. Нужна при
+переходе из режима `ledger` в режим `row` и для проверки отставания фонового
+цикла контрольных точек.
+
+Примеры:
+    python -m scripts.checkpoint_ledger
+    python -m scripts.checkpoint_ledger --batch-size 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в PYTHONPATH
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import get_settings  # noqa: E402
+from app.crud.accounts import crud_account  # noqa: E402
+from app.crud.payments import crud_payment  # noqa: E402
+from app.db.session import AsyncSessionLocal  # noqa: E402
+from app.services.ledger import LedgerCheckpointer  # noqa: E402
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создаёт парсер аргументов командной строки."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Контрольная точка балансов режима ledger")
+    parser.add_argument("--batch-size", type=int, default=settings.ledger_checkpoint_batch_size,
+                        help="число платежей, учитываемых одной транзакцией")
+    return parser
+
+
+async def main(argv: list[str] | None = None) -> int:
+    """Точка входа CLI."""
+    args = build_parser().parse_args(argv)
+    checkpointer = LedgerCheckpointer(
+        AsyncSessionLocal,
+        crud_account,
+        crud_payment,
+        batch_size=args.batch_size,
+        interval_seconds=0,
+    )
+    applied = await checkpointer.run_once()
+    print(json.dumps({"checkpointed": applied}, ensure_ascii=False, indent=2))
+    return applied
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Уплотнение счетов: назначение счёта по умолчанию и слияние пустых дублей.
+
+Обходит владельцев счетов пакетами (одна транзакция на пакет) и переносит
+платежи пустых счетов-дублей на счёт по умолчанию, удаляя сами дубли. Счета с
+ненулевым балансом и счета с историей в архиве платежей сохраняются. Воркеры
+узнают об изменениях через шину инвалидаций. Скрипт можно прерывать и
+запускать повторно; одновременно с архивацией его не запускают.
+
+Примеры:
+    python -m scripts.compact_accounts --dry-run
+    python -m scripts.compact_accounts --batch-size 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в PYTHONPATH
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.cache.bus import build_invalidation_bus  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.crud.accounts import crud_account  # noqa: E402
+from app.crud.payments import crud_payment  # noqa: E402
+from app.db.archive import build_payment_archive  # noqa: E402
+from app.db.session import AsyncSessionLocal  # noqa: E402
+from app.services.compaction import AccountCompactionService  # noqa: E402
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создаёт парсер аргументов командной строки."""
+    parser = argparse.ArgumentParser(description="Уплотнение пустых счетов-дублей")
+    parser.add_argument("--batch-size", type=int, default=1000,
+                        help="число пользователей в одной транзакции")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="только подсчитать изменения, ничего не сохраняя")
+    return parser
+
+
+async def main(argv: list[str] | None = None) -> dict:
+    """Точка входа CLI."""
+    args = build_parser().parse_args(argv)
+    settings = get_settings()
+    bus = build_invalidation_bus(settings)
+    service = AccountCompactionService(
+        AsyncSessionLocal,
+        crud_account,
+        crud_payment,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+        archive=build_payment_archive(settings),
+        bus=bus,
+    )
+    await bus.start()
+    try:
+        report = asdict(await service.run())
+    finally:
+        await bus.stop()
+    print(json.dumps({"dry_run": args.dry_run, **report}, ensure_ascii=False, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
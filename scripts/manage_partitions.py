@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Обслуживание помесячных секций таблицы платежей (PostgreSQL).
+
+Создаёт секции текущего и следующих месяцев и отсоединяет секции старше срока
+хранения, если архивация уже перенесла из них все платежи; секции с платежами
+остаются присоединёнными (`retained` в отчёте). Запускается по расписанию
+(например, раз в сутки) после `scripts/archive_payments.py`; повторный запуск
+ничего не меняет.
+
+Примеры:
+    python -m scripts.manage_partitions --dry-run
+    python -m scripts.manage_partitions --months-ahead 6 --retention-months 24
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в PYTHONPATH
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import get_settings  # noqa: E402
+from app.db.session import AsyncSessionLocal  # noqa: E402
+from app.services.partitions import PaymentPartitionService  # noqa: E402
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создаёт парсер аргументов командной строки."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Обслуживание секций таблицы платежей")
+    parser.add_argument("--months-ahead", type=int,
+                        default=settings.payments_partitions_months_ahead,
+                        help="на сколько месяцев вперёд создавать секции")
+    parser.add_argument("--retention-months", type=int,
+                        default=settings.payments_partitions_retention_months,
+                        help="сколько месяцев истории оставлять присоединённой (0 — все)")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="только показать изменения, ничего не сохраняя")
+    return parser
+
+
+async def main(argv: list[str] | None = None) -> dict:
+    """Точка входа CLI."""
+    args = build_parser().parse_args(argv)
+    service = PaymentPartitionService(
+        AsyncSessionLocal,
+        months_ahead=args.months_ahead,
+        retention_months=args.retention_months,
+        dry_run=args.dry_run,
+    )
+    report = asdict(await service.run())
+    print(json.dumps({"dry_run": args.dry_run, **report}, ensure_ascii=False, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Сверка балансов счетов с суммами их платежей.
+
+Делит счета на диапазоны идентификаторов и сверяет их параллельно. Каждое
+расхождение сразу печатается строкой JSON (или пишется в `--output`), в конце
+выводится сводка. С `--checkpoint` прерванная сверка продолжается с места
+остановки.
+
+Примеры:
+    python -m scripts.reconcile_balances
+    python -m scripts.reconcile_balances --concurrency 8 --checkpoint /tmp/reconcile.json
+    python -m scripts.reconcile_balances --output mismatches.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+
+# Добавляем корневую директорию проекта в PYTHONPATH
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.config import get_settings  # noqa: E402
+from app.crud.accounts import crud_account  # noqa: E402
+from app.crud.payments import crud_payment  # noqa: E402
+from app.db.archive import build_payment_archive  # noqa: E402
+from app.db.session import AsyncSessionLocal  # noqa: E402
+from app.services.reconciliation import BalanceMismatch, BalanceReconciliationService  # noqa: E402
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создаёт парсер аргументов командной строки."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Сверка балансов с платежами")
+    parser.add_argument("--range-size", type=int, default=settings.reconciliation_range_size,
+                        help="длина диапазона идентификаторов счетов")
+    parser.add_argument("--concurrency", type=int, default=settings.reconciliation_concurrency,
+                        help="сколько диапазонов сверять одновременно")
+    parser.add_argument("--checkpoint", default=settings.reconciliation_checkpoint_path,
+                        help="файл контрольной точки для возобновления")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="начать заново, игнорируя контрольную точку")
+    parser.add_argument("--output", help="файл для расхождений (JSON Lines)")
+    return parser
+
+
+async def main(argv: list[str] | None = None) -> dict:
+    """Точка входа CLI."""
+    args = build_parser().parse_args(argv)
+    settings = get_settings()
+    service = BalanceReconciliationService(
+        AsyncSessionLocal,
+        crud_account,
+        crud_payment,
+        range_size=args.range_size,
+        concurrency=args.concurrency,
+        max_reported=0,
+        archive=build_payment_archive(settings),
+        checkpoint_path=args.checkpoint,
+    )
+    output = open(args.output, "a", encoding="utf-8") if args.output else nullcontext(sys.stdout)
+    with output as stream:
+
+        def report(mismatch: BalanceMismatch) -> None:
+            stream.write(json.dumps({
+                "account_id": mismatch.account_id,
+                "user_id": mismatch.user_id,
+                "balance": str(mismatch.balance),
+                "payments_total": str(mismatch.payments_total),
+                "difference": str(mismatch.difference),
+            }) + "\n")
+
+        job = await service.run(on_mismatch=report, resume=not args.no_resume)
+    summary = {
+        "status": job.status,
+        "ranges": job.ranges_total,
+        "accounts_checked": job.accounts_checked,
+        "mismatch_count": job.mismatch_count,
+        "error": job.error,
+    }
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return summary
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
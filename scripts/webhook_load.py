@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""Нагрузочный драйвер для вебхука пополнения `POST /api/v1/webhook/payment`.
+
+Генерирует корректно подписанные запросы с заданной интенсивностью (open-loop)
+и выводит отчёт: пропускная способность, перцентили задержек и коды ответов.
+
+Профиль трафика настраивается параметрами:
+- ``--duplicate-ratio`` — доля повторов уже отправленных `transaction_id` (ожидается 409)
+- ``--new-account-ratio`` — доля запросов с `account_id = 0` (создание нового счёта)
+- ``--skew`` — перекос на «горячие» счета (показатель Zipf, 0 — равномерно)
+
+Цель — либо внешний URL (``--url``), либо приложение в текущем процессе (``--asgi``).
+
+Примеры:
+    python -m scripts.webhook_load --url http://localhost:8000 --targets 1:1,1:2,2:3
+    python -m scripts.webhook_load --asgi --targets 1:1 --rate 200 --duration 30 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from decimal import Decimal
+from pathlib import Path
+
+import httpx
+
+# Добавляем корневую директорию проекта в PYTHONPATH
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.constants import WebhookPaths  # noqa: E402
+from app.utils.crypto import compute_signature  # noqa: E402
+
+
+WEBHOOK_URL = f"{WebhookPaths.PREFIX}{WebhookPaths.PAYMENT}"
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class LoadConfig:
+    """Параметры нагрузки."""
+
+    targets: list[tuple[int, int]]
+    secret_key: str
+    rate: float = 50.0
+    duration: float = 10.0
+    total: int | None = None
+    concurrency: int = 100
+    duplicate_ratio: float = 0.0
+    new_account_ratio: float = 0.0
+    skew: float = 0.0
+    min_amount: Decimal = Decimal("1.00")
+    max_amount: Decimal = Decimal("100.00")
+    timeout: float = 10.0
+    seed: int | None = None
+
+
+@dataclass
+class LoadStats:
+    """Накопленные результаты прогона."""
+
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    sent: int = 0
+    duplicates_sent: int = 0
+    new_accounts_sent: int = 0
+    elapsed: float = 0.0
+
+    def record(self, latency: float, status: int | None, error: str | None = None) -> None:
+        """Фиксирует результат одного запроса."""
+        self.latencies.append(latency)
+        if status is not None:
+            self.statuses[status] += 1
+        if error is not None:
+            self.errors[error] += 1
+
+    def percentile(self, p: float) -> float:
+        """Возвращает перцентиль задержки в миллисекундах (nearest-rank)."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        rank = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered)) - 1))
+        return ordered[rank] * 1000
+
+    def summary(self) -> dict:
+        """Формирует сводку прогона."""
+        completed = len(self.latencies)
+        return {
+            "sent": self.sent,
+            "completed": completed,
+            "duplicates_sent": self.duplicates_sent,
+            "new_accounts_sent": self.new_accounts_sent,
+            "elapsed_s": round(self.elapsed, 3),
+            "throughput_rps": round(completed / self.elapsed, 2) if self.elapsed else 0.0,
+            "latency_ms": {
+                **{f"p{p}": round(self.percentile(p), 2) for p in PERCENTILES},
+                "max": round(max(self.latencies) * 1000, 2) if self.latencies else 0.0,
+            },
+            "status_codes": {str(k): v for k, v in sorted(self.statuses.items())},
+            "errors": dict(self.errors),
+        }
+
+
+class PayloadFactory:
+    """Генератор подписанных тел вебхука по профилю нагрузки."""
+
+    def __init__(self, config: LoadConfig) -> None:
+        """Инициализирует генератор.
+
+        Args:
+            config (LoadConfig): Параметры нагрузки.
+        """
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.sent_payloads: list[dict] = []
+        self.user_ids = sorted({user_id for user_id, _ in config.targets})
+        # Zipf-веса: счёт с рангом r получает вес 1 / r^skew
+        weights = [1 / (rank**config.skew) for rank in range(1, len(config.targets) + 1)]
+        total = sum(weights)
+        acc = 0.0
+        self.cum_weights = []
+        for w in weights:
+            acc += w / total
+            self.cum_weights.append(acc)
+
+    def _amount(self) -> Decimal:
+        low = int(self.config.min_amount * 100)
+        high = int(self.config.max_amount * 100)
+        return Decimal(self.rng.randint(low, high)) / 100
+
+    def next(self) -> tuple[dict, str]:
+        """Возвращает очередное тело запроса и его вид.
+
+        Returns:
+            tuple[dict, str]: Тело вебхука и вид запроса (`new`, `existing`, `duplicate`).
+        """
+        if self.sent_payloads and self.rng.random() < self.config.duplicate_ratio:
+            return self.rng.choice(self.sent_payloads), "duplicate"
+
+        if self.rng.random() < self.config.new_account_ratio:
+            user_id, account_id, kind = self.rng.choice(self.user_ids), 0, "new"
+        else:
+            user_id, account_id = self.rng.choices(
+                self.config.targets, cum_weights=self.cum_weights
+            )[0]
+            kind = "existing"
+
+        amount = self._amount()
+        transaction_id = f"load-{uuid.uuid4()}"
+        payload = {
+            "transaction_id": transaction_id,
+            "user_id": user_id,
+            "account_id": account_id,
+            "amount": str(amount),
+            "signature": compute_signature(
+                account_id=account_id,
+                amount=amount,
+                transaction_id=transaction_id,
+                user_id=user_id,
+                secret_key=self.config.secret_key,
+            ),
+        }
+        self.sent_payloads.append(payload)
+        return payload, kind
+
+
+async def run_load(client: httpx.AsyncClient, config: LoadConfig) -> LoadStats:
+    """Выполняет прогон нагрузки open-loop с заданной интенсивностью.
+
+    Запросы запускаются по расписанию `t0 + i / rate` независимо от ответов, число
+    одновременных запросов ограничено `concurrency`.
+
+    Args:
+        client (httpx.AsyncClient): HTTP-клиент, направленный на цель.
+        config (LoadConfig): Параметры нагрузки.
+
+    Returns:
+        LoadStats: Результаты прогона.
+    """
+    stats = LoadStats()
+    factory = PayloadFactory(config)
+    semaphore = asyncio.Semaphore(config.concurrency)
+    total = config.total if config.total is not None else int(config.rate * config.duration)
+    interval = 1 / config.rate
+    tasks: list[asyncio.Task] = []
+
+    async def fire(payload: dict) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                resp = await client.post(WEBHOOK_URL, json=payload)
+            except httpx.HTTPError as exc:
+                stats.record(time.perf_counter() - started, None, type(exc).__name__)
+                return
+            stats.record(time.perf_counter() - started, resp.status_code)
+
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    for i in range(total):
+        delay = t0 + i * interval - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        payload, kind = factory.next()
+        stats.sent += 1
+        if kind == "duplicate":
+            stats.duplicates_sent += 1
+        elif kind == "new":
+            stats.new_accounts_sent += 1
+        tasks.append(asyncio.create_task(fire(payload)))
+
+    await asyncio.gather(*tasks)
+    stats.elapsed = loop.time() - t0
+    return stats
+
+
+@asynccontextmanager
+async def open_client(url: str | None, timeout: float):
+    """Открывает клиента к внешнему URL либо к приложению в текущем процессе."""
+    if url:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits) as client:
+            yield client
+        return
+
+    from app.main import create_app
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://asgi", timeout=timeout
+        ) as client:
+            yield client
+
+
+def parse_targets(raw: str) -> list[tuple[int, int]]:
+    """Разбирает список целей вида ``user_id:account_id,...``."""
+    targets = []
+    for item in raw.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        user_id, _, account_id = item.partition(":")
+        targets.append((int(user_id), int(account_id or 0)))
+    if not targets:
+        raise argparse.ArgumentTypeError("нужна хотя бы одна цель user_id:account_id")
+    return targets
+
+
+def print_report(summary: dict) -> None:
+    """Печатает отчёт в человекочитаемом виде."""
+    latency = summary["latency_ms"]
+    print("📊 Результаты нагрузки на вебхук")
+    print(f"  Отправлено:        {summary['sent']} (повторов: {summary['duplicates_sent']}, "
+          f"новых счетов: {summary['new_accounts_sent']})")
+    print(f"  Завершено:         {summary['completed']} за {summary['elapsed_s']} с")
+    print(f"  Пропускная способность: {summary['throughput_rps']} запр/с")
+    print("  Задержка, мс:      " + ", ".join(f"{k}={v}" for k, v in latency.items()))
+    print("  Коды ответов:      " + (
+        ", ".join(f"{k}: {v}" for k, v in summary["status_codes"].items()) or "—"
+    ))
+    if summary["errors"]:
+        print("  Ошибки транспорта: " + ", ".join(
+            f"{k}: {v}" for k, v in summary["errors"].items()
+        ))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Создаёт парсер аргументов командной строки."""
+    parser = argparse.ArgumentParser(description="Нагрузочный драйвер вебхука пополнения")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="базовый URL сервиса, например http://localhost:8000")
+    target.add_argument("--asgi", action="store_true", help="нагружать приложение в процессе")
+    parser.add_argument("--targets", type=parse_targets, required=True,
+                        help="существующие счета: user_id:account_id через запятую")
+    parser.add_argument("--secret", default=os.getenv("WEBHOOK_SECRET_KEY"),
+                        help="секрет подписи (по умолчанию из настроек приложения)")
+    parser.add_argument("--rate", type=float, default=50.0, help="целевая интенсивность, запр/с")
+    parser.add_argument("--duration", type=float, default=10.0, help="длительность, с")
+    parser.add_argument("--requests", type=int, default=None,
+                        help="общее число запросов (переопределяет --duration)")
+    parser.add_argument("--concurrency", type=int, default=100,
+                        help="максимум одновременных запросов")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.0,
+                        help="доля повторов transaction_id [0..1]")
+    parser.add_argument("--new-account-ratio", type=float, default=0.0,
+                        help="доля запросов с account_id=0 [0..1]")
+    parser.add_argument("--skew", type=float, default=0.0,
+                        help="показатель Zipf для горячих счетов (0 — равномерно)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="таймаут запроса, с")
+    parser.add_argument("--seed", type=int, default=None, help="seed генератора случайных чисел")
+    parser.add_argument("--json", action="store_true", help="вывести отчёт в JSON")
+    return parser
+
+
+async def main(argv: list[str] | None = None) -> dict:
+    """Точка входа CLI."""
+    args = build_parser().parse_args(argv)
+    secret = args.secret
+    if not secret:
+        from app.core.config import get_settings
+
+        secret = get_settings().webhook_secret_key
+
+    config = LoadConfig(
+        targets=args.targets,
+        secret_key=secret,
+        rate=args.rate,
+        duration=args.duration,
+        total=args.requests,
+        concurrency=args.concurrency,
+        duplicate_ratio=args.duplicate_ratio,
+        new_account_ratio=args.new_account_ratio,
+        skew=args.skew,
+        timeout=args.timeout,
+        seed=args.seed,
+    )
+
+    async with open_client(args.url, args.timeout) as client:
+        stats = await run_load(client, config)
+
+    summary = stats.summary()
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        print_report(summary)
+    return summary
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
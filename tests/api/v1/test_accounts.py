@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 from fastapi import status
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.crud.accounts import CRUDAccount
 from app.crud.users import CRUDUser
 from tests.constants import (
     TestAccountsPaths,
@@ -15,6 +18,7 @@ from tests.constants import (
     TestAuthData,
     TestPaginationParams,
     TestDomainIds,
+    TestMonetaryConstants,
 )
 
 
@@ -368,3 +372,259 @@ class TestAccountsApi:
             headers={TestAuthData.AUTHORIZATION_HEADER: TestAuthData.MISSING_BEARER},
         )
         assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.asyncio()
+    async def test_admin_reconciliation_job(
+        self,
+        app,
+        client: AsyncClient,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+        make_token: callable,  # type: ignore[type-arg]
+    ) -> None:
+        users = CRUDUser()
+        async with test_sessionmaker() as db:
+            admin = await users.create(
+                db,
+                email=TestUserData.ADMIN_EMAIL,
+                full_name=TestUserData.ADMIN_FULL_NAME,
+                password=TestUserData.ADMIN_PASSWORD,
+                is_admin=True,
+            )
+            account = await CRUDAccount().create_for_user(db, admin.id)
+            account.balance = TestMonetaryConstants.AMOUNT_10_00
+            await db.commit()
+            token = make_token(admin.id)
+            account_id = account.id
+        headers = {TestAuthData.AUTHORIZATION_HEADER: f"{TestAuthData.BEARER_PREFIX}{token}"}
+
+        resp = await client.post(
+            f"{TestAccountsPaths.PREFIX}{TestAccountsPaths.ADMIN_RECONCILIATION}", headers=headers
+        )
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+        job_id = resp.json()["id"]
+
+        await app.state.container.reconciliation_service.wait_all()
+        path = f"{TestAccountsPaths.PREFIX}{TestAccountsPaths.ADMIN_RECONCILIATION_JOB}"
+        resp = await client.get(path.format(job_id=job_id), headers=headers)
+        assert resp.status_code == status.HTTP_200_OK
+        body = resp.json()
+        assert body["status"] == "done"
+        assert body["mismatch_count"] == 1
+        assert body["mismatches"][0]["account_id"] == account_id
+        assert body["mismatches"][0]["difference"] == "10.00"
+
+        resp = await client.get(path.format(job_id="missing"), headers=headers)
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.asyncio()
+    async def test_debit_account(
+        self,
+        client: AsyncClient,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+        make_token: callable,  # type: ignore[type-arg]
+    ) -> None:
+        users = CRUDUser()
+        async with test_sessionmaker() as db:
+            owner = await users.create(
+                db,
+                email=TestUserData.OWNER_EMAIL,
+                full_name=TestUserData.OWNER_FULL_NAME,
+                password=TestUserData.OWNER_PASSWORD,
+            )
+            other = await users.create(
+                db,
+                email=TestUserData.USER_EMAIL,
+                full_name=TestUserData.USER_FULL_NAME,
+                password=TestUserData.USER_PASSWORD,
+            )
+            account = await CRUDAccount().create_for_user(db, owner.id)
+            account.balance = TestMonetaryConstants.AMOUNT_10_00
+            await db.commit()
+            owner_id, other_id, account_id = owner.id, other.id, account.id
+
+        path = f"{TestAccountsPaths.PREFIX}{TestAccountsPaths.USERS_ACCOUNT_DEBITS}"
+        url = path.format(user_id=owner_id, account_id=account_id)
+        headers = {
+            TestAuthData.AUTHORIZATION_HEADER: f"{TestAuthData.BEARER_PREFIX}{make_token(owner_id)}"
+        }
+
+        resp = await client.post(
+            url, json={"transaction_id": "debit-1", "amount": "2.50"}, headers=headers
+        )
+        assert resp.status_code == status.HTTP_201_CREATED
+        body = resp.json()
+        assert (body["account_id"], body["amount"], body["balance"]) == (
+            account_id,
+            "2.50",
+            "7.50",
+        )
+
+        resp = await client.post(
+            url, json={"transaction_id": "debit-2", "amount": "7.51"}, headers=headers
+        )
+        assert resp.status_code == status.HTTP_409_CONFLICT
+        assert resp.json()["detail"] == TestErrorMessages.INSUFFICIENT_FUNDS
+
+        resp = await client.post(
+            url, json={"transaction_id": "debit-1", "amount": "1.00"}, headers=headers
+        )
+        assert resp.status_code == status.HTTP_409_CONFLICT
+
+        resp = await client.post(
+            path.format(user_id=owner_id, account_id=account_id + 1),
+            json={"transaction_id": "debit-3", "amount": "1.00"},
+            headers=headers,
+        )
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+        assert resp.json()["detail"] == TestErrorMessages.ACCOUNT_NOT_FOUND
+
+        resp = await client.post(
+            url,
+            json={"transaction_id": "debit-4", "amount": "1.00"},
+            headers={
+                TestAuthData.AUTHORIZATION_HEADER: (
+                    f"{TestAuthData.BEARER_PREFIX}{make_token(other_id)}"
+                )
+            },
+        )
+        assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+        resp = await client.post(
+            url, json={"transaction_id": "debit-5", "amount": "0"}, headers=headers
+        )
+        assert resp.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    @pytest.mark.asyncio()
+    async def test_transfer_between_users(
+        self,
+        client: AsyncClient,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+        make_token: callable,  # type: ignore[type-arg]
+    ) -> None:
+        users, accounts = CRUDUser(), CRUDAccount()
+        async with test_sessionmaker() as db:
+            owner = await users.create(
+                db,
+                email=TestUserData.OWNER_EMAIL,
+                full_name=TestUserData.OWNER_FULL_NAME,
+                password=TestUserData.OWNER_PASSWORD,
+            )
+            other = await users.create(
+                db,
+                email=TestUserData.USER_EMAIL,
+                full_name=TestUserData.USER_FULL_NAME,
+                password=TestUserData.USER_PASSWORD,
+            )
+            source = await accounts.create_for_user(db, owner.id)
+            source.balance = TestMonetaryConstants.AMOUNT_10_00
+            target = await accounts.create_for_user(db, other.id)
+            await db.commit()
+            owner_id, other_id = owner.id, other.id
+            source_id, target_id = source.id, target.id
+
+        url = f"{TestAccountsPaths.PREFIX}{TestAccountsPaths.USERS_TRANSFERS}".format(
+            user_id=owner_id
+        )
+        headers = {
+            TestAuthData.AUTHORIZATION_HEADER: f"{TestAuthData.BEARER_PREFIX}{make_token(owner_id)}"
+        }
+        payload = {
+            "transaction_id": "transfer-1",
+            "from_account_id": source_id,
+            "to_account_id": target_id,
+            "amount": "4.00",
+        }
+
+        resp = await client.post(url, json=payload, headers=headers)
+        assert resp.status_code == status.HTTP_201_CREATED
+        body = resp.json()
+        assert (body["from_account_id"], body["to_account_id"], body["balance"]) == (
+            source_id,
+            target_id,
+            "6.00",
+        )
+
+        resp = await client.post(url, json=payload, headers=headers)
+        assert resp.status_code == status.HTTP_409_CONFLICT
+        assert resp.json()["detail"] == TestErrorMessages.TRANSACTION_ALREADY_PROCESSED
+
+        resp = await client.post(
+            url,
+            json={**payload, "transaction_id": "transfer-2", "to_account_id": source_id},
+            headers=headers,
+        )
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+        assert resp.json()["detail"] == TestErrorMessages.TRANSFER_SAME_ACCOUNT
+
+        resp = await client.post(
+            url,
+            json={
+                **payload,
+                "transaction_id": "transfer-3",
+                "from_account_id": target_id,
+                "to_account_id": source_id,
+            },
+            headers=headers,
+        )
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+        resp = await client.post(
+            url,
+            json={**payload, "transaction_id": "transfer-4"},
+            headers={
+                TestAuthData.AUTHORIZATION_HEADER: (
+                    f"{TestAuthData.BEARER_PREFIX}{make_token(other_id)}"
+                )
+            },
+        )
+        assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.asyncio()
+    async def test_account_events_stream(
+        self,
+        app,
+        client: AsyncClient,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+        make_token: callable,  # type: ignore[type-arg]
+    ) -> None:
+        async with test_sessionmaker() as db:
+            user = await CRUDUser().create(
+                db,
+                email=TestUserData.OWNER_EMAIL,
+                full_name=TestUserData.OWNER_FULL_NAME,
+                password=TestUserData.OWNER_PASSWORD,
+            )
+            account = await CRUDAccount().create_for_user(db, user.id)
+            account.balance = TestMonetaryConstants.AMOUNT_10_00
+            await db.commit()
+            user_id, account_id = user.id, account.id
+        headers = {
+            TestAuthData.AUTHORIZATION_HEADER: f"{TestAuthData.BEARER_PREFIX}{make_token(user_id)}"
+        }
+        hub = app.state.container.account_events
+        url = f"{TestAccountsPaths.PREFIX}{TestAccountsPaths.ME_ACCOUNT_EVENTS}"
+
+        stream = asyncio.create_task(client.get(url, headers=headers))
+        while hub.subscriber_count() == 0:
+            await asyncio.sleep(0.01)
+        path = f"{TestAccountsPaths.PREFIX}{TestAccountsPaths.USERS_ACCOUNT_DEBITS}"
+        resp = await client.post(
+            path.format(user_id=user_id, account_id=account_id),
+            json={"transaction_id": "events-debit-1", "amount": "2.50"},
+            headers=headers,
+        )
+        assert resp.status_code == status.HTTP_201_CREATED
+        await hub.stop()
+
+        resp = await stream
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        assert resp.text == (
+            "event: balance\n"
+            f'data: {{"id":{account_id},"user_id":{user_id},"balance":"7.50","version":2}}\n\n'
+        )
+
+    @pytest.mark.asyncio()
+    async def test_account_events_without_auth(self, client: AsyncClient) -> None:
+        resp = await client.get(f"{TestAccountsPaths.PREFIX}{TestAccountsPaths.ME_ACCOUNT_EVENTS}")
+        assert resp.status_code == status.HTTP_401_UNAUTHORIZED
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+
 import pytest
 from fastapi import status
 from httpx import AsyncClient
@@ -74,3 +76,64 @@ class TestHealthApi:
 
         resp4 = await client.get(health_db, headers=headers)
         assert resp4.status_code == status.HTTP_200_OK
+
+    @pytest.mark.asyncio()
+    async def test_health_ready_reports_metrics(self, client: AsyncClient) -> None:
+        """Детальная проба готовности отдаёт показатели замера."""
+        path = f"{TestHealthPaths.PREFIX}{TestHealthPaths.HEALTH_READY}"
+        resp = await client.get(path)
+        assert resp.status_code == status.HTTP_200_OK
+        body = resp.json()
+        assert body["status"] == TestApiSuccessResponses.STATUS_OK
+        assert body["db"]["ok"] is True
+        assert body["db"]["latency_ms"] >= 0
+        assert isinstance(body["pool"], dict)
+        assert body["event_loop_lag_ms"] >= 0
+
+    @pytest.mark.asyncio()
+    async def test_health_ready_unavailable_keeps_metrics(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Без БД проба готовности отвечает 503 с показателями замера."""
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        async def fail_execute(self: AsyncSession, *args, **kwargs):  # type: ignore[no-untyped-def]
+            raise RuntimeError(TestValidationData.ROOT_CAUSE_MESSAGE)
+
+        monkeypatch.setattr(AsyncSession, "execute", fail_execute, raising=True)
+
+        path = f"{TestHealthPaths.PREFIX}{TestHealthPaths.HEALTH_READY}"
+        resp = await client.get(path)
+        assert resp.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        body = resp.json()
+        assert body["status"] == "unavailable"
+        assert body["db"] == {"ok": False, "latency_ms": None, "error": "RuntimeError"}
+        assert isinstance(body["pool"], dict)
+        assert body["event_loop_lag_ms"] >= 0
+
+    @pytest.mark.asyncio()
+    async def test_health_db_served_from_background_sample(
+        self, app, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Свежий фоновый замер отдаётся пробе без обращения к БД."""
+        from sqlalchemy.ext.asyncio import AsyncSession
+
+        monitor = app.state.container.health_monitor
+        monitor.start()
+        while monitor.cached() is None:
+            await asyncio.sleep(0.01)
+        await monitor.stop()
+
+        async def fail_execute(self: AsyncSession, *args, **kwargs):  # type: ignore[no-untyped-def]
+            raise RuntimeError(TestValidationData.ROOT_CAUSE_MESSAGE)
+
+        monkeypatch.setattr(AsyncSession, "execute", fail_execute, raising=True)
+
+        path = f"{TestHealthPaths.PREFIX}{TestHealthPaths.HEALTH_DB}"
+        resp = await client.get(path)
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.headers["X-DB-Query-Count"] == "0"
+
+        ready = f"{TestHealthPaths.PREFIX}{TestHealthPaths.HEALTH_READY}"
+        resp = await client.get(ready)
+        assert resp.status_code == status.HTTP_200_OK
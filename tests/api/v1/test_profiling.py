@@ -0,0 +1,215 @@
+"""Тесты API профилирования запросов и журнала медленных SQL."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.container import ServiceContainer
+from app.core.profiling import ProfilingMiddleware
+from app.crud.users import CRUDUser
+from tests.constants import (
+    TestAuthData,
+    TestErrorMessages,
+    TestHealthPaths,
+    TestProfilingPaths,
+    TestUserData,
+)
+
+
+PROFILE_ID_HEADER = "X-Profile-Id"
+HEALTH_PATH = f"{TestHealthPaths.PREFIX}{TestHealthPaths.HEALTH}"
+HEALTH_DB_PATH = f"{TestHealthPaths.PREFIX}{TestHealthPaths.HEALTH_DB}"
+
+
+def enable_profiling(
+    app: FastAPI,
+    test_settings,
+    test_sessionmaker: async_sessionmaker[AsyncSession],
+    directory: Path,
+    **overrides,
+) -> None:
+    """Пересобирает контейнер с профилированием и подключает middleware."""
+    settings = test_settings.model_copy(
+        update={"profiling_enabled": True, "profiling_dir": str(directory), **overrides}
+    )
+    app.state.container = ServiceContainer.build(settings, test_sessionmaker)
+    app.add_middleware(ProfilingMiddleware)
+
+
+async def create_user(
+    test_sessionmaker: async_sessionmaker[AsyncSession], *, is_admin: bool
+) -> int:
+    async with test_sessionmaker() as db:
+        user = await CRUDUser().create(
+            db,
+            email=TestUserData.ADMIN_EMAIL if is_admin else TestUserData.TEST_EMAIL_GENERIC,
+            full_name=TestUserData.ADMIN_FULL_NAME,
+            password=TestUserData.ADMIN_PASSWORD,
+            is_admin=is_admin,
+        )
+        await db.commit()
+        return user.id
+
+
+def auth_headers(token: str) -> dict[str, str]:
+    return {TestAuthData.AUTHORIZATION_HEADER: f"{TestAuthData.BEARER_PREFIX}{token}"}
+
+
+class TestProfilingApi:
+    """Профилирование по токену и выборке, админские эндпойнты."""
+
+    @pytest.mark.asyncio()
+    async def test_disabled_profiling_is_not_found(
+        self,
+        client: AsyncClient,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+        make_token: callable,  # type: ignore[type-arg]
+    ) -> None:
+        admin_id = await create_user(test_sessionmaker, is_admin=True)
+        path = f"{TestProfilingPaths.PREFIX}{TestProfilingPaths.ADMIN_PROFILES}"
+
+        resp = await client.get(path, headers=auth_headers(make_token(admin_id)))
+
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+        assert resp.json()["detail"] == TestErrorMessages.PROFILING_DISABLED
+
+    @pytest.mark.asyncio()
+    async def test_non_admin_cannot_get_token(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        test_settings,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+        make_token: callable,  # type: ignore[type-arg]
+        tmp_path: Path,
+    ) -> None:
+        enable_profiling(app, test_settings, test_sessionmaker, tmp_path)
+        user_id = await create_user(test_sessionmaker, is_admin=False)
+        path = f"{TestProfilingPaths.PREFIX}{TestProfilingPaths.ADMIN_PROFILING_TOKEN}"
+
+        resp = await client.post(path, headers=auth_headers(make_token(user_id)))
+
+        assert resp.status_code == status.HTTP_403_FORBIDDEN
+
+    @pytest.mark.asyncio()
+    async def test_request_with_token_is_profiled(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        test_settings,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+        make_token: callable,  # type: ignore[type-arg]
+        tmp_path: Path,
+    ) -> None:
+        enable_profiling(app, test_settings, test_sessionmaker, tmp_path)
+        headers = auth_headers(make_token(await create_user(test_sessionmaker, is_admin=True)))
+        prefix = TestProfilingPaths.PREFIX
+
+        resp = await client.post(f"{prefix}{TestProfilingPaths.ADMIN_PROFILING_TOKEN}", headers=headers)
+        assert resp.status_code == status.HTTP_201_CREATED
+        token = resp.json()
+
+        resp = await client.get(HEALTH_DB_PATH, headers={token["header"]: "forged"})
+        assert PROFILE_ID_HEADER not in resp.headers
+        resp = await client.get(HEALTH_DB_PATH, headers={token["header"]: token["token"]})
+        assert resp.status_code == status.HTTP_200_OK
+        profile_id = resp.headers[PROFILE_ID_HEADER]
+
+        resp = await client.get(f"{prefix}{TestProfilingPaths.ADMIN_PROFILES}", headers=headers)
+        assert [item["id"] for item in resp.json()] == [profile_id]
+
+        path = f"{prefix}{TestProfilingPaths.ADMIN_PROFILE_ID}"
+        resp = await client.get(path.format(profile_id=profile_id), headers=headers)
+        assert resp.status_code == status.HTTP_200_OK
+        body = resp.json()
+        assert body["route"] == HEALTH_DB_PATH
+        assert body["trigger"] == "token"
+        assert body["status_code"] == status.HTTP_200_OK
+        assert any("health" in frame["function"] for frame in body["frames"])
+
+        resp = await client.get(path.format(profile_id="missing"), headers=headers)
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+        assert resp.json()["detail"] == TestErrorMessages.PROFILE_NOT_FOUND
+
+    @pytest.mark.asyncio()
+    async def test_sampled_route_is_profiled(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        test_settings,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+        tmp_path: Path,
+    ) -> None:
+        enable_profiling(
+            app,
+            test_settings,
+            test_sessionmaker,
+            tmp_path,
+            profiling_sample_rates={HEALTH_PATH: 1.0},
+        )
+
+        sampled = await client.get(HEALTH_PATH)
+        other = await client.get(HEALTH_DB_PATH)
+
+        assert PROFILE_ID_HEADER in sampled.headers
+        assert PROFILE_ID_HEADER not in other.headers
+        (info,) = await app.state.container.request_profiler.list_profiles()
+        assert (info.route, info.trigger) == (HEALTH_PATH, "sample")
+
+
+class TestSlowQueriesApi:
+    """Журнал медленных SQL-выражений для администратора."""
+
+    @pytest.mark.asyncio()
+    async def test_admin_sees_slow_queries(
+        self,
+        app: FastAPI,
+        client: AsyncClient,
+        test_settings,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+        make_token: callable,  # type: ignore[type-arg]
+    ) -> None:
+        path = f"{TestProfilingPaths.PREFIX}{TestProfilingPaths.ADMIN_SLOW_QUERIES}"
+        admin_headers = auth_headers(make_token(await create_user(test_sessionmaker, is_admin=True)))
+        resp = await client.get(path, headers=admin_headers)
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+        assert resp.json()["detail"] == TestErrorMessages.SLOW_QUERY_LOG_DISABLED
+
+        settings = test_settings.model_copy(
+            update={"slow_query_log_enabled": True, "slow_query_threshold_ms": 0.0}
+        )
+        app.state.container = ServiceContainer.build(settings, test_sessionmaker)
+        slow_log = app.state.container.slow_query_log
+        slow_log.install(test_sessionmaker.kw["bind"])
+        try:
+            await client.get(HEALTH_DB_PATH)
+            await slow_log.wait_explains()
+            resp = await client.get(path, headers=admin_headers)
+        finally:
+            await slow_log.uninstall()
+
+        assert resp.status_code == status.HTTP_200_OK
+        # Последним записан SELECT 1 пробы; до ответа добавлен поиск администратора
+        entry = resp.json()[-1]
+        assert entry["statement"] == "SELECT 1"
+        assert entry["parameters"] == []
+        assert entry["plan"] is not None
+
+    @pytest.mark.asyncio()
+    async def test_non_admin_cannot_read_slow_queries(
+        self,
+        client: AsyncClient,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+        make_token: callable,  # type: ignore[type-arg]
+    ) -> None:
+        path = f"{TestProfilingPaths.PREFIX}{TestProfilingPaths.ADMIN_SLOW_QUERIES}"
+        headers = auth_headers(make_token(await create_user(test_sessionmaker, is_admin=False)))
+
+        resp = await client.get(path, headers=headers)
+
+        assert resp.status_code == status.HTTP_403_FORBIDDEN
@@ -713,3 +713,54 @@ class TestUsersApi:
             json={},
         )
         assert resp.status_code == status.HTTP_200_OK
+
+    @pytest.mark.asyncio()
+    async def test_admin_purge_user_returns_job_handle(
+        self,
+        app,
+        client: AsyncClient,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+        make_token: callable,  # type: ignore[type-arg]
+    ) -> None:
+        from tests.constants import TestUsersPaths
+
+        users = CRUDUser()
+        async with test_sessionmaker() as db:
+            admin = await users.create(
+                db,
+                email=TestUserData.ADMIN_EMAIL,
+                full_name=TestUserData.ADMIN_FULL_NAME,
+                password=TestUserData.ADMIN_PASSWORD,
+                is_admin=True,
+            )
+            victim = await users.create(
+                db,
+                email=TestUserData.DELETE_EMAIL,
+                full_name=TestUserData.DELETE_FULL_NAME,
+                password=TestUserData.PASS_123,
+            )
+            await db.commit()
+            token = make_token(admin.id)
+        headers = {TestAuthData.AUTHORIZATION_HEADER: f"{TestAuthData.BEARER_PREFIX}{token}"}
+
+        resp = await client.post(
+            f"{TestUsersPaths.PREFIX}{TestUsersPaths.ADMIN_USER_PURGE}".format(user_id=victim.id),
+            headers=headers,
+        )
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+        job = resp.json()
+        assert job["user_id"] == victim.id
+
+        await app.state.container.purge_service.wait_all()
+        resp = await client.get(
+            f"{TestUsersPaths.PREFIX}{TestUsersPaths.ADMIN_PURGE_JOB}".format(job_id=job["id"]),
+            headers=headers,
+        )
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.json()["status"] == "done"
+
+        resp = await client.get(
+            f"{TestUsersPaths.PREFIX}{TestUsersPaths.ADMIN_PURGE_JOB}".format(job_id="missing"),
+            headers=headers,
+        )
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,194 @@
+"""Тесты кэша снимков балансов."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache import BalanceCache, BalanceSnapshot, InvalidationMessage, build_balance_cache
+from app.crud.accounts import CRUDAccount
+from app.crud.payments import CRUDPayment
+from app.crud.users import CRUDUser
+from app.services.accounts import AccountService
+from app.services.users import UserService
+from app.services.webhook import WebhookService
+from app.validators.async_ import UserAsyncValidator
+from tests.constants import TestUserData, TestValidationData
+
+
+class FakeClock:
+    """Управляемые часы для проверки TTL."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_cache(clock: FakeClock | None = None, **kwargs) -> BalanceCache:
+    params = {'max_entries': 100, 'max_accounts_per_user': 10, 'ttl_seconds': 60.0}
+    params.update(kwargs)
+    if clock is not None:
+        params['clock'] = clock
+    return BalanceCache(**params)
+
+
+def snap(account_id: int, balance: str, version: int, user_id: int = 1) -> BalanceSnapshot:
+    return BalanceSnapshot(id=account_id, user_id=user_id, balance=Decimal(balance), version=version)
+
+
+class TestBalanceCache:
+    """Тесты процессного кэша балансов."""
+
+    def test_listing_miss_then_hit(self) -> None:
+        cache = make_cache()
+        assert cache.list_for_user(1, limit=10, offset=0) is None
+
+        cache.set_user_accounts(1, [snap(1, '1.00', 1), snap(2, '2.00', 1)])
+        page = cache.list_for_user(1, limit=1, offset=1)
+
+        assert page == [snap(2, '2.00', 1)]
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_put_rejects_older_version(self) -> None:
+        cache = make_cache()
+        assert cache.put(snap(1, '5.00', 3))
+        assert not cache.put(snap(1, '4.00', 2))
+        assert cache.get(1).balance == Decimal('5.00')
+
+    def test_invalidation_blocks_stale_reload(self) -> None:
+        cache = make_cache()
+        cache.set_user_accounts(1, [snap(1, '1.00', 1)])
+
+        cache.apply_message(InvalidationMessage('account', 1, version=2, user_id=1))
+
+        assert cache.list_for_user(1, limit=10, offset=0) is None
+        assert not cache.set_user_accounts(1, [snap(1, '1.00', 1)])
+        assert cache.set_user_accounts(1, [snap(1, '3.00', 2)])
+
+    def test_account_deleted_drops_snapshot_and_listing(self) -> None:
+        cache = make_cache()
+        cache.set_user_accounts(1, [snap(1, '1.00', 1), snap(2, '0.00', 1)])
+
+        cache.apply_message(InvalidationMessage('account_deleted', 2, user_id=1))
+
+        assert cache.get(2) is None
+        assert cache.get(1) is not None
+        assert cache.list_for_user(1, limit=10, offset=0) is None
+
+    def test_own_messages_are_ignored(self) -> None:
+        cache = make_cache()
+        cache.put(snap(1, '1.00', 1))
+        cache.apply_message(InvalidationMessage('account', 1, version=2, origin=cache.origin))
+        assert cache.get(1) is not None
+
+    def test_ttl_expiry(self) -> None:
+        clock = FakeClock()
+        cache = make_cache(clock, ttl_seconds=5.0)
+        cache.set_user_accounts(1, [snap(1, '1.00', 1)])
+
+        clock.now = 5.0
+
+        assert cache.get(1) is None
+        assert cache.list_for_user(1, limit=10, offset=0) is None
+
+    def test_large_listing_not_cached(self) -> None:
+        cache = make_cache(max_accounts_per_user=1)
+        assert not cache.set_user_accounts(1, [snap(1, '1.00', 1), snap(2, '1.00', 1)])
+
+    def test_add_account_extends_loaded_listing(self) -> None:
+        cache = make_cache()
+        cache.set_user_accounts(1, [snap(2, '1.00', 1)])
+        cache.add_account(snap(1, '0.00', 1))
+        assert [s.id for s in cache.list_for_user(1, limit=10, offset=0)] == [1, 2]
+
+    def test_lru_eviction(self) -> None:
+        cache = make_cache(max_entries=2)
+        for account_id in (1, 2, 3):
+            cache.put(snap(account_id, '1.00', 1))
+        assert cache.get(1) is None
+        assert cache.get(3) is not None
+
+    def test_message_roundtrip(self) -> None:
+        message = InvalidationMessage('account', 7, version=3, user_id=2, origin='w1')
+        assert InvalidationMessage.decode(message.encode()) == message
+
+    def test_build_disabled_by_default(self, test_settings) -> None:
+        assert build_balance_cache(test_settings) is None
+        enabled = test_settings.model_copy(update={'balance_cache_enabled': True})
+        assert isinstance(build_balance_cache(enabled), BalanceCache)
+
+
+class TestBalanceCacheServices:
+    """Сквозная запись балансов из вебхуков и чтение листингов из кэша."""
+
+    @pytest.mark.asyncio()
+    async def test_webhook_writes_through_to_listing(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        cache = make_cache()
+        users, accounts, payments = CRUDUser(), CRUDAccount(), CRUDPayment()
+        account_service = AccountService(accounts, users, cache)
+        webhook_service = WebhookService(accounts, payments, UserAsyncValidator(users), cache)
+
+        async with test_sessionmaker() as db:
+            user = await users.create(
+                db,
+                email=TestUserData.TEST_EMAIL_GENERIC,
+                full_name=TestValidationData.TEST_USER_FULL_NAME,
+                password=TestUserData.SECURE_PASSWORD_123,
+            )
+            account = await accounts.create_for_user(db, user.id)
+            await db.commit()
+
+            listed = await account_service.get_user_accounts(db, user.id)
+            assert [a.balance for a in listed] == [Decimal('0.00')]
+
+            await webhook_service.process_topup(
+                db,
+                transaction_id='cache-tx-1',
+                account_id=account.id,
+                user_id=user.id,
+                amount=Decimal('10.00'),
+            )
+            await webhook_service.process_topup(
+                db,
+                transaction_id='cache-tx-2',
+                account_id=0,
+                user_id=user.id,
+                amount=Decimal('5.00'),
+            )
+
+            cached = cache.list_for_user(user.id, limit=10, offset=0)
+            assert [(s.balance, s.version) for s in cached] == [
+                (Decimal('10.00'), 2),
+                (Decimal('5.00'), 1),
+            ]
+            assert await account_service.get_user_accounts(db, user.id) == cached
+
+    @pytest.mark.asyncio()
+    async def test_delete_user_drops_listing(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        cache = make_cache()
+        users, accounts = CRUDUser(), CRUDAccount()
+        account_service = AccountService(accounts, users, cache)
+        user_service = UserService(users, balance_cache=cache)
+
+        async with test_sessionmaker() as db:
+            user = await users.create(
+                db,
+                email=TestUserData.TEST_EMAIL_GENERIC,
+                full_name=TestValidationData.TEST_USER_FULL_NAME,
+                password=TestUserData.SECURE_PASSWORD_123,
+            )
+            await db.commit()
+            await account_service.create_account_for_user(db, user.id)
+            await account_service.get_user_accounts(db, user.id)
+
+            await user_service.delete_user(db, user.id)
+
+            assert cache.list_for_user(user.id, limit=10, offset=0) is None
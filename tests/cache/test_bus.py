@@ -0,0 +1,264 @@
+"""Тесты шины инвалидаций между воркерами."""
+
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+
+import asyncpg
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache import (
+    BalanceCache,
+    BalanceSnapshot,
+    InvalidationBus,
+    InvalidationMessage,
+    OwnershipIndex,
+    PostgresInvalidationBus,
+    SingleFlight,
+    build_invalidation_bus,
+)
+from app.cache.bus import coalesce, encode_batches
+from app.core.constants import CoalescingScopes
+from app.crud.accounts import CRUDAccount
+from app.crud.users import CRUDUser
+from app.schemas import UserUpdate
+from app.services.accounts import AccountService
+from app.services.users import UserService
+from tests.constants import TestUserData, TestValidationData
+
+
+class FakeConnection:
+    """Соединение asyncpg, передающее уведомления шинам других воркеров."""
+
+    def __init__(self, *listeners: PostgresInvalidationBus) -> None:
+        self.listeners = listeners
+        self.payloads: list[str] = []
+        self.channels: list[str] = []
+        self.termination_listeners: list = []
+        self.closed = False
+
+    async def execute(self, _query: str, channel: str, payload: str) -> None:
+        self.payloads.append(payload)
+        for bus in self.listeners:
+            bus._on_notify(self, 0, channel, payload)
+
+    async def add_listener(self, channel: str, _callback) -> None:
+        self.channels.append(channel)
+
+    def add_termination_listener(self, callback) -> None:
+        self.termination_listeners.append(callback)
+
+    def terminate(self) -> None:
+        """Имитирует обрыв соединения сервером."""
+        for callback in self.termination_listeners:
+            callback(self)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def make_bus(connection: FakeConnection | None = None) -> PostgresInvalidationBus:
+    bus = PostgresInvalidationBus(
+        "postgresql://localhost/test", "cache_invalidation", flush_interval_seconds=0.0
+    )
+    bus._connection = connection or FakeConnection()
+    return bus
+
+
+class TestInvalidationMessages:
+    """Склейка и упаковка сообщений."""
+
+    def test_coalesce_keeps_newest_version(self) -> None:
+        pending: dict = {}
+        coalesce(
+            pending,
+            [
+                InvalidationMessage("account", 1, version=3, user_id=7),
+                InvalidationMessage("account", 1, version=2, user_id=7),
+                InvalidationMessage("account", 2, version=1, user_id=7),
+                InvalidationMessage("user", 7),
+                InvalidationMessage("user", 7),
+                InvalidationMessage("profile", 7),
+            ],
+        )
+
+        assert sorted(pending) == [("account", 1), ("account", 2), ("profile", 7), ("user", 7)]
+        assert pending[("account", 1)].version == 3
+
+    def test_batches_fit_notify_payload(self) -> None:
+        messages = [InvalidationMessage("account", i, version=1, user_id=i) for i in range(500)]
+
+        batches = encode_batches(messages, max_bytes=1000)
+
+        assert len(batches) > 1
+        assert all(len(batch) <= 1000 for batch in batches)
+        decoded = [InvalidationMessage.from_dict(item) for b in batches for item in json.loads(b)]
+        assert decoded == messages
+
+    def test_build_uses_memory_backend_by_default(self, test_settings) -> None:
+        assert type(build_invalidation_bus(test_settings)) is InvalidationBus
+        postgres = test_settings.model_copy(update={"invalidation_bus_backend": "postgres"})
+        assert isinstance(build_invalidation_bus(postgres), PostgresInvalidationBus)
+
+
+class TestPostgresInvalidationBus:
+    """Публикация после коммита, пакетная отправка и доставка."""
+
+    @pytest.mark.asyncio()
+    async def test_messages_are_sent_after_commit_only(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        bus = make_bus()
+
+        async with test_sessionmaker() as db:
+            await db.execute(select(1))
+            bus.publish(db, [InvalidationMessage("user", 1)])
+            await db.rollback()
+            await db.execute(select(1))
+            bus.publish(db, [InvalidationMessage("user", 2)])
+            assert bus.pending_count() == 0
+            await db.commit()
+
+        assert bus.pending_count() == 1
+        assert await bus.flush() == 1
+        (payload,) = bus._connection.payloads
+        assert [item["i"] for item in json.loads(payload)] == [2]
+
+    @pytest.mark.asyncio()
+    async def test_pending_messages_are_coalesced_into_one_notify(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        bus = make_bus()
+
+        for version in (2, 3, 4):
+            async with test_sessionmaker() as db:
+                bus.publish(db, [InvalidationMessage("account", 1, version=version, user_id=7)])
+                await db.commit()
+
+        assert await bus.flush() == 1
+        assert (bus.sent_notifications, bus.sent_messages) == (1, 1)
+        (payload,) = bus._connection.payloads
+        assert json.loads(payload)[0]["v"] == 4
+
+    def test_deliver_skips_own_messages_and_isolates_handlers(self) -> None:
+        bus = InvalidationBus()
+        received = []
+
+        def broken(_message: InvalidationMessage) -> None:
+            raise RuntimeError("boom")
+
+        bus.subscribe(broken)
+        bus.subscribe(received.append)
+        remote = InvalidationMessage("user_deleted", 5, origin="other")
+        bus.deliver([InvalidationMessage("user_deleted", 4, origin=bus.origin), remote])
+
+        assert received == [remote]
+
+    @pytest.mark.asyncio()
+    async def test_user_changes_reach_other_worker(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        users, accounts = CRUDUser(), CRUDAccount()
+        remote_bus = make_bus()
+        local_bus = make_bus(FakeConnection(remote_bus))
+        remote_index = OwnershipIndex(max_accounts=10, bus=remote_bus)
+        remote_flights = SingleFlight(window_seconds=60.0)
+        UserService(users, flights=remote_flights, bus=remote_bus)
+        AccountService(accounts, users, flights=remote_flights, bus=remote_bus)
+        local_service = UserService(users, bus=local_bus)
+
+        async with test_sessionmaker() as db:
+            user = await users.create(
+                db,
+                email=TestUserData.TEST_EMAIL_GENERIC,
+                full_name=TestValidationData.TEST_USER_FULL_NAME,
+                password=TestUserData.SECURE_PASSWORD_123,
+            )
+            await db.commit()
+            user_id = user.id
+        remote_index.add_account(1, user_id)
+
+        async def load() -> str:
+            return "cached"
+
+        await remote_flights.run(users.coalescing_scope(user_id), "user", load)
+        await remote_flights.run((CoalescingScopes.USER_ACCOUNTS, user_id), "page", load)
+        executed = remote_flights.executed
+
+        async with test_sessionmaker() as db:
+            await local_service.update_user(db, user_id, UserUpdate(full_name="Renamed User"))
+        await local_bus.flush()
+
+        await remote_flights.run(users.coalescing_scope(user_id), "user", load)
+        await remote_flights.run((CoalescingScopes.USER_ACCOUNTS, user_id), "page", load)
+        assert remote_flights.executed == executed + 1
+        assert remote_index.has_user(user_id)
+
+        async with test_sessionmaker() as db:
+            await local_service.delete_user(db, user_id)
+        await local_bus.flush()
+
+        assert not remote_index.has_user(user_id)
+        assert remote_index.owner_of(1) is None
+        await remote_flights.run((CoalescingScopes.USER_ACCOUNTS, user_id), "page", load)
+        assert remote_flights.executed == executed + 2
+
+
+class TestInvalidationBusReconnect:
+    """Переподключение после обрыва и сброс кэшей воркера."""
+
+    @pytest.mark.asyncio()
+    async def test_lost_connection_is_reopened_and_caches_reset(self, monkeypatch) -> None:
+        first, second = FakeConnection(), FakeConnection()
+        outcomes: list = [first, OSError("connection refused"), second]
+
+        async def connect(_dsn: str) -> FakeConnection:
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        monkeypatch.setattr(asyncpg, "connect", connect)
+        bus = PostgresInvalidationBus(
+            "postgresql://localhost/test",
+            "cache_invalidation",
+            flush_interval_seconds=0.0,
+            reconnect_initial_seconds=0.0,
+        )
+        cache = BalanceCache(max_entries=10, max_accounts_per_user=10, ttl_seconds=60.0, bus=bus)
+        index = OwnershipIndex(max_accounts=10, bus=bus)
+        flights = SingleFlight(window_seconds=60.0)
+        bus.subscribe_reset(flights.clear)
+
+        async def load() -> str:
+            return "cached"
+
+        await bus.listen("account_events", lambda _payload: None)
+        await bus.start()
+        try:
+            assert first.channels == [bus.channel, "account_events"]
+            cache.put(BalanceSnapshot(1, 7, Decimal("10.00"), 1))
+            index.add_account(1, 7)
+            await flights.run((CoalescingScopes.USER_ACCOUNTS, 7), "page", load)
+
+            first.terminate()
+            reconnector = bus._reconnector
+            bus.enqueue([InvalidationMessage("user", 7, origin=bus.origin)])
+            assert await bus.flush() == 0
+            await reconnector
+
+            assert second.channels == [bus.channel, "account_events"]
+            assert bus.reconnects == 1 and not outcomes
+            assert cache.get(1) is None
+            assert not index.has_user(7) and index.owner_of(1) is None
+            await flights.run((CoalescingScopes.USER_ACCOUNTS, 7), "page", load)
+            assert flights.executed == 2
+
+            await bus.flush()
+            assert [item["i"] for p in second.payloads for item in json.loads(p)] == [7]
+        finally:
+            await bus.stop()
+        assert second.closed
@@ -0,0 +1,184 @@
+"""Тесты объединения одинаковых одновременных чтений."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache import SingleFlight
+from app.crud.accounts import CRUDAccount
+from app.crud.users import CRUDUser
+from app.db.session import QueryCounter
+from app.services.accounts import AccountService
+from tests.constants import TestUserData, TestValidationData
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSingleFlight:
+    """Тесты реестра single-flight."""
+
+    @pytest.mark.asyncio()
+    async def test_concurrent_calls_share_one_load(self) -> None:
+        flights = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def load() -> int:
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return 42
+
+        tasks = [asyncio.create_task(flights.run("s", 1, load)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(*tasks) == [42] * 5
+        assert calls == 1
+        assert flights.stats() == {"executed": 1, "coalesced": 4, "reused": 0, "saved": 4}
+
+    @pytest.mark.asyncio()
+    async def test_error_is_shared(self) -> None:
+        flights = SingleFlight()
+        release = asyncio.Event()
+
+        async def load() -> int:
+            await release.wait()
+            raise LookupError("boom")
+
+        tasks = [asyncio.create_task(flights.run("s", 1, load)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(result, LookupError) for result in results)
+        assert flights.executed == 1
+
+    @pytest.mark.asyncio()
+    async def test_cancelled_leader_hands_over(self) -> None:
+        flights = SingleFlight()
+        started = asyncio.Event()
+        calls = 0
+
+        async def load() -> int:
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                started.set()
+                await asyncio.Event().wait()
+            return calls
+
+        leader = asyncio.create_task(flights.run("s", 1, load))
+        await started.wait()
+        follower = asyncio.create_task(flights.run("s", 1, load))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == 2
+        assert leader.cancelled()
+
+    @pytest.mark.asyncio()
+    async def test_window_reuses_result_until_expired_or_forgotten(self) -> None:
+        clock = FakeClock()
+        flights = SingleFlight(window_seconds=1.0, clock=clock)
+        calls = 0
+
+        async def load() -> int:
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flights.run("s", 1, load) == 1
+        assert await flights.run("s", 1, load) == 1
+        clock.now = 1.0
+        assert await flights.run("s", 1, load) == 2
+        flights.forget("s")
+        assert await flights.run("s", 1, load) == 3
+        assert flights.reused == 1
+
+    @pytest.mark.asyncio()
+    async def test_forget_during_flight_skips_window(self) -> None:
+        flights = SingleFlight(window_seconds=60.0)
+        release = asyncio.Event()
+
+        async def load() -> str:
+            await release.wait()
+            return "stale"
+
+        task = asyncio.create_task(flights.run("s", 1, load))
+        await asyncio.sleep(0)
+        flights.forget("s")
+        release.set()
+        assert await task == "stale"
+
+        async def fresh() -> str:
+            return "fresh"
+
+        assert await flights.run("s", 1, fresh) == "fresh"
+
+
+class TestCoalescedReads:
+    """Объединение чтений в CRUD и сервисе счетов."""
+
+    @pytest.mark.asyncio()
+    async def test_get_coalesced_gives_each_session_its_own_instance(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], query_counter: QueryCounter
+    ) -> None:
+        users = CRUDUser()
+        async with test_sessionmaker() as db:
+            user = await users.create(
+                db,
+                email=TestUserData.USER1_EMAIL,
+                full_name=TestValidationData.TEST_USER_FULL_NAME,
+                password=TestUserData.SECURE_PASSWORD_123,
+            )
+            await db.commit()
+
+        flights = SingleFlight()
+        async with test_sessionmaker() as db1, test_sessionmaker() as db2:
+            query_counter.clear()
+            first, second = await asyncio.gather(
+                users.get_coalesced(db1, user.id, flights),
+                users.get_coalesced(db2, user.id, flights),
+            )
+
+            assert len(query_counter) == 1
+            assert first is not second
+            assert first in db1 and second in db2
+            assert second.email == TestUserData.USER1_EMAIL
+            assert not db2.dirty
+
+    @pytest.mark.asyncio()
+    async def test_account_listing_is_shared_and_invalidated(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], query_counter: QueryCounter
+    ) -> None:
+        flights = SingleFlight(window_seconds=60.0)
+        service = AccountService(CRUDAccount(), CRUDUser(), flights=flights)
+        async with test_sessionmaker() as db:
+            user = await CRUDUser().create(
+                db,
+                email=TestUserData.USER1_EMAIL,
+                full_name=TestValidationData.TEST_USER_FULL_NAME,
+                password=TestUserData.SECURE_PASSWORD_123,
+            )
+            await db.commit()
+            await service.create_account_for_user(db, user.id)
+
+            query_counter.clear()
+            first = await service.get_user_accounts(db, user.id)
+            second = await service.get_user_accounts(db, user.id)
+            assert len(query_counter) == 1  # пользователь уже в загрузчике сессии
+            assert first is second
+            assert flights.reused == 1
+
+            await service.create_account_for_user(db, user.id)
+            assert len(await service.get_user_accounts(db, user.id)) == 2
@@ -0,0 +1,191 @@
+"""Тесты индекса владения счетами."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache import OwnershipIndex, build_ownership_index
+from app.cache.bus import InvalidationMessage
+from app.core.errors import NotFoundError
+from app.crud.accounts import CRUDAccount
+from app.crud.payments import CRUDPayment
+from app.crud.users import CRUDUser
+from app.services.users import UserService
+from app.services.webhook import WebhookService
+from app.validators.async_ import UserAsyncValidator
+from tests.constants import TestUserData, TestValidationData
+
+
+async def create_user(
+    db: AsyncSession, users: CRUDUser, email: str = TestUserData.TEST_EMAIL_GENERIC
+):
+    user = await users.create(
+        db,
+        email=email,
+        full_name=TestValidationData.TEST_USER_FULL_NAME,
+        password=TestUserData.SECURE_PASSWORD_123,
+    )
+    await db.commit()
+    return user
+
+
+class TestOwnershipIndex:
+    """Тесты процессного индекса владения."""
+
+    def test_positive_answers_only(self) -> None:
+        index = OwnershipIndex(max_accounts=10)
+        index.add_account(1, 7)
+
+        assert index.owner_of(1) == 7
+        assert index.owner_of(2) is None
+        assert index.has_user(7)
+        assert not index.has_user(8)
+        assert (index.hits, index.misses) == (2, 2)
+
+    def test_remove_user_drops_accounts(self) -> None:
+        index = OwnershipIndex(max_accounts=10)
+        index.add_account(1, 7)
+        index.add_account(2, 7)
+        index.add_account(3, 8)
+
+        index.remove_user(7)
+
+        assert not index.has_user(7)
+        assert index.owner_of(1) is None
+        assert index.owner_of(3) == 8
+        assert len(index) == 1
+
+        index.remove_user(7)
+        index.add_account(1, 7)
+        index.remove_user(7)
+        assert len(index) == 1
+
+    def test_account_deleted_message_drops_account(self) -> None:
+        index = OwnershipIndex(max_accounts=10)
+        index.add_account(1, 7)
+        index.add_account(2, 7)
+
+        index.apply_message(InvalidationMessage('account_deleted', 2, user_id=7))
+        index.remove_account(3)
+
+        assert index.owner_of(1) == 7
+        assert index.owner_of(2) is None
+        assert index.has_user(7)
+        assert len(index) == 1
+
+    def test_capacity_limit(self) -> None:
+        index = OwnershipIndex(max_accounts=1)
+        index.add_account(1, 7)
+        index.add_account(2, 7)
+
+        assert index.owner_of(2) is None
+        assert index.has_user(7)
+
+    def test_build_disabled_by_default(self, test_settings) -> None:
+        assert build_ownership_index(test_settings) is None
+        enabled = test_settings.model_copy(update={'ownership_index_enabled': True})
+        assert isinstance(build_ownership_index(enabled), OwnershipIndex)
+
+    @pytest.mark.asyncio()
+    async def test_warm_streams_users_and_accounts(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        users, accounts = CRUDUser(), CRUDAccount()
+        async with test_sessionmaker() as db:
+            owner = await create_user(db, users)
+            idle = await create_user(db, users, TestUserData.USER2_EMAIL)
+            account = await accounts.create_for_user(db, owner.id)
+            await db.commit()
+
+        index = OwnershipIndex(max_accounts=10)
+        await index.warm(test_sessionmaker, batch_size=1)
+
+        assert index.owner_of(account.id) == owner.id
+        assert index.has_user(idle.id)
+
+        index.remove_user(owner.id)
+        assert index.owner_of(account.id) is None
+        assert len(index) == 0
+
+
+class TestOwnershipIndexServices:
+    """Проверки владения без запросов к БД в сервисах."""
+
+    @pytest.mark.asyncio()
+    async def test_webhook_skips_user_lookup_for_known_user(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        index = OwnershipIndex(max_accounts=10)
+        users, accounts, payments = CRUDUser(), CRUDAccount(), CRUDPayment()
+        validator = UserAsyncValidator(users, index)
+        service = WebhookService(accounts, payments, validator, ownership=index)
+
+        async with test_sessionmaker() as db:
+            user = await create_user(db, users)
+            index.add_user(user.id)
+            validator.get_user_or_error = AsyncMock()
+
+            payment = await service.process_topup(
+                db,
+                transaction_id='own-tx-1',
+                account_id=0,
+                user_id=user.id,
+                amount=Decimal('5.00'),
+            )
+
+        validator.get_user_or_error.assert_not_awaited()
+        assert index.owner_of(payment.account_id) == user.id
+
+    @pytest.mark.asyncio()
+    async def test_webhook_foreign_account_skips_lookup(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        index = OwnershipIndex(max_accounts=10)
+        users, accounts, payments = CRUDUser(), CRUDAccount(), CRUDPayment()
+        service = WebhookService(
+            accounts, payments, UserAsyncValidator(users, index), ownership=index
+        )
+
+        async with test_sessionmaker() as db:
+            owner = await create_user(db, users)
+            other = await create_user(db, users, TestUserData.USER2_EMAIL)
+            foreign = await accounts.create_for_user(db, owner.id)
+            await db.commit()
+            index.add_account(foreign.id, owner.id)
+            index.add_user(other.id)
+            accounts.get_for_user = AsyncMock()
+
+            payment = await service.process_topup(
+                db,
+                transaction_id='own-tx-2',
+                account_id=foreign.id,
+                user_id=other.id,
+                amount=Decimal('5.00'),
+            )
+
+        accounts.get_for_user.assert_not_awaited()
+        assert payment.account_id != foreign.id
+
+    @pytest.mark.asyncio()
+    async def test_delete_user_forgets_ownership(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        index = OwnershipIndex(max_accounts=10)
+        users, accounts = CRUDUser(), CRUDAccount()
+        service = UserService(users, ownership=index)
+
+        async with test_sessionmaker() as db:
+            user = await create_user(db, users)
+            account = await accounts.create_for_user(db, user.id)
+            await db.commit()
+            index.add_account(account.id, user.id)
+
+            await service.delete_user(db, user.id)
+
+            assert index.owner_of(account.id) is None
+            with pytest.raises(NotFoundError):
+                await service.user_validator.assert_user_exists(db, user.id)
@@ -6,22 +6,34 @@
 - фабрику FastAPI-приложения
 - HTTP-клиент для интеграционных тестов
 - фикстуры для performance тестов с pytest-postgresql
+- детектор блокировок цикла событий для async-тестов (по выбору)
 """
 
 from __future__ import annotations
 
+import asyncio
+import inspect
 from collections.abc import AsyncGenerator
 from pathlib import Path
-from typing import AsyncIterator
+from typing import AsyncIterator, Iterator
 
 import pytest
 import pytest_asyncio
 from fastapi import FastAPI
-from httpx import ASGITransport, AsyncClient
+from httpx import ASGITransport, AsyncClient, Response
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.core.config import Settings, get_settings
-from app.db.session import get_db_session
+from app.core.container import ServiceContainer
+from app.core.constants import QueryBudgets
+from app.core.loop_monitor import EventLoopMonitor
+from app.db.session import (
+    QueryCounter,
+    count_queries,
+    get_db_session,
+    install_query_counter,
+    install_sqlite_foreign_keys,
+)
 from app.models import account as _account_model  # noqa: F401
 from app.models import payment as _payment_model  # noqa: F401
 
@@ -52,6 +64,8 @@ async def test_sessionmaker(test_db_url: str) -> async_sessionmaker[AsyncSession
         echo=False,
         future=True,
     )
+    install_query_counter(engine)
+    install_sqlite_foreign_keys(engine)
 
     sessionmaker = async_sessionmaker(
         engine,
@@ -76,6 +90,36 @@ async def test_sessionmaker(test_db_url: str) -> async_sessionmaker[AsyncSession
     await engine.dispose()
 
 
+@pytest.fixture()
+def query_counter() -> Iterator[QueryCounter]:
+    """Счётчик SQL-выражений, выполненных в тесте.
+
+    Тест очищает счётчик перед проверяемой операцией и сравнивает его длину
+    с минимально необходимым числом запросов.
+
+    Yields:
+        QueryCounter: Счётчик выражений (`statements` — по порядку).
+    """
+    with count_queries() as counter:
+        yield counter
+
+
+async def enforce_query_budget(response: Response) -> None:
+    """Проваливает тест, если маршрут превысил объявленный бюджет SQL-выражений.
+
+    Args:
+        response: Ответ тестового клиента.
+    """
+    budget = response.headers.get(QueryBudgets.BUDGET_HEADER)
+    if budget is None:
+        return
+    count = int(response.headers[QueryBudgets.COUNT_HEADER])
+    assert count <= int(budget), (
+        f'{response.request.method} {response.request.url.path}: '
+        f'{count} SQL-выражений при бюджете {budget}'
+    )
+
+
 @pytest.fixture()
 def test_settings(test_db_url: str) -> Settings:  # type: ignore[name-defined]
     """Создать настройки для тестов.
@@ -138,7 +182,8 @@ async def app(
 ) -> FastAPI:  # type: ignore[name-defined]
     """Создать экземпляр тестового FastAPI приложения с переопределённой БД.
 
-    Переопределяет `get_db_session` и `get_settings` для использования тестовых значений.
+    Переопределяет `get_db_session` и `get_settings` и пересобирает контейнер
+    зависимостей приложения с тестовыми настройками.
     Устанавливает необходимые переменные окружения до импорта приложения.
 
     Args:
@@ -157,6 +202,8 @@ async def app(
     monkeypatch.setenv('JWT_SECRET', TestUserData.JWT_SECRET_TEST)
     monkeypatch.setenv('WEBHOOK_SECRET_KEY', TestUserData.TEST_WEBHOOK_SECRET)
     monkeypatch.setenv('CORS_ORIGINS', TestValidationData.CORS_WILDCARD)
+    # Режим отладки включает заголовки с числом SQL-выражений (проверка бюджетов)
+    monkeypatch.setenv('DEBUG', 'true')
 
     # Создаём приложение ПОСЛЕ установки окружения
     # Импорт и создание приложения выполняем ПОСЛЕ установки окружения
@@ -173,6 +220,7 @@ async def app(
 
     application.dependency_overrides[get_db_session] = override_get_db_session
     application.dependency_overrides[get_settings] = override_get_settings
+    application.state.container = ServiceContainer.build(test_settings, test_sessionmaker)
     return application
 
 
@@ -187,10 +235,54 @@ async def client(app: FastAPI) -> AsyncIterator[AsyncClient]:
         AsyncClient: HTTP-клиент.
     """
     transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url='http://test') as ac:
+    async with AsyncClient(
+        transport=transport,
+        base_url='http://test',
+        event_hooks={'response': [enforce_query_budget]},
+    ) as ac:
         yield ac
 
 
+# === Детектор блокировок цикла событий ===
+
+
+@pytest_asyncio.fixture()
+async def loop_monitor(request: pytest.FixtureRequest) -> AsyncIterator[EventLoopMonitor]:
+    """Следит за циклом событий во время теста и проваливает его при блокировке.
+
+    Подключается к async-тестам с маркером `loop_monitor` или ко всем async-тестам
+    при запуске с `--loop-monitor`. Порог задаёт `--loop-monitor-threshold-ms`.
+
+    Args:
+        request: Запрос фикстуры pytest.
+
+    Yields:
+        EventLoopMonitor: Запущенный монитор цикла событий.
+    """
+    threshold = request.config.getoption('--loop-monitor-threshold-ms') / 1000
+    monitor = EventLoopMonitor(
+        interval_seconds=threshold / 4,
+        threshold_seconds=threshold,
+        report_interval_seconds=3600.0,
+        top_sites=5,
+    )
+    monitor.start()
+    yield monitor
+    # Последний замер приписывает задержку захваченному месту
+    await asyncio.sleep(monitor.interval_seconds * 2)
+    await monitor.stop()
+    sites = monitor.blocking_sites()
+    if sites:
+        pytest.fail(
+            'Тест заблокировал цикл событий:\n'
+            + '\n'.join(
+                f'{site.site} (раз: {site.count}, макс. {site.max_ms:.1f} мс)\n{site.stack}'
+                for site in sites
+            ),
+            pytrace=False,
+        )
+
+
 # === Фикстуры для performance тестов с pytest-postgresql ===
 
 
@@ -237,6 +329,7 @@ async def performance_sessionmaker(postgresql):
         pool_recycle=1800,
         isolation_level='READ_COMMITTED',
     )
+    install_query_counter(perf_engine)
 
     sessionmaker = async_sessionmaker(
         perf_engine,
@@ -252,10 +345,36 @@ async def performance_sessionmaker(postgresql):
 
 
 @pytest_asyncio.fixture(scope='function')
-async def performance_app(performance_sessionmaker):
+async def migrated_sessionmaker(performance_sessionmaker, monkeypatch: pytest.MonkeyPatch):
+    """Sessionmaker PostgreSQL со схемой из миграций Alembic (секции, триггеры, ключи)."""
+    from alembic import command
+    from alembic.config import Config
+
+    from app.models import Base
+    from tests.constants import TestUserData
+
+    engine = performance_sessionmaker.kw['bind']
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+    monkeypatch.setenv('DATABASE_URL', engine.url.render_as_string(hide_password=False))
+    monkeypatch.setenv('JWT_SECRET', TestUserData.JWT_SECRET_TEST)
+    monkeypatch.setenv('WEBHOOK_SECRET_KEY', TestUserData.TEST_WEBHOOK_SECRET)
+    config = Config()
+    config.set_main_option('script_location', str(Path(__file__).parent.parent / 'alembic'))
+    # env.py запускает миграции в собственном цикле событий
+    await asyncio.to_thread(command.upgrade, config, 'head')
+
+    yield performance_sessionmaker
+
+
+@pytest_asyncio.fixture(scope='function')
+async def performance_app(performance_sessionmaker, monkeypatch: pytest.MonkeyPatch):
     """Создает тестовое приложение для performance тестов."""
     from app.main import create_app
 
+    monkeypatch.setenv('DEBUG', 'true')
+
     # Создаем копию приложения без lifespan для тестов
     test_app = create_app()
 
@@ -273,7 +392,11 @@ async def performance_app(performance_sessionmaker):
 async def performance_client(performance_app):
     """HTTP-клиент для performance тестов."""
     transport = ASGITransport(app=performance_app)
-    async with AsyncClient(transport=transport, base_url='http://test') as ac:
+    async with AsyncClient(
+        transport=transport,
+        base_url='http://test',
+        event_hooks={'response': [enforce_query_budget]},
+    ) as ac:
         yield ac
 
 
@@ -316,6 +439,7 @@ async def clean_database(performance_sessionmaker, setup_test_database):
 
             # Очищаем таблицы в правильном порядке (сначала payments, потом accounts, потом users)
             await session.execute(text('DELETE FROM payments'))
+            await session.execute(text('DELETE FROM debits'))
             await session.execute(text('DELETE FROM accounts'))
             await session.execute(text('DELETE FROM users'))
             await session.commit()
@@ -409,12 +533,31 @@ def performance_metrics():
     }
 
 
+def pytest_addoption(parser):
+    """Опции запуска тестов."""
+    parser.addoption(
+        '--loop-monitor',
+        action='store_true',
+        default=False,
+        help='проваливать async-тесты, заблокировавшие цикл событий',
+    )
+    parser.addoption(
+        '--loop-monitor-threshold-ms',
+        type=float,
+        default=100.0,
+        help='задержка цикла событий, после которой тест считается блокирующим',
+    )
+
+
 def pytest_configure(config):
     """Конфигурация pytest."""
     # Регистрируем кастомные маркеры
     config.addinivalue_line('markers', 'performance: marks tests as performance tests')
     config.addinivalue_line('markers', 'slow: marks tests as slow tests')
     config.addinivalue_line('markers', 'stress: marks tests as stress tests')
+    config.addinivalue_line(
+        'markers', 'loop_monitor: fails the async test if it blocks the event loop'
+    )
 
 
 def pytest_collection_modifyitems(config, items):
@@ -427,3 +570,13 @@ def pytest_collection_modifyitems(config, items):
         # Добавляем маркер slow для performance тестов
         if 'performance' in str(item.fspath):
             item.add_marker(pytest.mark.slow)
+
+        # Детектор блокировок цикла событий для async-тестов
+        monitored = config.getoption('--loop-monitor') or item.get_closest_marker('loop_monitor')
+        function = getattr(item, 'function', None)
+        if (
+            monitored
+            and inspect.iscoroutinefunction(function)
+            and 'loop_monitor' not in item.fixturenames
+        ):
+            item.fixturenames.append('loop_monitor')
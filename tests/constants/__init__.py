@@ -7,6 +7,7 @@ from .api_paths import (
     TestAuthPaths,
     TestHealthPaths,
     TestPaymentsPaths,
+    TestProfilingPaths,
     TestUsersPaths,
     TestWebhookPaths,
 )
@@ -49,6 +50,7 @@ __all__ = [
     "TestAccountsPaths",
     "TestPaymentsPaths",
     "TestHealthPaths",
+    "TestProfilingPaths",
     "TestRegexPatterns",
     "TestFieldConstraints",
     "TestUserData",
@@ -12,6 +12,7 @@ from app.core.constants import (
     AuthPaths,
     HealthPaths,
     PaymentsPaths,
+    ProfilingPaths,
     UsersPaths,
     WebhookPaths,
 )
@@ -47,3 +48,7 @@ class TestPaymentsPaths(PaymentsPaths):
 
 class TestWebhookPaths(WebhookPaths):
     """Пути для webhook-эндпойнтов в тестах."""
+
+
+class TestProfilingPaths(ProfilingPaths):
+    """Константы API профилирования запросов для тестов."""
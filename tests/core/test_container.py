@@ -0,0 +1,126 @@
+"""Тесты контейнера зависимостей и бенчмарк разрешения зависимостей."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.config import Settings
+from app.core.container import ServiceContainer
+from app.core.deps import get_app_settings, get_webhook_service
+from app.crud.accounts import CRUDAccount, crud_account
+from app.crud.payments import CRUDPayment, crud_payment
+from app.crud.users import CRUDUser, crud_user
+from app.services.webhook import WebhookService
+from app.validators.async_ import UserAsyncValidator
+
+
+BENCH_REQUESTS = 300
+
+
+class TestServiceContainer:
+    """Контейнер собирается один раз и раздаёт общие экземпляры."""
+
+    def test_build_wires_singletons(self, test_settings: Settings) -> None:
+        container = ServiceContainer.build(test_settings)
+
+        assert container.settings is test_settings
+        assert container.users_crud is crud_user
+        assert container.webhook_service.accounts_crud is crud_account
+        assert container.webhook_service.user_validator is container.user_validator
+        assert container.auth_service.settings is test_settings
+        assert container.balance_cache is None
+        assert container.route_limits is None
+
+    def test_cache_shared_between_services(self, test_settings: Settings) -> None:
+        settings = test_settings.model_copy(update={"balance_cache_enabled": True})
+        container = ServiceContainer.build(settings)
+
+        assert container.balance_cache is not None
+        assert container.account_service.balance_cache is container.balance_cache
+        assert container.webhook_service.balance_cache is container.balance_cache
+        assert container.user_service.balance_cache is container.balance_cache
+
+    @pytest.mark.asyncio()
+    async def test_providers_return_container_instances(self, app: FastAPI) -> None:
+        container = app.state.container
+
+        @app.get("/_container_probe")
+        async def probe(
+            service: WebhookService = Depends(get_webhook_service),
+            settings: Settings = Depends(get_app_settings),
+        ) -> dict:
+            return {
+                "service": service is container.webhook_service,
+                "settings": settings is container.settings,
+            }
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            first = (await client.get("/_container_probe")).json()
+            second = (await client.get("/_container_probe")).json()
+
+        assert first == second == {"service": True, "settings": True}
+
+
+# Цепочка провайдеров в прежнем виде: синхронные `def`, объект сервиса на запрос
+def legacy_user_crud() -> CRUDUser:
+    return crud_user
+
+
+def legacy_account_crud() -> CRUDAccount:
+    return crud_account
+
+
+def legacy_payment_crud() -> CRUDPayment:
+    return crud_payment
+
+
+def legacy_user_validator(users: CRUDUser = Depends(legacy_user_crud)) -> UserAsyncValidator:
+    return UserAsyncValidator(users)
+
+
+def legacy_webhook_service(
+    accounts: CRUDAccount = Depends(legacy_account_crud),
+    payments: CRUDPayment = Depends(legacy_payment_crud),
+    validator: UserAsyncValidator = Depends(legacy_user_validator),
+) -> WebhookService:
+    return WebhookService(accounts, payments, validator)
+
+
+@pytest.mark.stress()
+class TestDependencyResolutionBenchmark:
+    """Бенчмарк накладных расходов DI на маршрут (без работы с БД)."""
+
+    @pytest.mark.asyncio()
+    async def test_container_providers_faster_than_threadpool_chain(
+        self, test_settings: Settings
+    ) -> None:
+        bench_app = FastAPI()
+        bench_app.state.container = ServiceContainer.build(test_settings)
+
+        @bench_app.get("/legacy")
+        async def legacy(service: WebhookService = Depends(legacy_webhook_service)) -> None:
+            return None
+
+        @bench_app.get("/container")
+        async def container(service: WebhookService = Depends(get_webhook_service)) -> None:
+            return None
+
+        transport = ASGITransport(app=bench_app)
+        timings = {}
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            for path in ("/legacy", "/container"):
+                await client.get(path)
+                start = time.perf_counter()
+                for _ in range(BENCH_REQUESTS):
+                    await client.get(path)
+                timings[path] = (time.perf_counter() - start) / BENCH_REQUESTS
+
+        assert timings["/container"] < timings["/legacy"], (
+            f"DI на запрос: threadpool-цепочка {timings['/legacy'] * 1e6:.0f} мкс, "
+            f"контейнер {timings['/container'] * 1e6:.0f} мкс"
+        )
@@ -92,7 +92,7 @@ class TestDeps:
 
         async with test_sessionmaker() as db:
             with pytest.raises(HTTPException) as exc_info:
-                await get_current_user(db, token, settings)
+                await get_current_user(db, token, settings, None)
             assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
 
     @pytest.mark.asyncio()
@@ -129,7 +129,8 @@ class TestDeps:
         assert exc_info.value.status_code == status.HTTP_403_FORBIDDEN
         assert TestErrorMessages.FORBIDDEN in exc_info.value.detail
 
-    def test_require_self_or_admin_user_owner_access(self) -> None:
+    @pytest.mark.asyncio()
+    async def test_require_self_or_admin_user_owner_access(self) -> None:
         """Владелец имеет доступ к своему ресурсу."""
         user = User(
             id=TestDomainIds.TEST_USER_ID,
@@ -139,9 +140,10 @@ class TestDeps:
             is_admin=False,
         )
 
-        require_self_or_admin_user(TestDomainIds.TEST_USER_ID, user)
+        await require_self_or_admin_user(TestDomainIds.TEST_USER_ID, user)
 
-    def test_require_self_or_admin_user_admin_access(self) -> None:
+    @pytest.mark.asyncio()
+    async def test_require_self_or_admin_user_admin_access(self) -> None:
         """Администратор имеет доступ к чужому ресурсу."""
         admin = User(
             id=TestDomainIds.TEST_USER_ID,
@@ -151,9 +153,10 @@ class TestDeps:
             is_admin=True,
         )
 
-        require_self_or_admin_user(TestDomainIds.NONEXISTENT_USER_ID, admin)
+        await require_self_or_admin_user(TestDomainIds.NONEXISTENT_USER_ID, admin)
 
-    def test_require_self_or_admin_user_forbidden(self) -> None:
+    @pytest.mark.asyncio()
+    async def test_require_self_or_admin_user_forbidden(self) -> None:
         """Обычному пользователю запрещён доступ к чужому ресурсу."""
         user = User(
             id=TestDomainIds.TEST_USER_ID,
@@ -164,6 +167,6 @@ class TestDeps:
         )
 
         with pytest.raises(HTTPException) as exc_info:
-            require_self_or_admin_user(TestDomainIds.NONEXISTENT_USER_ID, user)
+            await require_self_or_admin_user(TestDomainIds.NONEXISTENT_USER_ID, user)
         assert exc_info.value.status_code == status.HTTP_403_FORBIDDEN
         assert TestErrorMessages.ACCESS_DENIED in exc_info.value.detail
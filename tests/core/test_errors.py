@@ -2,20 +2,44 @@
 
 from __future__ import annotations
 
+import time
+from typing import Iterator
+
+import pytest
 from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
 
+from app.core import errors as errors_module
 from app.core.errors import (
     AuthError,
     DomainError,
+    DuplicateTransactionError,
     ForbiddenError,
     NotFoundError,
     ServiceUnavailableError,
     ValidationError,
+    register_domain_error,
+    resolve_error_spec,
+    to_error_response,
     to_http_exc,
 )
 from tests.constants import TestErrorMessages, TestFieldConstraints, TestValidationData
 
 
+# Сколько раз повторяется набор из пяти ошибок в бенчмарке потока ошибок
+ERROR_FLOOD_ROUNDS = 1000
+
+
+@pytest.fixture()
+def error_registry() -> Iterator[None]:
+    """Восстанавливает глобальный реестр доменных ошибок после теста."""
+    registry = dict(errors_module._registry)
+    yield
+    errors_module._registry.clear()
+    errors_module._registry.update(registry)
+    errors_module._resolved.clear()
+
+
 class TestDomainErrors:
     """Тесты для доменных исключений."""
 
@@ -198,3 +222,85 @@ class TestToHttpExc:
         assert http_exc.status_code == status.HTTP_400_BAD_REQUEST
         assert http_exc.detail == TestValidationData.VALIDATION_FAILED_MESSAGE
         assert error.__cause__ is cause
+
+
+class TestErrorRegistry:
+    """Тесты табличного маппинга доменных ошибок."""
+
+    def test_subclass_inherits_parent_status(self) -> None:
+        """Наследник зарегистрированной ошибки получает статус предка по MRO."""
+
+        class AccountNotFoundError(NotFoundError):
+            pass
+
+        spec = resolve_error_spec(AccountNotFoundError)
+
+        assert spec.status_code == status.HTTP_404_NOT_FOUND
+        assert spec.default_detail == TestErrorMessages.NOT_FOUND
+
+    def test_register_custom_error(self, error_registry: None) -> None:
+        """Новый тип ошибки регистрирует собственный статус."""
+
+        @register_domain_error(
+            status.HTTP_429_TOO_MANY_REQUESTS, TestValidationData.CUSTOM_ERROR_MESSAGE
+        )
+        class TooManyRequestsError(DomainError):
+            pass
+
+        http_exc = to_http_exc(TooManyRequestsError())
+
+        assert http_exc.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert http_exc.detail == TestValidationData.CUSTOM_ERROR_MESSAGE
+
+    def test_registration_invalidates_resolved_cache(self, error_registry: None) -> None:
+        """Регистрация после первого разрешения перекрывает закэшированный статус предка."""
+
+        class LateError(ValidationError):
+            pass
+
+        assert resolve_error_spec(LateError).status_code == status.HTTP_400_BAD_REQUEST
+
+        register_domain_error(status.HTTP_409_CONFLICT, TestErrorMessages.INVALID_PARAMS)(LateError)
+
+        assert resolve_error_spec(LateError).status_code == status.HTTP_409_CONFLICT
+
+    def test_error_response_matches_json_response(self) -> None:
+        """Предкодированное тело совпадает с сериализацией JSONResponse."""
+        error = DuplicateTransactionError()
+
+        response = to_error_response(error)
+        expected = JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={"detail": TestErrorMessages.TRANSACTION_ALREADY_PROCESSED},
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.body == expected.body
+        assert response.media_type == expected.media_type
+
+    def test_error_response_reuses_encoded_body(self) -> None:
+        """Тело ответа для одинакового сообщения кодируется один раз."""
+        first = to_error_response(NotFoundError(TestErrorMessages.USER_NOT_FOUND))
+        second = to_error_response(NotFoundError(TestErrorMessages.USER_NOT_FOUND))
+
+        assert first.body is second.body
+
+    @pytest.mark.stress()
+    def test_error_response_flood_throughput(self) -> None:
+        """Бенчмарк: построение ответов при потоке ошибок разных типов."""
+        errors = [
+            NotFoundError(),
+            ForbiddenError(),
+            AuthError(TestErrorMessages.INVALID_CREDENTIALS),
+            ValidationError(TestErrorMessages.INVALID_SIGNATURE),
+            DuplicateTransactionError(),
+        ] * ERROR_FLOOD_ROUNDS
+
+        start = time.perf_counter()
+        for error in errors:
+            to_error_response(error)
+        elapsed = time.perf_counter() - start
+
+        errors_per_second = len(errors) / elapsed
+        print(f"Ответов на доменные ошибки в секунду: {errors_per_second:.0f}")
+        assert errors_per_second > 10_000, f"Только {errors_per_second:.0f} ответов в секунду"
@@ -0,0 +1,191 @@
+"""Тесты ограничения частоты запросов и сброса нагрузки."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI, status
+from httpx import AsyncClient
+
+from app.core.config import Settings
+from app.core.constants import LimitScopes, RouteLimitNames
+from app.core.errors import OverloadedError, RateLimitedError
+from app.core.limits import (
+    ConcurrencyLimiter,
+    RouteLimits,
+    RoutePolicy,
+    TokenBucketLimiter,
+    build_route_limits,
+)
+from app.utils.crypto import compute_signature
+from tests.constants import (
+    TestAuthPaths,
+    TestDomainIds,
+    TestMonetaryConstants,
+    TestUserData,
+    TestWebhookPaths,
+)
+
+
+class FakeClock:
+    """Управляемые часы для token bucket."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucketLimiter:
+    """Тесты token bucket."""
+
+    def test_burst_then_refill(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucketLimiter(2.0, 3, max_keys=10, clock=clock)
+
+        assert [bucket.acquire("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.acquire("a") == pytest.approx(0.5)
+
+        clock.now = 0.5
+        assert bucket.acquire("a") == 0.0
+
+    def test_keys_are_independent(self) -> None:
+        bucket = TokenBucketLimiter(1.0, 1, max_keys=10, clock=FakeClock())
+        assert bucket.acquire("a") == 0.0
+        assert bucket.acquire("a") > 0
+        assert bucket.acquire("b") == 0.0
+
+    def test_key_count_is_bounded(self) -> None:
+        bucket = TokenBucketLimiter(1.0, 1, max_keys=2, clock=FakeClock())
+        for key in ("a", "b", "c"):
+            bucket.acquire(key)
+        assert len(bucket._buckets) == 2
+
+
+class TestRouteLimits:
+    """Тесты реестра лимитов маршрутов."""
+
+    def test_rate_limited_counts_rejection(self) -> None:
+        limits = RouteLimits(
+            {"r": RoutePolicy(buckets={"ip": TokenBucketLimiter(1.0, 1, max_keys=10)})}
+        )
+        with limits.guard("r", {"ip": "1.1.1.1"}):
+            pass
+        with pytest.raises(RateLimitedError) as exc_info:
+            with limits.guard("r", {"ip": "1.1.1.1"}):
+                pass
+
+        assert LimitScopes.RETRY_AFTER_HEADER in exc_info.value.headers
+        assert limits.stats()["rejections"] == {"r:ip": 1}
+
+    def test_shedder_rejects_when_saturated_and_releases(self) -> None:
+        limits = RouteLimits({"r": RoutePolicy(shedder=ConcurrencyLimiter(1))})
+
+        with limits.guard("r", {}):
+            assert limits.stats()["in_flight"] == {"r": 1}
+            with pytest.raises(OverloadedError):
+                with limits.guard("r", {}):
+                    pass
+
+        assert limits.stats()["in_flight"] == {"r": 0}
+        assert limits.stats()["rejections"] == {"r:overload": 1}
+
+    def test_slot_released_on_error(self) -> None:
+        limits = RouteLimits({"r": RoutePolicy(shedder=ConcurrencyLimiter(1))})
+        with pytest.raises(ValueError):
+            with limits.guard("r", {}):
+                raise ValueError
+        assert limits.policies["r"].shedder.in_flight == 0
+
+    def test_unknown_route_passes(self) -> None:
+        with RouteLimits({}).guard("missing", {"ip": "x"}):
+            pass
+
+    def test_build_from_settings(self, test_settings: Settings) -> None:
+        assert build_route_limits(test_settings) is None
+
+        settings = test_settings.model_copy(
+            update={"rate_limit_enabled": True, "auth_login_email_rate": 0.0}
+        )
+        limits = build_route_limits(settings)
+        login = limits.policies[RouteLimitNames.AUTH_LOGIN]
+        assert set(login.buckets) == {LimitScopes.IP}
+        assert login.shedder.max_in_flight == settings.auth_login_max_in_flight
+
+
+class TestLoginRateLimitApi:
+    """Ограничение логина через API возвращает 429 до проверки пароля."""
+
+    @pytest.mark.asyncio()
+    async def test_login_flood_by_email_gets_429(
+        self, app: FastAPI, client: AsyncClient, test_settings: Settings
+    ) -> None:
+        limits = build_route_limits(
+            test_settings.model_copy(
+                update={
+                    "rate_limit_enabled": True,
+                    "auth_login_email_rate": 0.01,
+                    "auth_login_email_burst": 2,
+                }
+            )
+        )
+        app.state.container = replace(app.state.container, route_limits=limits)
+        path = f"{TestAuthPaths.PREFIX}{TestAuthPaths.LOGIN}"
+        body = {"email": TestUserData.WRONG_EMAIL, "password": TestUserData.WRONG_PASSWORD}
+
+        codes = [(await client.post(path, json=body)).status_code for _ in range(3)]
+        limited = await client.post(path, json=body)
+
+        assert codes[:2] == [status.HTTP_401_UNAUTHORIZED] * 2
+        assert codes[2] == status.HTTP_429_TOO_MANY_REQUESTS
+        assert limited.headers[LimitScopes.RETRY_AFTER_HEADER]
+        assert limits.stats()["rejections"] == {
+            f"{RouteLimitNames.AUTH_LOGIN}:{LimitScopes.EMAIL}": 2
+        }
+
+
+class TestWebhookRateLimitApi:
+    """Ограничение вебхука по IP клиента, а не по заголовкам запроса."""
+
+    @pytest.mark.asyncio()
+    async def test_source_header_does_not_open_new_bucket(
+        self, app: FastAPI, client: AsyncClient, test_settings: Settings
+    ) -> None:
+        limits = build_route_limits(
+            test_settings.model_copy(
+                update={
+                    "rate_limit_enabled": True,
+                    "webhook_source_rate": 0.01,
+                    "webhook_source_burst": 2,
+                }
+            )
+        )
+        app.state.container = replace(app.state.container, route_limits=limits)
+        path = f"{TestWebhookPaths.PREFIX}{TestWebhookPaths.PAYMENT}"
+        payload = {
+            "transaction_id": TestDomainIds.WEBHOOK_TX_1,
+            "user_id": TestDomainIds.NONEXISTENT_USER_ID,
+            "account_id": TestDomainIds.TEST_ACCOUNT_ID,
+            "amount": str(TestMonetaryConstants.AMOUNT_100_00),
+        }
+        payload["signature"] = compute_signature(
+            account_id=payload["account_id"],
+            amount=Decimal(payload["amount"]),
+            transaction_id=payload["transaction_id"],
+            user_id=payload["user_id"],
+            secret_key="forged",
+        )
+
+        codes = [
+            (await client.post(path, json=payload, headers={"X-Webhook-Source": str(i)}))
+            .status_code
+            for i in range(3)
+        ]
+
+        assert codes == [status.HTTP_400_BAD_REQUEST] * 2 + [status.HTTP_429_TOO_MANY_REQUESTS]
+        assert limits.stats()["rejections"] == {
+            f"{RouteLimitNames.WEBHOOK_PAYMENT}:{LimitScopes.SOURCE}": 1
+        }
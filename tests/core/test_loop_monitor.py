@@ -0,0 +1,90 @@
+"""Тесты детектора блокировок цикла событий."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from app.core.loop_monitor import EventLoopMonitor, LagHistogram, build_event_loop_monitor
+
+
+def block_event_loop(seconds: float) -> None:
+    """Синхронная работа, которую детектор должен найти."""
+    time.sleep(seconds)
+
+
+class TestLagHistogram:
+    """Кумулятивная гистограмма задержек."""
+
+    def test_buckets_are_cumulative(self) -> None:
+        histogram = LagHistogram(buckets_ms=(1, 10))
+        for value in (0.5, 5.0, 7.0, 50.0):
+            histogram.observe(value)
+
+        assert histogram.to_dict() == {
+            "buckets": {"1": 1, "10": 3, "+Inf": 4},
+            "count": 4,
+            "sum_ms": 62.5,
+            "max_ms": 50.0,
+        }
+
+
+class TestEventLoopMonitor:
+    """Замер задержек и захват блокирующих вызовов."""
+
+    @pytest.mark.asyncio()
+    async def test_blocking_call_site_is_captured(self, caplog: pytest.LogCaptureFixture) -> None:
+        monitor = EventLoopMonitor(
+            interval_seconds=0.01,
+            threshold_seconds=0.05,
+            report_interval_seconds=60.0,
+            top_sites=5,
+        )
+        monitor.start()
+        await asyncio.sleep(0.05)
+
+        block_event_loop(0.3)
+        await asyncio.sleep(0.05)
+        with caplog.at_level(logging.WARNING, logger="app.core.loop_monitor"):
+            await monitor.stop()
+
+        (site,) = monitor.blocking_sites()
+        assert site.site.startswith("tests/core/test_loop_monitor.py:")
+        assert site.site.endswith("in block_event_loop")
+        assert site.count == 1
+        assert site.max_ms >= 200
+        assert monitor.lag.max_ms >= 200
+        assert monitor.report()["blocking_calls"][0]["site"] == site.site
+        assert "block_event_loop" in caplog.text
+
+    @pytest.mark.asyncio()
+    async def test_idle_loop_records_no_blocking(self) -> None:
+        monitor = EventLoopMonitor(
+            interval_seconds=0.01,
+            threshold_seconds=0.2,
+            report_interval_seconds=60.0,
+            top_sites=5,
+        )
+        monitor.start()
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+
+        assert monitor.lag.count > 0
+        assert monitor.blocking_sites() == []
+
+    @pytest.mark.loop_monitor()
+    @pytest.mark.asyncio()
+    async def test_marked_test_runs_under_monitor(self, request: pytest.FixtureRequest) -> None:
+        assert "loop_monitor" in request.fixturenames
+        monitor = request.getfixturevalue("loop_monitor")
+        await asyncio.sleep(monitor.interval_seconds * 3)
+
+        assert monitor.lag.count > 0
+
+    def test_build_disabled_by_default(self, test_settings) -> None:
+        assert build_event_loop_monitor(test_settings) is None
+        enabled = test_settings.model_copy(update={"loop_monitor_enabled": True})
+        assert isinstance(build_event_loop_monitor(enabled), EventLoopMonitor)
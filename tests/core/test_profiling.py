@@ -0,0 +1,155 @@
+"""Тесты профилировщика запросов."""
+
+from __future__ import annotations
+
+import asyncio
+import cProfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from jose import JWTError, jwt
+
+from app.core.profiling import (
+    ProfileInfo,
+    ProfilingMiddleware,
+    RequestProfiler,
+    build_request_profiler,
+)
+from app.core.security import create_access_token
+from tests.constants import TestUserData
+
+
+def make_profiler(directory: Path, **kwargs) -> RequestProfiler:
+    return RequestProfiler(
+        directory, secret=TestUserData.JWT_SECRET_TEST, algorithm="HS256", **kwargs
+    )
+
+
+def fibonacci(n: int) -> int:
+    """Рекурсивная функция, заметная в профиле."""
+    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+
+def make_info(profile_id: str, created_at: datetime) -> ProfileInfo:
+    return ProfileInfo(
+        id=profile_id,
+        method="GET",
+        path="/api/v1/health",
+        route="/api/v1/health",
+        status_code=200,
+        duration_ms=1.5,
+        trigger="token",
+        created_at=created_at,
+    )
+
+
+class TestProfilingTokens:
+    """Токены профилирования отделены от токенов доступа."""
+
+    def test_token_is_not_interchangeable_with_access_token(self, tmp_path: Path) -> None:
+        profiler = make_profiler(tmp_path)
+        token = profiler.issue_token(1)
+        access = create_access_token(1, TestUserData.JWT_SECRET_TEST, "HS256", 5)
+
+        assert profiler.token_valid(token)
+        assert not profiler.token_valid(access)
+        assert not profiler.token_valid("garbage")
+        with pytest.raises(JWTError):
+            jwt.decode(token, TestUserData.JWT_SECRET_TEST, algorithms=["HS256"])
+
+    def test_expired_token_is_rejected(self, tmp_path: Path) -> None:
+        profiler = make_profiler(tmp_path, token_ttl_seconds=-1)
+
+        assert not profiler.token_valid(profiler.issue_token(1))
+
+    def test_build_respects_enabled_flag(self, test_settings, tmp_path: Path) -> None:
+        assert build_request_profiler(test_settings) is None
+        enabled = test_settings.model_copy(
+            update={"profiling_enabled": True, "profiling_dir": str(tmp_path)}
+        )
+        assert build_request_profiler(enabled).directory == tmp_path
+
+
+class TestProfileStorage:
+    """Сохранение, ротация и чтение профилей."""
+
+    @pytest.mark.asyncio()
+    async def test_top_frames_are_sorted_by_cumulative_time(self, tmp_path: Path) -> None:
+        profiler = make_profiler(tmp_path, top_frames=2)
+        profile = cProfile.Profile()
+        profile.enable()
+        fibonacci(15)
+        profile.disable()
+        await profiler.save(profile, make_info("a" * 32, datetime.now(timezone.utc)))
+
+        info, frames = await profiler.get("a" * 32)
+
+        assert info.route == "/api/v1/health"
+        assert len(frames) == 2
+        cumulative = [frame.cumulative_ms for frame in frames]
+        assert cumulative == sorted(cumulative, reverse=True)
+        (fib,) = [frame for frame in frames if "fibonacci" in frame.function]
+        assert fib.function.startswith("tests/core/test_profiling.py:")
+        assert fib.calls > fib.primitive_calls == 1
+
+    @pytest.mark.asyncio()
+    async def test_oldest_profiles_are_removed(self, tmp_path: Path) -> None:
+        profiler = make_profiler(tmp_path, max_profiles=2)
+        started = datetime.now(timezone.utc)
+        for i, profile_id in enumerate(("1" * 32, "2" * 32, "3" * 32)):
+            profile = cProfile.Profile()
+            await profiler.save(profile, make_info(profile_id, started + timedelta(seconds=i)))
+
+        profiles = await profiler.list_profiles()
+
+        assert [info.id for info in profiles] == ["3" * 32, "2" * 32]
+        assert len(list(tmp_path.iterdir())) == 4
+        assert await profiler.get("1" * 32) is None
+
+    @pytest.mark.asyncio()
+    async def test_profile_id_cannot_escape_directory(self, tmp_path: Path) -> None:
+        profiler = make_profiler(tmp_path / "profiles")
+        (tmp_path / "secret.json").write_text("{}")
+
+        assert await profiler.get("../secret") is None
+
+
+class TestProfilingMiddleware:
+    """Границы профиля запроса."""
+
+    @pytest.mark.asyncio()
+    async def test_streaming_response_frees_profiler_after_headers(self, tmp_path: Path) -> None:
+        profiler = make_profiler(tmp_path, sample_rates={"/events": 1.0})
+        headers_sent = asyncio.Event()
+        close_stream = asyncio.Event()
+
+        async def stream(scope, receive, send) -> None:  # type: ignore[no-untyped-def]
+            headers = [(b"content-type", b"text/event-stream")]
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            headers_sent.set()
+            await close_stream.wait()
+            await send({"type": "http.response.body", "body": b"data: 1\n\n"})
+
+        async def send(message) -> None:  # type: ignore[no-untyped-def]
+            pass
+
+        container = SimpleNamespace(request_profiler=profiler)
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": "/events",
+            "headers": [],
+            "app": SimpleNamespace(state=SimpleNamespace(container=container)),
+        }
+        request = asyncio.create_task(ProfilingMiddleware(stream)(scope, None, send))
+        await headers_sent.wait()
+
+        (info,) = await profiler.list_profiles()
+        assert (info.path, info.status_code) == ("/events", 200)
+        assert profiler.trigger(scope) == "sample"
+
+        close_stream.set()
+        await request
+        assert len(await profiler.list_profiles()) == 1
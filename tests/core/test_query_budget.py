@@ -0,0 +1,68 @@
+"""Тесты подсчёта SQL-выражений и бюджетов маршрутов."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.constants import QueryBudgets
+from app.db.session import count_queries
+from tests.constants import TestApiPrefixes, TestHealthPaths
+
+
+class TestCountQueries:
+    """Счётчик выражений на уровне движка."""
+
+    @pytest.mark.asyncio()
+    async def test_nested_counters(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        async with test_sessionmaker() as db:
+            with count_queries() as outer:
+                await db.execute(text('SELECT 1'))
+                with count_queries() as inner:
+                    await db.execute(text('SELECT 2'))
+                await db.execute(text('SELECT 3'))
+
+        assert len(outer) == 3
+        assert inner.statements == ['SELECT 2']
+
+    @pytest.mark.asyncio()
+    async def test_clear(self, test_sessionmaker: async_sessionmaker[AsyncSession]) -> None:
+        async with test_sessionmaker() as db:
+            with count_queries() as counter:
+                await db.execute(text('SELECT 1'))
+                counter.clear()
+                await db.execute(text('SELECT 2'))
+
+        assert counter.statements == ['SELECT 2']
+
+
+class TestRouteBudgets:
+    """Бюджеты объявлены для всех маршрутов API и попадают в ответ."""
+
+    def test_every_api_route_declares_budget(self, app: FastAPI) -> None:
+        operations = [
+            (method, path, operation)
+            for path, item in app.openapi()['paths'].items()
+            if path.startswith(TestApiPrefixes.API_V1)
+            for method, operation in item.items()
+        ]
+
+        assert operations
+        missing = [
+            (method, path)
+            for method, path, operation in operations
+            if QueryBudgets.OPENAPI_KEY not in operation
+        ]
+        assert missing == []
+
+    @pytest.mark.asyncio()
+    async def test_headers_in_debug_mode(self, client: AsyncClient) -> None:
+        response = await client.get(f"{TestApiPrefixes.API_V1}{TestHealthPaths.HEALTH_DB}")
+
+        assert response.headers[QueryBudgets.BUDGET_HEADER] == str(QueryBudgets.HEALTH_DB)
+        assert int(response.headers[QueryBudgets.COUNT_HEADER]) <= QueryBudgets.HEALTH_DB
@@ -0,0 +1,106 @@
+"""Тесты пакетной загрузки объектов по первичному ключу."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.crud.users import CRUDUser
+from app.db.session import QueryCounter
+from app.models.user import User
+from tests.constants import TestDomainIds, TestUserData, TestValidationData
+
+
+async def create_users(db: AsyncSession, count: int) -> list[User]:
+    users = [
+        await CRUDUser().create(
+            db,
+            email=f"loader{i}@example.com",
+            full_name=TestValidationData.TEST_USER_FULL_NAME,
+            password=TestUserData.SECURE_PASSWORD_123,
+        )
+        for i in range(count)
+    ]
+    await db.commit()
+    return users
+
+
+class TestBatchLoader:
+    """Вызовы одного такта объединяются в один запрос в пределах сессии."""
+
+    @pytest.mark.asyncio()
+    async def test_same_tick_loads_share_one_query(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], query_counter: QueryCounter
+    ) -> None:
+        crud = CRUDUser()
+        async with test_sessionmaker() as db:
+            ids = [user.id for user in await create_users(db, 3)]
+
+        async with test_sessionmaker() as db:
+            query_counter.clear()
+            loaded = await asyncio.gather(
+                *(crud.load(db, obj_id) for obj_id in [*ids, TestDomainIds.NONEXISTENT_USER_ID])
+            )
+
+            assert len(query_counter) == 1
+            assert [user.id for user in loaded[:3]] == ids
+            assert loaded[3] is None
+
+            query_counter.clear()
+            assert await crud.load(db, ids[0]) is loaded[0]
+            assert len(query_counter) == 0
+            assert crud.loader(db).batches == 1
+
+    @pytest.mark.asyncio()
+    async def test_load_many_chunks_and_keeps_order(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], query_counter: QueryCounter
+    ) -> None:
+        crud = CRUDUser()
+        crud.batch_load_size = 2
+        async with test_sessionmaker() as db:
+            ids = [user.id for user in await create_users(db, 5)]
+
+        async with test_sessionmaker() as db:
+            query_counter.clear()
+            loaded = await crud.load_many(db, list(reversed(ids)))
+
+            assert [user.id for user in loaded] == list(reversed(ids))
+            assert len(query_counter) == 3
+
+    @pytest.mark.asyncio()
+    async def test_cache_is_per_session_and_skips_deleted(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        crud = CRUDUser()
+        async with test_sessionmaker() as db:
+            (user,) = await create_users(db, 1)
+
+        async with test_sessionmaker() as db1, test_sessionmaker() as db2:
+            first = await crud.load(db1, user.id)
+            second = await crud.load(db2, user.id)
+            assert first is not second
+            assert crud.loader(db1) is not crud.loader(db2)
+
+            await crud.delete(db1, first)
+            await db1.commit()
+            assert await crud.load(db1, user.id) is None
+
+    @pytest.mark.asyncio()
+    async def test_reloads_after_rollback(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], query_counter: QueryCounter
+    ) -> None:
+        crud = CRUDUser()
+        async with test_sessionmaker() as db:
+            (user,) = await create_users(db, 1)
+
+        async with test_sessionmaker() as db:
+            await crud.load(db, user.id)
+            await db.rollback()
+            query_counter.clear()
+
+            reloaded = await crud.load(db, user.id)
+
+            assert reloaded.email == user.email
+            assert len(query_counter) == 1
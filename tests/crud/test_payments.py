@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
+
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
@@ -50,3 +52,55 @@ class TestPaymentsCRUD:
 
             listed = await payments.list_for_user(db, user.id)
             assert len(listed) == TestNumericConstants.COUNT_SINGLE
+
+    @pytest.mark.asyncio()
+    async def test_period_filters(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        """Платежи читаются за период, заданный по ключу секционирования."""
+        users = CRUDUser()
+        accounts = CRUDAccount()
+        payments = CRUDPayment()
+        now = datetime.now(timezone.utc)
+
+        async with test_sessionmaker() as db:
+            user = await users.create(
+                db,
+                email=TestUserData.PAY_USER_EMAIL,
+                full_name=TestUserData.PAY_USER_FULL_NAME,
+                password=TestUserData.PAY_USER_PASSWORD,
+            )
+            acc = await accounts.create_for_user(db, user.id)
+            old = await payments.create(
+                db,
+                transaction_id=TestDomainIds.TEST_TX_1,
+                user_id=user.id,
+                account_id=acc.id,
+                amount=TestMonetaryConstants.AMOUNT_10_00,
+            )
+            old.created_at = now - timedelta(days=60)
+            recent = await payments.create(
+                db,
+                transaction_id=TestDomainIds.TEST_TX_2,
+                user_id=user.id,
+                account_id=acc.id,
+                amount=TestMonetaryConstants.AMOUNT_10_00,
+            )
+            await db.commit()
+            week_ago = now - timedelta(days=7)
+
+            listed = await payments.list_for_user_paginated(db, user.id, limit=10, offset=0)
+            assert [p.id for p in listed] == [old.id, recent.id]
+            listed = await payments.list_for_user_paginated(
+                db, user.id, limit=10, offset=0, created_from=week_ago
+            )
+            assert [p.id for p in listed] == [recent.id]
+            listed = await payments.list_for_user_paginated(
+                db, user.id, limit=10, offset=0, created_to=week_ago
+            )
+            assert [p.id for p in listed] == [old.id]
+
+            assert await payments.get_by_transaction(
+                db, TestDomainIds.TEST_TX_1, created_from=week_ago
+            ) is None
+            assert await payments.get_by_transaction(db, TestDomainIds.TEST_TX_1) is not None
@@ -0,0 +1,128 @@
+"""Тесты шаблонов запросов CRUD и микро-бенчмарки их построения/выполнения."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.crud.accounts import CRUDAccount
+from app.crud.base import CRUDBase, query_template
+from app.crud.payments import CRUDPayment
+from app.crud.users import CRUDUser
+from app.models.account import Account
+from app.models.user import User
+from tests.constants import TestUserData, TestValidationData
+
+
+BENCH_ITERATIONS = 2000
+
+
+class TestQueryTemplates:
+    """Шаблоны строятся один раз и корректно параметризуются."""
+
+    def test_statement_built_once_per_class(self) -> None:
+        first, second = CRUDUser(), CRUDUser()
+        assert first._get_by_email is second._get_by_email
+        assert first._get_by_id is second._get_by_id
+
+    def test_base_template_is_per_model(self) -> None:
+        assert CRUDUser()._get_by_id is not CRUDAccount()._get_by_id
+        assert CRUDBase(User)._get_by_id is not CRUDUser()._get_by_id
+
+    def test_descriptor_on_class_returns_itself(self) -> None:
+        assert isinstance(CRUDBase.__dict__["_get_by_id"], query_template)
+        assert isinstance(CRUDUser._get_by_email, query_template)
+
+    def test_locked_variant_adds_for_update(self) -> None:
+        crud = CRUDAccount()
+        assert crud._get_for_user._for_update_arg is None
+        assert crud._get_for_user_locked._for_update_arg is not None
+
+    @pytest.mark.asyncio()
+    async def test_templates_bind_parameters(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        users, accounts, payments = CRUDUser(), CRUDAccount(), CRUDPayment()
+        async with test_sessionmaker() as db:
+            user = await users.create(
+                db,
+                email=TestUserData.TEST_EMAIL_GENERIC,
+                full_name=TestValidationData.TEST_USER_FULL_NAME,
+                password=TestUserData.SECURE_PASSWORD_123,
+            )
+            first = await accounts.create_for_user(db, user.id)
+            second = await accounts.create_for_user(db, user.id)
+            await db.commit()
+
+            assert (await users.get_by_email(db, user.email)).id == user.id
+            assert await users.get_by_email(db, TestUserData.WRONG_EMAIL) is None
+            assert (await accounts.get_for_user(db, second.id, user.id)).id == second.id
+            assert await accounts.get_for_user(db, second.id, user.id + 1) is None
+            page = await accounts.list_for_user_paginated(db, user.id, limit=1, offset=1)
+            assert [a.id for a in page] == [second.id]
+            full = await accounts.list_for_user_paginated(db, user.id, limit=5, offset=0)
+            assert [a.id for a in full] == [first.id, second.id]
+            assert await payments.get_by_transaction(db, "missing") is None
+
+
+@pytest.mark.stress()
+class TestQueryTemplateBenchmarks:
+    """Микро-бенчмарки накладных расходов на вызов."""
+
+    def test_statement_construction_overhead(self) -> None:
+        """Шаблон избегает построения statement и вычисления ключа кэша на вызов."""
+        crud = CRUDAccount()
+
+        start = time.perf_counter()
+        for i in range(BENCH_ITERATIONS):
+            select(Account).where(Account.id == i, Account.user_id == i)._generate_cache_key()
+        ad_hoc = (time.perf_counter() - start) / BENCH_ITERATIONS
+
+        start = time.perf_counter()
+        for _ in range(BENCH_ITERATIONS):
+            crud._get_for_user._generate_cache_key()
+        templated = (time.perf_counter() - start) / BENCH_ITERATIONS
+
+        assert templated * 5 < ad_hoc, (
+            f"select()+cache key: {ad_hoc * 1e6:.1f} мкс, шаблон: {templated * 1e6:.1f} мкс"
+        )
+
+    @pytest.mark.asyncio()
+    async def test_execution_overhead(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        """Выполнение шаблона не медленнее ad-hoc запроса (SQLite, горячий кэш)."""
+        users = CRUDUser()
+        async with test_sessionmaker() as db:
+            user = await users.create(
+                db,
+                email=TestUserData.TEST_EMAIL_GENERIC,
+                full_name=TestValidationData.TEST_USER_FULL_NAME,
+                password=TestUserData.SECURE_PASSWORD_123,
+            )
+            await db.commit()
+
+            async def ad_hoc() -> None:
+                await db.execute(select(User).where(User.email == user.email))
+
+            async def templated() -> None:
+                await users.get_by_email(db, user.email)
+
+            # Лучшее из нескольких чередующихся раундов сглаживает шум планировщика
+            timings = {"ad_hoc": float("inf"), "templated": float("inf")}
+            rounds, per_round = 5, BENCH_ITERATIONS // 10
+            for _ in range(rounds):
+                for name, call in (("ad_hoc", ad_hoc), ("templated", templated)):
+                    start = time.perf_counter()
+                    for _ in range(per_round):
+                        await call()
+                    elapsed = (time.perf_counter() - start) / per_round
+                    timings[name] = min(timings[name], elapsed)
+
+        assert timings["templated"] < timings["ad_hoc"] * 1.5, (
+            f"выполнение ad-hoc: {timings['ad_hoc'] * 1e6:.1f} мкс, "
+            f"шаблон: {timings['templated'] * 1e6:.1f} мкс"
+        )
@@ -0,0 +1,130 @@
+"""Тесты холодного архива платежей."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from app.db.archive import PaymentArchive
+from app.models.payment import Payment
+
+
+def make_payment(payment_id: int, user_id: int, month: int) -> Payment:
+    return Payment(
+        id=payment_id,
+        transaction_id=f"tx-{payment_id}",
+        user_id=user_id,
+        account_id=user_id * 10,
+        amount=Decimal("1.50"),
+        created_at=datetime(2024, month, 1, tzinfo=timezone.utc),
+    )
+
+
+@pytest.fixture()
+def archive_dir(tmp_path: Path) -> Path:
+    return tmp_path / "archive"
+
+
+class TestPaymentArchive:
+    """Запись сегментов и чтение по индексам."""
+
+    @pytest.mark.asyncio()
+    async def test_append_and_lookup(self, archive_dir: Path) -> None:
+        archive = PaymentArchive(archive_dir)
+        await archive.append([make_payment(1, 1, 1), make_payment(2, 2, 2)])
+        segment = await archive.append([make_payment(3, 1, 3)])
+
+        assert segment.number == 2
+        assert sorted(p.name for p in archive_dir.iterdir()) == [
+            "payments-00000001.idx.json",
+            "payments-00000001.jsonl.gz",
+            "payments-00000002.idx.json",
+            "payments-00000002.jsonl.gz",
+        ]
+        found = await archive.find_transaction("tx-2")
+        assert found is not None
+        assert (found.id, found.user_id, found.amount) == (2, 2, Decimal("1.50"))
+        assert await archive.find_transaction("tx-404") is None
+        assert [p.id for p in await archive.list_for_user(1)] == [1, 3]
+        assert await archive.latest_segment_ids() == [3]
+
+    @pytest.mark.asyncio()
+    async def test_list_for_user_filters_period(self, archive_dir: Path) -> None:
+        archive = PaymentArchive(archive_dir)
+        await archive.append([make_payment(i, 1, i) for i in range(1, 6)])
+
+        listed = await archive.list_for_user(
+            1,
+            created_from=datetime(2024, 2, 1, tzinfo=timezone.utc),
+            created_to=datetime(2024, 4, 1),
+        )
+
+        assert [p.id for p in listed] == [2, 3]
+
+    @pytest.mark.asyncio()
+    async def test_reader_sees_segments_of_other_writer(self, archive_dir: Path) -> None:
+        reader = PaymentArchive(archive_dir)
+        assert await reader.find_transaction("tx-1") is None
+
+        await PaymentArchive(archive_dir).append([make_payment(1, 1, 1)])
+
+        assert (await reader.find_transaction("tx-1")).id == 1
+        assert len(reader.segments) == 1
+
+    @pytest.mark.asyncio()
+    async def test_segment_without_index_is_ignored(self, archive_dir: Path) -> None:
+        archive_dir.mkdir()
+        (archive_dir / "payments-00000001.jsonl.gz").write_bytes(b"broken")
+        archive = PaymentArchive(archive_dir)
+
+        segment = await archive.append([make_payment(1, 1, 1)])
+
+        assert segment.number == 1
+        assert (await archive.find_transaction("tx-1")).id == 1
+
+    @pytest.mark.asyncio()
+    async def test_page_reads_only_segments_of_the_page(
+        self, archive_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        archive = PaymentArchive(archive_dir)
+        for month in range(1, 5):
+            await archive.append([make_payment(month, 1, month), make_payment(10 + month, 2, month)])
+        read = []
+        original = archive._read_segment
+        monkeypatch.setattr(
+            archive, "_read_segment", lambda number: read.append(number) or original(number)
+        )
+
+        page, total = await archive.page_for_user(1, limit=1, offset=2)
+
+        assert [p.id for p in page] == [3]
+        assert total == 4
+        assert read == [3]
+        assert await archive.latest_segment_ids(user_id=1) == [4]
+        assert read == [3]
+
+    @pytest.mark.asyncio()
+    async def test_lookup_reads_only_index_of_matching_segment(
+        self, archive_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        for month in range(1, 5):
+            await PaymentArchive(archive_dir).append([make_payment(month, month, month)])
+        archive = PaymentArchive(archive_dir)
+        await archive.refresh()
+        read = []
+        original = archive._read_index
+        monkeypatch.setattr(
+            archive, "_read_index", lambda number: read.append(number) or original(number)
+        )
+
+        found = await archive.find_transaction("tx-3")
+        missing = await archive.find_transaction("tx-404")
+        page, total = await archive.page_for_user(2, limit=10, offset=0)
+
+        assert (found.id, missing) == (3, None)
+        assert ([p.id for p in page], total) == ([2], 1)
+        assert read == [3, 2]
+        assert [s.rows for s in archive.segments] == [1, 1, 1, 1]
@@ -0,0 +1,152 @@
+"""Тесты журнала медленных SQL-выражений."""
+
+from __future__ import annotations
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.constants import SlowQueries
+from app.crud.accounts import CRUDAccount
+from app.crud.users import CRUDUser
+from app.db.session import count_queries
+from app.db.slow_queries import (
+    SlowQueryEntry,
+    SlowQueryLog,
+    build_slow_query_log,
+    redact_parameters,
+)
+from tests.constants import TestUserData
+
+
+@pytest_asyncio.fixture()
+async def slow_log(test_sessionmaker: async_sessionmaker[AsyncSession]):
+    log = SlowQueryLog(threshold_ms=0.0, max_entries=3)
+    log.install(test_sessionmaker.kw["bind"])
+    yield log
+    await log.uninstall()
+
+
+class TestRedaction:
+    """Значения параметров заменяются типами."""
+
+    def test_nested_parameters_keep_only_types(self) -> None:
+        assert redact_parameters(("secret@example.com", 5)) == ["<str>", "<int>"]
+        assert redact_parameters({"email": "a", "limit": None}) == {
+            "email": "<str>",
+            "limit": "<NoneType>",
+        }
+        assert redact_parameters([(1,), (2,)]) == [["<int>"], ["<int>"]]
+
+    def test_build_respects_enabled_flag(self, test_settings) -> None:
+        assert build_slow_query_log(test_settings) is None
+        enabled = test_settings.model_copy(
+            update={"slow_query_log_enabled": True, "slow_query_threshold_ms": 5.0}
+        )
+        assert build_slow_query_log(enabled).threshold_ms == 5.0
+
+
+class TestSlowQueryLog:
+    """Запись медленных выражений и планы выполнения."""
+
+    @pytest.mark.asyncio()
+    async def test_crud_query_is_logged_with_plan(
+        self, slow_log: SlowQueryLog, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        with count_queries() as counter:
+            async with test_sessionmaker() as db:
+                await CRUDUser().get_by_email(db, TestUserData.TEST_EMAIL_GENERIC)
+            await slow_log.wait_explains()
+
+        (entry,) = slow_log.entries()
+        assert entry.statement.lstrip().upper().startswith("SELECT")
+        assert TestUserData.TEST_EMAIL_GENERIC not in repr(entry.parameters)
+        assert "<str>" in entry.parameters
+        assert entry.plan_error is None
+        assert "users" in entry.plan
+        # Выражения плана не попадают ни в журнал, ни в счётчик запроса
+        assert len(counter) == 1
+
+    @pytest.mark.asyncio()
+    async def test_ring_buffer_keeps_latest_entries(
+        self, slow_log: SlowQueryLog, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        slow_log.explain = False
+        async with test_sessionmaker() as db:
+            for i in range(5):
+                await db.execute(text(f"SELECT {i}"))
+
+        assert slow_log.captured == 5
+        assert [entry.statement for entry in slow_log.entries()] == [
+            "SELECT 4",
+            "SELECT 3",
+            "SELECT 2",
+        ]
+
+    @pytest.mark.asyncio()
+    async def test_fast_and_uninstalled_queries_are_ignored(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        log = SlowQueryLog(threshold_ms=60_000.0, max_entries=10)
+        log.install(test_sessionmaker.kw["bind"])
+        async with test_sessionmaker() as db:
+            await db.execute(text("SELECT 1"))
+        log.threshold_ms = 0.0
+        await log.uninstall()
+        async with test_sessionmaker() as db:
+            await db.execute(text("SELECT 1"))
+
+        assert log.entries() == []
+
+    @pytest.mark.asyncio()
+    async def test_explains_beyond_limit_are_skipped(
+        self, slow_log: SlowQueryLog, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        slow_log.max_concurrent_explains = 1
+        async with test_sessionmaker() as db:
+            await db.execute(text("SELECT 1"))
+            await db.execute(text("SELECT 2"))
+        await slow_log.wait_explains()
+
+        second, first = slow_log.entries()
+        assert first.plan is not None
+        assert second.plan is None and second.plan_error is not None
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "clause", ["FOR UPDATE", "FOR NO KEY UPDATE", "FOR SHARE", "for key share skip locked"]
+    )
+    async def test_locking_statements_are_not_explained(
+        self, slow_log: SlowQueryLog, clause: str
+    ) -> None:
+        statement = f"SELECT accounts.id FROM accounts WHERE accounts.id = ? {clause}"
+        entry = SlowQueryEntry(
+            id=1, statement=statement, parameters=["<int>"], duration_ms=1.0, executemany=False
+        )
+
+        slow_log._schedule_explain(entry, statement, (1,), False)
+
+        assert entry.plan_error == SlowQueries.PLAN_LOCKING
+        assert slow_log._explains == set()
+
+    @pytest.mark.asyncio()
+    @pytest.mark.postgresql()
+    async def test_lock_query_is_logged_without_replay_on_postgresql(
+        self, performance_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        log = SlowQueryLog(threshold_ms=0.0, max_entries=10, explain_analyze=True)
+        log.install(performance_sessionmaker.kw["bind"])
+        try:
+            async with performance_sessionmaker() as db:
+                await CRUDAccount().list_by_ids_locked(db, [1])
+                await db.execute(text("SELECT 1"))
+            await log.wait_explains()
+        finally:
+            await log.uninstall()
+
+        entries = log.entries()
+        locking = next(entry for entry in entries if "FOR UPDATE" in entry.statement)
+        plain = next(entry for entry in entries if entry.statement == "SELECT 1")
+        assert locking.plan is None and locking.plan_error == SlowQueries.PLAN_LOCKING
+        assert plain.plan_error is None and "actual time" in plain.plan
@@ -0,0 +1,222 @@
+"""Тесты хаба событий счетов (SSE)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache import BalanceSnapshot, InvalidationBus, build_invalidation_bus
+from app.core.constants import AccountEventKinds, ServerSentEvents
+from app.crud.accounts import CRUDAccount
+from app.crud.payments import CRUDPayment
+from app.crud.users import CRUDUser
+from app.events import (
+    AccountEvent,
+    AccountEventHub,
+    PostgresAccountEventTransport,
+    build_account_event_hub,
+)
+from app.services.webhook import WebhookService
+from app.validators.async_ import UserAsyncValidator
+from tests.constants import TestUserData, TestValidationData
+
+
+class NotifyConnection:
+    """Соединение asyncpg шины, передающее уведомления подписчикам канала."""
+
+    def __init__(self) -> None:
+        self.listeners: dict[str, list] = {}
+        self.notifications: list[tuple[str, str]] = []
+
+    async def add_listener(self, channel: str, callback) -> None:
+        self.listeners.setdefault(channel, []).append(callback)
+
+    async def execute(self, _query: str, channel: str, payload: str) -> None:
+        self.notifications.append((channel, payload))
+        for callback in self.listeners.get(channel, ()):
+            callback(self, 0, channel, payload)
+
+
+def make_hub(**kwargs) -> AccountEventHub:
+    params = {"queue_size": 10, "heartbeat_seconds": 60.0}
+    params.update(kwargs)
+    return AccountEventHub(**params)
+
+
+def balance_event(user_id: int, balance: str, version: int) -> AccountEvent:
+    return AccountEvent.balance(BalanceSnapshot(1, user_id, Decimal(balance), version))
+
+
+def parse_frame(frame: bytes) -> tuple[str, dict]:
+    event_line, data_line = frame.decode().strip().split("\n")
+    return event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))
+
+
+class TestAccountEventHub:
+    """Подписки, доставка и переполнение очередей."""
+
+    @pytest.mark.asyncio()
+    async def test_stream_delivers_only_own_events(self) -> None:
+        hub = make_hub()
+        stream = hub.stream(1)
+        next_frame = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        assert hub.subscriber_count() == 1
+
+        hub.dispatch([balance_event(2, "9.00", 2), balance_event(1, "5.00", 3)])
+
+        kind, data = parse_frame(await next_frame)
+        assert kind == AccountEventKinds.BALANCE
+        assert data == {"id": 1, "user_id": 1, "balance": "5.00", "version": 3}
+        await stream.aclose()
+        assert hub.subscriber_count() == 0
+
+    @pytest.mark.asyncio()
+    async def test_overflow_sends_resync_and_ends_stream(self) -> None:
+        hub = make_hub(queue_size=2)
+        stream = hub.stream(1)
+        first = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+
+        hub.dispatch([balance_event(1, f"{i}.00", i + 1) for i in range(4)])
+
+        assert parse_frame(await first)[0] == AccountEventKinds.BALANCE
+        frames = [frame async for frame in stream]
+        assert [parse_frame(frame)[0] for frame in frames] == [AccountEventKinds.RESYNC]
+        assert hub.subscriber_count() == 0
+
+    @pytest.mark.asyncio()
+    async def test_idle_stream_sends_keepalive(self) -> None:
+        hub = make_hub(heartbeat_seconds=0.01)
+        stream = hub.stream(1)
+
+        assert await anext(stream) == ServerSentEvents.KEEPALIVE
+        await stream.aclose()
+
+    @pytest.mark.asyncio()
+    async def test_stop_closes_open_streams(self) -> None:
+        hub = make_hub()
+        stream = hub.stream(1)
+        frames = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+
+        await hub.stop()
+
+        with pytest.raises(StopAsyncIteration):
+            await frames
+
+    def test_remote_events_skip_own_origin(self) -> None:
+        hub = make_hub()
+        subscription = hub.subscribe(1)
+        event = balance_event(1, "1.00", 2)
+
+        hub._on_remote(AccountEvent.from_dict({**event.to_dict(), "o": hub.origin}))
+        hub._on_remote(AccountEvent.from_dict({**event.to_dict(), "o": "other"}))
+
+        assert subscription._queue.qsize() == 1
+
+
+class TestPostgresAccountEvents:
+    """Рассылка событий через соединение шины инвалидаций."""
+
+    @pytest.fixture()
+    def postgres_settings(self, test_settings):
+        return test_settings.model_copy(
+            update={"invalidation_bus_backend": "postgres", "account_events_backend": "postgres"}
+        )
+
+    def test_postgres_events_require_postgres_bus(self, postgres_settings) -> None:
+        hub = build_account_event_hub(postgres_settings, InvalidationBus())
+
+        assert type(hub.transport) is not PostgresAccountEventTransport
+
+    @pytest.mark.asyncio()
+    async def test_events_are_sent_by_bus_after_commit(
+        self, postgres_settings, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        connection = NotifyConnection()
+        sender_bus, receiver_bus = (build_invalidation_bus(postgres_settings) for _ in range(2))
+        sender_bus._connection = receiver_bus._connection = connection
+        sender = build_account_event_hub(postgres_settings, sender_bus)
+        receiver = build_account_event_hub(postgres_settings, receiver_bus)
+        await sender.start()
+        await receiver.start()
+        subscription = receiver.subscribe(1)
+
+        async with test_sessionmaker() as db:
+            await db.execute(select(1))
+            await sender.publish(db, [balance_event(1, "1.00", 2)])
+            await db.rollback()
+            await db.execute(select(1))
+            await sender.publish(db, [balance_event(1, "2.00", 3)])
+            await db.commit()
+        assert connection.notifications == []
+        await sender_bus.flush()
+
+        ((channel, _payload),) = connection.notifications
+        assert channel == postgres_settings.account_events_channel
+        event = await subscription.get()
+        assert event.data["balance"] == "2.00"
+        assert subscription._queue.empty()
+
+    @pytest.mark.asyncio()
+    async def test_bus_reset_sends_resync(self, postgres_settings) -> None:
+        bus = build_invalidation_bus(postgres_settings)
+        hub = build_account_event_hub(postgres_settings, bus)
+        stream = hub.stream(1)
+        first = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+
+        bus.reset()
+
+        assert parse_frame(await first)[0] == AccountEventKinds.RESYNC
+        assert [frame async for frame in stream] == []
+        assert hub.subscriber_count() == 0
+
+
+class TestWebhookEvents:
+    """Публикация событий пополнения."""
+
+    @pytest.mark.asyncio()
+    async def test_topup_dispatches_payment_and_balance_after_commit(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        async with test_sessionmaker() as db:
+            user = await CRUDUser().create(
+                db,
+                email=TestUserData.USER1_EMAIL,
+                full_name=TestValidationData.TEST_USER_FULL_NAME,
+                password=TestUserData.SECURE_PASSWORD_123,
+            )
+            account = await CRUDAccount().create_for_user(db, user.id)
+            await db.commit()
+            user_id, account_id = user.id, account.id
+        hub = make_hub()
+        subscription = hub.subscribe(user_id)
+        webhook = WebhookService(
+            CRUDAccount(), CRUDPayment(), UserAsyncValidator(CRUDUser()), events=hub
+        )
+
+        async with test_sessionmaker() as db:
+            await webhook.process_topup(
+                db,
+                transaction_id="events-tx-1",
+                user_id=user_id,
+                account_id=account_id,
+                amount=Decimal("7.50"),
+            )
+
+        payment = await subscription.get()
+        balance = await subscription.get()
+        assert (payment.kind, payment.data["amount"]) == (AccountEventKinds.PAYMENT, "7.50")
+        assert (balance.kind, balance.data["balance"], balance.data["version"]) == (
+            AccountEventKinds.BALANCE,
+            "7.50",
+            2,
+        )
+        assert subscription._queue.empty()
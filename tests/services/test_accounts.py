@@ -5,10 +5,12 @@ from __future__ import annotations
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from app.cache import BalanceCache
 from app.core.constants import ErrorMessages, PaginationParams
 from app.core.errors import NotFoundError
 from app.crud.accounts import CRUDAccount
 from app.crud.users import CRUDUser
+from app.db.session import QueryCounter
 from app.models.account import Account
 from app.services.accounts import AccountService
 from tests.constants import (
@@ -115,6 +117,33 @@ class TestAccountService:
             )
             assert len(result) == TestNumericConstants.COUNT_SINGLE
 
+    @pytest.mark.asyncio()
+    async def test_cached_listing_pages_past_cache_cap(
+        self,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+    ) -> None:
+        """Страницы за пределами лимита кэша берутся из БД, а не из усечённого списка."""
+        cache = BalanceCache(max_entries=100, max_accounts_per_user=3, ttl_seconds=60.0)
+        service = AccountService(CRUDAccount(), CRUDUser(), cache)
+        async with test_sessionmaker() as db:
+            user = await CRUDUser().create(
+                db,
+                email=TestUserData.PAGINATION_EMAIL,
+                full_name=TestUserData.PAGINATION_FULL_NAME,
+                password=TestUserData.SECURE_PASSWORD_123,
+            )
+            accounts = [await CRUDAccount().create_for_user(db, user.id) for _ in range(7)]
+            await db.commit()
+            ids = [account.id for account in accounts]
+
+            pages = [
+                await service.get_user_accounts(db, user.id, limit=2, offset=offset)
+                for offset in (0, 2, 4, 6)
+            ]
+
+        assert [account.id for page in pages for account in page] == ids
+        assert cache.list_for_user(user.id, limit=2, offset=0) is None
+
     @pytest.mark.asyncio()
     async def test_get_user_accounts_default_pagination(
         self,
@@ -229,3 +258,27 @@ class TestAccountService:
 
         assert service.accounts_crud is mock_accounts_crud
         assert service.users_crud is mock_users_crud
+
+    @pytest.mark.asyncio()
+    async def test_create_account_query_count(
+        self,
+        account_service: AccountService,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+        query_counter: QueryCounter,
+    ) -> None:
+        """Создание счёта: проверка пользователя и INSERT ... RETURNING, без refresh."""
+        async with test_sessionmaker() as db:
+            user = await CRUDUser().create(
+                db,
+                email=TestUserData.TEST_EMAIL_GENERIC,
+                full_name=TestValidationData.TEST_USER_FULL_NAME,
+                password=TestUserData.SECURE_PASSWORD_123,
+            )
+            await db.commit()
+            query_counter.clear()
+
+            account = await account_service.create_account_for_user(db, user.id)
+
+            assert len(query_counter) == 2
+            assert account.id is not None
+            assert account.version == 1
@@ -0,0 +1,191 @@
+"""Тесты PaymentArchivalService и чтения архива через CRUD платежей."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.errors import DuplicateTransactionError
+from app.crud.accounts import CRUDAccount
+from app.crud.payments import CRUDPayment
+from app.crud.users import CRUDUser
+from app.db.archive import PaymentArchive
+from app.models.payment import Payment
+from app.services.archival import ArchivalReport, PaymentArchivalService
+from app.services.webhook import WebhookService
+from app.validators.async_ import UserAsyncValidator
+from tests.constants import TestMonetaryConstants, TestUserData, TestValidationData
+
+
+NOW = datetime.now(timezone.utc)
+
+
+async def create_payments(
+    sessionmaker: async_sessionmaker[AsyncSession], ages_days: list[int]
+) -> tuple[int, int]:
+    """Создаёт пользователя с платежами заданного возраста; возвращает user_id и account_id."""
+    async with sessionmaker() as db:
+        user = await CRUDUser().create(
+            db,
+            email=TestUserData.USER1_EMAIL,
+            full_name=TestValidationData.TEST_USER_FULL_NAME,
+            password=TestUserData.SECURE_PASSWORD_123,
+        )
+        account = await CRUDAccount().create_for_user(db, user.id)
+        for i, age in enumerate(ages_days):
+            payment = await CRUDPayment().create(
+                db,
+                transaction_id=f"archive-tx-{i}",
+                user_id=user.id,
+                account_id=account.id,
+                amount=TestMonetaryConstants.AMOUNT_10_00,
+            )
+            payment.created_at = NOW - timedelta(days=age)
+        await db.commit()
+        return user.id, account.id
+
+
+def make_service(
+    sessionmaker: async_sessionmaker[AsyncSession], archive: PaymentArchive, **kwargs: bool
+) -> PaymentArchivalService:
+    return PaymentArchivalService(
+        sessionmaker,
+        CRUDPayment(archive),
+        archive,
+        hot_days=30,
+        chunk_size=2,
+        delete_batch_size=1,
+        clock=lambda: NOW,
+        **kwargs,
+    )
+
+
+async def count_payments(sessionmaker: async_sessionmaker[AsyncSession]) -> int:
+    async with sessionmaker() as db:
+        return await db.scalar(select(func.count()).select_from(Payment))
+
+
+class TestPaymentArchival:
+    """Перенос старых платежей и прозрачное чтение архива."""
+
+    @pytest.mark.asyncio()
+    async def test_moves_old_payments_to_archive(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path
+    ) -> None:
+        await create_payments(test_sessionmaker, [400, 200, 100, 5])
+        archive = PaymentArchive(tmp_path / "archive")
+
+        report = await make_service(test_sessionmaker, archive).run()
+
+        assert report == ArchivalReport(segments=2, archived=3, deleted=3, recovered=0)
+        assert await count_payments(test_sessionmaker) == 1
+        assert [s.rows for s in archive.segments] == [2, 1]
+
+    @pytest.mark.asyncio()
+    async def test_dry_run_changes_nothing(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path
+    ) -> None:
+        await create_payments(test_sessionmaker, [400, 5])
+
+        report = await make_service(test_sessionmaker, PaymentArchive(tmp_path / "archive"), dry_run=True).run()
+
+        assert report == ArchivalReport(archived=1)
+        assert await count_payments(test_sessionmaker) == 2
+        assert not (tmp_path / "archive").exists()
+
+    @pytest.mark.asyncio()
+    async def test_rerun_cleans_up_interrupted_segment(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path
+    ) -> None:
+        await create_payments(test_sessionmaker, [400, 5])
+        archive = PaymentArchive(tmp_path / "archive")
+        async with test_sessionmaker() as db:
+            old = await CRUDPayment().list_archivable(
+                db, before=NOW - timedelta(days=30), after_id=0, limit=10
+            )
+        await archive.append(old)  # сбой до удаления строк из БД
+
+        report = await make_service(test_sessionmaker, archive).run()
+
+        assert report == ArchivalReport(recovered=1)
+        assert await count_payments(test_sessionmaker) == 1
+        assert len(archive.segments) == 1
+
+    @pytest.mark.asyncio()
+    async def test_crud_reads_fall_back_to_archive(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path
+    ) -> None:
+        user_id, _ = await create_payments(test_sessionmaker, [400, 200, 100, 5])
+        archive = PaymentArchive(tmp_path / "archive")
+        await make_service(test_sessionmaker, archive).run()
+        payments = CRUDPayment(archive)
+
+        async with test_sessionmaker() as db:
+            found = await payments.get_by_transaction(
+                db, "archive-tx-0", created_from=NOW - timedelta(days=31)
+            )
+            assert found is not None and found.user_id == user_id
+
+            history = await payments.list_for_user_paginated(db, user_id, limit=10, offset=0)
+            assert [p.transaction_id for p in history] == [f"archive-tx-{i}" for i in range(4)]
+            page = await payments.list_for_user_paginated(db, user_id, limit=2, offset=2)
+            assert [p.transaction_id for p in page] == ["archive-tx-2", "archive-tx-3"]
+            recent = await payments.list_for_user_paginated(
+                db, user_id, limit=10, offset=0, created_from=NOW - timedelta(days=150)
+            )
+            assert [p.transaction_id for p in recent] == ["archive-tx-2", "archive-tx-3"]
+
+    @pytest.mark.asyncio()
+    async def test_pages_skip_rows_of_interrupted_archival(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path
+    ) -> None:
+        user_id, _ = await create_payments(test_sessionmaker, [400, 200, 100, 5])
+        archive = PaymentArchive(tmp_path / "archive")
+        async with test_sessionmaker() as db:
+            old = await CRUDPayment().list_archivable(
+                db, before=NOW - timedelta(days=30), after_id=0, limit=10
+            )
+        await archive.append(old)  # сбой до удаления строк из БД
+        payments = CRUDPayment(archive)
+
+        async with test_sessionmaker() as db:
+            pages = [
+                await payments.list_for_user_paginated(db, user_id, limit=1, offset=offset)
+                for offset in range(5)
+            ]
+
+        assert [[p.transaction_id for p in page] for page in pages] == [
+            ["archive-tx-0"],
+            ["archive-tx-1"],
+            ["archive-tx-2"],
+            ["archive-tx-3"],
+            [],
+        ]
+
+    @pytest.mark.asyncio()
+    async def test_webhook_rejects_archived_duplicate(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path
+    ) -> None:
+        user_id, account_id = await create_payments(test_sessionmaker, [400])
+        archive = PaymentArchive(tmp_path / "archive")
+        await make_service(test_sessionmaker, archive).run()
+        service = WebhookService(
+            CRUDAccount(),
+            CRUDPayment(archive),
+            UserAsyncValidator(CRUDUser()),
+            idempotency_lookback=timedelta(days=31),
+        )
+
+        async with test_sessionmaker() as db:
+            with pytest.raises(DuplicateTransactionError):
+                await service.process_topup(
+                    db,
+                    transaction_id="archive-tx-0",
+                    account_id=account_id,
+                    user_id=user_id,
+                    amount=TestMonetaryConstants.AMOUNT_10_00,
+                )
@@ -0,0 +1,172 @@
+"""Тесты AccountCompactionService."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.cache.bus import PostgresInvalidationBus
+from app.crud.accounts import CRUDAccount
+from app.crud.payments import CRUDPayment
+from app.crud.users import CRUDUser
+from app.db.archive import PaymentArchive
+from app.models.account import Account
+from app.models.payment import Payment
+from app.services.compaction import AccountCompactionService, CompactionReport
+from tests.constants import TestUserData, TestValidationData
+
+
+def make_service(
+    sessionmaker: async_sessionmaker[AsyncSession], *, dry_run: bool = False, **kwargs
+) -> AccountCompactionService:
+    return AccountCompactionService(
+        sessionmaker, CRUDAccount(), CRUDPayment(), batch_size=1, dry_run=dry_run, **kwargs
+    )
+
+
+async def create_user_with_accounts(
+    sessionmaker: async_sessionmaker[AsyncSession], email: str, balances: list[str]
+) -> int:
+    """Создаёт пользователя со счетами; у каждого пустого счёта есть нулевой платёж."""
+    async with sessionmaker() as db:
+        user = await CRUDUser().create(
+            db,
+            email=email,
+            full_name=TestValidationData.TEST_USER_FULL_NAME,
+            password=TestUserData.SECURE_PASSWORD_123,
+        )
+        for i, balance in enumerate(balances):
+            account = await CRUDAccount().create_for_user(db, user.id)
+            account.balance = Decimal(balance)
+            await CRUDPayment().create(
+                db,
+                transaction_id=f"compact-{user.id}-{i}",
+                user_id=user.id,
+                account_id=account.id,
+                amount=Decimal(balance),
+            )
+        await db.commit()
+        return user.id
+
+
+async def load_accounts(
+    sessionmaker: async_sessionmaker[AsyncSession], user_id: int
+) -> list[Account]:
+    async with sessionmaker() as db:
+        result = await db.scalars(
+            select(Account).where(Account.user_id == user_id).order_by(Account.id)
+        )
+        return list(result)
+
+
+class TestAccountCompaction:
+    """Тесты уплотнения счетов."""
+
+    @pytest.mark.asyncio()
+    async def test_merges_empty_duplicates_into_default(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        first = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER1_EMAIL, ["0.00", "0.00", "5.00", "0.00"]
+        )
+        second = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER2_EMAIL, ["7.00"]
+        )
+
+        report = await make_service(test_sessionmaker).run()
+
+        assert report == CompactionReport(
+            users_scanned=2, defaults_assigned=2, accounts_merged=2, payments_moved=2
+        )
+        accounts = await load_accounts(test_sessionmaker, first)
+        assert [(a.balance, a.is_default) for a in accounts] == [
+            (Decimal("0.00"), True),
+            (Decimal("5.00"), False),
+        ]
+        async with test_sessionmaker() as db:
+            payments = await db.scalars(select(Payment).where(Payment.user_id == first))
+            assert {p.account_id for p in payments} == {a.id for a in accounts}
+        assert [a.is_default for a in await load_accounts(test_sessionmaker, second)] == [True]
+
+    @pytest.mark.asyncio()
+    async def test_dry_run_keeps_accounts(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER1_EMAIL, ["0.00", "0.00"]
+        )
+
+        report = await make_service(test_sessionmaker, dry_run=True).run()
+
+        assert report.accounts_merged == 1
+        accounts = await load_accounts(test_sessionmaker, user_id)
+        assert len(accounts) == 2
+        assert not any(a.is_default for a in accounts)
+
+    @pytest.mark.asyncio()
+    async def test_existing_default_is_kept(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER1_EMAIL, ["0.00"]
+        )
+        async with test_sessionmaker() as db:
+            default = await CRUDAccount().upsert_default_for_user(db, user_id)
+            await db.commit()
+
+        report = await make_service(test_sessionmaker).run()
+
+        assert report.defaults_assigned == 0
+        assert [a.id for a in await load_accounts(test_sessionmaker, user_id)] == [default.id]
+
+    @pytest.mark.asyncio()
+    async def test_keeps_empty_accounts_with_archived_history(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path
+    ) -> None:
+        user_id = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER1_EMAIL, ["0.00", "0.00", "0.00"]
+        )
+        accounts = await load_accounts(test_sessionmaker, user_id)
+        archive = PaymentArchive(tmp_path / "archive")
+        async with test_sessionmaker() as db:
+            payments = await db.scalars(
+                select(Payment).where(Payment.account_id == accounts[1].id)
+            )
+            await archive.append(list(payments))
+
+        report = await make_service(test_sessionmaker, archive=archive).run()
+
+        assert (report.accounts_merged, report.accounts_archived) == (1, 1)
+        assert [a.id for a in await load_accounts(test_sessionmaker, user_id)] == [
+            accounts[0].id,
+            accounts[1].id,
+        ]
+
+    @pytest.mark.asyncio()
+    async def test_publishes_invalidations_after_commit(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER1_EMAIL, ["0.00", "0.00"]
+        )
+        default, duplicate = await load_accounts(test_sessionmaker, user_id)
+        bus = PostgresInvalidationBus(
+            "postgresql://localhost/test", "cache_invalidation", flush_interval_seconds=0.0
+        )
+
+        await make_service(test_sessionmaker, dry_run=True, bus=bus).run()
+        assert bus.pending_count() == 0
+
+        await make_service(test_sessionmaker, bus=bus).run()
+
+        assert {(m.kind, m.key, m.version, m.user_id) for m in bus._pending.values()} == {
+            ("account", default.id, default.version + 1, user_id),
+            ("account_deleted", duplicate.id, 0, user_id),
+            ("user", user_id, 0, 0),
+        }
+        merged = await load_accounts(test_sessionmaker, user_id)
+        assert [(a.id, a.version) for a in merged] == [(default.id, default.version + 1)]
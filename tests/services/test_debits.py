@@ -0,0 +1,242 @@
+"""Тесты атомарных списаний AccountService.debit."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.errors import DuplicateTransactionError, InsufficientFundsError, NotFoundError
+from app.crud.accounts import CRUDAccount
+from app.crud.debits import CRUDDebit
+from app.crud.payments import CRUDPayment
+from app.crud.users import CRUDUser
+from app.models.account import Account
+from app.models.debit import Debit
+from app.services.accounts import AccountService
+from app.services.compaction import AccountCompactionService
+from app.services.reconciliation import BalanceReconciliationService
+from app.services.webhook import WebhookService
+from app.validators.async_ import UserAsyncValidator
+from tests.constants import TestUserData, TestValidationData
+
+
+async def create_funded_user(
+    sessionmaker: async_sessionmaker[AsyncSession], balance: str
+) -> tuple[int, int]:
+    """Создаёт пользователя со счётом, пополненным на `balance`."""
+    async with sessionmaker() as db:
+        user = await CRUDUser().create(
+            db,
+            email=TestUserData.USER1_EMAIL,
+            full_name=TestValidationData.TEST_USER_FULL_NAME,
+            password=TestUserData.SECURE_PASSWORD_123,
+        )
+        account = await CRUDAccount().create_for_user(db, user.id)
+        account.balance = Decimal(balance)
+        await CRUDPayment().create(
+            db,
+            transaction_id="debit-seed",
+            user_id=user.id,
+            account_id=account.id,
+            amount=Decimal(balance),
+        )
+        await db.commit()
+        return user.id, account.id
+
+
+def make_service(*, ledger: bool = False) -> AccountService:
+    return AccountService(CRUDAccount(), CRUDUser(), ledger=ledger, debits_crud=CRUDDebit())
+
+
+async def debit(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    user_id: int,
+    account_id: int,
+    transaction_id: str,
+    amount: str,
+    *,
+    ledger: bool = False,
+) -> tuple[Debit, Decimal]:
+    async with sessionmaker() as db:
+        return await make_service(ledger=ledger).debit(
+            db,
+            user_id,
+            account_id,
+            transaction_id=transaction_id,
+            amount=Decimal(amount),
+        )
+
+
+async def load_account(sessionmaker: async_sessionmaker[AsyncSession], account_id: int) -> Account:
+    async with sessionmaker() as db:
+        return await db.get(Account, account_id)
+
+
+class TestAccountDebit:
+    """Списания со счёта."""
+
+    @pytest.mark.asyncio()
+    async def test_debit_decrements_balance_and_records_row(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, account_id = await create_funded_user(test_sessionmaker, "10.00")
+
+        row, balance = await debit(test_sessionmaker, user_id, account_id, "debit-1", "3.25")
+
+        assert balance == Decimal("6.75")
+        assert (row.account_id, row.amount) == (account_id, Decimal("3.25"))
+        account = await load_account(test_sessionmaker, account_id)
+        assert (account.balance, account.version) == (Decimal("6.75"), 2)
+
+    @pytest.mark.asyncio()
+    async def test_debit_of_whole_balance_leaves_zero(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, account_id = await create_funded_user(test_sessionmaker, "5.00")
+
+        _, balance = await debit(test_sessionmaker, user_id, account_id, "debit-1", "5.00")
+
+        assert balance == Decimal("0.00")
+
+    @pytest.mark.asyncio()
+    async def test_insufficient_funds_changes_nothing(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, account_id = await create_funded_user(test_sessionmaker, "5.00")
+
+        with pytest.raises(InsufficientFundsError):
+            await debit(test_sessionmaker, user_id, account_id, "debit-1", "5.01")
+
+        account = await load_account(test_sessionmaker, account_id)
+        assert (account.balance, account.version) == (Decimal("5.00"), 1)
+        async with test_sessionmaker() as db:
+            assert await CRUDDebit().get_by_transaction(db, "debit-1") is None
+
+    @pytest.mark.asyncio()
+    async def test_repeated_transaction_is_rejected(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, account_id = await create_funded_user(test_sessionmaker, "10.00")
+        await debit(test_sessionmaker, user_id, account_id, "debit-1", "1.00")
+
+        with pytest.raises(DuplicateTransactionError):
+            await debit(test_sessionmaker, user_id, account_id, "debit-1", "1.00")
+
+        account = await load_account(test_sessionmaker, account_id)
+        assert account.balance == Decimal("9.00")
+
+    @pytest.mark.asyncio()
+    async def test_foreign_or_missing_account_is_not_found(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, account_id = await create_funded_user(test_sessionmaker, "10.00")
+
+        with pytest.raises(NotFoundError):
+            await debit(test_sessionmaker, user_id + 1, account_id, "debit-1", "1.00")
+        with pytest.raises(NotFoundError):
+            await debit(test_sessionmaker, user_id, account_id + 1, "debit-2", "1.00")
+
+    @pytest.mark.asyncio()
+    async def test_ledger_mode_spends_checkpointed_balance_only(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, account_id = await create_funded_user(test_sessionmaker, "5.00")
+        webhook = WebhookService(
+            CRUDAccount(), CRUDPayment(), UserAsyncValidator(CRUDUser()), ledger=True
+        )
+        async with test_sessionmaker() as db:
+            await webhook.process_topup(
+                db,
+                transaction_id="ledger-tx-1",
+                user_id=user_id,
+                account_id=account_id,
+                amount=Decimal("20.00"),
+            )
+
+        with pytest.raises(InsufficientFundsError):
+            await debit(test_sessionmaker, user_id, account_id, "debit-1", "6.00", ledger=True)
+        _, balance = await debit(
+            test_sessionmaker, user_id, account_id, "debit-2", "4.00", ledger=True
+        )
+
+        assert balance == Decimal("21.00")
+
+
+class TestDebitsInMaintenance:
+    """Учёт списаний сверкой и уплотнением."""
+
+    @pytest.mark.asyncio()
+    async def test_reconciliation_nets_debits(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, account_id = await create_funded_user(test_sessionmaker, "10.00")
+        await debit(test_sessionmaker, user_id, account_id, "debit-1", "2.50")
+        service = BalanceReconciliationService(
+            test_sessionmaker,
+            CRUDAccount(),
+            CRUDPayment(),
+            range_size=10,
+            concurrency=1,
+            debits_crud=CRUDDebit(),
+        )
+
+        assert (await service.run()).mismatch_count == 0
+
+    @pytest.mark.asyncio()
+    async def test_compaction_moves_debits_with_payments(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, drained_id = await create_funded_user(test_sessionmaker, "4.00")
+        async with test_sessionmaker() as db:
+            await CRUDAccount().create_for_user(db, user_id)
+            await db.commit()
+        await debit(test_sessionmaker, user_id, drained_id, "debit-1", "4.00")
+        service = AccountCompactionService(
+            test_sessionmaker,
+            CRUDAccount(),
+            CRUDPayment(),
+            batch_size=10,
+            debits_crud=CRUDDebit(),
+        )
+
+        await service.run()
+
+        async with test_sessionmaker() as db:
+            survivors = list(await db.scalars(select(Account.id).where(Account.user_id == user_id)))
+            owners = list(await db.scalars(select(Debit.account_id)))
+        assert len(survivors) == 1
+        assert owners == survivors
+
+
+class TestPostgresDebit:
+    """Условное UPDATE ... RETURNING на PostgreSQL."""
+
+    def test_debit_statement_compiles_with_execution_parameters(self) -> None:
+        statement = CRUDAccount()._debit_postgresql
+        keys = ["b_account_id", "b_user_id", "b_amount"]
+
+        compiled = statement.compile(dialect=postgresql.dialect(), column_keys=keys)
+
+        assert "RETURNING" in str(compiled)
+
+    @pytest.mark.asyncio()
+    @pytest.mark.postgresql()
+    async def test_debit_on_postgresql(
+        self, performance_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, account_id = await create_funded_user(performance_sessionmaker, "10.00")
+
+        row, balance = await debit(performance_sessionmaker, user_id, account_id, "pg-1", "7.50")
+        with pytest.raises(InsufficientFundsError):
+            await debit(performance_sessionmaker, user_id, account_id, "pg-2", "5.00")
+        with pytest.raises(DuplicateTransactionError):
+            await debit(performance_sessionmaker, user_id, account_id, "pg-1", "1.00")
+
+        assert row.amount == Decimal("7.50")
+        assert balance == Decimal("2.50")
+        account = await load_account(performance_sessionmaker, account_id)
+        assert (account.balance, account.version) == (Decimal("2.50"), 2)
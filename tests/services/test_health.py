@@ -0,0 +1,94 @@
+"""Тесты фонового монитора состояния HealthMonitor."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.loop_monitor import EventLoopMonitor
+from app.services.health import HealthMonitor
+
+
+class FakeClock:
+    """Управляемые часы для проверки свежести замеров."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_monitor(
+    sessionmaker: async_sessionmaker[AsyncSession], clock: FakeClock | None = None, **kwargs
+) -> HealthMonitor:
+    params = {"interval_seconds": 5.0, "max_age_seconds": 15.0, "db_timeout_seconds": 2.0}
+    params.update(kwargs)
+    if clock is not None:
+        params["clock"] = clock
+    return HealthMonitor(sessionmaker, **params)
+
+
+class TestHealthMonitor:
+    """Замеры состояния и их кэширование."""
+
+    @pytest.mark.asyncio()
+    async def test_sample_reports_db_and_pool(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        sample = await make_monitor(test_sessionmaker).sample()
+
+        assert sample.db_ok
+        assert sample.db_error is None
+        assert sample.db_latency_ms >= 0
+        assert set(sample.pool) <= {"size", "checked_out", "checked_in", "overflow"}
+
+    @pytest.mark.asyncio()
+    async def test_db_failure_is_reported(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        async def fail_execute(self: AsyncSession, *args, **kwargs):  # type: ignore[no-untyped-def]
+            raise RuntimeError("db down")
+
+        monkeypatch.setattr(AsyncSession, "execute", fail_execute)
+
+        sample = await make_monitor(test_sessionmaker).sample()
+
+        assert not sample.db_ok
+        assert (sample.db_latency_ms, sample.db_error) == (None, "RuntimeError")
+
+    @pytest.mark.asyncio()
+    async def test_background_sample_is_served_until_stale(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        clock = FakeClock()
+        monitor = make_monitor(test_sessionmaker, clock)
+        assert monitor.cached() is None
+
+        monitor.start()
+        while monitor.cached() is None:
+            await asyncio.sleep(0.01)
+        sample = monitor.cached()
+        await monitor.stop()
+
+        assert await monitor.current() is sample
+        clock.now = 15.5
+        assert monitor.cached() is None
+        assert await monitor.current() is not sample
+        assert monitor.describe(sample)["age_seconds"] == 15.5
+
+    @pytest.mark.asyncio()
+    async def test_report_includes_loop_lag_histogram(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        loop_monitor = EventLoopMonitor(
+            interval_seconds=0.01, threshold_seconds=0.1, report_interval_seconds=60.0, top_sites=5
+        )
+        loop_monitor.lag.observe(3.0)
+        monitor = make_monitor(test_sessionmaker, loop_monitor=loop_monitor)
+
+        report = monitor.describe(await monitor.sample())
+
+        assert report["event_loop_lag_histogram"]["count"] == 1
@@ -0,0 +1,183 @@
+"""Тесты режима баланса `ledger` и LedgerCheckpointer."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.crud.accounts import CRUDAccount
+from app.crud.payments import CRUDPayment
+from app.crud.users import CRUDUser
+from app.db.archive import PaymentArchive
+from app.models.account import Account
+from app.models.payment import Payment
+from app.services.accounts import AccountService
+from app.services.archival import PaymentArchivalService
+from app.services.ledger import LedgerCheckpointer
+from app.services.reconciliation import BalanceReconciliationService
+from app.services.webhook import WebhookService
+from app.validators.async_ import UserAsyncValidator
+from tests.constants import TestUserData, TestValidationData
+
+
+async def create_user(sessionmaker: async_sessionmaker[AsyncSession]) -> tuple[int, int]:
+    """Создаёт пользователя со счётом; возвращает user_id и account_id."""
+    async with sessionmaker() as db:
+        user = await CRUDUser().create(
+            db,
+            email=TestUserData.USER1_EMAIL,
+            full_name=TestValidationData.TEST_USER_FULL_NAME,
+            password=TestUserData.SECURE_PASSWORD_123,
+        )
+        account = await CRUDAccount().create_for_user(db, user.id)
+        await db.commit()
+        return user.id, account.id
+
+
+def make_webhook() -> WebhookService:
+    return WebhookService(
+        CRUDAccount(), CRUDPayment(), UserAsyncValidator(CRUDUser()), ledger=True
+    )
+
+
+def make_checkpointer(
+    sessionmaker: async_sessionmaker[AsyncSession], batch_size: int = 2
+) -> LedgerCheckpointer:
+    return LedgerCheckpointer(
+        sessionmaker, CRUDAccount(), CRUDPayment(), batch_size=batch_size, interval_seconds=0
+    )
+
+
+async def topup(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    transaction_id: str,
+    user_id: int,
+    account_id: int,
+    amount: str,
+) -> None:
+    async with sessionmaker() as db:
+        await make_webhook().process_topup(
+            db,
+            transaction_id=transaction_id,
+            user_id=user_id,
+            account_id=account_id,
+            amount=Decimal(amount),
+        )
+
+
+async def list_balances(
+    sessionmaker: async_sessionmaker[AsyncSession], user_id: int
+) -> list[tuple[int, Decimal, int]]:
+    service = AccountService(CRUDAccount(), CRUDUser(), ledger=True)
+    async with sessionmaker() as db:
+        accounts = await service.get_user_accounts(db, user_id)
+    return [(a.id, a.balance, a.version) for a in accounts]
+
+
+class TestLedgerMode:
+    """Пополнения в режиме `ledger` и вычисляемые балансы."""
+
+    @pytest.mark.asyncio()
+    async def test_topup_appends_payment_without_touching_account(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, account_id = await create_user(test_sessionmaker)
+        await topup(test_sessionmaker, "ledger-tx-1", user_id, account_id, "10.50")
+        await topup(test_sessionmaker, "ledger-tx-2", user_id, account_id, "4.25")
+
+        async with test_sessionmaker() as db:
+            account = await db.get(Account, account_id)
+            assert account.balance == Decimal("0.00")
+            assert account.version == 1
+            pending = await db.scalar(
+                select(func.count()).where(Payment.checkpointed.is_(False))
+            )
+            assert pending == 2
+
+        assert await list_balances(test_sessionmaker, user_id) == [
+            (account_id, Decimal("14.75"), 3)
+        ]
+
+    @pytest.mark.asyncio()
+    async def test_topup_without_account_uses_default(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, account_id = await create_user(test_sessionmaker)
+        await topup(test_sessionmaker, "ledger-tx-1", user_id, 0, "5.00")
+        await topup(test_sessionmaker, "ledger-tx-2", user_id, 0, "7.00")
+
+        balances = await list_balances(test_sessionmaker, user_id)
+        assert [balance for _, balance, _ in balances] == [Decimal("0.00"), Decimal("12.00")]
+        async with test_sessionmaker() as db:
+            defaults = await db.scalar(
+                select(func.count()).where(Account.user_id == user_id, Account.is_default)
+            )
+            assert defaults == 1
+
+    @pytest.mark.asyncio()
+    async def test_pagination_counts_accounts_not_payments(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, first_id = await create_user(test_sessionmaker)
+        async with test_sessionmaker() as db:
+            second_id = (await CRUDAccount().create_for_user(db, user_id)).id
+            await db.commit()
+        for i in range(3):
+            await topup(test_sessionmaker, f"ledger-tx-{i}", user_id, first_id, "1.00")
+        await topup(test_sessionmaker, "ledger-tx-3", user_id, second_id, "2.00")
+
+        service = AccountService(CRUDAccount(), CRUDUser(), ledger=True)
+        async with test_sessionmaker() as db:
+            page = await service.get_user_accounts(db, user_id, limit=1, offset=1)
+        assert [(a.id, a.balance) for a in page] == [(second_id, Decimal("2.00"))]
+
+
+class TestLedgerCheckpointer:
+    """Перенос неучтённых платежей в балансы."""
+
+    @pytest.mark.asyncio()
+    async def test_run_once_rolls_up_in_batches_without_changing_balance(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, account_id = await create_user(test_sessionmaker)
+        for i in range(5):
+            await topup(test_sessionmaker, f"ledger-tx-{i}", user_id, account_id, "3.10")
+        before = await list_balances(test_sessionmaker, user_id)
+
+        assert await make_checkpointer(test_sessionmaker).run_once() == 5
+        assert await make_checkpointer(test_sessionmaker).run_once() == 0
+
+        assert await list_balances(test_sessionmaker, user_id) == before
+        async with test_sessionmaker() as db:
+            account = await db.get(Account, account_id)
+            assert (account.balance, account.version) == (Decimal("15.50"), 6)
+
+    @pytest.mark.asyncio()
+    async def test_checkpointed_balances_reconcile_and_archive(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], tmp_path
+    ) -> None:
+        user_id, account_id = await create_user(test_sessionmaker)
+        await topup(test_sessionmaker, "ledger-tx-1", user_id, account_id, "8.00")
+        reconciliation = BalanceReconciliationService(
+            test_sessionmaker, CRUDAccount(), CRUDPayment(), range_size=10, concurrency=1
+        )
+        archival = PaymentArchivalService(
+            test_sessionmaker,
+            CRUDPayment(),
+            PaymentArchive(tmp_path / "archive"),
+            hot_days=-1,
+            chunk_size=10,
+            delete_batch_size=10,
+            dry_run=True,
+        )
+
+        assert (await reconciliation.run()).mismatch_count == 0
+        assert (await archival.run()).archived == 0
+
+        await make_checkpointer(test_sessionmaker).run_once()
+
+        assert (await reconciliation.run()).mismatch_count == 0
+        assert (await archival.run()).archived == 1
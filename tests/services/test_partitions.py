@@ -0,0 +1,200 @@
+"""Тесты обслуживания помесячных секций платежей."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.crud.accounts import CRUDAccount
+from app.crud.users import CRUDUser
+from app.models.payment import Payment
+from app.services.partitions import MonthPartition, PaymentPartitionService
+from tests.constants import TestUserData, TestValidationData
+
+
+NOW = datetime(2025, 11, 15, 12, tzinfo=timezone.utc)
+PAST = datetime(2000, 1, 15, 12, tzinfo=timezone.utc)
+
+
+async def create_account(sessionmaker: async_sessionmaker[AsyncSession]) -> tuple[int, int]:
+    """Создаёт пользователя со счётом."""
+    async with sessionmaker() as db:
+        user = await CRUDUser().create(
+            db,
+            email=TestUserData.USER1_EMAIL,
+            full_name=TestValidationData.TEST_USER_FULL_NAME,
+            password=TestUserData.SECURE_PASSWORD_123,
+        )
+        account = await CRUDAccount().create_for_user(db, user.id)
+        await db.commit()
+        return user.id, account.id
+
+
+async def insert_payment(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    owner: tuple[int, int],
+    transaction_id: str,
+    created_at: datetime,
+) -> None:
+    """Вставляет платёж с заданным моментом создания."""
+    user_id, account_id = owner
+    async with sessionmaker() as db:
+        db.add(
+            Payment(
+                transaction_id=transaction_id,
+                user_id=user_id,
+                account_id=account_id,
+                amount=Decimal("1.00"),
+                created_at=created_at,
+            )
+        )
+        await db.commit()
+
+
+async def partition_of(sessionmaker: async_sessionmaker[AsyncSession], transaction_id: str) -> str:
+    """Возвращает имя секции, в которой лежит платёж."""
+    async with sessionmaker() as db:
+        return await db.scalar(
+            text("SELECT tableoid::regclass::text FROM payments WHERE transaction_id = :t"),
+            {"t": transaction_id},
+        )
+
+
+class TestMonthPartition:
+    """Границы и имена секций."""
+
+    def test_name_and_bounds(self) -> None:
+        partition = MonthPartition.containing(NOW)
+
+        assert partition.name == "payments_p2025_11"
+        assert partition.start == datetime(2025, 11, 1, tzinfo=timezone.utc)
+        assert partition.end == datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+    def test_shift_crosses_year(self) -> None:
+        partition = MonthPartition(2025, 11)
+
+        assert partition.shift(2) == MonthPartition(2026, 1)
+        assert partition.shift(-11) == MonthPartition(2024, 12)
+
+    def test_containing_uses_utc(self) -> None:
+        moment = datetime(2025, 12, 1, 1, tzinfo=timezone(timedelta(hours=3)))
+
+        assert MonthPartition.containing(moment) == MonthPartition(2025, 11)
+
+    def test_from_name_ignores_foreign_tables(self) -> None:
+        assert MonthPartition.from_name("payments_p2024_03") == MonthPartition(2024, 3)
+        assert MonthPartition.from_name("payments_default") is None
+        assert MonthPartition.from_name("payment_transaction_ids") is None
+
+
+class TestPartitionPlan:
+    """Планирование создания и отсоединения секций."""
+
+    def make_service(self, **kwargs: int) -> PaymentPartitionService:
+        return PaymentPartitionService(None, clock=lambda: NOW, **kwargs)  # type: ignore[arg-type]
+
+    def test_creates_missing_future_partitions(self) -> None:
+        service = self.make_service(months_ahead=2)
+
+        to_create, to_detach = service.plan({"payments_p2025_11"})
+
+        assert [p.name for p in to_create] == ["payments_p2025_12", "payments_p2026_01"]
+        assert to_detach == []
+
+    def test_detaches_partitions_older_than_retention(self) -> None:
+        service = self.make_service(months_ahead=0, retention_months=2)
+        existing = {"payments_p2025_07", "payments_p2025_08", "payments_p2025_09",
+                    "payments_p2025_11", "payments_default"}
+
+        to_create, to_detach = service.plan(existing)
+
+        assert to_create == []
+        assert [p.name for p in to_detach] == ["payments_p2025_07", "payments_p2025_08"]
+
+    def test_detach_can_be_skipped(self) -> None:
+        service = self.make_service(months_ahead=0, retention_months=1)
+
+        _, to_detach = service.plan({"payments_p2020_01", "payments_p2025_11"}, detach=False)
+
+        assert to_detach == []
+
+    @pytest.mark.asyncio()
+    async def test_noop_on_sqlite(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        service = PaymentPartitionService(test_sessionmaker, months_ahead=3, retention_months=1)
+
+        report = await service.run()
+
+        assert report.partitioned is False
+        assert report.created == [] and report.detached == []
+
+
+class TestPartitionsOnPostgres:
+    """Миграция секционирования, триггеры ключей и обслуживание секций на PostgreSQL."""
+
+    @pytest.mark.asyncio()
+    @pytest.mark.postgresql()
+    async def test_duplicate_transaction_rejected_across_partitions(
+        self, migrated_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        owner = await create_account(migrated_sessionmaker)
+        now = datetime.now(timezone.utc)
+        await insert_payment(migrated_sessionmaker, owner, "pg-dup", now)
+
+        with pytest.raises(IntegrityError):
+            await insert_payment(migrated_sessionmaker, owner, "pg-dup", now - timedelta(days=62))
+
+    @pytest.mark.asyncio()
+    @pytest.mark.postgresql()
+    async def test_payment_outside_partitions_goes_to_default(
+        self, migrated_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        owner = await create_account(migrated_sessionmaker)
+
+        await insert_payment(migrated_sessionmaker, owner, "pg-old", PAST)
+
+        assert await partition_of(migrated_sessionmaker, "pg-old") == "payments_default"
+
+    @pytest.mark.asyncio()
+    @pytest.mark.postgresql()
+    async def test_new_partition_takes_rows_from_default_and_keeps_keys(
+        self, migrated_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        owner = await create_account(migrated_sessionmaker)
+        await insert_payment(migrated_sessionmaker, owner, "pg-old", PAST)
+        service = PaymentPartitionService(migrated_sessionmaker, months_ahead=0, clock=lambda: PAST)
+
+        report = await service.ensure_future()
+
+        assert report.created == ["payments_p2000_01"]
+        assert await partition_of(migrated_sessionmaker, "pg-old") == "payments_p2000_01"
+        with pytest.raises(IntegrityError):
+            await insert_payment(migrated_sessionmaker, owner, "pg-old", PAST)
+
+    @pytest.mark.asyncio()
+    @pytest.mark.postgresql()
+    async def test_retention_detaches_only_empty_partitions(
+        self, migrated_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        owner = await create_account(migrated_sessionmaker)
+        await PaymentPartitionService(
+            migrated_sessionmaker, months_ahead=1, clock=lambda: PAST
+        ).ensure_future()
+        await insert_payment(migrated_sessionmaker, owner, "pg-old", PAST)
+        service = PaymentPartitionService(
+            migrated_sessionmaker, months_ahead=0, retention_months=1
+        )
+
+        report = await service.run()
+
+        assert report.detached == ["payments_p2000_02"]
+        assert report.retained == ["payments_p2000_01"]
+        async with migrated_sessionmaker() as db:
+            kept = list(await db.scalars(select(Payment.transaction_id)))
+        assert kept == ["pg-old"]
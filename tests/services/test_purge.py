@@ -0,0 +1,130 @@
+"""Тесты UserPurgeService."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.constants import ErrorMessages, PurgeJobStatus
+from app.core.errors import NotFoundError
+from app.crud.accounts import CRUDAccount
+from app.crud.payments import CRUDPayment
+from app.crud.users import CRUDUser
+from app.models.account import Account
+from app.models.payment import Payment
+from app.services.purge import UserPurgeService
+from app.validators.async_ import UserAsyncValidator
+from tests.constants import TestDomainIds, TestUserData, TestValidationData
+
+
+def make_service(
+    sessionmaker: async_sessionmaker[AsyncSession], batch_size: int = 2
+) -> UserPurgeService:
+    users = CRUDUser()
+    return UserPurgeService(
+        sessionmaker,
+        users,
+        CRUDAccount(),
+        CRUDPayment(),
+        UserAsyncValidator(users),
+        batch_size=batch_size,
+    )
+
+
+async def create_user_with_history(
+    sessionmaker: async_sessionmaker[AsyncSession], accounts: int, payments_per_account: int
+) -> int:
+    async with sessionmaker() as db:
+        user = await CRUDUser().create(
+            db,
+            email=TestUserData.TEST_EMAIL_GENERIC,
+            full_name=TestValidationData.TEST_USER_FULL_NAME,
+            password=TestUserData.SECURE_PASSWORD_123,
+        )
+        for a in range(accounts):
+            account = await CRUDAccount().create_for_user(db, user.id)
+            for p in range(payments_per_account):
+                await CRUDPayment().create(
+                    db,
+                    transaction_id=f"purge-{a}-{p}",
+                    user_id=user.id,
+                    account_id=account.id,
+                    amount=Decimal("1.00"),
+                )
+        await db.commit()
+        return user.id
+
+
+async def count_rows(sessionmaker: async_sessionmaker[AsyncSession], model, user_id: int) -> int:
+    async with sessionmaker() as db:
+        stmt = select(func.count()).select_from(model).where(model.user_id == user_id)
+        return (await db.execute(stmt)).scalar_one()
+
+
+class TestUserPurgeService:
+    """Тесты фоновой пакетной очистки."""
+
+    @pytest.mark.asyncio()
+    async def test_purge_deletes_history_in_batches(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id = await create_user_with_history(test_sessionmaker, 3, 3)
+        service = make_service(test_sessionmaker)
+
+        async with test_sessionmaker() as db:
+            job = await service.start_purge(db, user_id)
+        await service.wait_all()
+
+        assert service.get_job(job.id) is job
+        assert job.status == PurgeJobStatus.DONE
+        assert (job.payments_deleted, job.accounts_deleted) == (9, 3)
+        assert await count_rows(test_sessionmaker, Payment, user_id) == 0
+        assert await count_rows(test_sessionmaker, Account, user_id) == 0
+        async with test_sessionmaker() as db:
+            assert await CRUDUser().get(db, user_id) is None
+
+    @pytest.mark.asyncio()
+    async def test_active_job_is_reused(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id = await create_user_with_history(test_sessionmaker, 1, 1)
+        service = make_service(test_sessionmaker)
+
+        async with test_sessionmaker() as db:
+            first = await service.start_purge(db, user_id)
+            second = await service.start_purge(db, user_id)
+
+        assert first is second
+        await service.wait_all()
+
+    @pytest.mark.asyncio()
+    async def test_purge_unknown_user(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        service = make_service(test_sessionmaker)
+        async with test_sessionmaker() as db:
+            with pytest.raises(NotFoundError, match=ErrorMessages.USER_NOT_FOUND):
+                await service.start_purge(db, TestDomainIds.NONEXISTENT_USER_ID)
+        with pytest.raises(NotFoundError, match=ErrorMessages.PURGE_JOB_NOT_FOUND):
+            service.get_job("missing")
+
+    @pytest.mark.asyncio()
+    async def test_failure_is_reported(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id = await create_user_with_history(test_sessionmaker, 1, 1)
+        service = make_service(test_sessionmaker)
+
+        async def broken(*args, **kwargs) -> int:
+            raise RuntimeError("boom")
+
+        service.payments_crud.delete_batch_for_user = broken
+        async with test_sessionmaker() as db:
+            job = await service.start_purge(db, user_id)
+        await service.wait_all()
+
+        assert job.status == PurgeJobStatus.FAILED
+        assert job.error == "boom"
@@ -0,0 +1,218 @@
+"""Тесты BalanceReconciliationService."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.crud.accounts import CRUDAccount
+from app.crud.payments import CRUDPayment
+from app.crud.users import CRUDUser
+from app.db.archive import PaymentArchive
+from app.models.account import Account
+from app.models.payment import Payment
+from app.services.archival import PaymentArchivalService
+from app.services.partitions import PaymentPartitionService
+from app.services.reconciliation import (
+    BalanceMismatch,
+    BalanceReconciliationService,
+    ReconciliationCheckpoint,
+)
+from tests.constants import TestUserData, TestValidationData
+
+
+async def create_accounts(
+    sessionmaker: async_sessionmaker[AsyncSession], count: int
+) -> list[int]:
+    """Создаёт счета с одним платежом на 10.00 и согласованным балансом."""
+    async with sessionmaker() as db:
+        user = await CRUDUser().create(
+            db,
+            email=TestUserData.USER1_EMAIL,
+            full_name=TestValidationData.TEST_USER_FULL_NAME,
+            password=TestUserData.SECURE_PASSWORD_123,
+        )
+        ids = []
+        for i in range(count):
+            account = await CRUDAccount().create_for_user(db, user.id)
+            account.balance = Decimal("10.00")
+            await CRUDPayment().create(
+                db,
+                transaction_id=f"reconcile-tx-{i}",
+                user_id=user.id,
+                account_id=account.id,
+                amount=Decimal("10.00"),
+            )
+            ids.append(account.id)
+        await db.commit()
+        return ids
+
+
+async def set_balance(
+    sessionmaker: async_sessionmaker[AsyncSession], account_id: int, balance: str
+) -> None:
+    async with sessionmaker() as db:
+        await db.execute(
+            update(Account).where(Account.id == account_id).values(balance=Decimal(balance))
+        )
+        await db.commit()
+
+
+def make_service(
+    sessionmaker: async_sessionmaker[AsyncSession], **kwargs: object
+) -> BalanceReconciliationService:
+    options = {"range_size": 2, "concurrency": 3, **kwargs}
+    return BalanceReconciliationService(sessionmaker, CRUDAccount(), CRUDPayment(), **options)
+
+
+class FailingPayments(CRUDPayment):
+    """CRUD платежей, падающий на диапазоне с заданным началом."""
+
+    def __init__(self, fail_low: int) -> None:
+        super().__init__()
+        self.fail_low = fail_low
+
+    async def totals_by_account(
+        self, db: AsyncSession, low: int, high: int
+    ) -> dict[int, Decimal]:
+        if low == self.fail_low:
+            raise RuntimeError("boom")
+        return await super().totals_by_account(db, low, high)
+
+
+class TestBalanceReconciliation:
+    """Сверка балансов по диапазонам счетов."""
+
+    @pytest.mark.asyncio()
+    async def test_reports_mismatches(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        ids = await create_accounts(test_sessionmaker, 7)
+        await set_balance(test_sessionmaker, ids[4], "15.00")
+        streamed: list[BalanceMismatch] = []
+
+        job = await make_service(test_sessionmaker).run(on_mismatch=streamed.append)
+
+        assert job.status == "done"
+        assert (job.accounts_checked, job.mismatch_count) == (7, 1)
+        assert job.ranges_done == job.ranges_total
+        assert streamed == job.mismatches
+        (mismatch,) = job.mismatches
+        assert mismatch.account_id == ids[4]
+        assert mismatch.payments_total == Decimal("10.00")
+        assert mismatch.difference == Decimal("5.00")
+
+    @pytest.mark.asyncio()
+    async def test_keeps_only_max_reported(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        ids = await create_accounts(test_sessionmaker, 4)
+        for account_id in ids:
+            await set_balance(test_sessionmaker, account_id, "0.00")
+
+        job = await make_service(test_sessionmaker, max_reported=1).run()
+
+        assert job.mismatch_count == 4
+        assert len(job.mismatches) == 1
+
+    @pytest.mark.asyncio()
+    async def test_resumes_from_checkpoint(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path
+    ) -> None:
+        ids = await create_accounts(test_sessionmaker, 6)
+        checkpoint = tmp_path / "reconciliation.json"
+        first = ids[0] // 2 * 2
+        fail_low = first + 2
+
+        service = BalanceReconciliationService(
+            test_sessionmaker,
+            CRUDAccount(),
+            FailingPayments(fail_low),
+            range_size=2,
+            concurrency=1,
+            checkpoint_path=checkpoint,
+        )
+        failed = await service.run()
+        assert failed.status == "failed"
+        saved = json.loads(checkpoint.read_text())
+        assert saved["done_below"] == fail_low
+
+        resumed = await make_service(test_sessionmaker, checkpoint_path=checkpoint).run()
+
+        assert resumed.status == "done"
+        assert resumed.accounts_checked == len(ids)
+        assert resumed.ranges_done == resumed.ranges_total
+        assert not checkpoint.exists()
+
+    @pytest.mark.asyncio()
+    async def test_counts_archived_payments(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path
+    ) -> None:
+        await create_accounts(test_sessionmaker, 3)
+        archive = PaymentArchive(tmp_path / "archive")
+        await PaymentArchivalService(
+            test_sessionmaker,
+            CRUDPayment(archive),
+            archive,
+            hot_days=0,
+            chunk_size=2,
+            delete_batch_size=10,
+            clock=lambda: datetime.now(timezone.utc) + timedelta(days=1),
+        ).run()
+
+        job = await make_service(test_sessionmaker, archive=archive).run()
+
+        assert (job.accounts_checked, job.mismatch_count) == (3, 0)
+
+    @pytest.mark.asyncio()
+    @pytest.mark.postgresql()
+    async def test_counts_history_of_detached_partition(
+        self, migrated_sessionmaker: async_sessionmaker[AsyncSession], tmp_path: Path
+    ) -> None:
+        past = datetime(2000, 1, 15, tzinfo=timezone.utc)
+        await PaymentPartitionService(
+            migrated_sessionmaker, months_ahead=0, clock=lambda: past
+        ).ensure_future()
+        await create_accounts(migrated_sessionmaker, 3)
+        async with migrated_sessionmaker() as db:
+            await db.execute(update(Payment).values(created_at=past))
+            await db.commit()
+        archive = PaymentArchive(tmp_path / "archive")
+        await PaymentArchivalService(
+            migrated_sessionmaker,
+            CRUDPayment(archive),
+            archive,
+            hot_days=1,
+            chunk_size=2,
+            delete_batch_size=10,
+        ).run()
+        partitions = PaymentPartitionService(
+            migrated_sessionmaker, months_ahead=0, retention_months=1
+        )
+
+        report = await partitions.run()
+        job = await make_service(migrated_sessionmaker, archive=archive).run()
+
+        assert report.detached == ["payments_p2000_01"]
+        assert (job.accounts_checked, job.mismatch_count) == (3, 0)
+
+
+class TestReconciliationCheckpoint:
+    """Сплошная граница пройденных диапазонов."""
+
+    def test_mark_done_advances_contiguous_prefix(self) -> None:
+        checkpoint = ReconciliationCheckpoint(range_size=10, done_below=0)
+
+        checkpoint.mark_done(20)
+        checkpoint.mark_done(0)
+        assert (checkpoint.done_below, checkpoint.done) == (10, {20})
+        checkpoint.mark_done(10)
+
+        assert (checkpoint.done_below, checkpoint.done) == (30, set())
+        assert checkpoint.is_done(25) and not checkpoint.is_done(30)
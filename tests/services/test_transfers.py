@@ -0,0 +1,275 @@
+"""Тесты TransferService."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.errors import (
+    DuplicateTransactionError,
+    InsufficientFundsError,
+    NotFoundError,
+    ValidationError,
+)
+from app.crud.accounts import CRUDAccount
+from app.crud.debits import CRUDDebit
+from app.crud.payments import CRUDPayment
+from app.crud.users import CRUDUser
+from app.models.account import Account
+from app.models.payment import Payment
+from app.services.reconciliation import BalanceReconciliationService
+from app.services.transfers import TransferService
+from app.services.webhook import WebhookService
+from app.validators.async_ import UserAsyncValidator
+from tests.constants import TestUserData, TestValidationData
+
+
+async def create_user_with_accounts(
+    sessionmaker: async_sessionmaker[AsyncSession], email: str, balances: list[str]
+) -> tuple[int, list[int]]:
+    """Создаёт пользователя со счетами, пополненными на `balances`."""
+    async with sessionmaker() as db:
+        user = await CRUDUser().create(
+            db,
+            email=email,
+            full_name=TestValidationData.TEST_USER_FULL_NAME,
+            password=TestUserData.SECURE_PASSWORD_123,
+        )
+        account_ids = []
+        for i, balance in enumerate(balances):
+            account = await CRUDAccount().create_for_user(db, user.id)
+            account.balance = Decimal(balance)
+            await CRUDPayment().create(
+                db,
+                transaction_id=f"transfer-seed-{user.id}-{i}",
+                user_id=user.id,
+                account_id=account.id,
+                amount=Decimal(balance),
+            )
+            account_ids.append(account.id)
+        await db.commit()
+        return user.id, account_ids
+
+
+def make_service(*, ledger: bool = False) -> TransferService:
+    return TransferService(CRUDAccount(), CRUDPayment(), CRUDDebit(), ledger=ledger)
+
+
+async def transfer(
+    sessionmaker: async_sessionmaker[AsyncSession],
+    user_id: int,
+    from_account_id: int,
+    to_account_id: int,
+    transaction_id: str,
+    amount: str,
+    *,
+    ledger: bool = False,
+) -> Decimal:
+    async with sessionmaker() as db:
+        _, balance = await make_service(ledger=ledger).transfer(
+            db,
+            user_id,
+            transaction_id=transaction_id,
+            from_account_id=from_account_id,
+            to_account_id=to_account_id,
+            amount=Decimal(amount),
+        )
+        return balance
+
+
+async def load_balances(
+    sessionmaker: async_sessionmaker[AsyncSession], account_ids: list[int]
+) -> list[tuple[Decimal, int]]:
+    async with sessionmaker() as db:
+        result = await db.execute(
+            select(Account.balance, Account.version)
+            .where(Account.id.in_(account_ids))
+            .order_by(Account.id)
+        )
+        return [tuple(row) for row in result]
+
+
+class TestTransferService:
+    """Переводы между счетами."""
+
+    @pytest.mark.asyncio()
+    async def test_transfer_moves_money_between_users(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        sender, (source,) = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER1_EMAIL, ["10.00"]
+        )
+        _, (target,) = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER2_EMAIL, ["1.00"]
+        )
+
+        balance = await transfer(test_sessionmaker, sender, source, target, "transfer-1", "4.00")
+
+        assert balance == Decimal("6.00")
+        assert await load_balances(test_sessionmaker, [source, target]) == [
+            (Decimal("6.00"), 2),
+            (Decimal("5.00"), 2),
+        ]
+        reconciliation = BalanceReconciliationService(
+            test_sessionmaker, CRUDAccount(), CRUDPayment(), range_size=10, concurrency=1
+        )
+        assert (await reconciliation.run()).mismatch_count == 0
+
+    @pytest.mark.asyncio()
+    async def test_transfer_to_lower_id_between_own_accounts(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, (first, second) = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER1_EMAIL, ["0.00", "3.00"]
+        )
+
+        await transfer(test_sessionmaker, user_id, second, first, "transfer-1", "3.00")
+
+        assert await load_balances(test_sessionmaker, [first, second]) == [
+            (Decimal("3.00"), 2),
+            (Decimal("0.00"), 2),
+        ]
+
+    @pytest.mark.asyncio()
+    async def test_rejections_leave_balances_untouched(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, (source, target) = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER1_EMAIL, ["5.00", "0.00"]
+        )
+        other_id, (foreign,) = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER2_EMAIL, ["5.00"]
+        )
+
+        with pytest.raises(InsufficientFundsError):
+            await transfer(test_sessionmaker, user_id, source, target, "transfer-1", "5.01")
+        with pytest.raises(ValidationError):
+            await transfer(test_sessionmaker, user_id, source, source, "transfer-2", "1.00")
+        with pytest.raises(NotFoundError):
+            await transfer(test_sessionmaker, user_id, foreign, target, "transfer-3", "1.00")
+        with pytest.raises(NotFoundError):
+            await transfer(test_sessionmaker, user_id, source, foreign + 1, "transfer-4", "1.00")
+
+        assert await load_balances(test_sessionmaker, [source, target, foreign]) == [
+            (Decimal("5.00"), 1),
+            (Decimal("0.00"), 1),
+            (Decimal("5.00"), 1),
+        ]
+
+    @pytest.mark.asyncio()
+    async def test_repeated_transaction_is_rejected(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, (source, target) = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER1_EMAIL, ["5.00", "0.00"]
+        )
+        await transfer(test_sessionmaker, user_id, source, target, "transfer-1", "1.00")
+
+        with pytest.raises(DuplicateTransactionError):
+            await transfer(test_sessionmaker, user_id, source, target, "transfer-1", "1.00")
+
+        assert await load_balances(test_sessionmaker, [source, target]) == [
+            (Decimal("4.00"), 2),
+            (Decimal("1.00"), 2),
+        ]
+
+    @pytest.mark.asyncio()
+    async def test_ledger_mode_credits_pending_payment(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, (source, target) = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER1_EMAIL, ["5.00", "0.00"]
+        )
+
+        await transfer(test_sessionmaker, user_id, source, target, "transfer-1", "2.00", ledger=True)
+
+        assert await load_balances(test_sessionmaker, [source, target]) == [
+            (Decimal("3.00"), 2),
+            (Decimal("0.00"), 1),
+        ]
+        async with test_sessionmaker() as db:
+            credit = await db.scalar(
+                select(Payment).where(Payment.transaction_id == "transfer:transfer-1")
+            )
+        assert (credit.account_id, credit.checkpointed) == (target, False)
+
+    @pytest.mark.asyncio()
+    async def test_ledger_mode_locks_both_accounts(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, (source, target) = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER1_EMAIL, ["5.00", "0.00"]
+        )
+        accounts = CRUDAccount()
+        accounts.list_by_ids_locked = AsyncMock(wraps=accounts.list_by_ids_locked)
+        service = TransferService(accounts, CRUDPayment(), CRUDDebit(), ledger=True)
+
+        async with test_sessionmaker() as db:
+            await service.transfer(
+                db,
+                user_id,
+                transaction_id="transfer-1",
+                from_account_id=source,
+                to_account_id=target,
+                amount=Decimal("1.00"),
+            )
+
+        accounts.list_by_ids_locked.assert_awaited_once()
+        assert accounts.list_by_ids_locked.await_args.args[1] == [source, target]
+
+    @pytest.mark.asyncio()
+    async def test_transfer_does_not_take_provider_transaction_id(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, (source, target) = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER1_EMAIL, ["5.00", "0.00"]
+        )
+        await transfer(test_sessionmaker, user_id, source, target, "x1", "1.00")
+        webhook = WebhookService(CRUDAccount(), CRUDPayment(), UserAsyncValidator(CRUDUser()))
+
+        async with test_sessionmaker() as db:
+            await webhook.process_topup(
+                db,
+                transaction_id="x1",
+                user_id=user_id,
+                account_id=target,
+                amount=Decimal("3.00"),
+            )
+
+        assert await load_balances(test_sessionmaker, [source, target]) == [
+            (Decimal("4.00"), 2),
+            (Decimal("4.00"), 3),
+        ]
+
+    @pytest.mark.asyncio()
+    async def test_integrity_error_without_duplicate_is_not_409(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        user_id, (source, target) = await create_user_with_accounts(
+            test_sessionmaker, TestUserData.USER1_EMAIL, ["5.00", "0.00"]
+        )
+        debits = CRUDDebit()
+        debits.create = AsyncMock(side_effect=IntegrityError("INSERT", {}, Exception("fk")))
+        service = TransferService(CRUDAccount(), CRUDPayment(), debits)
+
+        async with test_sessionmaker() as db:
+            with pytest.raises(IntegrityError):
+                await service.transfer(
+                    db,
+                    user_id,
+                    transaction_id="transfer-1",
+                    from_account_id=source,
+                    to_account_id=target,
+                    amount=Decimal("1.00"),
+                )
+
+        assert await load_balances(test_sessionmaker, [source, target]) == [
+            (Decimal("5.00"), 1),
+            (Decimal("0.00"), 1),
+        ]
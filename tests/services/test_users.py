@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+from decimal import Decimal
+
 import pytest
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.constants import ErrorMessages
 from app.core.errors import NotFoundError, ValidationError
+from app.crud.accounts import CRUDAccount
+from app.crud.payments import CRUDPayment
 from app.crud.users import CRUDUser
+from app.db.session import QueryCounter
+from app.models.account import Account
+from app.models.payment import Payment
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 from app.services.users import UserService
@@ -303,6 +311,38 @@ class TestUserService:
             deleted_user = await users_crud.get(db, user.id)
             assert deleted_user is None
 
+    @pytest.mark.asyncio()
+    async def test_delete_user_cascades_to_accounts_and_payments(
+        self,
+        user_service: UserService,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+    ) -> None:
+        """Счета и платежи удаляются каскадом внешних ключей и на SQLite."""
+        async with test_sessionmaker() as db:
+            user = await user_service.create_user(
+                db,
+                UserCreate(
+                    email=TestUserData.DELETE_EMAIL,
+                    full_name=TestUserData.DELETE_FULL_NAME,
+                    password=TestUserData.PASS_123,
+                ),
+            )
+            account = await CRUDAccount().create_for_user(db, user.id)
+            await CRUDPayment().create(
+                db,
+                transaction_id=TestDomainIds.TEST_TX_1,
+                user_id=user.id,
+                account_id=account.id,
+                amount=Decimal("10.00"),
+            )
+            await db.commit()
+
+            await user_service.delete_user(db, user.id)
+
+            accounts = await db.scalar(select(func.count()).select_from(Account))
+            payments = await db.scalar(select(func.count()).select_from(Payment))
+            assert (accounts, payments) == (0, 0)
+
     @pytest.mark.asyncio()
     async def test_delete_user_not_found(
         self,
@@ -375,3 +415,51 @@ class TestUserService:
                 ValidationError, match=ErrorMessages.EMAIL_ALREADY_EXISTS
             ):
                 await service.create_user(db, user_data)
+
+    @pytest.mark.asyncio()
+    async def test_create_user_query_count(
+        self,
+        user_service: UserService,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+        query_counter: QueryCounter,
+    ) -> None:
+        """Создание пользователя: проверка email и INSERT ... RETURNING, без refresh."""
+        async with test_sessionmaker() as db:
+            user_data = UserCreate(
+                email=TestUserData.NEW_USER_EMAIL,
+                full_name=TestUserData.NEW_USER_FULL_NAME,
+                password=TestUserData.NEW_PASS_123,
+            )
+            query_counter.clear()
+
+            user = await user_service.create_user(db, user_data)
+
+            assert len(query_counter) == 2
+            assert user.id is not None
+            assert user.created_at is not None
+
+    @pytest.mark.asyncio()
+    async def test_update_user_query_count(
+        self,
+        user_service: UserService,
+        test_sessionmaker: async_sessionmaker[AsyncSession],
+        query_counter: QueryCounter,
+    ) -> None:
+        """Обновление email: загрузка, проверка уникальности и UPDATE, без refresh."""
+        async with test_sessionmaker() as db:
+            user = await user_service.create_user(
+                db,
+                UserCreate(
+                    email=TestUserData.OLD_EMAIL,
+                    full_name=TestUserData.UPDATE_FULL_NAME,
+                    password=TestUserData.PASS_123,
+                ),
+            )
+            query_counter.clear()
+
+            result = await user_service.update_user(
+                db, user.id, UserUpdate(email=TestUserData.NEW_EMAIL)
+            )
+
+            assert len(query_counter) == 3
+            assert result.email == TestUserData.NEW_EMAIL
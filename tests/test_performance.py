@@ -947,3 +947,231 @@ async def test_decimal_precision_postgresql(
     # Проверяем производительность
     payments_per_second = len(precision_amounts) / processing_time
     assert payments_per_second > 1, f'Только {payments_per_second:.1f} платежей в секунду'
+
+
+@pytest.mark.asyncio()
+@pytest.mark.stress()
+async def test_domain_error_flood_postgresql(
+    performance_client: AsyncClient,
+    performance_sessionmaker: async_sessionmaker[AsyncSession],
+    make_performance_token: callable,  # type: ignore[type-arg]
+) -> None:
+    """Бенчмарк пропускной способности при потоке доменных ошибок (PostgreSQL)."""
+    admin_data = await create_test_user(
+        performance_sessionmaker,
+        TestUserData.ADMIN_EMAIL,
+        TestUserData.ADMIN_FULL_NAME,
+        TestUserData.ADMIN_PASSWORD,
+        is_admin=True,
+    )
+    admin_token = make_performance_token(admin_data['id'])
+
+    # Неверная подпись -> ValidationError (400), несуществующий пользователь -> NotFoundError (404)
+    bad_signature = {
+        'transaction_id': 'flood-tx',
+        'user_id': admin_data['id'],
+        'account_id': 0,
+        'amount': '10.00',
+        'signature': 'invalid',
+    }
+
+    def flood_requests():
+        return [
+            performance_client.post('/api/v1/webhook/payment', json=bad_signature),
+            performance_client.get(
+                '/api/v1/admin/users/999999',
+                headers={'Authorization': f'Bearer {admin_token}'},
+            ),
+        ]
+
+    all_tasks = []
+    for _ in range(250):
+        all_tasks.extend(flood_requests())
+
+    start_time = time.time()
+    results = await asyncio.gather(*all_tasks, return_exceptions=True)
+    processing_time = time.time() - start_time
+
+    statuses = [r.status_code for r in results if hasattr(r, 'status_code')]
+    assert len(statuses) == len(all_tasks)
+    assert set(statuses) == {status.HTTP_400_BAD_REQUEST, status.HTTP_404_NOT_FOUND}
+
+    requests_per_second = len(all_tasks) / processing_time
+    print(f'Доменных ошибок в секунду: {requests_per_second:.1f}')
+    assert requests_per_second > 20, f'Только {requests_per_second:.1f} запросов в секунду'
+
+
+@pytest.mark.asyncio()
+@pytest.mark.slow()
+async def test_crud_template_execution_postgresql(
+    performance_sessionmaker: async_sessionmaker[AsyncSession],
+) -> None:
+    """Бенчмарк выполнения шаблонных запросов CRUD с кэшем prepared statement asyncpg."""
+    from sqlalchemy import select
+
+    from app.crud.accounts import CRUDAccount
+    from app.models.user import User
+
+    user_data = await create_test_user(
+        performance_sessionmaker,
+        TestUserData.USER_EMAIL,
+        TestUserData.USER_FULL_NAME,
+        TestUserData.USER_PASSWORD,
+    )
+    users, accounts = CRUDUser(), CRUDAccount()
+    iterations = 500
+
+    async with performance_sessionmaker() as db:
+        account_id = (await accounts.create_for_user(db, user_data['id'])).id
+        await db.commit()
+
+        start_time = time.time()
+        for _ in range(iterations):
+            await db.execute(select(User).where(User.email == TestUserData.USER_EMAIL))
+        ad_hoc_time = time.time() - start_time
+
+        start_time = time.time()
+        for _ in range(iterations):
+            await users.get_by_email(db, TestUserData.USER_EMAIL)
+            await accounts.get_for_user(db, account_id, user_data['id'])
+        templated_time = (time.time() - start_time) / 2
+
+    print(
+        f'Ad-hoc: {ad_hoc_time / iterations * 1e6:.0f} мкс/запрос, '
+        f'шаблон: {templated_time / iterations * 1e6:.0f} мкс/запрос'
+    )
+    assert templated_time < ad_hoc_time * 1.5
+
+
+@pytest.mark.asyncio()
+@pytest.mark.stress()
+async def test_concurrent_debits_no_oversell_postgresql(
+    performance_client: AsyncClient,
+    performance_sessionmaker: async_sessionmaker[AsyncSession],
+    make_performance_token: callable,  # type: ignore[type-arg]
+) -> None:
+    """Стресс-тест параллельных списаний с одного счёта: без ухода в минус (PostgreSQL)."""
+    from sqlalchemy import func, select
+
+    from app.crud.accounts import CRUDAccount
+    from app.models.account import Account
+    from app.models.debit import Debit
+
+    user_data = await create_test_user(
+        performance_sessionmaker,
+        TestUserData.USER_EMAIL,
+        TestUserData.USER_FULL_NAME,
+        TestUserData.USER_PASSWORD,
+    )
+    async with performance_sessionmaker() as db:
+        account = await CRUDAccount().create_for_user(db, user_data['id'])
+        account.balance = Decimal('100.00')
+        await db.commit()
+        account_id = account.id
+    token = make_performance_token(user_data['id'])
+    path = f'/api/v1/users/{user_data["id"]}/accounts/{account_id}/debits'
+
+    # 300 списаний по 1.00 при балансе 100.00: успешных должно быть ровно 100
+    tasks = [
+        performance_client.post(
+            path,
+            json={'transaction_id': f'debit-stress-{i}', 'amount': '1.00'},
+            headers={'Authorization': f'Bearer {token}'},
+        )
+        for i in range(300)
+    ]
+
+    start_time = time.time()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    processing_time = time.time() - start_time
+
+    statuses = [r.status_code for r in results if hasattr(r, 'status_code')]
+    assert len(statuses) == len(tasks)
+    assert statuses.count(status.HTTP_201_CREATED) == 100
+    assert statuses.count(status.HTTP_409_CONFLICT) == 200
+
+    async with performance_sessionmaker() as db:
+        balance = await db.scalar(select(Account.balance).where(Account.id == account_id))
+        debited = await db.scalar(
+            select(func.count()).select_from(Debit).where(Debit.account_id == account_id)
+        )
+    assert balance == Decimal('0.00')
+    assert debited == 100
+
+    debits_per_second = len(tasks) / processing_time
+    print(f'Списаний в секунду: {debits_per_second:.1f}')
+
+
+@pytest.mark.asyncio()
+@pytest.mark.stress()
+async def test_random_transfers_conserve_total_postgresql(
+    performance_client: AsyncClient,
+    performance_sessionmaker: async_sessionmaker[AsyncSession],
+    make_performance_token: callable,  # type: ignore[type-arg]
+) -> None:
+    """Стресс-тест встречных переводов: без взаимоблокировок, сумма балансов сохраняется."""
+    import random
+
+    from sqlalchemy import func, select
+
+    from app.crud.accounts import CRUDAccount
+    from app.models.account import Account
+
+    admin_data = await create_test_user(
+        performance_sessionmaker,
+        TestUserData.ADMIN_EMAIL,
+        TestUserData.ADMIN_FULL_NAME,
+        TestUserData.ADMIN_PASSWORD,
+        is_admin=True,
+    )
+    user_id = admin_data['id']
+    async with performance_sessionmaker() as db:
+        account_ids = []
+        for _ in range(5):
+            account = await CRUDAccount().create_for_user(db, user_id)
+            account.balance = Decimal('100.00')
+            account_ids.append(account.id)
+        await db.commit()
+    token = make_performance_token(user_id)
+    initial_total = Decimal('500.00')
+
+    # Мало счетов и много переводов: пары A→B и B→A постоянно встречаются
+    rng = random.Random(42)
+    tasks = []
+    for i in range(400):
+        source, target = rng.sample(account_ids, 2)
+        tasks.append(
+            performance_client.post(
+                f'/api/v1/users/{user_id}/transfers',
+                json={
+                    'transaction_id': f'transfer-stress-{i}',
+                    'from_account_id': source,
+                    'to_account_id': target,
+                    'amount': str(Decimal(rng.randint(1, 3000)) / 100),
+                },
+                headers={'Authorization': f'Bearer {token}'},
+            )
+        )
+
+    start_time = time.time()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    processing_time = time.time() - start_time
+
+    statuses = [r.status_code for r in results if hasattr(r, 'status_code')]
+    assert len(statuses) == len(tasks)
+    assert set(statuses) <= {status.HTTP_201_CREATED, status.HTTP_409_CONFLICT}
+    assert statuses.count(status.HTTP_201_CREATED) > len(tasks) // 2
+
+    async with performance_sessionmaker() as db:
+        total = await db.scalar(
+            select(func.sum(Account.balance)).where(Account.id.in_(account_ids))
+        )
+        negative = await db.scalar(
+            select(func.count()).where(Account.id.in_(account_ids), Account.balance < 0)
+        )
+    assert total == initial_total
+    assert negative == 0
+
+    transfers_per_second = len(tasks) / processing_time
+    print(f'Переводов в секунду: {transfers_per_second:.1f}')
+    assert transfers_per_second > 5, f'Только {transfers_per_second:.1f} переводов в секунду'
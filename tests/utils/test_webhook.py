@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
 import pytest
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.errors import DuplicateTransactionError
 from app.crud.accounts import CRUDAccount
 from app.crud.payments import CRUDPayment
 from app.crud.users import CRUDUser
+from app.db.session import QueryCounter
 from app.services.webhook import WebhookService
 from app.utils.crypto import compute_signature
 from app.validators.async_ import UserAsyncValidator
@@ -684,12 +690,13 @@ class TestProcessTopup:
                 full_name=TestUserData.ROLLBACK_FULL_NAME,
                 password=TestUserData.PASSWORD_123_STRONG,
             )
+            account = await CRUDAccount().create_for_user(db, user.id)
 
             await payments.create(
                 db,
                 transaction_id=TestDomainIds.DUPLICATE_TX,
                 user_id=user.id,
-                account_id=TestDomainIds.TEST_ACCOUNT_ID_NEXT,
+                account_id=account.id,
                 amount=TestMonetaryConstants.AMOUNT_50_25,
             )
             await db.commit()
@@ -710,6 +717,77 @@ class TestProcessTopup:
             assert original_payment.amount == TestMonetaryConstants.AMOUNT_50_25
             assert original_payment.transaction_id == TestDomainIds.DUPLICATE_TX
 
+    @pytest.mark.asyncio()
+    async def test_duplicate_older_than_lookback_is_rejected(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        """Повтор старше глубины проверки отклоняет уникальный ключ транзакции."""
+        users = CRUDUser()
+        payments = CRUDPayment()
+
+        async with test_sessionmaker() as db:
+            user = await users.create(
+                db,
+                email=TestUserData.ROLLBACK_EMAIL,
+                full_name=TestUserData.ROLLBACK_FULL_NAME,
+                password=TestUserData.PASSWORD_123_STRONG,
+            )
+            user_id = user.id
+            account = await CRUDAccount().create_for_user(db, user_id)
+            payment = await payments.create(
+                db,
+                transaction_id=TestDomainIds.DUPLICATE_TX,
+                user_id=user.id,
+                account_id=account.id,
+                amount=TestMonetaryConstants.AMOUNT_50_25,
+            )
+            payment.created_at = datetime.now(timezone.utc) - timedelta(days=90)
+            await db.commit()
+
+            service = WebhookService(
+                CRUDAccount(),
+                CRUDPayment(),
+                UserAsyncValidator(CRUDUser()),
+                idempotency_lookback=timedelta(days=31),
+            )
+            with pytest.raises(DuplicateTransactionError):
+                await service.process_topup(
+                    db,
+                    transaction_id=TestDomainIds.DUPLICATE_TX,
+                    account_id=TestDomainIds.TEST_ACCOUNT_ID,
+                    user_id=user_id,
+                    amount=TestMonetaryConstants.AMOUNT_75_00,
+                )
+
+            assert len(await payments.list_for_user(db, user_id)) == 1
+
+    @pytest.mark.asyncio()
+    async def test_integrity_error_without_duplicate_is_not_409(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        """Ошибка целостности без существующей транзакции не выдаётся за повтор."""
+        payments = CRUDPayment()
+        payments.create = AsyncMock(side_effect=IntegrityError("INSERT", {}, Exception("fk")))
+
+        async with test_sessionmaker() as db:
+            user = await CRUDUser().create(
+                db,
+                email=TestUserData.ROLLBACK_EMAIL,
+                full_name=TestUserData.ROLLBACK_FULL_NAME,
+                password=TestUserData.PASSWORD_123_STRONG,
+            )
+            await db.commit()
+
+            service = WebhookService(CRUDAccount(), payments, UserAsyncValidator(CRUDUser()))
+            with pytest.raises(IntegrityError):
+                await service.process_topup(
+                    db,
+                    transaction_id=TestDomainIds.DUPLICATE_TX,
+                    account_id=TestDomainIds.TEST_ACCOUNT_ID,
+                    user_id=user.id,
+                    amount=TestMonetaryConstants.AMOUNT_75_00,
+                )
+
     @pytest.mark.asyncio()
     async def test_creates_payment_record(
         self, test_sessionmaker: async_sessionmaker[AsyncSession]
@@ -744,3 +822,84 @@ class TestProcessTopup:
             assert user_payments[0].transaction_id == TestDomainIds.TX_PAYMENT_RECORD
             assert user_payments[0].amount == TestMonetaryConstants.AMOUNT_30_00
             assert user_payments[0].user_id == user.id
+
+    @pytest.mark.asyncio()
+    async def test_anonymous_topups_share_default_account(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession]
+    ) -> None:
+        """Пополнения без account_id зачисляются на один счёт по умолчанию."""
+        users = CRUDUser()
+        accounts = CRUDAccount()
+
+        async with test_sessionmaker() as db:
+            user = await users.create(
+                db,
+                email=TestUserData.PAYMENT_EMAIL,
+                full_name=TestUserData.PAYMENT_FULL_NAME,
+                password=TestUserData.PASSWORD_123_STRONG,
+            )
+            service = WebhookService(accounts, CRUDPayment(), UserAsyncValidator(users))
+            first = await service.process_topup(
+                db,
+                transaction_id="default-tx-1",
+                account_id=0,
+                user_id=user.id,
+                amount=TestMonetaryConstants.AMOUNT_30_00,
+            )
+            second = await service.process_topup(
+                db,
+                transaction_id="default-tx-2",
+                account_id=TestDomainIds.TEST_ACCOUNT_ID + 1000,
+                user_id=user.id,
+                amount=TestMonetaryConstants.AMOUNT_20_00,
+            )
+
+            user_accounts = await accounts.list_for_user(db, user.id)
+            assert first.account_id == second.account_id
+            assert len(user_accounts) == 1
+            assert user_accounts[0].is_default
+            assert user_accounts[0].balance == Decimal("50.00")
+            assert user_accounts[0].version == 2
+
+    @pytest.mark.asyncio()
+    async def test_topup_query_count(
+        self, test_sessionmaker: async_sessionmaker[AsyncSession], query_counter: QueryCounter
+    ) -> None:
+        """Пополнение: минимальное число запросов, без refresh после коммита."""
+        users = CRUDUser()
+        accounts = CRUDAccount()
+
+        async with test_sessionmaker() as db:
+            user = await users.create(
+                db,
+                email=TestUserData.PAYMENT_EMAIL,
+                full_name=TestUserData.PAYMENT_FULL_NAME,
+                password=TestUserData.PASSWORD_123_STRONG,
+            )
+            account = await accounts.create_for_user(db, user.id)
+            await db.commit()
+            service = WebhookService(accounts, CRUDPayment(), UserAsyncValidator(users))
+
+            # Проверка дубля, SELECT ... FOR UPDATE, INSERT платежа, UPDATE баланса
+            query_counter.clear()
+            payment = await service.process_topup(
+                db,
+                transaction_id="count-tx-1",
+                account_id=account.id,
+                user_id=user.id,
+                amount=TestMonetaryConstants.AMOUNT_30_00,
+            )
+            assert len(query_counter) == 4
+            assert payment.id is not None
+            assert payment.created_at is not None
+
+            # Проверка дубля, проверка пользователя, upsert счёта, INSERT платежа, UPDATE баланса
+            query_counter.clear()
+            await service.process_topup(
+                db,
+                transaction_id="count-tx-2",
+                account_id=0,
+                user_id=user.id,
+                amount=TestMonetaryConstants.AMOUNT_30_00,
+            )
+            assert len(query_counter) == 5
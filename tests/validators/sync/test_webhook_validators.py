@@ -57,6 +57,19 @@ class TestWebhookValidator:
         with pytest.raises(ValidationError, match=ErrorMessages.INVALID_TRANSACTION_ID):
             WebhookValidator.validate_payment_data(payload)
 
+    def test_validate_payment_data_rejects_transfer_key(self) -> None:
+        """Ключи зачислений переводов недоступны провайдеру пополнений."""
+        payload = WebhookPayment(
+            transaction_id=f"transfer:{TestDomainIds.WEBHOOK_TX_1}",
+            account_id=TestDomainIds.TEST_ACCOUNT_ID,
+            user_id=TestDomainIds.TEST_USER_ID,
+            amount=TestMonetaryConstants.AMOUNT_100_00,
+            signature=TestTransactionData.SIGNATURE_GENERIC,
+        )
+
+        with pytest.raises(ValidationError, match=ErrorMessages.INVALID_TRANSACTION_ID):
+            WebhookValidator.validate_payment_data(payload)
+
     def test_validate_signature_valid(self) -> None:
         """Правильная подпись не вызывает ошибок."""
         secret = TestTransactionData.SECRET_KEY